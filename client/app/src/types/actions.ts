@@ -22,6 +22,7 @@ export interface GetTaskHistoryAction {
   payload: {
     ship_id?: string
     max_rows?: number
+    cursor?: string
   }
 }
 
@@ -412,6 +412,8 @@ export interface ShipDestroyedMessage extends ServerMessagePayload {
 export interface TaskHistoryMessage extends ServerMessagePayload {
   tasks: TaskHistoryEntry[]
   total_count: number
+  has_more?: boolean
+  next_cursor?: string | null
 }
 
 // --- Chat History Messages
@@ -0,0 +1,129 @@
+-- ============================================================================
+-- Leaderboard Rank Snapshots
+-- ============================================================================
+-- The leaderboard views are whole-player-base aggregates with window-function
+-- ranking on top, and the news digest used to rank them live on every run.
+-- This captures the ranks of every category on a schedule instead. Digests
+-- read the snapshot nearest their window end (and the one nearest the window
+-- start for rank changes), so they are cheap and historically accurate.
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+
+CREATE TABLE IF NOT EXISTS public.leaderboard_rank_snapshots (
+  captured_at TIMESTAMPTZ NOT NULL,
+  category TEXT NOT NULL,
+  character_id UUID NOT NULL,
+  name TEXT,
+  rank INTEGER NOT NULL,
+  score BIGINT,
+  PRIMARY KEY (captured_at, category, character_id)
+);
+
+COMMENT ON TABLE public.leaderboard_rank_snapshots IS
+  'Per-category leaderboard ranks captured by capture_leaderboard_rank_snapshot(). One captured_at per run.';
+
+ALTER TABLE public.leaderboard_rank_snapshots ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY leaderboard_rank_snapshots_service ON public.leaderboard_rank_snapshots
+  FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+CREATE OR REPLACE FUNCTION public.capture_leaderboard_rank_snapshot(
+  p_retention interval DEFAULT INTERVAL '90 days'
+) RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_captured_at timestamptz := now();
+  v_rows integer;
+  v_total integer := 0;
+BEGIN
+  -- Each category is captured independently so one failing view doesn't
+  -- lose the others; a missing category just has no rows in this snapshot.
+  BEGIN
+    INSERT INTO leaderboard_rank_snapshots (captured_at, category, character_id, name, rank, score)
+    SELECT v_captured_at, 'wealth', character_id, name,
+           row_number() OVER (ORDER BY total_wealth DESC), total_wealth::bigint
+    FROM leaderboard_wealth
+    WHERE character_id IS NOT NULL;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_total := v_total + v_rows;
+  EXCEPTION
+    WHEN OTHERS THEN
+      RAISE WARNING 'capture_leaderboard_rank_snapshot: wealth failed: %', SQLERRM;
+  END;
+
+  BEGIN
+    INSERT INTO leaderboard_rank_snapshots (captured_at, category, character_id, name, rank, score)
+    SELECT v_captured_at, 'trading', character_id, name,
+           row_number() OVER (ORDER BY total_trade_volume DESC), total_trade_volume::bigint
+    FROM leaderboard_trading
+    WHERE character_id IS NOT NULL;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_total := v_total + v_rows;
+  EXCEPTION
+    WHEN OTHERS THEN
+      RAISE WARNING 'capture_leaderboard_rank_snapshot: trading failed: %', SQLERRM;
+  END;
+
+  BEGIN
+    INSERT INTO leaderboard_rank_snapshots (captured_at, category, character_id, name, rank, score)
+    SELECT v_captured_at, 'territory', character_id, name,
+           row_number() OVER (
+             ORDER BY sectors_controlled DESC, total_fighters_deployed DESC NULLS LAST
+           ),
+           sectors_controlled::bigint
+    FROM leaderboard_territory
+    WHERE character_id IS NOT NULL;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_total := v_total + v_rows;
+  EXCEPTION
+    WHEN OTHERS THEN
+      RAISE WARNING 'capture_leaderboard_rank_snapshot: territory failed: %', SQLERRM;
+  END;
+
+  BEGIN
+    INSERT INTO leaderboard_rank_snapshots (captured_at, category, character_id, name, rank, score)
+    SELECT v_captured_at, 'exploration', character_id, name,
+           row_number() OVER (ORDER BY sectors_visited DESC), sectors_visited::bigint
+    FROM leaderboard_exploration
+    WHERE character_id IS NOT NULL;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    v_total := v_total + v_rows;
+  EXCEPTION
+    WHEN OTHERS THEN
+      RAISE WARNING 'capture_leaderboard_rank_snapshot: exploration failed: %', SQLERRM;
+  END;
+
+  IF p_retention IS NOT NULL THEN
+    DELETE FROM leaderboard_rank_snapshots
+     WHERE captured_at < v_captured_at - p_retention;
+  END IF;
+
+  RETURN v_total;
+END;
+$$;
+
+COMMENT ON FUNCTION public.capture_leaderboard_rank_snapshot(interval) IS
+  'Captures every leaderboard category''s ranks under one captured_at and prunes snapshots older than p_retention. Safe to run from pg_cron.';
+
+REVOKE ALL ON FUNCTION public.capture_leaderboard_rank_snapshot(interval) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.capture_leaderboard_rank_snapshot(interval) TO service_role;
+
+DO $do$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1
+    FROM cron.job
+    WHERE jobname = 'leaderboard-rank-snapshot'
+  ) THEN
+    PERFORM cron.schedule(
+      'leaderboard-rank-snapshot',
+      '5 * * * *',
+      $$SELECT public.capture_leaderboard_rank_snapshot(INTERVAL '90 days');$$
+    );
+  END IF;
+END;
+$do$;
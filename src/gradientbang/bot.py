@@ -353,7 +353,11 @@ async def run_bot(transport, runner_args: RunnerArguments) -> None:
     # Parallel branch alongside the voice LLM. Drives client panels/modals
     # from the same user turn the voice LLM sees.
     # @TODO: run as worker vs. parallel pipeline branch
-    ui_agent = UIAgent.create(rtvi=rtvi, game_client=orchestrator.game_client)
+    ui_agent = UIAgent.create(
+        rtvi=rtvi,
+        game_client=orchestrator.game_client,
+        session_cache=orchestrator.session_cache,
+    )
 
     # ── Pipeline ────────────────────────────────────────────────────────
     voice_llm = create_llm_service(get_voice_llm_config())
@@ -63,6 +63,14 @@ class Settings(BaseSettings):
         default=None,
         description="Debug-only path to append a JSONL trace of Supabase events. Unset in normal operation.",
     )
+    GAME_CLIENT_KNOWLEDGE_CACHE: bool = Field(
+        default=False,
+        description="Answer repeated list_known_ports/local_map_region/path_with_region calls from a per-character cache kept current by game events, and plot courses over known warps locally.",
+    )
+    GAME_CLIENT_KNOWLEDGE_CACHE_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="Maximum age (seconds) of a cached map/port answer before it is re-fetched.",
+    )
     SUPABASE_LEGACY_ID_NAMESPACE: str = Field(
         default="5a53c4f5-8f16-4be6-8d3d-2620f4c41b3b",
         description="UUID namespace used to map legacy character labels to stable UUIDs.",
@@ -281,6 +289,14 @@ class Settings(BaseSettings):
         default=2.0,
         description="Seconds to wait before requesting a deferred UIAgent intent.",
     )
+    SESSION_CACHE_COURSE_PLOT_TTL_SECS: float = Field(
+        default=300.0,
+        description="TTL (seconds) for course plots in the session cache shared by the UI agent and voice tools.",
+    )
+    SESSION_CACHE_MAP_TTL_SECS: float = Field(
+        default=30.0,
+        description="TTL (seconds) for get-my-map regions in the session cache. Movement also invalidates them.",
+    )
 
     # ===== LLM provider keys =====
     OPENAI_API_KEY: str | None = Field(
@@ -7,6 +7,13 @@ import asyncio
 import uuid
 import inspect
 
+from gradientbang.game.knowledge_cache import (
+    DEFAULT_TTL_SECONDS as KNOWLEDGE_CACHE_TTL_SECONDS,
+    MAP_REGION,
+    PATH_REGION,
+    PORTS_LIST,
+    KnowledgeCache,
+)
 from gradientbang.utils.summary_formatters import (
     bank_transaction_summary,
     chat_message_summary,
@@ -137,6 +144,10 @@ class BaseAsyncGameClient:
         # Task ID to attach to all API calls (set by TaskAgent during task execution)
         self._current_task_id: Optional[str] = None
 
+        # Opt-in cache of map/port answers (see enable_knowledge_cache)
+        self._knowledge_cache: Optional[KnowledgeCache] = None
+        self._replay_tasks: set[asyncio.Task] = set()
+
         # Optional summary formatters: endpoint/event name -> formatter function
         self._summary_formatters: Dict[str, Callable[[Dict[str, Any]], str]] = (
             self._build_default_summaries()
@@ -176,6 +187,82 @@ class BaseAsyncGameClient:
         """Set the current task ID to attach to all subsequent API requests."""
         self._current_task_id = value
 
+    @property
+    def knowledge_cache(self) -> Optional[KnowledgeCache]:
+        """Return the map/port knowledge cache, or None when it is disabled."""
+        return self._knowledge_cache
+
+    def enable_knowledge_cache(
+        self, *, ttl: float = KNOWLEDGE_CACHE_TTL_SECONDS
+    ) -> KnowledgeCache:
+        """Answer repeated map/port queries locally while the event stream says they hold.
+
+        Once enabled, ``list_known_ports``, ``local_map_region`` and
+        ``path_with_region`` return (and re-emit) a cached answer for the same
+        arguments and origin sector until an event invalidates it or ``ttl``
+        seconds pass, and ``plot_course`` is planned over known warps when the
+        answer cannot depend on unknown sectors. Statistics are available via
+        ``knowledge_cache.stats()``.
+        """
+        if self._knowledge_cache is None:
+            self._knowledge_cache = KnowledgeCache(ttl=ttl)
+        return self._knowledge_cache
+
+    def _knowledge_key(
+        self, payload: Mapping[str, Any], origin_field: str
+    ) -> Optional[Tuple[Any, ...]]:
+        """Cache key for a map/port query; None when the cache is off or origin unknown."""
+        if self._knowledge_cache is None or not self._knowledge_cache_applies():
+            return None
+        origin = payload.get(origin_field, self._current_sector)
+        if origin is None:
+            return None
+        options = sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in payload.items()
+            if name not in {"character_id", origin_field}
+        )
+        return (origin, *options)
+
+    def _knowledge_cache_applies(self) -> bool:
+        """Whether the current call is on behalf of the bound character."""
+        return True
+
+    def _effective_task_id(self) -> Optional[str]:
+        """Task ID the current call is tagged with."""
+        return self._current_task_id
+
+    def _replay_cached_event(
+        self, event_name: str, payload: Mapping[str, Any], request_id: Optional[str] = None
+    ) -> str:
+        """Emit a locally answered event after the caller gets its response.
+
+        The event is addressed to the bound character the same way the server
+        addresses a direct reply, so relays and task agents handle it like the
+        original. Returns the request_id it carries.
+        """
+        request_id = request_id or str(uuid.uuid4())
+        bound = self._bound_character_id()
+        event_payload: Dict[str, Any] = {
+            **payload,
+            "__event_context": {
+                "scope": "direct",
+                "reason": "direct",
+                "character_id": bound,
+                "recipient_ids": [bound],
+                "recipient_reasons": ["direct"],
+            },
+        }
+        task_id = self._effective_task_id()
+        if task_id:
+            event_payload["__task_id"] = task_id
+        task = asyncio.create_task(
+            self._process_event(event_name, event_payload, request_id=request_id)
+        )
+        self._replay_tasks.add(task)
+        task.add_done_callback(self._replay_tasks.discard)
+        return request_id
+
     def set_summary_formatter(
         self, endpoint: str, formatter: Callable[[Dict[str, Any]], str]
     ) -> None:
@@ -379,6 +466,8 @@ class BaseAsyncGameClient:
         if isinstance(payload, Mapping):
             self._maybe_update_current_sector(event_name, payload)
             self._maybe_update_corporation_id(event_name, payload)
+            if self._knowledge_cache is not None:
+                self._knowledge_cache.observe(event_name, payload, request_id)
 
         event_message: Dict[str, Any] = {
             "event_name": event_name,
@@ -793,7 +882,9 @@ class BaseAsyncGameClient:
             character_id: Character to plot course for (must match bound ID)
 
         Returns:
-            Minimal RPC acknowledgment (course details arrive via ``course.plot``)
+            RPC acknowledgment (course details also arrive via ``course.plot``).
+            With the knowledge cache enabled, courses that stay within known
+            warps are planned locally and never reach the server.
 
         Raises:
             RPCError: If the request fails
@@ -813,6 +904,33 @@ class BaseAsyncGameClient:
         if from_sector is not None:
             payload["from_sector"] = from_sector
 
+        origin = from_sector if from_sector is not None else self._current_sector
+        if (
+            self._knowledge_cache is not None
+            and self._knowledge_cache_applies()
+            and origin is not None
+        ):
+            route = self._knowledge_cache.routes.route(int(origin), int(to_sector))
+            if route is not None:
+                request_id = str(uuid.uuid4())
+                result: Dict[str, Any] = {
+                    "from_sector": int(origin),
+                    "to_sector": int(to_sector),
+                    "path": list(route.path),
+                    "distance": route.distance,
+                }
+                event_payload = {
+                    "source": {
+                        "type": "rpc",
+                        "method": "plot_course",
+                        "request_id": request_id,
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    },
+                    **result,
+                }
+                self._replay_cached_event("course.plot", event_payload, request_id)
+                return {"request_id": request_id, **result, "success": True}
+
         ack = await self._request("plot_course", payload)
         return ack
 
@@ -1552,7 +1670,16 @@ class BaseAsyncGameClient:
         if source is not None:
             payload["source"] = source
 
+        key = self._knowledge_key(payload, "center_sector")
+        if key is not None:
+            cached = self._knowledge_cache.get(MAP_REGION, key)
+            if cached is not None:
+                request_id = self._replay_cached_event(MAP_REGION, cached)
+                return {"request_id": request_id, **cached, "success": True}
+
         ack = await self._request("local_map_region", payload)
+        if key is not None:
+            self._knowledge_cache.put(MAP_REGION, key, ack)
         return ack
 
     async def list_known_ports(
@@ -1607,7 +1734,16 @@ class BaseAsyncGameClient:
         if mega is not None:
             payload["mega"] = mega
 
+        key = self._knowledge_key(payload, "from_sector")
+        if key is not None:
+            cached = self._knowledge_cache.get(PORTS_LIST, key)
+            if cached is not None:
+                request_id = self._replay_cached_event(PORTS_LIST, cached)
+                return {"request_id": request_id, **cached, "success": True}
+
         ack = await self._request("list_known_ports", payload)
+        if key is not None:
+            self._knowledge_cache.put(PORTS_LIST, key, ack)
         return ack
 
     async def path_with_region(
@@ -1645,6 +1781,16 @@ class BaseAsyncGameClient:
             "max_sectors": int(max_sectors),
         }
 
+        key = self._knowledge_key(payload, "from_sector")
+        if key is not None:
+            cached = self._knowledge_cache.get(PATH_REGION, key)
+            if cached is not None:
+                request_id = self._replay_cached_event(PATH_REGION, cached)
+                return {"request_id": request_id, "success": True}
+            # The answer arrives as a path.region event tagged with our request_id.
+            payload["request_id"] = str(uuid.uuid4())
+            self._knowledge_cache.expect(PATH_REGION, key, payload["request_id"])
+
         ack = await self._request("path_with_region", payload)
         return ack
 
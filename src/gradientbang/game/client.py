@@ -135,6 +135,9 @@ class AsyncGameClient(BaseAsyncGameClient):
 
         self._http = httpx.AsyncClient(timeout=10.0)
 
+        if settings.GAME_CLIENT_KNOWLEDGE_CACHE:
+            self.enable_knowledge_cache(ttl=settings.GAME_CLIENT_KNOWLEDGE_CACHE_TTL_SECONDS)
+
         self._canonical_character_id = canonicalize_character_id(character_id)
         self._canonical_actor_character_id = (
             canonicalize_character_id(actor_character_id)
@@ -412,6 +415,17 @@ class AsyncGameClient(BaseAsyncGameClient):
         }
         return await self._request("combat_disband_garrison", payload)
 
+    def _knowledge_cache_applies(self) -> bool:
+        # Brokered calls may act for another character through this client.
+        override_character_id = _per_call_character_id.get()
+        return override_character_id is None or (
+            canonicalize_character_id(str(override_character_id)) == self._canonical_character_id
+        )
+
+    def _effective_task_id(self) -> Optional[str]:
+        override_task_id = _per_call_task_id.get()
+        return override_task_id if override_task_id is not None else self._current_task_id
+
     def _inject_character_ids(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         enriched = dict(payload)
         override_character_id = _per_call_character_id.get()
@@ -0,0 +1,349 @@
+"""Client-side cache of one character's map and port knowledge.
+
+``list_known_ports``, ``local_map_region`` and ``path_with_region`` answers
+are remembered per argument set and replayed while fresh instead of asking
+the server again. Freshness is kept by the event stream the client already
+receives, not just by age:
+
+- ``port.update`` (and ports in ``sector.update``) patch the port in every
+  cached answer that lists it, so trade loops keep hitting.
+- Arriving in (or being shown) a sector not yet known as visited grows what
+  the character knows, so every cached answer is dropped. Query answers
+  themselves only describe existing knowledge and never count as growth.
+- Garrison, combat, salvage and ``sector.update`` events drop the map and
+  path answers that include their sector, since those show sector contents.
+- Corporation membership changes change whose knowledge is merged in, so
+  they drop everything.
+- Anything older than ``ttl`` seconds is a miss regardless.
+
+The cache also keeps what events have taught it about sectors (warps,
+ports, regions, positions) in :attr:`KnowledgeCache.sectors`, which
+:attr:`KnowledgeCache.routes` plans courses over.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Set, Tuple
+
+from gradientbang.game.route_planner import RoutePlanner
+
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MAX_ENTRIES = 256
+
+PORTS_LIST = "ports.list"
+MAP_REGION = "map.region"
+PATH_REGION = "path.region"
+
+_SECTOR_CONTENT_EVENT_PREFIXES = ("garrison.", "combat.", "salvage.")
+_SECTOR_CONTENT_EVENTS = {"sector.update", "ship.destroyed"}
+# Response and transport fields that are not part of the cached answer.
+_RESPONSE_METADATA = {"request_id", "success", "__event_context", "__task_id", "meta"}
+_QUERY_ANSWERS = {PORTS_LIST, MAP_REGION, PATH_REGION}
+_MEMBERSHIP_EVENTS = {
+    "corporation.created",
+    "corporation.disbanded",
+    "corporation.member_joined",
+    "corporation.member_left",
+    "corporation.member_kicked",
+}
+
+
+@dataclass(slots=True)
+class SectorKnowledge:
+    """What the event stream has shown about one sector."""
+
+    visited: bool = False
+    adjacent: Optional[Tuple[int, ...]] = None
+    port: Optional[Dict[str, Any]] = None
+    region: Optional[str] = None
+    position: Optional[Tuple[int, int]] = None
+
+
+@dataclass(slots=True)
+class _Entry:
+    payload: Dict[str, Any]
+    stored_at: float
+    sectors: Set[int] = field(default_factory=set)
+
+
+class KnowledgeCache:
+    """Cached map/port answers for one bound character, kept current by events."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Tuple[str, Hashable], _Entry] = OrderedDict()
+        # request_id -> (kind, key, issued_at) for answers that arrive as events.
+        self._pending: Dict[str, Tuple[str, Hashable, float]] = {}
+        self.sectors: Dict[int, SectorKnowledge] = {}
+        # Bumped whenever a sector's warps or visited flag change.
+        self.topology_version = 0
+        self.routes = RoutePlanner(self)
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.invalidations = 0
+
+    def get(self, kind: str, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached answer, or ``None`` (counted as a miss)."""
+        entry = self._entries.get((kind, key))
+        if entry is not None and self._clock() - entry.stored_at > self.ttl:
+            del self._entries[(kind, key)]
+            entry = None
+        if entry is None:
+            self.misses[kind] += 1
+            return None
+        self._entries.move_to_end((kind, key))
+        self.hits[kind] += 1
+        return copy.deepcopy(entry.payload)
+
+    def put(self, kind: str, key: Hashable, payload: Mapping[str, Any]) -> None:
+        stored = {k: copy.deepcopy(v) for k, v in payload.items() if k not in _RESPONSE_METADATA}
+        self.learn(kind, stored)
+        self._entries[(kind, key)] = _Entry(stored, self._clock(), _payload_sectors(kind, stored))
+        self._entries.move_to_end((kind, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def expect(self, kind: str, key: Hashable, request_id: str) -> None:
+        """Store the ``kind`` event carrying ``request_id`` under ``key`` when it arrives."""
+        now = self._clock()
+        self._pending = {
+            rid: pending for rid, pending in self._pending.items() if now - pending[2] <= self.ttl
+        }
+        self._pending[request_id] = (kind, key, now)
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """Drop every cached answer, or only those of ``kind``."""
+        stale = [entry_key for entry_key in self._entries if kind is None or entry_key[0] == kind]
+        for entry_key in stale:
+            del self._entries[entry_key]
+        self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "known_sectors": len(self.sectors),
+            "routes": self.routes.stats(),
+        }
+
+    # ------------------------------------------------------------------
+    # Event stream
+    # ------------------------------------------------------------------
+
+    def observe(self, event_name: str, payload: Any, request_id: Optional[str] = None) -> None:
+        """Update knowledge and cached answers from one incoming event."""
+        if not isinstance(payload, Mapping):
+            return
+
+        if request_id is not None and request_id in self._pending:
+            kind, key, _issued_at = self._pending.pop(request_id)
+            if kind == event_name:
+                self.put(kind, key, payload)
+                return
+
+        if event_name in _MEMBERSHIP_EVENTS:
+            self.invalidate()
+            return
+
+        if event_name == "port.update":
+            sector = payload.get("sector")
+            if isinstance(sector, Mapping):
+                self._update_port(_sector_id(sector.get("id")), sector.get("port"))
+            return
+
+        self.learn(event_name, payload)
+
+        if event_name in _SECTOR_CONTENT_EVENTS or event_name.startswith(
+            _SECTOR_CONTENT_EVENT_PREFIXES
+        ):
+            sector_id = _event_sector_id(event_name, payload)
+            if sector_id is not None:
+                self._invalidate_sector(sector_id)
+            if event_name == "sector.update" and "port" in payload:
+                self._update_port(sector_id, payload.get("port"))
+
+    def learn(self, event_name: str, payload: Mapping[str, Any]) -> None:
+        """Record the sectors a map, path, port list or sector snapshot describes."""
+        grew = False
+        if event_name in {"map.local", "map.region", "map.update"}:
+            for sector in _mappings(payload.get("sectors")):
+                grew |= self._learn_sector(
+                    _sector_id(sector.get("id")),
+                    sector,
+                    visited=bool(sector.get("visited")),
+                )
+        elif event_name == PATH_REGION:
+            for sector in _mappings(payload.get("sectors")):
+                grew |= self._learn_sector(
+                    _sector_id(sector.get("sector_id")),
+                    sector,
+                    visited=bool(sector.get("visited")),
+                )
+        elif event_name == PORTS_LIST:
+            for port_info in _mappings(payload.get("ports")):
+                sector = port_info.get("sector")
+                if isinstance(sector, Mapping):
+                    self._learn_sector(_sector_id(sector.get("id")), sector, visited=False)
+        elif event_name in {"sector.update", "movement.complete", "status.snapshot"}:
+            sector = payload if event_name == "sector.update" else payload.get("sector")
+            if isinstance(sector, Mapping):
+                grew |= self._learn_sector(_sector_id(sector.get("id")), sector, visited=True)
+        if grew and event_name not in _QUERY_ANSWERS:
+            self.invalidate()
+
+    def _learn_sector(
+        self, sector_id: Optional[int], data: Mapping[str, Any], *, visited: bool
+    ) -> bool:
+        """Merge one sector description; True when it is newly visited."""
+        if sector_id is None:
+            return False
+        known = self.sectors.get(sector_id)
+        if known is None:
+            known = self.sectors[sector_id] = SectorKnowledge()
+        newly_visited = visited and not known.visited
+        known.visited = known.visited or visited
+        # Lanes shown for unvisited sectors are derived from their visited
+        # neighbours, so only a visited sector's own warps are trusted.
+        adjacent = _adjacent_ids(data) if visited else None
+        if adjacent is not None and adjacent != known.adjacent:
+            known.adjacent = adjacent
+            self.topology_version += 1
+        elif newly_visited:
+            self.topology_version += 1
+        port = data.get("port")
+        if isinstance(port, Mapping) and port:
+            known.port = {**(known.port or {}), **port}
+        region = data.get("region")
+        if isinstance(region, str) and region:
+            known.region = region
+        position = data.get("position")
+        if isinstance(position, (list, tuple)) and len(position) == 2:
+            known.position = (int(position[0]), int(position[1]))
+        return newly_visited
+
+    def _update_port(self, sector_id: Optional[int], port: Any) -> None:
+        if sector_id is None or not isinstance(port, Mapping):
+            return
+        self._learn_sector(sector_id, {"port": port}, visited=False)
+        stale = []
+        for entry_key, entry in self._entries.items():
+            kind = entry_key[0]
+            if sector_id not in entry.sectors:
+                continue
+            if kind == PORTS_LIST:
+                for port_info in _mappings(entry.payload.get("ports")):
+                    sector = port_info.get("sector")
+                    if isinstance(sector, dict) and _sector_id(sector.get("id")) == sector_id:
+                        sector["port"] = {**(sector.get("port") or {}), **copy.deepcopy(port)}
+            elif kind == PATH_REGION:
+                for sector in _mappings(entry.payload.get("sectors")):
+                    if _sector_id(sector.get("sector_id")) == sector_id and isinstance(
+                        sector.get("port"), dict
+                    ):
+                        sector["port"] = {**sector["port"], **copy.deepcopy(port)}
+            elif kind == MAP_REGION:
+                for sector in _mappings(entry.payload.get("sectors")):
+                    if _sector_id(sector.get("id")) != sector_id:
+                        continue
+                    # Map sectors carry a compact port (code, mega); refresh
+                    # those keys, and drop the answer if it showed no port.
+                    if isinstance(sector.get("port"), dict):
+                        sector["port"].update(
+                            {k: copy.deepcopy(v) for k, v in port.items() if k in sector["port"]}
+                        )
+                    else:
+                        stale.append(entry_key)
+        for entry_key in stale:
+            del self._entries[entry_key]
+        self.invalidations += len(stale)
+
+    def _invalidate_sector(self, sector_id: int) -> None:
+        stale = [
+            entry_key
+            for entry_key, entry in self._entries.items()
+            if entry_key[0] in {MAP_REGION, PATH_REGION} and sector_id in entry.sectors
+        ]
+        for entry_key in stale:
+            del self._entries[entry_key]
+        self.invalidations += len(stale)
+
+
+def _mappings(value: Any) -> List[Mapping[str, Any]]:
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, Mapping)]
+
+
+def _sector_id(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def _event_sector_id(event_name: str, payload: Mapping[str, Any]) -> Optional[int]:
+    if event_name == "sector.update":
+        return _sector_id(payload.get("id"))
+    sector = payload.get("sector")
+    if isinstance(sector, Mapping):
+        return _sector_id(sector.get("id"))
+    return _sector_id(sector) if sector is not None else _sector_id(payload.get("sector_id"))
+
+
+def _adjacent_ids(data: Mapping[str, Any]) -> Optional[Tuple[int, ...]]:
+    """Outgoing warps from ``lanes`` or ``adjacent_sectors`` (dict or list form).
+
+    ``lanes`` keep the universe's warp order, which the server's path search
+    follows; ``adjacent_sectors`` dicts arrive keyed in ascending order.
+    """
+    lanes = data.get("lanes")
+    if isinstance(lanes, list):
+        targets = [_sector_id(lane.get("to")) for lane in lanes if isinstance(lane, Mapping)]
+        return tuple(target for target in targets if target is not None)
+    adjacent = data.get("adjacent_sectors")
+    if isinstance(adjacent, Mapping):
+        adjacent = list(adjacent)
+    if isinstance(adjacent, list):
+        targets = [_sector_id(target) for target in adjacent]
+        return tuple(target for target in targets if target is not None)
+    return None
+
+
+def _payload_sectors(kind: str, payload: Mapping[str, Any]) -> Set[int]:
+    """Sector ids a cached answer describes, for targeted patching and invalidation."""
+    ids: List[Optional[int]] = []
+    if kind == PORTS_LIST:
+        for port_info in _mappings(payload.get("ports")):
+            sector = port_info.get("sector")
+            if isinstance(sector, Mapping):
+                ids.append(_sector_id(sector.get("id")))
+    elif kind == MAP_REGION:
+        ids.extend(_sector_id(sector.get("id")) for sector in _mappings(payload.get("sectors")))
+    elif kind == PATH_REGION:
+        ids.extend(
+            _sector_id(sector.get("sector_id")) for sector in _mappings(payload.get("sectors"))
+        )
+        path = payload.get("path")
+        if isinstance(path, list):
+            ids.extend(_sector_id(sector) for sector in path)
+    return {sector_id for sector_id in ids if sector_id is not None}
+
+
+__all__ = ["DEFAULT_TTL_SECONDS", "KnowledgeCache", "SectorKnowledge"]
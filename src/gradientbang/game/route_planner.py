@@ -0,0 +1,153 @@
+"""Shortest paths over the warps a character already knows.
+
+The server answers ``plot_course`` with a breadth-first search over the whole
+universe. The client only knows the warps of sectors it has visited, so a
+local search is exact only as far as that knowledge reaches: every BFS layer
+up to the first sector whose warps are unknown (the *horizon*) is built from
+the same warps, in the same order, as the server's. A destination within the
+horizon gets the server's distance, and its path too when warps were learned
+in universe order (``lanes``). Anything further could have a shorter route
+through an unknown sector, so :meth:`RoutePlanner.route` returns ``None`` and
+the caller asks the server.
+
+Search trees are kept per origin and grown one BFS layer at a time only as far
+as the destination, so nearby destinations are cheap and repeated queries from
+the same sector (trade loops, "how far is X" checks) only walk parent links.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from gradientbang.game.knowledge_cache import KnowledgeCache
+
+DEFAULT_MAX_TREES = 16
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    path: Tuple[int, ...]
+    distance: int
+
+
+@dataclass(slots=True)
+class _SearchTree:
+    parents: Dict[int, Optional[int]]
+    # The deepest complete layer, which the next expansion starts from.
+    frontier: List[int]
+    depth: int = 0
+    # Depth of the first sector whose warps are unknown (None: none reached).
+    horizon: Optional[int] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.frontier or (self.horizon is not None and self.depth >= self.horizon)
+
+
+class RoutePlanner:
+    """In-process ``plot_course`` answers from a :class:`KnowledgeCache`."""
+
+    def __init__(self, cache: "KnowledgeCache", *, max_trees: int = DEFAULT_MAX_TREES) -> None:
+        self._cache = cache
+        self.max_trees = max_trees
+        self._version: Optional[int] = None
+        self._graph: Dict[int, Tuple[int, ...]] = {}
+        self._trees: OrderedDict[int, _SearchTree] = OrderedDict()
+        self.answered = 0
+        self.fallbacks = 0
+
+    def route(self, from_sector: int, to_sector: int) -> Optional[Route]:
+        """Return the server's shortest path, or ``None`` when it needs the server.
+
+        Like the server, the destination must be a visited sector; otherwise
+        (or when the answer depends on unknown warps) ``None`` is returned.
+        """
+        route = self._route(from_sector, to_sector)
+        if route is None:
+            self.fallbacks += 1
+        else:
+            self.answered += 1
+        return route
+
+    def distance(self, from_sector: int, to_sector: int) -> Optional[int]:
+        route = self.route(from_sector, to_sector)
+        return None if route is None else route.distance
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "answered": self.answered,
+            "fallbacks": self.fallbacks,
+            "trees": len(self._trees),
+            "graph_sectors": len(self._graph),
+        }
+
+    def _route(self, from_sector: int, to_sector: int) -> Optional[Route]:
+        self._sync()
+        if to_sector not in self._graph:
+            return None
+        if from_sector == to_sector:
+            return Route((from_sector,), 0)
+
+        tree = self._trees.get(from_sector)
+        if tree is None:
+            tree = self._trees[from_sector] = _SearchTree({from_sector: None}, [from_sector])
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(from_sector)
+
+        parents = tree.parents
+        while to_sector not in parents and not tree.exhausted:
+            self._expand(tree)
+        if to_sector not in parents:
+            return None
+        path = [to_sector]
+        parent = parents[to_sector]
+        while parent is not None:
+            path.append(parent)
+            parent = parents[parent]
+        path.reverse()
+        distance = len(path) - 1
+        if tree.horizon is not None and distance > tree.horizon:
+            return None
+        return Route(tuple(path), distance)
+
+    def _sync(self) -> None:
+        version = self._cache.topology_version
+        if version == self._version:
+            return
+        self._version = version
+        self._trees.clear()
+        self._graph = {
+            sector_id: known.adjacent
+            for sector_id, known in self._cache.sectors.items()
+            if known.visited and known.adjacent is not None
+        }
+
+    def _expand(self, tree: _SearchTree) -> None:
+        """Add the next BFS layer, visiting warps in universe order like the server.
+
+        Whole layers are expanded so every unknown sector at the current depth
+        is seen before an answer at the next depth is trusted.
+        """
+        graph = self._graph
+        parents = tree.parents
+        next_frontier = []
+        for sector_id in tree.frontier:
+            adjacent = graph.get(sector_id)
+            if adjacent is None:
+                if tree.horizon is None:
+                    tree.horizon = tree.depth
+                continue
+            for neighbor in adjacent:
+                if neighbor not in parents:
+                    parents[neighbor] = sector_id
+                    next_frontier.append(neighbor)
+        tree.frontier = next_frontier
+        tree.depth += 1
+
+
+__all__ = ["Route", "RoutePlanner"]
@@ -23,7 +23,7 @@ import subprocess
 import sys
 from pathlib import Path
 
-from gradientbang.newspaper.scripts import front_page_regions
+from gradientbang.newspaper.scripts import front_page_regions, image_cache
 
 
 ROOT = Path(__file__).resolve().parents[4]
@@ -147,6 +147,20 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--metadata-out", type=Path, default=None)
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=image_cache.DEFAULT_CACHE_DIR,
+        help=(
+            "Content-addressed image cache; an unchanged banner is copied from it "
+            "instead of regenerated."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the image cache.",
+    )
     return parser.parse_args(argv)
 
 
@@ -190,6 +204,8 @@ def main(argv: list[str] | None = None) -> int:
         str(out),
         "--no-augment",
     ]
+    if not args.no_cache:
+        cmd.extend(["--cache-dir", str(args.cache_dir)])
     if args.force:
         cmd.append("--force")
     if args.dry_run:
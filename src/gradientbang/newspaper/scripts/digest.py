@@ -4,16 +4,21 @@
 from __future__ import annotations
 
 import argparse
-import hashlib
+import copy
+import functools
 import json
 import os
+import queue
 import re
 import sys
-from collections import Counter
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, Iterator
 
 import psycopg
 from dotenv import load_dotenv
@@ -82,6 +87,9 @@ COMMODITY_NAMES = {
     "RO": "retro organics",
     "NS": "neuro-symbolics",
 }
+LEADERBOARD_SOURCES = ("snapshot", "live", "none")
+# Live ranks; rows and ordering match capture_leaderboard_rank_snapshot() so
+# live and snapshot ranks agree.
 LEADERBOARD_QUERIES = {
     "wealth": """
         SELECT character_id, name, rank, total_wealth AS score
@@ -89,6 +97,7 @@ LEADERBOARD_QUERIES = {
           SELECT character_id, name, total_wealth,
                  row_number() OVER (ORDER BY total_wealth DESC) AS rank
           FROM leaderboard_wealth
+          WHERE character_id IS NOT NULL
         ) ranked
     """,
     "trading": """
@@ -97,6 +106,7 @@ LEADERBOARD_QUERIES = {
           SELECT character_id, name, total_trade_volume,
                  row_number() OVER (ORDER BY total_trade_volume DESC) AS rank
           FROM leaderboard_trading
+          WHERE character_id IS NOT NULL
         ) ranked
     """,
     "territory": """
@@ -107,6 +117,7 @@ LEADERBOARD_QUERIES = {
                    ORDER BY sectors_controlled DESC, total_fighters_deployed DESC NULLS LAST
                  ) AS rank
           FROM leaderboard_territory
+          WHERE character_id IS NOT NULL
         ) ranked
     """,
     "exploration": """
@@ -115,12 +126,55 @@ LEADERBOARD_QUERIES = {
           SELECT character_id, name, sectors_visited,
                  row_number() OVER (ORDER BY sectors_visited DESC) AS rank
           FROM leaderboard_exploration
+          WHERE character_id IS NOT NULL
         ) ranked
     """,
 }
 
+# Ranks of every category from the latest snapshot taken at or before %(at)s;
+# captured hourly by capture_leaderboard_rank_snapshot() (pg_cron).
+LEADERBOARD_SNAPSHOT_QUERY = """
+SELECT captured_at, category, character_id, name, rank, score
+FROM leaderboard_rank_snapshots
+WHERE captured_at = (
+  SELECT max(captured_at) FROM leaderboard_rank_snapshots WHERE captured_at <= %(at)s
+)
+"""
+
+
+# Rows fetched per round trip from the server-side event cursor.
+DEFAULT_FETCH_BATCH_SIZE = 5000
+# Recipient fan-out copies are written in one transaction and share a
+# timestamp; this bounds how long an event stays open for merging.
+DEFAULT_DEDUP_WINDOW = timedelta(minutes=5)
+EVENT_CURSOR_NAME = "news_digest_events"
+PARTIAL_SCHEMA = "gradientbang.news_digest_partial.v1"
+DEFAULT_CHECKPOINT_BUCKET = timedelta(hours=1)
+# Buckets that ended less than this long ago may still be receiving rows, so
+# they are recomputed rather than checkpointed.
+CHECKPOINT_SETTLE_DELAY = timedelta(minutes=5)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Partitioned fetches open at most this many concurrent connections; extra
+# partitions just make each slice (and its statement_timeout) smaller.
+MAX_PARTITION_CONNECTIONS = 8
+DEFAULT_PARTITION_RETRIES = 2
+PARTITION_RETRY_DELAY_SECONDS = 1.0
+# Batches a slice may buffer ahead of the consumer before its fetch blocks.
+PARTITION_QUEUE_BATCHES = 2
+PARTITION_QUEUE_POLL_SECONDS = 0.1
+# Fields a --digests player/corp filter is matched against. All of them are
+# part of an event's identity key, so every delivery of an event agrees.
+PLAYER_FILTER_FIELDS = (
+    ("character_id", "character_name"),
+    ("actor_character_id", "actor_name"),
+    ("sender_id", "sender_name"),
+)
+CORP_FILTER_FIELDS = (("corp_id", "corp_name"),)
+DIGEST_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
 
 Json = dict[str, Any]
+IdentityKey = tuple[Any, ...]
 
 
 @dataclass(slots=True)
@@ -228,6 +282,79 @@ class Digest:
     leaderboard_ranks: dict[str, dict[str, dict[str, Any]]]
     period_ranks: dict[str, dict[str, int]]
     warnings: list[str] = field(default_factory=list)
+    # Snapshot the official ranks come from; None when they were queried live.
+    leaderboard_as_of: datetime | None = None
+    # category -> character_id -> places climbed since the window-start snapshot.
+    leaderboard_deltas: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class LeaderboardRanks:
+    """Official leaderboard ranks for a digest window."""
+
+    ranks: dict[str, dict[str, dict[str, Any]]] = field(default_factory=dict)
+    as_of: datetime | None = None
+    deltas: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class PartialDigest:
+    """Aggregates for ``[start, end)`` that merge with the adjacent intervals.
+
+    Ranks and warnings are window-level and only derived once partials have
+    been merged into the final window (see ``digest_from_partial``).
+    """
+
+    start: datetime
+    end: datetime
+    global_stats: GlobalStats
+    players: dict[str, PlayerDigest]
+
+
+@dataclass(frozen=True, slots=True)
+class DigestSpec:
+    """One of several digests built from a single scan (see ``multi_digest``).
+
+    ``players`` and ``corps`` hold ids or names, matched case-insensitively.
+    A player filter keeps events the player acted in (as character, actor or
+    sender), not ones merely delivered to them; a corp filter keeps events
+    tagged with the corp.
+    """
+
+    name: str
+    start: datetime
+    end: datetime
+    players: frozenset[str] = frozenset()
+    corps: frozenset[str] = frozenset()
+
+    def __post_init__(self) -> None:
+        if not DIGEST_NAME_RE.fullmatch(self.name):
+            raise ValueError(f"digest name {self.name!r} must be a plain file name")
+        if self.start >= self.end:
+            raise ValueError(f"digest {self.name!r}: window start must be before window end")
+        object.__setattr__(self, "players", frozenset(value.lower() for value in self.players))
+        object.__setattr__(self, "corps", frozenset(value.lower() for value in self.corps))
+
+    def accepts(self, timestamp: datetime, field_value: Callable[[str], Any]) -> bool:
+        """Whether a row or event (read through ``field_value``) belongs to this digest."""
+        if not self.start <= timestamp < self.end:
+            return False
+        if self.players and not matches_filter(self.players, field_value, PLAYER_FILTER_FIELDS):
+            return False
+        return not self.corps or matches_filter(self.corps, field_value, CORP_FILTER_FIELDS)
+
+
+def matches_filter(
+    wanted: frozenset[str],
+    field_value: Callable[[str], Any],
+    fields: tuple[tuple[str, str], ...],
+) -> bool:
+    for id_field, name_field in fields:
+        for name in (id_field, name_field):
+            value = clean_str(field_value(name))
+            if value is not None and value.lower() in wanted:
+                return True
+    return False
 
 
 def main() -> None:
@@ -237,23 +364,53 @@ def main() -> None:
 def run(argv: list[str]) -> int:
     args = parse_args(argv)
     try:
-        start, end = resolve_window(args)
+        multi = bool(args.window or args.digests)
+        if not multi:
+            start, end = resolve_window(args)
         env_path = Path(args.env_file) if args.env_file else None
         if env_path and env_path.exists():
             load_dotenv(env_path, override=False)
         dsn = resolve_database_url(args.database_url)
-        rows, leaderboard_ranks = fetch_digest_inputs(
-            dsn=dsn,
-            start=start,
-            end=end,
-            statement_timeout=args.statement_timeout,
-            include_leaderboard=not args.no_current_leaderboard,
-        )
-        digest = build_digest(rows, start=start, end=end, leaderboard_ranks=leaderboard_ranks)
-        if args.format == "json":
-            output = json.dumps(digest_to_dict(digest), indent=2, sort_keys=True) + "\n"
+        leaderboard_source = "none" if args.no_current_leaderboard else args.leaderboard_source
+        if multi:
+            return run_multi(args, dsn=dsn, leaderboard_source=leaderboard_source)
+        if args.partitions > 1 and args.checkpoint_dir:
+            raise ValueError("--partitions cannot be combined with --checkpoint-dir")
+        if args.partitions > 1:
+            digest = partitioned_digest(
+                dsn=dsn,
+                start=start,
+                end=end,
+                statement_timeout=args.statement_timeout,
+                leaderboard_source=leaderboard_source,
+                partitions=args.partitions,
+                retries=args.partition_retries,
+                batch_size=args.batch_size,
+                dedup_window=timedelta(seconds=args.dedup_window_seconds),
+            )
+        elif args.checkpoint_dir:
+            digest = checkpointed_digest(
+                dsn=dsn,
+                start=start,
+                end=end,
+                statement_timeout=args.statement_timeout,
+                leaderboard_source=leaderboard_source,
+                store=CheckpointStore(Path(args.checkpoint_dir)),
+                bucket=parse_duration(args.checkpoint_bucket),
+                batch_size=args.batch_size,
+                dedup_window=timedelta(seconds=args.dedup_window_seconds),
+            )
         else:
-            output = render_markdown(digest, max_lines_per_section=args.max_lines_per_section)
+            digest = stream_digest(
+                dsn=dsn,
+                start=start,
+                end=end,
+                statement_timeout=args.statement_timeout,
+                leaderboard_source=leaderboard_source,
+                batch_size=args.batch_size,
+                dedup_window=timedelta(seconds=args.dedup_window_seconds),
+            )
+        output = format_digest(digest, args)
         if args.output:
             output_path = Path(args.output)
             output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -269,6 +426,38 @@ def run(argv: list[str]) -> int:
         return 1
 
 
+def run_multi(args: argparse.Namespace, *, dsn: str, leaderboard_source: str) -> int:
+    if args.partitions > 1 or args.checkpoint_dir:
+        raise ValueError(
+            "--window/--digests cannot be combined with --partitions or --checkpoint-dir"
+        )
+    if args.output:
+        raise ValueError("--window/--digests write one file per digest; use --output-dir")
+    if not args.output_dir:
+        raise ValueError("--window/--digests require --output-dir")
+    specs = resolve_digest_specs(args)
+    digests = multi_digest(
+        dsn=dsn,
+        specs=specs,
+        statement_timeout=args.statement_timeout,
+        leaderboard_source=leaderboard_source,
+        batch_size=args.batch_size,
+        dedup_window=timedelta(seconds=args.dedup_window_seconds),
+    )
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".json" if args.format == "json" else ".md"
+    for name, digest in digests.items():
+        (output_dir / f"{name}{suffix}").write_text(format_digest(digest, args))
+    return 0
+
+
+def format_digest(digest: Digest, args: argparse.Namespace) -> str:
+    if args.format == "json":
+        return json.dumps(digest_to_dict(digest), indent=2, sort_keys=True) + "\n"
+    return render_markdown(digest, max_lines_per_section=args.max_lines_per_section)
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
@@ -289,6 +478,27 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         help="Relative window length ending at --end or now, for example 90m, 1h, 24h, 7d.",
     )
 
+    multi = parser.add_argument_group("several digests from one scan")
+    multi.add_argument(
+        "--window",
+        action="append",
+        default=[],
+        metavar="NAME=WINDOW",
+        help=(
+            "Add a named digest; WINDOW is a duration ending at --end or now (24h, 7d) or "
+            "START/END timestamps. May be repeated. Writes <output-dir>/NAME.md (or .json)."
+        ),
+    )
+    multi.add_argument(
+        "--digests",
+        help=(
+            'JSON file listing digests: [{"name": ..., "duration": "7d" | "start"/"end", '
+            '"players": [id or name, ...], "corps": [id or name, ...]}, ...]. Combines with '
+            "--window; all digests are built from one scan of their union range."
+        ),
+    )
+    multi.add_argument("--output-dir", help="Directory for --window/--digests output files.")
+
     db = parser.add_argument_group("database")
     db.add_argument(
         "--env-file",
@@ -304,10 +514,72 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         default="60s",
         help="Postgres statement_timeout for the read-only transaction. Defaults to 60s.",
     )
+    db.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=DEFAULT_FETCH_BATCH_SIZE,
+        help=(
+            "Event rows fetched per round trip from the server-side cursor. "
+            f"Bounds peak memory. Defaults to {DEFAULT_FETCH_BATCH_SIZE}."
+        ),
+    )
+    db.add_argument(
+        "--dedup-window-seconds",
+        type=float,
+        default=DEFAULT_DEDUP_WINDOW.total_seconds(),
+        help=(
+            "How far apart (by timestamp) recipient fan-out rows of one event may be and "
+            f"still merge. Defaults to {DEFAULT_DEDUP_WINDOW.total_seconds():g}."
+        ),
+    )
+    db.add_argument(
+        "--partitions",
+        type=positive_int,
+        default=1,
+        help=(
+            "Split the window into this many time slices and fetch them concurrently, each on "
+            f"its own read-only connection (at most {MAX_PARTITION_CONNECTIONS} at once) with its "
+            "own statement_timeout. Defaults to 1 (a single scan)."
+        ),
+    )
+    db.add_argument(
+        "--partition-retries",
+        type=int,
+        default=DEFAULT_PARTITION_RETRIES,
+        help=(
+            "Retries for a partition that times out or loses its connection. "
+            f"Defaults to {DEFAULT_PARTITION_RETRIES}."
+        ),
+    )
     db.add_argument(
         "--no-current-leaderboard",
         action="store_true",
-        help="Skip querying current leaderboard views.",
+        help="Skip official leaderboard ranks entirely.",
+    )
+    db.add_argument(
+        "--leaderboard-source",
+        choices=LEADERBOARD_SOURCES[:2],
+        default="snapshot",
+        help=(
+            "Where official ranks come from: the leaderboard_rank_snapshots row set nearest "
+            "the window end (with rank changes since the window start), or live queries over "
+            "the leaderboard views. Falls back to live when no snapshot exists. "
+            "Defaults to snapshot."
+        ),
+    )
+
+    checkpoints = parser.add_argument_group("checkpoints")
+    checkpoints.add_argument(
+        "--checkpoint-dir",
+        help=(
+            "Reuse and store per-bucket partial digests in this directory, so overlapping "
+            "windows (e.g. a rolling 7d digest) only query buckets not seen before."
+        ),
+    )
+    checkpoints.add_argument(
+        "--checkpoint-bucket",
+        default="1h",
+        help="Checkpoint bucket length, for example 15m or 1h. Defaults to 1h.",
     )
 
     output = parser.add_argument_group("output")
@@ -327,6 +599,13 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return parsed
+
+
 def resolve_window(args: argparse.Namespace) -> tuple[datetime, datetime]:
     end = parse_timestamp(args.end) if args.end else datetime.now(timezone.utc)
     duration = parse_duration(args.duration) if args.duration else None
@@ -349,6 +628,53 @@ def resolve_window(args: argparse.Namespace) -> tuple[datetime, datetime]:
     return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
 
 
+def resolve_digest_specs(args: argparse.Namespace) -> list[DigestSpec]:
+    """``DigestSpec``s for ``--window`` and ``--digests``; relative windows end at --end or now."""
+    default_end = parse_timestamp(args.end) if args.end else datetime.now(timezone.utc)
+    entries: list[dict[str, Any]] = []
+    for value in args.window:
+        name, separator, window = value.partition("=")
+        if not separator or not window:
+            raise ValueError(f"--window must look like NAME=7d or NAME=START/END, not {value!r}")
+        if "/" in window:
+            window_start, _, window_end = window.partition("/")
+            entries.append({"name": name, "start": window_start, "end": window_end})
+        else:
+            entries.append({"name": name, "duration": window})
+    if args.digests:
+        entries.extend(
+            require_dict(entry, "digest spec")
+            for entry in require_list(
+                json.loads(Path(args.digests).read_text()), "--digests file"
+            )
+        )
+
+    specs: list[DigestSpec] = []
+    for entry in entries:
+        name = str(entry.get("name") or "")
+        end = parse_timestamp(entry["end"]) if entry.get("end") else default_end
+        if entry.get("start"):
+            start = parse_timestamp(entry["start"])
+        elif entry.get("duration"):
+            start = end - parse_duration(str(entry["duration"]))
+        else:
+            raise ValueError(f"digest {name!r} needs a start or a duration")
+        specs.append(
+            DigestSpec(
+                name=name,
+                start=start,
+                end=end,
+                players=frozenset(str(value) for value in entry.get("players") or ()),
+                corps=frozenset(str(value) for value in entry.get("corps") or ()),
+            )
+        )
+    names = [spec.name for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate digest names: {', '.join(duplicates)}")
+    return specs
+
+
 def parse_timestamp(value: str) -> datetime:
     raw = value.strip()
     if not raw:
@@ -409,6 +735,391 @@ def fetch_digest_inputs(
             raise
 
 
+def stream_digest(
+    *,
+    dsn: str,
+    start: datetime,
+    end: datetime,
+    statement_timeout: str,
+    leaderboard_source: str = "snapshot",
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+) -> Digest:
+    """Build a digest by streaming events through a server-side cursor.
+
+    Unlike ``fetch_digest_inputs`` the window's rows are never held in memory
+    at once: they are fetched ``batch_size`` at a time and aggregated as they
+    arrive, so peak memory follows the batch size rather than the window length.
+    """
+    with psycopg.connect(dsn, row_factory=dict_row) as conn:
+        conn.execute("BEGIN READ ONLY")
+        try:
+            conn.execute("SELECT set_config('statement_timeout', %s, true)", (statement_timeout,))
+            leaderboard = fetch_leaderboard(
+                conn, start=start, end=end, source=leaderboard_source
+            )
+            digest = build_digest_streaming(
+                iter_event_rows(conn, start=start, end=end, batch_size=batch_size),
+                start=start,
+                end=end,
+                leaderboard_ranks=leaderboard.ranks,
+                leaderboard_as_of=leaderboard.as_of,
+                leaderboard_deltas=leaderboard.deltas,
+                dedup_window=dedup_window,
+            )
+            conn.execute("COMMIT")
+            return digest
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def partitioned_digest(
+    *,
+    dsn: str,
+    start: datetime,
+    end: datetime,
+    statement_timeout: str,
+    partitions: int,
+    leaderboard_source: str = "snapshot",
+    retries: int = DEFAULT_PARTITION_RETRIES,
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+) -> Digest:
+    """Like ``stream_digest``, but the window is fetched as concurrent time slices.
+
+    Each slice runs in its own read-only transaction, so slices do not share
+    a snapshot; events are append-only, so a closed window reads the same.
+    """
+    leaderboard = LeaderboardRanks()
+    if leaderboard_source != "none":
+        with psycopg.connect(dsn, row_factory=dict_row) as conn:
+            conn.execute("BEGIN READ ONLY")
+            try:
+                conn.execute(
+                    "SELECT set_config('statement_timeout', %s, true)", (statement_timeout,)
+                )
+                leaderboard = fetch_leaderboard(
+                    conn, start=start, end=end, source=leaderboard_source
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    return build_digest_streaming(
+        iter_partitioned_event_rows(
+            dsn=dsn,
+            start=start,
+            end=end,
+            partitions=partitions,
+            statement_timeout=statement_timeout,
+            batch_size=batch_size,
+            retries=retries,
+        ),
+        start=start,
+        end=end,
+        leaderboard_ranks=leaderboard.ranks,
+        leaderboard_as_of=leaderboard.as_of,
+        leaderboard_deltas=leaderboard.deltas,
+        dedup_window=dedup_window,
+    )
+
+
+def partition_window(
+    start: datetime, end: datetime, partitions: int
+) -> list[tuple[datetime, datetime]]:
+    """Split ``[start, end)`` into ``partitions`` equal, contiguous slices."""
+    if partitions <= 0:
+        raise ValueError("partitions must be positive")
+    bounds = [start + (end - start) * index / partitions for index in range(partitions)]
+    bounds.append(end)
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+
+def iter_partitioned_event_rows(
+    *,
+    dsn: str,
+    start: datetime,
+    end: datetime,
+    partitions: int,
+    statement_timeout: str,
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    retries: int = DEFAULT_PARTITION_RETRIES,
+    retry_delay: float = PARTITION_RETRY_DELAY_SECONDS,
+) -> Iterator[dict[str, Any]]:
+    """Yield ``EVENT_QUERY`` rows for ``[start, end)``, fetched slice by slice in parallel.
+
+    Slices are disjoint and each is ordered, so yielding them in slice order
+    is the ``(timestamp, id)`` merge. At most ``MAX_PARTITION_CONNECTIONS``
+    slices are in flight; each streams its rows through a queue of at most
+    ``PARTITION_QUEUE_BATCHES`` batches, so memory stays bounded by the
+    in-flight slices rather than the window. The next slice is started as
+    soon as the earliest one has been fully consumed.
+    """
+    intervals = deque(partition_window(start, end, partitions))
+    workers = min(len(intervals), MAX_PARTITION_CONNECTIONS)
+    stop = threading.Event()
+    in_flight: deque[tuple[queue.Queue[Any], Future[None]]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-digest") as pool:
+
+        def submit_next() -> None:
+            interval_start, interval_end = intervals.popleft()
+            sink: queue.Queue[Any] = queue.Queue(maxsize=PARTITION_QUEUE_BATCHES)
+            future = pool.submit(
+                stream_partition_with_retries,
+                dsn,
+                interval_start,
+                interval_end,
+                sink=sink,
+                stop=stop,
+                statement_timeout=statement_timeout,
+                batch_size=batch_size,
+                retries=retries,
+                retry_delay=retry_delay,
+            )
+            in_flight.append((sink, future))
+
+        try:
+            while intervals and len(in_flight) < workers:
+                submit_next()
+            while in_flight:
+                sink, future = in_flight.popleft()
+                while (batch := sink.get()) is not _SLICE_DONE:
+                    if isinstance(batch, BaseException):
+                        raise batch
+                    yield from batch
+                future.result()
+                if intervals:
+                    submit_next()
+        finally:
+            # Unblocks producers waiting on a full queue when the consumer stops early.
+            stop.set()
+            for _sink, future in in_flight:
+                future.cancel()
+
+
+_SLICE_DONE = object()
+
+
+def stream_partition_with_retries(
+    dsn: str,
+    start: datetime,
+    end: datetime,
+    *,
+    sink: queue.Queue[Any],
+    stop: threading.Event,
+    statement_timeout: str,
+    batch_size: int,
+    retries: int,
+    retry_delay: float,
+) -> None:
+    """Stream one slice into ``sink`` in batches, retrying timeouts and dropped connections.
+
+    A retry resumes the slice's ordered query after the last delivered
+    ``(timestamp, id)``, so rows committed between attempts neither repeat nor
+    shift what was already sent. Ends with ``_SLICE_DONE``, or with the error
+    once retries run out.
+    """
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                sink.put(item, timeout=PARTITION_QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    last: tuple[datetime, int] | None = None
+    attempt = 0
+    while True:
+        try:
+            batch: list[dict[str, Any]] = []
+            for row in fetch_partition(
+                dsn,
+                start,
+                end,
+                statement_timeout=statement_timeout,
+                batch_size=batch_size,
+                after=last,
+            ):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    last = (batch[-1]["timestamp"], batch[-1]["id"])
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_SLICE_DONE)
+            return
+        except psycopg.OperationalError as exc:
+            if attempt >= retries:
+                put(
+                    RuntimeError(
+                        f"event partition {start.isoformat()}..{end.isoformat()} failed "
+                        f"after {attempt + 1} attempts: {exc}"
+                    )
+                )
+                return
+            time.sleep(retry_delay * 2**attempt)
+            attempt += 1
+        except Exception as exc:
+            put(exc)
+            return
+
+
+def fetch_partition(
+    dsn: str,
+    start: datetime,
+    end: datetime,
+    *,
+    statement_timeout: str,
+    batch_size: int,
+    after: tuple[datetime, int] | None = None,
+) -> Iterator[dict[str, Any]]:
+    with psycopg.connect(dsn, row_factory=dict_row) as conn:
+        conn.execute("BEGIN READ ONLY")
+        conn.execute("SELECT set_config('statement_timeout', %s, true)", (statement_timeout,))
+        yield from iter_event_rows(conn, start=start, end=end, batch_size=batch_size, after=after)
+        conn.execute("COMMIT")
+
+
+def checkpointed_digest(
+    *,
+    dsn: str,
+    start: datetime,
+    end: datetime,
+    statement_timeout: str,
+    store: CheckpointStore,
+    leaderboard_source: str = "snapshot",
+    bucket: timedelta = DEFAULT_CHECKPOINT_BUCKET,
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+    now: datetime | None = None,
+) -> Digest:
+    """Build a digest from per-bucket partials, querying only uncached buckets.
+
+    Full buckets that ended more than ``CHECKPOINT_SETTLE_DELAY`` ago are read
+    from ``store`` when present and written to it after being computed; the
+    ragged edges of the window and still-open buckets are always queried.
+    """
+    settled_before = (now or datetime.now(timezone.utc)) - CHECKPOINT_SETTLE_DELAY
+    intervals = bucket_intervals(start, end, bucket)
+    reusable = [
+        interval_end - interval_start == bucket and interval_end <= settled_before
+        for interval_start, interval_end in intervals
+    ]
+    partials: list[PartialDigest | None] = [
+        store.load(*interval) if can_reuse else None
+        for interval, can_reuse in zip(intervals, reusable)
+    ]
+
+    with psycopg.connect(dsn, row_factory=dict_row) as conn:
+        conn.execute("BEGIN READ ONLY")
+        try:
+            conn.execute("SELECT set_config('statement_timeout', %s, true)", (statement_timeout,))
+            leaderboard = fetch_leaderboard(
+                conn, start=start, end=end, source=leaderboard_source
+            )
+            for index, (interval_start, interval_end) in enumerate(intervals):
+                if partials[index] is not None:
+                    continue
+                partials[index] = build_partial_digest(
+                    iter_event_rows(
+                        conn, start=interval_start, end=interval_end, batch_size=batch_size
+                    ),
+                    start=interval_start,
+                    end=interval_end,
+                    dedup_window=dedup_window,
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    completed = [partial for partial in partials if partial is not None]
+    for partial, can_reuse in zip(completed, reusable):
+        if can_reuse and not store.path_for(partial.start, partial.end).exists():
+            store.save(partial)
+    return digest_from_partial(
+        merge_partial_digests(completed),
+        leaderboard_ranks=leaderboard.ranks,
+        leaderboard_as_of=leaderboard.as_of,
+        leaderboard_deltas=leaderboard.deltas,
+    )
+
+
+def multi_digest(
+    *,
+    dsn: str,
+    specs: list[DigestSpec],
+    statement_timeout: str,
+    leaderboard_source: str = "snapshot",
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+) -> dict[str, Digest]:
+    """Build every digest in ``specs`` from one cursor over their union range.
+
+    Each digest equals what ``stream_digest`` would build for its window with
+    its filter applied, but the events are read and deduplicated once.
+    """
+    if not specs:
+        raise ValueError("no digests requested")
+    start = min(spec.start for spec in specs)
+    end = max(spec.end for spec in specs)
+    with psycopg.connect(dsn, row_factory=dict_row) as conn:
+        conn.execute("BEGIN READ ONLY")
+        try:
+            conn.execute("SELECT set_config('statement_timeout', %s, true)", (statement_timeout,))
+            by_window: dict[tuple[datetime, datetime], LeaderboardRanks] = {}
+            for spec in specs:
+                window = (spec.start, spec.end)
+                if window not in by_window:
+                    if leaderboard_source == "live" and by_window:
+                        # Live ranks don't depend on the window.
+                        by_window[window] = next(iter(by_window.values()))
+                    else:
+                        by_window[window] = fetch_leaderboard(
+                            conn, start=spec.start, end=spec.end, source=leaderboard_source
+                        )
+            digests = build_digests_streaming(
+                iter_event_rows(conn, start=start, end=end, batch_size=batch_size),
+                specs,
+                leaderboards={spec.name: by_window[(spec.start, spec.end)] for spec in specs},
+                dedup_window=dedup_window,
+            )
+            conn.execute("COMMIT")
+            return digests
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def iter_event_rows(
+    conn: psycopg.Connection[Any],
+    *,
+    start: datetime,
+    end: datetime,
+    batch_size: int,
+    after: tuple[datetime, int] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield ``EVENT_QUERY`` rows from a named cursor, ``batch_size`` per FETCH.
+
+    With ``after``, only rows past that ``(timestamp, id)`` are read.
+    """
+    with conn.cursor(name=EVENT_CURSOR_NAME, row_factory=dict_row) as cursor:
+        if after is None:
+            cursor.execute(EVENT_QUERY, {"start": start, "end": end})
+        else:
+            cursor.execute(
+                EVENT_QUERY_AFTER,
+                {"start": start, "end": end, "after_timestamp": after[0], "after_id": after[1]},
+            )
+        while batch := cursor.fetchmany(batch_size):
+            yield from batch
+
+
 EVENT_QUERY = """
 SELECT
   e.id,
@@ -448,6 +1159,73 @@ WHERE e.timestamp >= %(start)s
   AND e.timestamp < %(end)s
 ORDER BY e.timestamp ASC, e.id ASC
 """
+# EVENT_QUERY resumed after a row; the row comparison matches the sort order.
+EVENT_QUERY_AFTER = EVENT_QUERY.replace(
+    "\nORDER BY", "\n  AND (e.timestamp, e.id) > (%(after_timestamp)s, %(after_id)s)\nORDER BY"
+)
+
+
+def fetch_leaderboard(
+    conn: psycopg.Connection[Any],
+    *,
+    start: datetime,
+    end: datetime,
+    source: str,
+) -> LeaderboardRanks:
+    """Official ranks for ``[start, end)`` from ``source`` (see ``LEADERBOARD_SOURCES``)."""
+    if source == "none":
+        return LeaderboardRanks()
+    if source == "snapshot":
+        current = fetch_leaderboard_snapshot(conn, at=end)
+        if current is not None:
+            baseline = fetch_leaderboard_snapshot(conn, at=start)
+            if baseline is not None and baseline.as_of != current.as_of:
+                current.deltas = rank_deltas(current.ranks, baseline.ranks)
+            return current
+    elif source != "live":
+        raise ValueError(f"unknown leaderboard source {source!r}")
+    return LeaderboardRanks(ranks=fetch_current_leaderboard_ranks(conn))
+
+
+def fetch_leaderboard_snapshot(
+    conn: psycopg.Connection[Any], *, at: datetime
+) -> LeaderboardRanks | None:
+    """Ranks from the latest snapshot at or before ``at``, or None if there is none."""
+    conn.execute("SAVEPOINT leaderboard_snapshot")
+    try:
+        rows = conn.execute(LEADERBOARD_SNAPSHOT_QUERY, {"at": at}).fetchall()
+        conn.execute("RELEASE SAVEPOINT leaderboard_snapshot")
+    except psycopg.Error:
+        # Databases without the snapshot migration fall back to live ranks.
+        conn.execute("ROLLBACK TO SAVEPOINT leaderboard_snapshot")
+        conn.execute("RELEASE SAVEPOINT leaderboard_snapshot")
+        return None
+    if not rows:
+        return None
+    ranks: dict[str, dict[str, dict[str, Any]]] = {category: {} for category in LEADERBOARD_QUERIES}
+    for row in rows:
+        ranks.setdefault(row["category"], {})[str(row["character_id"])] = {
+            "rank": int(row["rank"]),
+            "score": row["score"],
+            "name": row["name"],
+        }
+    return LeaderboardRanks(ranks=ranks, as_of=rows[0]["captured_at"])
+
+
+def rank_deltas(
+    current: dict[str, dict[str, dict[str, Any]]],
+    baseline: dict[str, dict[str, dict[str, Any]]],
+) -> dict[str, dict[str, int]]:
+    """Places each character climbed (negative: fell) between two rank sets."""
+    deltas: dict[str, dict[str, int]] = {}
+    for category, entries in current.items():
+        previous = baseline.get(category, {})
+        deltas[category] = {
+            character_id: int(previous[character_id]["rank"]) - int(info["rank"])
+            for character_id, info in entries.items()
+            if character_id in previous
+        }
+    return deltas
 
 
 def fetch_current_leaderboard_ranks(
@@ -465,7 +1243,6 @@ def fetch_current_leaderboard_ranks(
                     "name": row["name"],
                 }
                 for row in conn.execute(query)
-                if row.get("character_id") is not None
             }
             conn.execute(f"RELEASE SAVEPOINT {savepoint}")
         except psycopg.Error:
@@ -481,23 +1258,112 @@ def build_digest(
     start: datetime,
     end: datetime,
     leaderboard_ranks: dict[str, dict[str, dict[str, Any]]],
+    leaderboard_as_of: datetime | None = None,
+    leaderboard_deltas: dict[str, dict[str, int]] | None = None,
 ) -> Digest:
-    events = dedupe_events(rows)
-    players: dict[str, PlayerDigest] = {}
-    stats = GlobalStats(raw_event_rows=len(rows), deduped_events=len(events))
-    warnings: list[str] = []
-    if rows and len(events) < len(rows):
-        warnings.append(
-            f"Deduplicated {len(rows) - len(events):,} recipient fan-out rows."
-        )
-    if leaderboard_ranks:
-        warnings.append(
-            "Current official leaderboard ranks are query-time ranks, not historical rank deltas."
+    accumulator = DigestAccumulator()
+    accumulator.stats.raw_event_rows = len(rows)
+    for event in dedupe_events(rows):
+        accumulator.add(event)
+    return accumulator.finish(
+        start=start,
+        end=end,
+        leaderboard_ranks=leaderboard_ranks,
+        leaderboard_as_of=leaderboard_as_of,
+        leaderboard_deltas=leaderboard_deltas,
+    )
+
+
+def build_digest_streaming(
+    rows: Iterable[dict[str, Any]],
+    *,
+    start: datetime,
+    end: datetime,
+    leaderboard_ranks: dict[str, dict[str, dict[str, Any]]],
+    leaderboard_as_of: datetime | None = None,
+    leaderboard_deltas: dict[str, dict[str, int]] | None = None,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+) -> Digest:
+    """``build_digest`` over rows in ``(timestamp, id)`` order, one pass, bounded memory.
+
+    Produces the same digest as ``build_digest`` whenever duplicate rows of an
+    event are no more than ``dedup_window`` apart, which holds for recipient
+    fan-out (all copies are inserted with the same timestamp).
+    """
+    accumulator = DigestAccumulator()
+    deduper = WindowedDeduper(dedup_window)
+    for event in deduper.feed(rows):
+        accumulator.add(event)
+    accumulator.stats.raw_event_rows = deduper.raw_rows
+    return accumulator.finish(
+        start=start,
+        end=end,
+        leaderboard_ranks=leaderboard_ranks,
+        leaderboard_as_of=leaderboard_as_of,
+        leaderboard_deltas=leaderboard_deltas,
+    )
+
+
+def build_digests_streaming(
+    rows: Iterable[dict[str, Any]],
+    specs: list[DigestSpec],
+    *,
+    leaderboards: dict[str, LeaderboardRanks] | None = None,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+) -> dict[str, Digest]:
+    """``build_digest_streaming`` for several specs over one ordered row stream.
+
+    Rows are deduplicated once and each event is routed to every spec that
+    accepts it. A spec's raw row count covers the deliveries it accepts, so
+    each digest matches building it alone from its own rows; as with
+    partials, this relies on fan-out copies sharing a timestamp.
+    """
+    leaderboards = leaderboards or {}
+    routes = [(spec, DigestAccumulator()) for spec in specs]
+
+    def counted(rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for row in rows:
+            timestamp = row["timestamp"]
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            for spec, accumulator in routes:
+                if spec.accepts(timestamp, row.get):
+                    accumulator.stats.raw_event_rows += 1
+            yield row
+
+    deduper = WindowedDeduper(dedup_window)
+    for event in deduper.feed(counted(rows)):
+        field_value = functools.partial(getattr, event)
+        for spec, accumulator in routes:
+            if spec.accepts(event.timestamp, field_value):
+                accumulator.add(event)
+
+    digests: dict[str, Digest] = {}
+    for spec, accumulator in routes:
+        leaderboard = leaderboards.get(spec.name, LeaderboardRanks())
+        digests[spec.name] = accumulator.finish(
+            start=spec.start,
+            end=spec.end,
+            leaderboard_ranks=leaderboard.ranks,
+            leaderboard_as_of=leaderboard.as_of,
+            leaderboard_deltas=leaderboard.deltas,
         )
-    else:
-        warnings.append("Current official leaderboard ranks were not available or were skipped.")
+    return digests
 
-    for event in events:
+
+@dataclass(slots=True)
+class DigestAccumulator:
+    """Incremental digest state; feed deduplicated events in timestamp order."""
+
+    players: dict[str, PlayerDigest] = field(default_factory=dict)
+    stats: GlobalStats = field(
+        default_factory=lambda: GlobalStats(raw_event_rows=0, deduped_events=0)
+    )
+
+    def add(self, event: Event) -> None:
+        players = self.players
+        stats = self.stats
+        stats.deduped_events += 1
         stats.event_counts[event.event_type] += 1
         if is_active_player_event(event.event_type):
             collect_active_ships(event, stats.active_ship_ids)
@@ -516,19 +1382,219 @@ def build_digest(
                 stats.active_player_keys.add(key)
             apply_event(event, players, stats)
 
-    period_ranks = compute_period_ranks(players)
-    return Digest(
-        start=start,
-        end=end,
-        generated_at=datetime.now(timezone.utc),
-        global_stats=stats,
-        players=players,
+    def finish(
+        self,
+        *,
+        start: datetime,
+        end: datetime,
+        leaderboard_ranks: dict[str, dict[str, dict[str, Any]]],
+        leaderboard_as_of: datetime | None = None,
+        leaderboard_deltas: dict[str, dict[str, int]] | None = None,
+    ) -> Digest:
+        stats = self.stats
+        warnings: list[str] = []
+        duplicates = stats.raw_event_rows - stats.deduped_events
+        if stats.raw_event_rows and duplicates > 0:
+            warnings.append(f"Deduplicated {duplicates:,} recipient fan-out rows.")
+        if leaderboard_ranks and leaderboard_as_of is not None:
+            note = (
+                "Official leaderboard ranks are from the snapshot taken "
+                f"{format_datetime(leaderboard_as_of)} UTC"
+            )
+            if leaderboard_deltas:
+                note += "; rank changes compare it with the last snapshot before the window."
+            else:
+                note += "; no earlier snapshot was available for rank changes."
+            warnings.append(note)
+        elif leaderboard_ranks:
+            warnings.append(
+                "Current official leaderboard ranks are query-time ranks, not historical rank deltas."
+            )
+        else:
+            warnings.append("Current official leaderboard ranks were not available or were skipped.")
+
+        return Digest(
+            start=start,
+            end=end,
+            generated_at=datetime.now(timezone.utc),
+            global_stats=stats,
+            players=self.players,
+            leaderboard_ranks=leaderboard_ranks,
+            period_ranks=compute_period_ranks(self.players),
+            warnings=warnings,
+            leaderboard_as_of=leaderboard_as_of,
+            leaderboard_deltas=leaderboard_deltas or {},
+        )
+
+    def partial(self, *, start: datetime, end: datetime) -> PartialDigest:
+        return PartialDigest(start=start, end=end, global_stats=self.stats, players=self.players)
+
+
+def build_partial_digest(
+    rows: Iterable[dict[str, Any]],
+    *,
+    start: datetime,
+    end: datetime,
+    dedup_window: timedelta = DEFAULT_DEDUP_WINDOW,
+) -> PartialDigest:
+    """Aggregate the ``(timestamp, id)``-ordered rows of ``[start, end)``.
+
+    Interval boundaries fall between timestamps, so recipient fan-out copies
+    (which share one) never straddle two partials.
+    """
+    accumulator = DigestAccumulator()
+    deduper = WindowedDeduper(dedup_window)
+    for event in deduper.feed(rows):
+        accumulator.add(event)
+    accumulator.stats.raw_event_rows = deduper.raw_rows
+    return accumulator.partial(start=start, end=end)
+
+
+def merge_partial_digests(partials: Iterable[PartialDigest]) -> PartialDigest:
+    """Merge adjacent partials, in time order, into one covering their union.
+
+    The merge is associative: any grouping of the same ordered partials
+    gives the same result, which also matches aggregating the whole window
+    in one pass. Inputs are left untouched.
+    """
+    merged: PartialDigest | None = None
+    for partial in partials:
+        if merged is None:
+            merged = copy.deepcopy(partial)
+            continue
+        if partial.start != merged.end:
+            raise ValueError(
+                f"partial digests must be contiguous: {merged.end.isoformat()} "
+                f"is followed by {partial.start.isoformat()}"
+            )
+        merge_global_stats(merged.global_stats, partial.global_stats)
+        for key, player in partial.players.items():
+            existing = merged.players.get(key)
+            if existing is None:
+                merged.players[key] = copy.deepcopy(player)
+            else:
+                merge_player_digest(existing, player)
+        merged.end = partial.end
+    if merged is None:
+        raise ValueError("no partial digests to merge")
+    return merged
+
+
+def merge_global_stats(target: GlobalStats, later: GlobalStats) -> None:
+    """Fold ``later``'s stats into ``target``; ``later`` covers the following interval."""
+    target.raw_event_rows += later.raw_event_rows
+    target.deduped_events += later.deduped_events
+    target.event_counts.update(later.event_counts)
+    target.active_player_keys |= later.active_player_keys
+    target.active_ship_ids |= later.active_ship_ids
+    target.sectors_visited.extend(later.sectors_visited)
+    target.unique_sectors |= later.unique_sectors
+    target.trade_sales += later.trade_sales
+    target.trade_buys += later.trade_buys
+    target.trade_volume += later.trade_volume
+    target.messages_broadcast += later.messages_broadcast
+    target.messages_direct += later.messages_direct
+    target.combat_ids_ended |= later.combat_ids_ended
+    target.combat_actions += later.combat_actions
+    target.ship_destroyed += later.ship_destroyed
+    target.garrisons_deployed += later.garrisons_deployed
+    target.ships_purchased += later.ships_purchased
+    target.ships_sold += later.ships_sold
+
+
+def merge_player_digest(target: PlayerDigest, later: PlayerDigest) -> None:
+    """Fold ``later`` into ``target``; the earlier interval keeps the display name."""
+    target.event_count += later.event_count
+    target.categorized_count += later.categorized_count
+    target.ships |= later.ships
+    target.sectors |= later.sectors
+    target.sector_visits += later.sector_visits
+    target.trades.extend(later.trades)
+    target.trade_sales += later.trade_sales
+    target.trade_buys += later.trade_buys
+    target.trade_volume += later.trade_volume
+    target.ship_events.extend(later.ship_events)
+    target.garrison_events.extend(later.garrison_events)
+    target.combat_events.extend(later.combat_events)
+    target.combat_wins += later.combat_wins
+    target.combat_losses += later.combat_losses
+    target.combat_neutral += later.combat_neutral
+    target.destroyed_ships += later.destroyed_ships
+    target.movement_events.extend(later.movement_events)
+    target.messages.extend(later.messages)
+    target.sessions.extend(later.sessions)
+    target.errors.extend(later.errors)
+    target.other_counts.update(later.other_counts)
+
+
+def digest_from_partial(
+    partial: PartialDigest,
+    *,
+    leaderboard_ranks: dict[str, dict[str, dict[str, Any]]],
+    leaderboard_as_of: datetime | None = None,
+    leaderboard_deltas: dict[str, dict[str, int]] | None = None,
+) -> Digest:
+    accumulator = DigestAccumulator(
+        players=copy.deepcopy(partial.players),
+        stats=copy.deepcopy(partial.global_stats),
+    )
+    return accumulator.finish(
+        start=partial.start,
+        end=partial.end,
         leaderboard_ranks=leaderboard_ranks,
-        period_ranks=period_ranks,
-        warnings=warnings,
+        leaderboard_as_of=leaderboard_as_of,
+        leaderboard_deltas=leaderboard_deltas,
     )
 
 
+def bucket_intervals(
+    start: datetime, end: datetime, bucket: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """Split ``[start, end)`` on epoch-aligned ``bucket`` boundaries.
+
+    Only the first and last intervals can be shorter than ``bucket``; every
+    full bucket has the same bounds in every window, so it can be reused.
+    """
+    if bucket <= timedelta(0):
+        raise ValueError("checkpoint bucket must be positive")
+    intervals: list[tuple[datetime, datetime]] = []
+    cursor = start
+    while cursor < end:
+        boundary = EPOCH + ((cursor - EPOCH) // bucket + 1) * bucket
+        intervals.append((cursor, min(boundary, end)))
+        cursor = intervals[-1][1]
+    return intervals
+
+
+class CheckpointStore:
+    """Partial digests persisted as one JSON file per interval."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def path_for(self, start: datetime, end: datetime) -> Path:
+        return self.directory / f"{checkpoint_stamp(start)}_{checkpoint_stamp(end)}.json"
+
+    def load(self, start: datetime, end: datetime) -> PartialDigest | None:
+        path = self.path_for(start, end)
+        if not path.exists():
+            return None
+        return partial_from_dict(json.loads(path.read_text()))
+
+    def save(self, partial: PartialDigest) -> Path:
+        path = self.path_for(partial.start, partial.end)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        # Key order is kept: counter insertion order breaks most_common() ties.
+        tmp_path.write_text(json.dumps(partial_to_dict(partial)))
+        tmp_path.replace(path)
+        return path
+
+
+def checkpoint_stamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
 def digest_to_dict(digest: Digest) -> dict[str, Any]:
     return {
         "schema": "gradientbang.news_digest.v1",
@@ -546,6 +1612,10 @@ def digest_to_dict(digest: Digest) -> dict[str, Any]:
         "leaderboard_ranks": digest.leaderboard_ranks,
         "period_ranks": digest.period_ranks,
         "warnings": list(digest.warnings),
+        "leaderboard_as_of": (
+            digest.leaderboard_as_of.isoformat() if digest.leaderboard_as_of else None
+        ),
+        "leaderboard_deltas": digest.leaderboard_deltas,
     }
 
 
@@ -572,6 +1642,44 @@ def digest_from_dict(data: dict[str, Any]) -> Digest:
             for category, ranks in require_dict(data.get("period_ranks", {}), "period_ranks").items()
         },
         warnings=[str(item) for item in require_list(data.get("warnings", []), "warnings")],
+        leaderboard_as_of=(
+            parse_timestamp(str(data["leaderboard_as_of"]))
+            if data.get("leaderboard_as_of")
+            else None
+        ),
+        leaderboard_deltas={
+            str(category): {str(key): int(delta) for key, delta in require_dict(deltas, category).items()}
+            for category, deltas in require_dict(data.get("leaderboard_deltas", {}), "leaderboard_deltas").items()
+        },
+    )
+
+
+def partial_to_dict(partial: PartialDigest) -> dict[str, Any]:
+    return {
+        "schema": PARTIAL_SCHEMA,
+        "start": partial.start.isoformat(),
+        "end": partial.end.isoformat(),
+        "global_stats": global_stats_to_dict(partial.global_stats),
+        # First-seen order, which ties in period ranks fall back on.
+        "players": [player_to_dict(player) for player in partial.players.values()],
+    }
+
+
+def partial_from_dict(data: dict[str, Any]) -> PartialDigest:
+    if data.get("schema") != PARTIAL_SCHEMA:
+        raise ValueError("unsupported partial digest schema")
+    players = {
+        player.key: player
+        for player in (
+            player_from_dict(require_dict(entry, "player"))
+            for entry in require_list(data.get("players"), "players")
+        )
+    }
+    return PartialDigest(
+        start=parse_timestamp(str(data["start"])),
+        end=parse_timestamp(str(data["end"])),
+        global_stats=global_stats_from_dict(require_dict(data.get("global_stats"), "global_stats")),
+        players=players,
     )
 
 
@@ -704,16 +1812,139 @@ def require_list(value: Any, label: str) -> list[Any]:
 
 
 def dedupe_events(rows: list[dict[str, Any]]) -> list[Event]:
-    grouped: dict[str, Event] = {}
+    grouped = EventIdentityIndex()
+    events: list[Event] = []
     for row in rows:
         event = event_from_row(row)
-        key = event_identity_key(event)
-        existing = grouped.get(key)
+        existing = grouped.find(event)
         if existing is None:
-            grouped[key] = event
+            grouped.add(event)
+            events.append(event)
             continue
         merge_delivery(existing, event)
-    return sorted(grouped.values(), key=lambda event: (event.timestamp, event.id))
+    return sorted(events, key=lambda event: (event.timestamp, event.id))
+
+
+class EventIdentityIndex:
+    """Finds the earlier delivery of an event among those added so far.
+
+    Events are bucketed by the cheap ``event_identity_key`` fields; payloads
+    are only compared when two events share those, which for most events
+    (one row, or a unique request/type/actor) never happens. Decoded JSON
+    payloads compare equal when their canonical JSON does, except that ``1``,
+    ``1.0`` and ``true`` are also equal to each other.
+    """
+
+    __slots__ = ("_groups", "_size")
+
+    def __init__(self) -> None:
+        self._groups: dict[IdentityKey, Event | list[Event]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def find(self, event: Event) -> Event | None:
+        group = self._groups.get(event_identity_key(event))
+        if group is None:
+            return None
+        if isinstance(group, Event):
+            return group if group.payload == event.payload else None
+        for candidate in group:
+            if candidate.payload == event.payload:
+                return candidate
+        return None
+
+    def add(self, event: Event) -> IdentityKey:
+        key = event_identity_key(event)
+        group = self._groups.get(key)
+        if group is None:
+            self._groups[key] = event
+        elif isinstance(group, Event):
+            self._groups[key] = [group, event]
+        else:
+            group.append(event)
+        self._size += 1
+        return key
+
+    def remove(self, key: IdentityKey, event: Event) -> None:
+        group = self._groups[key]
+        if isinstance(group, Event):
+            del self._groups[key]
+        else:
+            group.remove(event)
+            if len(group) == 1:
+                self._groups[key] = group[0]
+        self._size -= 1
+
+    def clear(self) -> None:
+        self._groups.clear()
+        self._size = 0
+
+    def events(self) -> Iterator[Event]:
+        for group in self._groups.values():
+            if isinstance(group, Event):
+                yield group
+            else:
+                yield from group
+
+
+class WindowedDeduper:
+    """Streaming ``dedupe_events`` with merging bounded to a timestamp window.
+
+    Rows must arrive in ``(timestamp, id)`` order. An event stays open for
+    merging until the stream has moved more than ``window`` past its
+    timestamp; it is then emitted. Emitted events come out in the same
+    ``(timestamp, id)`` order as ``dedupe_events``.
+    """
+
+    def __init__(self, window: timedelta = DEFAULT_DEDUP_WINDOW) -> None:
+        if window < timedelta(0):
+            raise ValueError("dedup window must not be negative")
+        self.window = window
+        self.raw_rows = 0
+        self._open = EventIdentityIndex()
+        self._arrivals: deque[tuple[datetime, IdentityKey, Event]] = deque()
+        self._last: tuple[datetime, int] | None = None
+
+    def feed(self, rows: Iterable[dict[str, Any]]) -> Iterator[Event]:
+        for row in rows:
+            yield from self.push(row)
+        yield from self.flush()
+
+    def push(self, row: dict[str, Any]) -> list[Event]:
+        event = event_from_row(row)
+        position = (event.timestamp, event.id)
+        if self._last is not None and position < self._last:
+            raise ValueError("event rows must be ordered by (timestamp, id)")
+        self._last = position
+        self.raw_rows += 1
+
+        ready = self._close_before(event.timestamp - self.window)
+        existing = self._open.find(event)
+        if existing is None:
+            key = self._open.add(event)
+            self._arrivals.append((event.timestamp, key, event))
+        else:
+            merge_delivery(existing, event)
+        return ready
+
+    def flush(self) -> list[Event]:
+        ready = sorted(self._open.events(), key=lambda event: (event.timestamp, event.id))
+        self._open.clear()
+        self._arrivals.clear()
+        return ready
+
+    def _close_before(self, cutoff: datetime) -> list[Event]:
+        closed: list[Event] = []
+        arrivals = self._arrivals
+        while arrivals and arrivals[0][0] < cutoff:
+            _timestamp, key, event = arrivals.popleft()
+            self._open.remove(key, event)
+            closed.append(event)
+        # A later duplicate can lower an open event's id, so order on close.
+        closed.sort(key=lambda event: (event.timestamp, event.id))
+        return closed
 
 
 def event_from_row(row: dict[str, Any]) -> Event:
@@ -754,28 +1985,23 @@ def event_from_row(row: dict[str, Any]) -> Event:
     )
 
 
-def event_identity_key(event: Event) -> str:
-    payload_fingerprint = stable_json_hash(event.payload)
-    base = [
-        event.event_type,
-        event.request_id or "",
-        event.task_id or "",
-        event.actor_character_id or "",
-        event.sender_id or "",
-        event.character_id or "",
-        event.corp_id or "",
-        event.ship_id or "",
-        str(event.sector_id if event.sector_id is not None else ""),
-        payload_fingerprint,
-    ]
-    if not event.request_id:
-        base.append(event.timestamp.isoformat())
-    return "|".join(base)
+def event_identity_key(event: Event) -> IdentityKey:
+    """Everything but the payload that identifies one event across its deliveries.
 
-
-def stable_json_hash(value: Any) -> str:
-    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
-    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+    ``EventIdentityIndex`` completes the identity by comparing payloads.
+    """
+    return (
+        event.event_type,
+        event.request_id,
+        event.task_id,
+        event.actor_character_id,
+        event.sender_id,
+        event.character_id,
+        event.corp_id,
+        event.ship_id,
+        event.sector_id,
+        None if event.request_id else event.timestamp,
+    )
 
 
 def merge_delivery(existing: Event, duplicate: Event) -> None:
@@ -1373,7 +2599,12 @@ def render_player(
             period_bits.append(f"{label} #{rank}")
     if period_bits:
         lines.append(f"- Period ranks: {', '.join(period_bits)}")
-    current = render_current_leaderboard_line(player, digest.leaderboard_ranks)
+    current = render_current_leaderboard_line(
+        player,
+        digest.leaderboard_ranks,
+        deltas=digest.leaderboard_deltas,
+        label="Current official ranks" if digest.leaderboard_as_of is None else "Official ranks",
+    )
     if current:
         lines.append(current)
     if player.combat_wins or player.combat_losses or player.combat_neutral:
@@ -1405,6 +2636,9 @@ def render_player(
 def render_current_leaderboard_line(
     player: PlayerDigest,
     leaderboard_ranks: dict[str, dict[str, dict[str, Any]]],
+    *,
+    deltas: dict[str, dict[str, int]] | None = None,
+    label: str = "Current official ranks",
 ) -> str | None:
     if not player.player_id:
         return None
@@ -1413,12 +2647,18 @@ def render_current_leaderboard_line(
         rank_info = leaderboard_ranks.get(category, {}).get(player.player_id)
         if not rank_info:
             continue
+        details: list[str] = []
         score = rank_info.get("score")
-        score_text = f" ({format_number(score)})" if score is not None else ""
-        bits.append(f"{category} #{rank_info['rank']}{score_text}")
+        if score is not None:
+            details.append(format_number(score))
+        delta = (deltas or {}).get(category, {}).get(player.player_id)
+        if delta:
+            details.append(f"up {delta}" if delta > 0 else f"down {-delta}")
+        details_text = f" ({'; '.join(details)})" if details else ""
+        bits.append(f"{category} #{rank_info['rank']}{details_text}")
     if not bits:
         return None
-    return f"- Current official ranks: {', '.join(bits)}"
+    return f"- {label}: {', '.join(bits)}"
 
 
 def render_item_section(title: str, items: list[str], max_lines: int) -> list[str]:
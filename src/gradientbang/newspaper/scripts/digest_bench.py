@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""Benchmark the news digest on synthetic event rows.
+
+``synthetic_event_rows`` produces rows shaped like ``EVENT_QUERY`` output
+without a database: recipient fan-out copies that share a timestamp and
+request id, multi-round combats, trades, chat and the status noise the digest
+skips, in ``(timestamp, id)`` order. The benchmark times ``dedupe_events``,
+``build_digest``, ``build_digest_streaming`` and ``render_markdown`` over it
+and reports rows/sec and peak RSS. The ``legacy_dedupe`` stage times the old
+SHA-1-of-canonical-JSON grouping as a baseline for ``dedupe_events``. Each
+measurement runs in a fresh process, because peak RSS is a per-process
+high-water mark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+from typing import Any, Iterator
+
+from gradientbang.newspaper.scripts.digest import (
+    Event,
+    build_digest,
+    build_digest_streaming,
+    dedupe_events,
+    event_from_row,
+    merge_delivery,
+    render_markdown,
+)
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DEFAULT_PLAYERS = 500
+DEFAULT_SECTORS = 5000
+# Mean number of extra deliveries (sector observers, corp members) per event.
+DEFAULT_FANOUT = 2.0
+# Mean seconds between consecutive events.
+DEFAULT_EVENT_GAP = 0.5
+STAGES = (
+    "dedupe_events",
+    "legacy_dedupe",
+    "build_digest",
+    "build_digest_streaming",
+    "render_markdown",
+)
+# Relative frequency of each kind of activity; combat expands into several events.
+EVENT_MIX = {
+    "movement": 30,
+    "trade": 20,
+    "chat": 12,
+    "noise": 15,
+    "task": 8,
+    "session": 5,
+    "garrison": 4,
+    "combat": 3,
+    "ship": 2,
+}
+COMMODITIES = ("quantum_foam", "retro_organics", "neuro_symbolics")
+SHIP_TYPES = ("kestrel_courier", "sparrow_scout", "wayfarer_freighter", "pike_frigate")
+NOISE_EVENT_TYPES = ("status.snapshot", "port.update", "map.local", "sector.update")
+COMBAT_RESULTS = ("stalemate", "victory", "toll_satisfied", "mutual_defeat")
+
+
+@dataclass(frozen=True, slots=True)
+class Pilot:
+    id: str
+    name: str
+    ship_id: str
+    ship_name: str
+    ship_type: str
+    corp_id: str | None
+    corp_name: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    stage: str
+    rows: int
+    seconds: float
+    rows_per_sec: float
+    input_rss_mb: float
+    peak_rss_mb: float
+
+
+def synthetic_event_rows(
+    count: int,
+    *,
+    seed: int = 0,
+    start: datetime = DEFAULT_START,
+    players: int = DEFAULT_PLAYERS,
+    sectors: int = DEFAULT_SECTORS,
+    fanout: float = DEFAULT_FANOUT,
+    event_gap: float = DEFAULT_EVENT_GAP,
+) -> Iterator[dict[str, Any]]:
+    """Yield ``count`` ``EVENT_QUERY``-shaped rows in ``(timestamp, id)`` order.
+
+    The same arguments always produce the same rows. Every delivery gets its
+    own decoded payload, as rows from psycopg do. The last event may be cut
+    short so that exactly ``count`` rows come out.
+    """
+    if count < 0:
+        raise ValueError("count must not be negative")
+    if players < 2 or sectors < 1:
+        raise ValueError("need at least two players and one sector")
+    generator = SyntheticEvents(
+        random.Random(seed),
+        start=start,
+        players=players,
+        sectors=sectors,
+        fanout=fanout,
+        event_gap=event_gap,
+    )
+    emitted = 0
+    while emitted < count:
+        for row in generator.next_rows():
+            yield row
+            emitted += 1
+            if emitted == count:
+                return
+
+
+class SyntheticEvents:
+    """Game activity for ``synthetic_event_rows``, one burst of rows at a time."""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        *,
+        start: datetime,
+        players: int,
+        sectors: int,
+        fanout: float,
+        event_gap: float,
+    ) -> None:
+        self.rng = rng
+        self.clock = start
+        self.sectors = sectors
+        self.fanout = fanout
+        self.event_gap = event_gap
+        self.next_id = 1
+        self.next_request = 1
+        self.pilots = [self._pilot(index) for index in range(players)]
+        self.locations = {pilot.id: rng.randint(1, sectors) for pilot in self.pilots}
+        self.kinds = list(EVENT_MIX)
+        self.weights = list(EVENT_MIX.values())
+
+    def _pilot(self, index: int) -> Pilot:
+        # Roughly half of the pilots fly for one of a handful of corporations.
+        corp = index % 10 if index % 2 else None
+        return Pilot(
+            id=f"00000000-0000-4000-8000-{index:012x}",
+            name=f"Pilot {index}",
+            ship_id=f"00000000-0000-4000-9000-{index:012x}",
+            ship_name=f"Ship {index}",
+            ship_type=self.rng.choice(SHIP_TYPES),
+            corp_id=None if corp is None else f"00000000-0000-4000-a000-{corp:012x}",
+            corp_name=None if corp is None else f"Corp {corp}",
+        )
+
+    def next_rows(self) -> list[dict[str, Any]]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        return getattr(self, f"_{kind}")()
+
+    def _tick(self) -> datetime:
+        self.clock += timedelta(seconds=self.rng.expovariate(1 / self.event_gap))
+        return self.clock
+
+    def _request_id(self) -> str:
+        request_id = f"req-{self.next_request:010d}"
+        self.next_request += 1
+        return request_id
+
+    def _observers(self, actor: Pilot) -> list[tuple[Pilot, str]]:
+        """Extra deliveries of ``actor``'s event: sector observers and corp members."""
+        extra = min(len(self.pilots) - 1, int(self.rng.expovariate(1 / self.fanout)))
+        observers = []
+        for pilot in self.rng.sample(self.pilots, extra + 1):
+            if pilot is actor or len(observers) == extra:
+                continue
+            same_corp = actor.corp_id is not None and pilot.corp_id == actor.corp_id
+            observers.append((pilot, "corp_member" if same_corp else "sector_snapshot"))
+        return observers
+
+    def _deliver(
+        self,
+        event_type: str,
+        payload: dict[str, Any],
+        recipients: list[tuple[Pilot | None, str | None]],
+        *,
+        actor: Pilot | None,
+        timestamp: datetime,
+        sector_id: int | None,
+        request_id: str | None = None,
+        character: Pilot | None = None,
+        sender: Pilot | None = None,
+        task_id: str | None = None,
+        scope: str = "direct",
+        is_broadcast: bool = False,
+    ) -> list[dict[str, Any]]:
+        encoded = json.dumps(payload)
+        ship = actor or character or sender
+        corp = actor or sender
+        rows = []
+        for recipient, reason in recipients:
+            rows.append(
+                {
+                    "id": self.next_id,
+                    "timestamp": timestamp,
+                    "inserted_at": timestamp,
+                    "direction": "event_out",
+                    "event_type": event_type,
+                    "scope": scope,
+                    "character_id": character.id if character else None,
+                    "character_name": character.name if character else None,
+                    "actor_character_id": actor.id if actor else None,
+                    "actor_name": actor.name if actor else None,
+                    "sender_id": sender.id if sender else None,
+                    "sender_name": sender.name if sender else None,
+                    "recipient_character_id": recipient.id if recipient else None,
+                    "recipient_name": recipient.name if recipient else None,
+                    "recipient_reason": reason,
+                    "corp_id": corp.corp_id if corp else None,
+                    "corp_name": corp.corp_name if corp else None,
+                    "sector_id": sector_id,
+                    "ship_id": ship.ship_id if ship else None,
+                    "ship_name": ship.ship_name if ship else None,
+                    "ship_type": ship.ship_type if ship else None,
+                    "request_id": request_id,
+                    "task_id": task_id,
+                    "is_broadcast": is_broadcast,
+                    "payload": json.loads(encoded),
+                    "meta": None,
+                }
+            )
+            self.next_id += 1
+        return rows
+
+    def _sector_event(
+        self, event_type: str, actor: Pilot, payload: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        return self._deliver(
+            event_type,
+            payload,
+            [(actor, "direct"), *self._observers(actor)],
+            actor=actor,
+            timestamp=self._tick(),
+            sector_id=self.locations[actor.id],
+            request_id=self._request_id(),
+            scope="sector",
+        )
+
+    def _movement(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        from_sector = self.locations[actor.id]
+        to_sector = self.rng.randint(1, self.sectors)
+        self.locations[actor.id] = to_sector
+        payload = {
+            "from_sector": from_sector,
+            "to_sector": to_sector,
+            "ship": {"ship_id": actor.ship_id, "current_sector": to_sector},
+        }
+        rows = self._sector_event("movement.complete", actor, payload)
+        # Observers in the destination sector see the arrival as noise.
+        arrival = {"sector": {"id": to_sector}, "player": {"id": actor.id, "name": actor.name}}
+        return rows + self._sector_event("character.moved", actor, arrival)
+
+    def _trade(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        units = self.rng.randint(1, 300)
+        payload = {
+            "trade": {
+                "trade_type": self.rng.choice(("buy", "sell")),
+                "commodity": self.rng.choice(COMMODITIES),
+                "units": units,
+                "price_per_unit": self.rng.randint(10, 60),
+            },
+            "sector": {"id": self.locations[actor.id]},
+        }
+        payload["trade"]["total_price"] = units * payload["trade"]["price_per_unit"]
+        return self._sector_event("trade.executed", actor, payload)
+
+    def _chat(self) -> list[dict[str, Any]]:
+        sender = self.rng.choice(self.pilots)
+        content = f"message {self.next_request} from {sender.name}"
+        if self.rng.random() < 0.3:
+            payload = {"type": "broadcast", "from_name": sender.name, "content": content}
+            return self._deliver(
+                "chat.message",
+                payload,
+                [(None, None)],
+                actor=None,
+                sender=sender,
+                timestamp=self._tick(),
+                sector_id=None,
+                request_id=self._request_id(),
+                scope="broadcast",
+                is_broadcast=True,
+            )
+        target = self.rng.choice(self.pilots)
+        while target is sender:
+            target = self.rng.choice(self.pilots)
+        payload = {
+            "type": "direct",
+            "from_name": sender.name,
+            "to_name": target.name,
+            "content": content,
+        }
+        return self._deliver(
+            "chat.message",
+            payload,
+            [(sender, "sender"), (target, "recipient")],
+            actor=None,
+            sender=sender,
+            timestamp=self._tick(),
+            sector_id=None,
+            request_id=self._request_id(),
+        )
+
+    def _noise(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        event_type = self.rng.choice(NOISE_EVENT_TYPES)
+        payload = {
+            "sector": {"id": self.locations[actor.id]},
+            "ship": {"ship_id": actor.ship_id, "fighters": self.rng.randint(0, 500)},
+        }
+        return self._deliver(
+            event_type,
+            payload,
+            [(actor, "direct")],
+            actor=None,
+            character=actor,
+            timestamp=self._tick(),
+            sector_id=self.locations[actor.id],
+        )
+
+    def _task(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        task_id = f"task-{self.next_request:010d}"
+        rows = []
+        for event_type in ("task.start", "task.finish"):
+            payload = {"task_id": task_id, "task_description": "Trade loop"}
+            rows += self._deliver(
+                event_type,
+                payload,
+                [(actor, "direct")],
+                actor=actor,
+                timestamp=self._tick(),
+                sector_id=self.locations[actor.id],
+                request_id=self._request_id(),
+                task_id=task_id,
+            )
+        return rows
+
+    def _session(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        return self._deliver(
+            "session.started",
+            {"character_id": actor.id},
+            [(actor, "direct")],
+            actor=actor,
+            timestamp=self._tick(),
+            sector_id=self.locations[actor.id],
+            request_id=self._request_id(),
+        )
+
+    def _garrison(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        payload = {
+            "sector": {"id": self.locations[actor.id]},
+            "garrison": {
+                "fighters": self.rng.randint(10, 1000),
+                "mode": self.rng.choice(("defensive", "offensive", "toll")),
+            },
+        }
+        return self._sector_event("garrison.deployed", actor, payload)
+
+    def _ship(self) -> list[dict[str, Any]]:
+        actor = self.rng.choice(self.pilots)
+        price = self.rng.randint(10_000, 500_000)
+        payload = {
+            "ship_type": self.rng.choice(SHIP_TYPES),
+            "ship_name": f"{actor.name}'s new ship",
+            "purchase_price": price,
+            "net_cost": price - self.rng.randint(0, price // 2),
+        }
+        return self._sector_event("ship.purchased", actor, payload)
+
+    def _combat(self) -> list[dict[str, Any]]:
+        """A whole combat: round 1 waiting, then actions and a result per round, then the end."""
+        fighters = self.rng.sample(self.pilots, self.rng.randint(2, 3))
+        sector = self.locations[fighters[0].id]
+        combat_id = f"combat-{self.next_request:010d}"
+        deliveries: list[tuple[Pilot | None, str | None]] = [
+            (pilot, "combat_participant") for pilot in fighters
+        ]
+        deliveries += self._observers(fighters[0])
+
+        def participants(losses: bool) -> list[dict[str, Any]]:
+            return [
+                {
+                    "id": pilot.id,
+                    "name": pilot.name,
+                    "ship": {
+                        "ship_type": pilot.ship_type,
+                        "fighter_loss": self.rng.randint(0, 40) if losses else 0,
+                        "shield_damage": round(self.rng.uniform(0, 25), 1) if losses else 0,
+                    },
+                }
+                for pilot in fighters
+            ]
+
+        rows = self._deliver(
+            "combat.round_waiting",
+            {"combat_id": combat_id, "round": 1, "sector": {"id": sector},
+             "participants": participants(False)},
+            deliveries,
+            actor=None,
+            timestamp=self._tick(),
+            sector_id=sector,
+            request_id=self._request_id(),
+            scope="sector",
+        )  # fmt: skip
+        rounds = self.rng.randint(1, 4)
+        for round_number in range(1, rounds + 1):
+            for pilot in fighters:
+                target = fighters[0] if pilot is not fighters[0] else fighters[1]
+                rows += self._deliver(
+                    "combat.action_accepted",
+                    {"combat_id": combat_id, "round": round_number, "action": "attack",
+                     "commit": self.rng.randint(1, 200), "target_id": target.id},
+                    [(pilot, "direct")],
+                    actor=pilot,
+                    timestamp=self._tick(),
+                    sector_id=sector,
+                    request_id=self._request_id(),
+                )  # fmt: skip
+            rows += self._deliver(
+                "combat.round_resolved",
+                {"combat_id": combat_id, "round": round_number, "sector": {"id": sector},
+                 "participants": participants(True)},
+                deliveries,
+                actor=None,
+                timestamp=self._tick(),
+                sector_id=sector,
+                request_id=self._request_id(),
+                scope="sector",
+            )  # fmt: skip
+        result = self.rng.choice((*COMBAT_RESULTS, f"{fighters[1].name}_defeated"))
+        ended = {"combat_id": combat_id, "result": result, "round": rounds,
+                 "sector": {"id": sector}, "participants": participants(True)}  # fmt: skip
+        timestamp = self._tick()
+        request_id = self._request_id()
+        for pilot in fighters:
+            # Each participant gets their own combat.ended, keyed by character_id.
+            rows += self._deliver(
+                "combat.ended",
+                ended,
+                [(pilot, "combat_participant")],
+                actor=None,
+                character=pilot,
+                timestamp=timestamp,
+                sector_id=sector,
+                request_id=request_id,
+            )
+        return rows
+
+
+def legacy_identity_key(event: Event) -> str:
+    """The SHA-1-of-canonical-JSON identity key ``dedupe_events`` used to use."""
+    encoded = json.dumps(event.payload, sort_keys=True, separators=(",", ":"), default=str)
+    base = [
+        event.event_type,
+        event.request_id or "",
+        event.task_id or "",
+        event.actor_character_id or "",
+        event.sender_id or "",
+        event.character_id or "",
+        event.corp_id or "",
+        event.ship_id or "",
+        str(event.sector_id if event.sector_id is not None else ""),
+        hashlib.sha1(encoded.encode("utf-8")).hexdigest(),
+    ]
+    if not event.request_id:
+        base.append(event.timestamp.isoformat())
+    return "|".join(base)
+
+
+def legacy_dedupe(rows: list[dict[str, Any]]) -> list[Event]:
+    """``dedupe_events`` as it was before the identity index: hash every payload."""
+    grouped: dict[str, Event] = {}
+    for item in rows:
+        event = event_from_row(item)
+        existing = grouped.setdefault(legacy_identity_key(event), event)
+        if existing is not event:
+            merge_delivery(existing, event)
+    return sorted(grouped.values(), key=lambda event: (event.timestamp, event.id))
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(stage: str, size: int, *, seed: int, players: int, fanout: float) -> Measurement:
+    """Time one stage over ``size`` synthetic rows in the current process."""
+    rows = list(synthetic_event_rows(size, seed=seed, players=players, fanout=fanout))
+    start = rows[0]["timestamp"] if rows else DEFAULT_START
+    end = rows[-1]["timestamp"] + timedelta(seconds=1) if rows else DEFAULT_START
+    window = {"start": start, "end": end, "leaderboard_ranks": {}}
+    digest = build_digest(rows, **window) if stage == "render_markdown" else None
+    input_rss = peak_rss_mb()
+
+    started = time.perf_counter()
+    if stage == "dedupe_events":
+        dedupe_events(rows)
+    elif stage == "legacy_dedupe":
+        legacy_dedupe(rows)
+    elif stage == "build_digest":
+        build_digest(rows, **window)
+    elif stage == "build_digest_streaming":
+        build_digest_streaming(rows, **window)
+    elif stage == "render_markdown":
+        render_markdown(digest, max_lines_per_section=8)
+    else:
+        raise ValueError(f"unknown stage: {stage}")
+    seconds = time.perf_counter() - started
+
+    return Measurement(
+        stage=stage,
+        rows=size,
+        seconds=seconds,
+        rows_per_sec=size / seconds if seconds else float("inf"),
+        input_rss_mb=input_rss,
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def main() -> None:
+    raise SystemExit(run(sys.argv[1:]))
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    if not args.json:
+        print(
+            f"{'stage':<24} {'rows':>10} {'seconds':>9} {'rows/sec':>12} "
+            f"{'input RSS':>10} {'peak RSS':>10}"
+        )
+    # A fresh worker per measurement keeps each peak RSS independent.
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1
+    ) as pool:
+        for size in args.sizes:
+            for stage in args.stages:
+                result = pool.submit(
+                    measure,
+                    stage,
+                    size,
+                    seed=args.seed,
+                    players=args.players,
+                    fanout=args.fanout,
+                ).result()
+                if args.json:
+                    print(json.dumps(asdict(result)), flush=True)
+                else:
+                    print(
+                        f"{result.stage:<24} {result.rows:>10,} {result.seconds:>9.3f} "
+                        f"{result.rows_per_sec:>12,.0f} {result.input_rss_mb:>8.0f}MB "
+                        f"{result.peak_rss_mb:>8.0f}MB",
+                        flush=True,
+                    )
+    return 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark news digest stages on synthetic event rows.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=row_counts,
+        default=DEFAULT_SIZES,
+        help="Comma-separated row counts. Default: 10000,100000,1000000.",
+    )
+    parser.add_argument(
+        "--stage",
+        dest="stages",
+        action="append",
+        choices=STAGES,
+        help="Stage to measure; repeatable. Default: all stages.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed. Default: 0.")
+    parser.add_argument(
+        "--players",
+        type=int,
+        default=DEFAULT_PLAYERS,
+        help=f"Synthetic player count. Default: {DEFAULT_PLAYERS}.",
+    )
+    parser.add_argument(
+        "--fanout",
+        type=float,
+        default=DEFAULT_FANOUT,
+        help=f"Mean extra deliveries per sector event. Default: {DEFAULT_FANOUT:g}.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per result.")
+    args = parser.parse_args(argv)
+    args.stages = args.stages or list(STAGES)
+    return args
+
+
+def row_counts(value: str) -> tuple[int, ...]:
+    try:
+        counts = tuple(int(part.replace("_", "")) for part in value.split(","))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("expected comma-separated integers") from exc
+    if not counts or any(count <= 0 for count in counts):
+        raise argparse.ArgumentTypeError("row counts must be positive")
+    return counts
+
+
+if __name__ == "__main__":
+    main()
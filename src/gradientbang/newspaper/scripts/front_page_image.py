@@ -13,7 +13,7 @@ import subprocess
 import sys
 from pathlib import Path
 
-from gradientbang.newspaper.scripts import front_page_regions
+from gradientbang.newspaper.scripts import front_page_regions, image_cache
 
 
 ROOT = Path(__file__).resolve().parents[4]
@@ -112,6 +112,8 @@ def parse_one_shot_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--quality", default=DEFAULT_QUALITY)
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--cache-dir", type=Path, default=image_cache.DEFAULT_CACHE_DIR, help="Content-addressed image cache.")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the image cache.")
     return parser.parse_args(argv)
 
 
@@ -155,6 +157,8 @@ def run_one_shot(argv: list[str]) -> int:
         str(out),
         "--no-augment",
     ]
+    if not args.no_cache:
+        cmd.extend(["--cache-dir", str(args.cache_dir)])
     if args.force:
         cmd.append("--force")
     if args.dry_run:
@@ -222,6 +226,12 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--quality", default=DEFAULT_QUALITY)
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help=f"Content-addressed image cache. Defaults to {image_cache.DEFAULT_CACHE_DIR}.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the image cache.")
 
     parser.add_argument("--size", help="One-shot image size, for example 2160x3840.")
     parser.add_argument("--layout", type=Path, help="Composited-regions layout geometry JSON.")
@@ -237,6 +247,11 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
             "paper, names highlighted in cyan). Default is linotype light mode."
         ),
     )
+    parser.add_argument(
+        "--both-modes",
+        action="store_true",
+        help="Composited-regions only: render light and dark pages, compositing both in one pass.",
+    )
     return parser.parse_args(argv)
 
 
@@ -249,6 +264,7 @@ def backend_argv(args: argparse.Namespace) -> list[str]:
             "--region": args.region,
             "--composite-only": args.composite_only,
             "--dark-mode": args.dark_mode,
+            "--both-modes": args.both_modes,
         }
         unsupported = [name for name, value in one_shot_only.items() if value]
         if unsupported:
@@ -269,6 +285,7 @@ def backend_argv(args: argparse.Namespace) -> list[str]:
             one_shot_argv.append("--force")
         if args.dry_run:
             one_shot_argv.append("--dry-run")
+        one_shot_argv.extend(cache_argv(args))
         return one_shot_argv
 
     if args.prompt_out:
@@ -300,9 +317,20 @@ def backend_argv(args: argparse.Namespace) -> list[str]:
         regions_argv.append("--composite-only")
     if args.dark_mode:
         regions_argv.append("--dark-mode")
+    if args.both_modes:
+        regions_argv.append("--both-modes")
+    regions_argv.extend(cache_argv(args))
     return regions_argv
 
 
+def cache_argv(args: argparse.Namespace) -> list[str]:
+    if args.no_cache:
+        return ["--no-cache"]
+    if args.cache_dir:
+        return ["--cache-dir", str(args.cache_dir)]
+    return []
+
+
 def run(argv: list[str]) -> int:
     args = parse_args(argv)
     selected_backend_argv = backend_argv(args)
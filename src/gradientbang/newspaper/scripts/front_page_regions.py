@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import hashlib
 from importlib.resources import files
@@ -14,8 +16,12 @@ import re
 import shlex
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
+
+from gradientbang.newspaper.scripts import image_cache
 
 
 ROOT = Path(__file__).resolve().parents[4]
@@ -36,6 +42,11 @@ DEFAULT_UI_REFERENCE = DEFAULT_REFERENCE_DIR / "gradient-bang-ui.png"
 DEFAULT_MODEL = "gpt-image-2"
 DEFAULT_QUALITY = "high"
 DEFAULT_COMPOSITE_SIZE = "2336x3504"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BACKOFF_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 120.0
+DEFAULT_COMPOSITE_WORKERS = min(4, os.cpu_count() or 1)
 
 TEMPLATE_VERSION = "gradient-news-regional-prompt-v5-consistent-headline-type"
 DARK_MODE_TEMPLATE_SUFFIX = "-dark"
@@ -143,6 +154,23 @@ class PlannedRegion:
     prompt: Path
     references: tuple[Path, ...]
     command: tuple[str, ...]
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class CompositeTarget:
+    planned: list[PlannedRegion]
+    composite_path: Path
+    composite_size: tuple[int, int]
+    light_mode: bool = False
+
+
+@dataclass(frozen=True)
+class RegionResult:
+    unit_id: str
+    status: str  # "generated", "skipped" (output already existed) or "failed"
+    attempts: int = 0
+    error: str = ""
 
 
 SHIP_REFERENCES = {
@@ -694,6 +722,8 @@ def plan_regions(
     force: bool,
     dry_run: bool,
     light_mode: bool = False,
+    generator_command: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
 ) -> tuple[list[PlannedRegion], dict[str, str]]:
     source_size = (
         int(layout["source_size"]["width"]),
@@ -707,6 +737,7 @@ def plan_regions(
     if not units:
         raise ValueError("No regions selected")
 
+    generator = list(generator_command or (sys.executable, str(IMAGE_GEN)))
     planned: list[PlannedRegion] = []
     prompt_hashes: dict[str, str] = {}
     for unit in units:
@@ -733,8 +764,7 @@ def plan_regions(
         prompt_hashes[unit.id] = sha256_bytes(prompt_bytes)
 
         cmd = [
-            sys.executable,
-            str(IMAGE_GEN),
+            *generator,
             "edit",
             "--model",
             model,
@@ -750,7 +780,11 @@ def plan_regions(
         ]
         for ref in references:
             cmd.extend(["--image", str(ref)])
-        if force:
+        if cache_dir is not None:
+            # Region PNGs are intermediates and every generated one is kept in
+            # the cache, so overwriting a stale region is always safe.
+            cmd.extend(["--cache-dir", str(cache_dir), "--force"])
+        elif force:
             cmd.append("--force")
         if dry_run:
             cmd.append("--dry-run")
@@ -764,6 +798,7 @@ def plan_regions(
                 prompt=prompt_path,
                 references=references,
                 command=tuple(cmd),
+                cached=cache_dir is not None,
             )
         )
 
@@ -832,14 +867,160 @@ def write_metadata(
     metadata_path.write_text(json.dumps(metadata, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
-def generate_regions(planned: list[PlannedRegion], *, composite_only: bool) -> None:
+def generate_regions(
+    planned: list[PlannedRegion],
+    *,
+    composite_only: bool,
+    force: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+) -> list[RegionResult]:
+    """Run each region's generator command, ``concurrency`` at a time.
+
+    Without an image cache, regions whose output already exists are skipped
+    unless ``force``, so an interrupted run resumes where it stopped. Cached
+    regions always run: unchanged ones are copied from the cache and edited
+    ones regenerate. A failing region does not stop
+    the others; rate-limit and timeout failures are retried, and a rate limit
+    pauses every worker (``RateLimitGate``) rather than just the one that hit it.
+    """
     if composite_only:
-        return
+        return []
     env = env_with_api_key()
-    for index, item in enumerate(planned, start=1):
-        print(f"[{index}/{len(planned)}] Generating {item.unit.id}: {item.generation_size[0]}x{item.generation_size[1]}")
-        print("Command:", " ".join(shlex.quote(part) for part in item.command))
-        subprocess.run(item.command, check=True, env=env)
+    gate = RateLimitGate()
+    print_lock = threading.Lock()
+    total = len(planned)
+
+    def run_one(index: int, item: PlannedRegion) -> RegionResult:
+        label = f"[{index}/{total}] {item.unit.id}"
+        if not force and not item.cached and item.output.exists():
+            with print_lock:
+                print(f"{label}: output exists, skipping ({item.output})")
+            return RegionResult(item.unit.id, "skipped")
+        with print_lock:
+            print(f"{label}: generating {item.generation_size[0]}x{item.generation_size[1]}")
+            print("Command:", " ".join(shlex.quote(part) for part in item.command))
+
+        attempt = 0
+        while True:
+            attempt += 1
+            gate.wait()
+            existed = item.output.exists()
+            completed = subprocess.run(
+                item.command, env=env, capture_output=True, text=True, check=False
+            )
+            with print_lock:
+                for line in completed.stdout.splitlines():
+                    print(f"{label}: {line}")
+                for line in completed.stderr.splitlines():
+                    print(f"{label}: {line}", file=sys.stderr)
+            if completed.returncode == 0:
+                return RegionResult(item.unit.id, "generated", attempt)
+
+            if not existed and item.output.exists():
+                # Don't let a half-written image look finished to the next resume.
+                item.output.unlink()
+            output = f"{completed.stdout}\n{completed.stderr}"
+            rate_limited = is_rate_limit_output(output)
+            error = last_line(completed.stderr) or f"exit status {completed.returncode}"
+            if not (rate_limited or is_transient_output(output)) or attempt >= max_attempts:
+                with print_lock:
+                    print(f"{label}: failed after {attempt} attempt(s): {error}", file=sys.stderr)
+                return RegionResult(item.unit.id, "failed", attempt, error)
+
+            delay = retry_after_seconds(output)
+            if delay is None:
+                delay = min(MAX_BACKOFF_SECONDS, backoff_seconds * 2 ** (attempt - 1))
+            if rate_limited:
+                gate.back_off(delay)
+            with print_lock:
+                reason = "rate limited" if rate_limited else "transient failure"
+                print(f"{label}: {reason}; retrying in {delay:.1f}s", file=sys.stderr)
+            if not rate_limited:
+                time.sleep(delay)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(run_one, range(1, total + 1), planned))
+
+    counts = {status: 0 for status in ("generated", "skipped", "failed")}
+    for result in results:
+        counts[result.status] += 1
+    print(
+        f"Regions: {counts['generated']} generated, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed"
+    )
+    return results
+
+
+class RateLimitGate:
+    """Shared pause: after a rate limit, no worker starts a request until it expires."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def back_off(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self) -> None:
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+
+def http_status_re(codes: str, reasons: str) -> re.Pattern[str]:
+    """Match ``codes`` only as an HTTP status.
+
+    The code must follow "status", "HTTP", "error" or "code", or be followed by
+    one of its ``reasons`` phrases. Bare digits such as sector ids or sizes
+    don't count.
+    """
+    return re.compile(
+        r"\b(?:status(?:[ _]code)?|http(?:/[0-9.]+)?|error(?: code)?|code)"
+        rf"\W{{0,3}}(?:{codes})\b|\b(?:{codes})\W{{0,3}}(?:{reasons})",
+        re.IGNORECASE,
+    )
+
+
+RATE_LIMIT_STATUS_RE = http_status_re("429", "too many requests")
+GATEWAY_STATUS_RE = http_status_re("50[23]", "bad gateway|service unavailable")
+
+
+def is_rate_limit_output(text: str) -> bool:
+    lowered = text.lower()
+    return (
+        "ratelimit" in lowered
+        or "rate_limit" in lowered
+        or "rate limit" in lowered
+        or "too many requests" in lowered
+        or RATE_LIMIT_STATUS_RE.search(text) is not None
+    )
+
+
+def is_transient_output(text: str) -> bool:
+    lowered = text.lower()
+    return (
+        any(
+            marker in lowered
+            for marker in ("timeout", "timed out", "connection reset", "connection error")
+        )
+        or GATEWAY_STATUS_RE.search(text) is not None
+    )
+
+
+def retry_after_seconds(text: str) -> float | None:
+    match = re.search(r"retry[- ]after[:= ]+([0-9]+(?:\.[0-9]+)?)", text, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def last_line(text: str) -> str:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return lines[-1] if lines else ""
 
 
 def composite_regions(
@@ -848,29 +1029,79 @@ def composite_regions(
     composite_path: Path,
     composite_size: tuple[int, int],
     light_mode: bool = False,
+    workers: int = DEFAULT_COMPOSITE_WORKERS,
+) -> None:
+    composite_pages(
+        [CompositeTarget(planned, composite_path, composite_size, light_mode)],
+        workers=workers,
+    )
+
+
+def composite_pages(
+    targets: list[CompositeTarget], *, workers: int = DEFAULT_COMPOSITE_WORKERS
 ) -> None:
+    """Composite one or more pages (e.g. light and dark) in a single worker pass.
+
+    Regions are decoded and resized on a thread pool (Pillow releases the GIL
+    for both) and pasted in plan order, so the output is pixel-identical to
+    pasting them one by one. Only a small window of regions is in flight at a
+    time: at most ``workers`` full-size decodes plus their fitted copies.
+    """
     try:
         from PIL import Image
     except ImportError as exc:
         raise SystemExit("Compositing requires Pillow. Run this via `uv run`.") from exc
 
-    missing = [item.output for item in planned if not item.output.exists()]
+    missing = [
+        item.output for target in targets for item in target.planned if not item.output.exists()
+    ]
     if missing:
         missing_text = "\n".join(str(path) for path in missing)
         raise SystemExit(f"Cannot composite; missing region images:\n{missing_text}")
 
-    background = LIGHT_COMPOSITE_BACKGROUND if light_mode else DARK_COMPOSITE_BACKGROUND
-    canvas = Image.new("RGB", composite_size, background)
-    for item in planned:
-        x0, y0, x1, y1 = item.target_bbox
-        target_size = (x1 - x0, y1 - y0)
-        region = Image.open(item.output).convert("RGB")
-        fitted = region.resize(target_size, resample=Image.Resampling.LANCZOS)
-        canvas.paste(fitted, (x0, y0))
-
-    composite_path.parent.mkdir(parents=True, exist_ok=True)
-    canvas.save(composite_path)
-    print(f"Wrote composite: {composite_path}")
+    canvases = [
+        Image.new(
+            "RGB",
+            target.composite_size,
+            LIGHT_COMPOSITE_BACKGROUND if target.light_mode else DARK_COMPOSITE_BACKGROUND,
+        )
+        for target in targets
+    ]
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        for canvas, target in zip(canvases, targets):
+            for item in target.planned:
+                x0, y0, x1, y1 = item.target_bbox
+                fitted = pool.submit(fit_region, item.output, (x1 - x0, y1 - y0))
+                in_flight.append((canvas, (x0, y0), fitted))
+                if len(in_flight) > 2 * workers:
+                    paste_fitted(*in_flight.popleft())
+        while in_flight:
+            paste_fitted(*in_flight.popleft())
+
+        saves = []
+        for canvas, target in zip(canvases, targets):
+            target.composite_path.parent.mkdir(parents=True, exist_ok=True)
+            saves.append(pool.submit(canvas.save, target.composite_path))
+        for save, target in zip(saves, targets):
+            save.result()
+            print(f"Wrote composite: {target.composite_path}")
+
+
+def fit_region(path: Path, target_size: tuple[int, int]):
+    from PIL import Image
+
+    with Image.open(path) as region:
+        # convert() on an RGB image is only a copy, so skip it.
+        rgb = region if region.mode == "RGB" else region.convert("RGB")
+        return rgb.resize(target_size, resample=Image.Resampling.LANCZOS)
+
+
+def paste_fitted(canvas, position: tuple[int, int], fitted) -> None:
+    region = fitted.result()
+    canvas.paste(region, position)
+    region.close()
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -895,6 +1126,39 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--force", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--composite-only", action="store_true", help="Skip image generation and compose existing region PNGs.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Regions generated at once. Defaults to {DEFAULT_CONCURRENCY}.",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=(
+            "Attempts per region for rate-limit and timeout failures. "
+            f"Defaults to {DEFAULT_MAX_ATTEMPTS}."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=image_cache.DEFAULT_CACHE_DIR,
+        help=(
+            "Content-addressed image cache shared with the other newspaper image scripts. "
+            f"Defaults to {image_cache.DEFAULT_CACHE_DIR}."
+        ),
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the image cache.")
+    parser.add_argument(
+        "--generator-command",
+        type=shlex.split,
+        help=(
+            "Command that replaces `python image_gen.py` (it receives the same `edit ...` "
+            "arguments), for example a stub generator when testing offline."
+        ),
+    )
     parser.add_argument(
         "--dark-mode",
         action="store_true",
@@ -905,6 +1169,23 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
             "suffix to keep light and dark renders side by side."
         ),
     )
+    parser.add_argument(
+        "--both-modes",
+        action="store_true",
+        help=(
+            "Render light and dark pages from the same copy, compositing both in one pass. "
+            "Dark output goes to <out-dir>-dark. Not combinable with --out or --metadata-out."
+        ),
+    )
+    parser.add_argument(
+        "--composite-workers",
+        type=int,
+        default=DEFAULT_COMPOSITE_WORKERS,
+        help=(
+            "Threads decoding and resizing regions while compositing. "
+            f"Defaults to {DEFAULT_COMPOSITE_WORKERS}."
+        ),
+    )
     return parser.parse_args(argv)
 
 
@@ -914,77 +1195,94 @@ def run(argv: list[str]) -> int:
         raise SystemExit(f"Missing front-page Markdown: {args.front_page_md}")
     if not args.layout.exists():
         raise SystemExit(f"Missing layout JSON: {args.layout}")
-    if not IMAGE_GEN.exists():
+    if not IMAGE_GEN.exists() and not args.generator_command:
         raise SystemExit(f"Missing image CLI: {IMAGE_GEN}")
 
-    light_mode = not args.dark_mode
+    if args.both_modes and (args.dark_mode or args.out or args.metadata_out):
+        raise SystemExit(
+            "--both-modes writes one page per mode; drop --dark-mode, --out and --metadata-out"
+        )
+
     front_page = parse_front_page_markdown(args.front_page_md)
     layout = read_layout(args.layout)
-    out_dir = args.out_dir or default_out_dir(args.front_page_md)
-    if not light_mode and args.out_dir is None:
-        out_dir = out_dir.with_name(out_dir.name + "-dark")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    default_composite_name = (
-        "front-page-regional-composite-dark.png"
-        if not light_mode
-        else "front-page-regional-composite.png"
-    )
-    composite_path = args.out or (out_dir / default_composite_name)
-    metadata_path = args.metadata_out or (
-        out_dir / ("metadata-composite-only.json" if args.composite_only else "metadata.json")
-    )
     selected_regions = set(args.region) if args.region else None
     global_references = args.reference if args.reference else default_references()
     missing_refs = [path for path in global_references if not path.exists()]
     if missing_refs:
         raise SystemExit(f"Missing reference image(s): {missing_refs}")
 
-    planned, prompt_hashes = plan_regions(
-        front_page=front_page,
-        layout=layout,
-        front_page_md=args.front_page_md,
-        out_dir=out_dir,
-        composite_size=args.composite_size,
-        global_references=global_references,
-        model=args.model,
-        quality=args.quality,
-        selected_regions=selected_regions,
-        force=args.force,
-        dry_run=args.dry_run,
-        light_mode=light_mode,
-    )
-    write_metadata(
-        metadata_path=metadata_path,
-        front_page_md=args.front_page_md,
-        layout_path=args.layout,
-        layout=layout,
-        out_dir=out_dir,
-        composite_path=composite_path,
-        composite_size=args.composite_size,
-        model=args.model,
-        quality=args.quality,
-        prompt_hashes=prompt_hashes,
-        planned=planned,
-        dry_run=args.dry_run,
-        composite_only=args.composite_only,
-        light_mode=light_mode,
-    )
-
-    print("Front page Markdown:", args.front_page_md)
-    print("Layout:", args.layout)
-    print("Output directory:", out_dir)
-    print("Metadata:", metadata_path)
-    print("Mode:", "light" if light_mode else "dark")
-    print("Regions:", ", ".join(item.unit.id for item in planned))
+    modes = (True, False) if args.both_modes else (not args.dark_mode,)
+    pages: list[CompositeTarget] = []
+    for light_mode in modes:
+        out_dir = args.out_dir or default_out_dir(args.front_page_md)
+        if not light_mode and (args.out_dir is None or args.both_modes):
+            out_dir = out_dir.with_name(out_dir.name + "-dark")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        default_composite_name = (
+            "front-page-regional-composite-dark.png"
+            if not light_mode
+            else "front-page-regional-composite.png"
+        )
+        composite_path = args.out or (out_dir / default_composite_name)
+        metadata_path = args.metadata_out or (
+            out_dir / ("metadata-composite-only.json" if args.composite_only else "metadata.json")
+        )
 
-    generate_regions(planned, composite_only=args.composite_only)
-    if not args.dry_run:
-        composite_regions(
-            planned,
+        planned, prompt_hashes = plan_regions(
+            front_page=front_page,
+            layout=layout,
+            front_page_md=args.front_page_md,
+            out_dir=out_dir,
+            composite_size=args.composite_size,
+            global_references=global_references,
+            model=args.model,
+            quality=args.quality,
+            selected_regions=selected_regions,
+            force=args.force,
+            dry_run=args.dry_run,
+            light_mode=light_mode,
+            generator_command=args.generator_command,
+            cache_dir=None if args.no_cache else args.cache_dir,
+        )
+        write_metadata(
+            metadata_path=metadata_path,
+            front_page_md=args.front_page_md,
+            layout_path=args.layout,
+            layout=layout,
+            out_dir=out_dir,
             composite_path=composite_path,
             composite_size=args.composite_size,
+            model=args.model,
+            quality=args.quality,
+            prompt_hashes=prompt_hashes,
+            planned=planned,
+            dry_run=args.dry_run,
+            composite_only=args.composite_only,
             light_mode=light_mode,
         )
+
+        print("Front page Markdown:", args.front_page_md)
+        print("Layout:", args.layout)
+        print("Output directory:", out_dir)
+        print("Metadata:", metadata_path)
+        print("Mode:", "light" if light_mode else "dark")
+        print("Regions:", ", ".join(item.unit.id for item in planned))
+
+        results = generate_regions(
+            planned,
+            composite_only=args.composite_only,
+            force=args.force,
+            concurrency=args.concurrency,
+            max_attempts=args.max_attempts,
+        )
+        failed = [result.unit_id for result in results if result.status == "failed"]
+        if failed:
+            print(f"Not compositing; failed regions: {', '.join(failed)}", file=sys.stderr)
+            return 1
+        pages.append(CompositeTarget(planned, composite_path, args.composite_size, light_mode))
+
+    if not args.dry_run:
+        composite_pages(pages, workers=args.composite_workers)
     return 0
 
 
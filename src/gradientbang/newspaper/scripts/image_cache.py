@@ -0,0 +1,129 @@
+"""Content-addressed cache for generated newspaper images.
+
+An entry is keyed on everything that decides what the Image API is asked for:
+the endpoint, model, size, quality and other request options, the SHA-256 of
+the final prompt, and the SHA-256 of each reference image (and mask) in order.
+Re-running a front page, banner or batch job with unchanged inputs copies the
+cached image instead of calling the API; editing any input changes the key, so
+only that image is regenerated.
+
+Layout: ``<cache>/<key[:2]>/<key>/entry.json`` plus ``image_<n>.<format>``.
+Entries are written to a temporary directory and renamed into place, so
+concurrent writers (region workers, batch jobs) never expose a partial entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[4]
+DEFAULT_CACHE_DIR = ROOT / "artifacts" / "gradient-news-image-cache"
+CACHE_SCHEMA = "gradientbang.news_image_cache.v1"
+ENTRY_FILE = "entry.json"
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_request(
+    *,
+    endpoint: str,
+    request: Mapping[str, Any],
+    references: Sequence[Path] = (),
+    mask: Path | None = None,
+) -> dict[str, Any]:
+    """Return the JSON-able facts an image request is cached under.
+
+    ``request`` is the API payload without file handles; its prompt is stored
+    as a hash and ``None`` options are dropped so they match an omitted flag.
+    """
+    options = {
+        key: value
+        for key, value in request.items()
+        if key not in {"prompt", "image", "mask"} and value is not None
+    }
+    return {
+        "schema": CACHE_SCHEMA,
+        "endpoint": endpoint,
+        "prompt_sha256": sha256_bytes(str(request.get("prompt", "")).encode("utf-8")),
+        "references_sha256": [sha256_file(path) for path in references],
+        "mask_sha256": sha256_file(mask) if mask is not None else None,
+        "options": options,
+    }
+
+
+def cache_key(description: Mapping[str, Any]) -> str:
+    canonical = json.dumps(description, sort_keys=True, separators=(",", ":"))
+    return sha256_bytes(canonical.encode("utf-8"))
+
+
+class ImageCache:
+    """Generated images on disk, addressed by :func:`cache_key`."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def entry_dir(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> list[bytes] | None:
+        entry_dir = self.entry_dir(key)
+        try:
+            entry = json.loads((entry_dir / ENTRY_FILE).read_text(encoding="utf-8"))
+            return [(entry_dir / name).read_bytes() for name in entry["images"]]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(
+        self,
+        key: str,
+        images: Sequence[bytes],
+        *,
+        description: Mapping[str, Any],
+        output_format: str,
+    ) -> None:
+        entry_dir = self.entry_dir(key)
+        if (entry_dir / ENTRY_FILE).exists():
+            return
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=entry_dir.parent))
+        try:
+            names = []
+            for index, data in enumerate(images, start=1):
+                name = f"image_{index}.{output_format}"
+                (staging / name).write_bytes(data)
+                names.append(name)
+            entry = {
+                **description,
+                "key": key,
+                "images": names,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            (staging / ENTRY_FILE).write_text(
+                json.dumps(entry, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+            )
+            try:
+                os.rename(staging, entry_dir)
+            except OSError:
+                # Another writer stored the same request first; keep theirs.
+                if not (entry_dir / ENTRY_FILE).exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
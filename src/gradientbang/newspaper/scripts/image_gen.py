@@ -22,6 +22,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 from io import BytesIO
 
 from gradientbang.config import settings
+from gradientbang.newspaper.scripts.image_cache import ImageCache, cache_key, describe_request
 
 DEFAULT_MODEL = "gpt-image-2"
 DEFAULT_SIZE = "auto"
@@ -362,8 +363,8 @@ def _downscale_image_bytes(image_bytes: bytes, *, max_dim: int, output_format: s
         return out.getvalue()
 
 
-def _decode_write_and_downscale(
-    images: List[str],
+def _write_and_downscale(
+    images: List[bytes],
     outputs: List[Path],
     *,
     force: bool,
@@ -371,30 +372,60 @@ def _decode_write_and_downscale(
     downscale_suffix: str,
     output_format: str,
 ) -> None:
-    for idx, image_b64 in enumerate(images):
+    for idx, raw in enumerate(images):
         if idx >= len(outputs):
             break
         out_path = outputs[idx]
         if out_path.exists() and not force:
-            _die(f"Output already exists: {out_path} (use --force to overwrite)")
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-
-        raw = base64.b64decode(image_b64)
-        out_path.write_bytes(raw)
-        print(f"Wrote {out_path}")
+            if out_path.read_bytes() != raw:
+                _die(f"Output already exists: {out_path} (use --force to overwrite)")
+            print(f"Unchanged {out_path}")
+        else:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            out_path.write_bytes(raw)
+            print(f"Wrote {out_path}")
 
         if downscale_max_dim is None:
             continue
 
         derived = _derive_downscale_path(out_path, downscale_suffix)
+        resized = _downscale_image_bytes(raw, max_dim=downscale_max_dim, output_format=output_format)
         if derived.exists() and not force:
-            _die(f"Output already exists: {derived} (use --force to overwrite)")
+            if derived.read_bytes() != resized:
+                _die(f"Output already exists: {derived} (use --force to overwrite)")
+            print(f"Unchanged {derived}")
+            continue
         derived.parent.mkdir(parents=True, exist_ok=True)
-        resized = _downscale_image_bytes(raw, max_dim=downscale_max_dim, output_format=output_format)
         derived.write_bytes(resized)
         print(f"Wrote {derived}")
 
 
+def _open_cache(args: argparse.Namespace) -> Optional[ImageCache]:
+    cache_dir = getattr(args, "cache_dir", None)
+    return ImageCache(Path(cache_dir)) if cache_dir else None
+
+
+def _cache_lookup(
+    cache: Optional[ImageCache],
+    *,
+    endpoint: str,
+    payload: Dict[str, Any],
+    references: Iterable[Path] = (),
+    mask: Optional[Path] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[List[bytes]]]:
+    """Return ``(description, key, cached images)``; all None without a cache."""
+    if cache is None:
+        return None, None, None
+    description = describe_request(
+        endpoint=endpoint, request=payload, references=list(references), mask=mask
+    )
+    key = cache_key(description)
+    images = cache.get(key)
+    if images is not None and len(images) < int(payload.get("n", 1)):
+        images = None
+    return description, key, images
+
+
 def _create_client():
     try:
         from openai import OpenAI
@@ -630,6 +661,7 @@ async def _run_generate_batch(args: argparse.Namespace) -> int:
 
     client = _create_async_client()
     sem = asyncio.Semaphore(args.concurrency)
+    cache = _open_cache(args)
 
     any_failed = False
 
@@ -661,19 +693,29 @@ async def _run_generate_batch(args: argparse.Namespace) -> int:
             explicit_out=job.get("out"),
         )
         try:
-            async with sem:
-                print(f"{job_label} starting", file=sys.stderr)
-                started = time.time()
-                result = await _generate_one_with_retries(
-                    client,
-                    payload,
-                    attempts=args.max_attempts,
-                    job_label=job_label,
-                )
-                elapsed = time.time() - started
-                print(f"{job_label} completed in {elapsed:.1f}s", file=sys.stderr)
-            images = [item.b64_json for item in result.data]
-            _decode_write_and_downscale(
+            description, key, images = _cache_lookup(
+                cache, endpoint="/v1/images/generations", payload=payload
+            )
+            if images is not None:
+                print(f"{job_label} cache hit {key}", file=sys.stderr)
+            else:
+                async with sem:
+                    print(f"{job_label} starting", file=sys.stderr)
+                    started = time.time()
+                    result = await _generate_one_with_retries(
+                        client,
+                        payload,
+                        attempts=args.max_attempts,
+                        job_label=job_label,
+                    )
+                    elapsed = time.time() - started
+                    print(f"{job_label} completed in {elapsed:.1f}s", file=sys.stderr)
+                images = [base64.b64decode(item.b64_json) for item in result.data]
+                if cache is not None:
+                    cache.put(
+                        key, images, description=description, output_format=effective_output_format
+                    )
+            _write_and_downscale(
                 images,
                 outputs,
                 force=args.force,
@@ -733,29 +775,41 @@ def _generate(args: argparse.Namespace) -> None:
     if args.downscale_max_dim is not None:
         downscaled = [str(_derive_downscale_path(p, args.downscale_suffix)) for p in output_paths]
 
+    cache = _open_cache(args)
+    description, key, cached = _cache_lookup(
+        cache, endpoint="/v1/images/generations", payload=payload
+    )
+
     if args.dry_run:
-        _print_request(
-            {
-                "endpoint": "/v1/images/generations",
-                "outputs": [str(p) for p in output_paths],
-                "outputs_downscaled": downscaled,
-                **payload,
-            }
-        )
+        preview = {
+            "endpoint": "/v1/images/generations",
+            "outputs": [str(p) for p in output_paths],
+            "outputs_downscaled": downscaled,
+            **payload,
+        }
+        if key is not None:
+            preview["cache"] = {"key": key, "hit": cached is not None}
+        _print_request(preview)
         return
 
-    print(
-        "Calling Image API (generation). This can take up to a couple of minutes.",
-        file=sys.stderr,
-    )
-    started = time.time()
-    client = _create_client()
-    result = client.images.generate(**payload)
-    elapsed = time.time() - started
-    print(f"Generation completed in {elapsed:.1f}s.", file=sys.stderr)
-
-    images = [item.b64_json for item in result.data]
-    _decode_write_and_downscale(
+    if cached is not None:
+        print(f"Cache hit {key}; skipping Image API call.", file=sys.stderr)
+        images = cached
+    else:
+        print(
+            "Calling Image API (generation). This can take up to a couple of minutes.",
+            file=sys.stderr,
+        )
+        started = time.time()
+        client = _create_client()
+        result = client.images.generate(**payload)
+        elapsed = time.time() - started
+        print(f"Generation completed in {elapsed:.1f}s.", file=sys.stderr)
+        images = [base64.b64decode(item.b64_json) for item in result.data]
+        if cache is not None:
+            cache.put(key, images, description=description, output_format=output_format)
+
+    _write_and_downscale(
         images,
         output_paths,
         force=args.force,
@@ -802,39 +856,56 @@ def _edit(args: argparse.Namespace) -> None:
     if args.downscale_max_dim is not None:
         downscaled = [str(_derive_downscale_path(p, args.downscale_suffix)) for p in output_paths]
 
+    cache = _open_cache(args)
+    description, key, cached = _cache_lookup(
+        cache,
+        endpoint="/v1/images/edits",
+        payload=payload,
+        references=image_paths,
+        mask=mask_path,
+    )
+
     if args.dry_run:
         payload_preview = dict(payload)
         payload_preview["image"] = [str(p) for p in image_paths]
         if mask_path:
             payload_preview["mask"] = str(mask_path)
-        _print_request(
-            {
-                "endpoint": "/v1/images/edits",
-                "outputs": [str(p) for p in output_paths],
-                "outputs_downscaled": downscaled,
-                **payload_preview,
-            }
-        )
+        preview = {
+            "endpoint": "/v1/images/edits",
+            "outputs": [str(p) for p in output_paths],
+            "outputs_downscaled": downscaled,
+            **payload_preview,
+        }
+        if key is not None:
+            preview["cache"] = {"key": key, "hit": cached is not None}
+        _print_request(preview)
         return
 
-    print(
-        f"Calling Image API (edit) with {len(image_paths)} image(s).",
-        file=sys.stderr,
-    )
-    started = time.time()
-    client = _create_client()
-
-    with _open_files(image_paths) as image_files, _open_mask(mask_path) as mask_file:
-        request = dict(payload)
-        request["image"] = image_files if len(image_files) > 1 else image_files[0]
-        if mask_file is not None:
-            request["mask"] = mask_file
-        result = client.images.edit(**request)
-
-    elapsed = time.time() - started
-    print(f"Edit completed in {elapsed:.1f}s.", file=sys.stderr)
-    images = [item.b64_json for item in result.data]
-    _decode_write_and_downscale(
+    if cached is not None:
+        print(f"Cache hit {key}; skipping Image API call.", file=sys.stderr)
+        images = cached
+    else:
+        print(
+            f"Calling Image API (edit) with {len(image_paths)} image(s).",
+            file=sys.stderr,
+        )
+        started = time.time()
+        client = _create_client()
+
+        with _open_files(image_paths) as image_files, _open_mask(mask_path) as mask_file:
+            request = dict(payload)
+            request["image"] = image_files if len(image_files) > 1 else image_files[0]
+            if mask_file is not None:
+                request["mask"] = mask_file
+            result = client.images.edit(**request)
+
+        elapsed = time.time() - started
+        print(f"Edit completed in {elapsed:.1f}s.", file=sys.stderr)
+        images = [base64.b64decode(item.b64_json) for item in result.data]
+        if cache is not None:
+            cache.put(key, images, description=description, output_format=output_format)
+
+    _write_and_downscale(
         images,
         output_paths,
         force=args.force,
@@ -934,6 +1005,9 @@ def _add_shared_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--downscale-max-dim", type=int)
     parser.add_argument("--downscale-suffix", default=DEFAULT_DOWNSCALE_SUFFIX)
 
+    # Content-addressed cache (optional): identical requests reuse the stored image.
+    parser.add_argument("--cache-dir")
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(
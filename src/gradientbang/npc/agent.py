@@ -0,0 +1,79 @@
+"""TaskAgent flavour used by the NPC runners.
+
+Shared by the single-ship launcher in :mod:`gradientbang.npc.run_npc` and the
+many-ship runner in :mod:`gradientbang.npc.fleet`. Importing this module pulls
+in pipecat and the TaskAgent stack, so the CLI imports it lazily.
+"""
+
+from __future__ import annotations
+
+from gradientbang.runtime.subagents.task_agent import ASYNC_TOOL_COMPLETIONS, TaskAgent
+from gradientbang.runtime.tool_schema import (
+    CREATE_CORPORATION,
+    JOIN_CORPORATION,
+    KICK_CORPORATION_MEMBER,
+    LEAVE_CORPORATION,
+    REGENERATE_INVITE_CODE,
+    RENAME_CORPORATION,
+    RENAME_SHIP,
+    SEND_MESSAGE,
+)
+
+# NPC-specific tools that TaskAgent normally lacks (voice-only in the bot
+# because they require UI confirmation flows that don't apply to NPCs).
+NPC_EXTRA_TOOLS = [
+    CREATE_CORPORATION,
+    JOIN_CORPORATION,
+    LEAVE_CORPORATION,
+    KICK_CORPORATION_MEMBER,
+    REGENERATE_INVITE_CODE,
+    RENAME_SHIP,
+    RENAME_CORPORATION,
+    SEND_MESSAGE,
+]
+
+# Every event type TaskAgent may wait on, plus ambient ones it filters for.
+NPC_FORWARDED_EVENTS = set(ASYNC_TOOL_COMPLETIONS.values()) | {
+    "error",
+    "chat.message",
+    "task.start",
+    "task.finish",
+    "task.cancel",
+    "combat.round_waiting",
+    "combat.round_resolved",
+    "combat.ended",
+    "combat.action_accepted",
+    "status.update",
+    "quest.progress",
+    "quest.complete",
+}
+
+
+class NPCTaskAgent(TaskAgent):
+    """TaskAgent with the full tool set for autonomous NPC operation."""
+
+    # Tools where schema param names don't match the RPC method signature.
+    _NPC_SPECIAL_HANDLERS = {
+        "send_message": "_tool_send_message",
+    }
+
+    def build_tools(self) -> list:
+        return super().build_tools() + NPC_EXTRA_TOOLS
+
+    def _get_tool_handler(self, tool_name):
+        npc_special = self._NPC_SPECIAL_HANDLERS.get(tool_name)
+        if npc_special:
+            return getattr(self, npc_special, None)
+        return super()._get_tool_handler(tool_name)
+
+    async def _tool_send_message(self, args: dict):
+        # Goes through the broker like every other game RPC; the sender is
+        # the envelope identity, so no character_id is passed here.
+        return await self._call_game(
+            "send_message",
+            content=args["content"],
+            msg_type=args.get("msg_type", "broadcast"),
+            to_name=args.get("to_player"),
+            to_ship_id=args.get("to_ship_id"),
+            to_ship_name=args.get("to_ship_name"),
+        )
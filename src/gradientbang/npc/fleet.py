@@ -0,0 +1,366 @@
+"""Run many NPC ships from one process.
+
+``run_npc.py ACTOR TASK`` hosts a single TaskAgent with its own game client,
+HTTP pool, event subscription and LLM service. Driving a couple hundred NPC
+ships that way means a couple hundred interpreters. The fleet runner hosts
+them all behind one :class:`FleetBroker`:
+
+* one :class:`AsyncGameClient` (one HTTP pool) carries every ship's RPCs,
+  with per-ship identity applied by the same broker handlers the
+  Orchestrator uses for its TaskAgent children;
+* one event subscription whose scope follows the ships currently running;
+  events are broadcast on the bus and each TaskAgent filters its own;
+* one resolved task-agent LLM config, with a service built per running ship
+  (pipecat LLM services are pipeline processors and cannot be shared);
+* ``max_concurrent`` bounds how many ships — and so how many pipelines and
+  LLM services — are alive at once.
+
+Each ship still takes its own session lock, joins on its own, and fails on
+its own: a lock conflict, failed join or crashed agent is reported in that
+ship's :class:`FleetShipResult` and the rest of the fleet carries on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+from pipecat.bus import BusEndWorkerMessage, BusMessage
+from pipecat.pipeline.job_context import JobParams, JobStatus
+from pipecat.workers.base_worker import BaseWorker
+
+from gradientbang.game.base_client import RPCError
+from gradientbang.game.client import per_call_identity
+from gradientbang.npc.agent import NPC_FORWARDED_EVENTS, NPCTaskAgent
+from gradientbang.runtime.bus import BusGameEventMessage
+from gradientbang.runtime.game_broker import BrokerIdentity, GameBrokerMixin
+
+
+@dataclass(frozen=True)
+class FleetShip:
+    """One entry of a fleet file: who acts, on which ship, doing what."""
+
+    actor_id: str
+    task: str
+    ship_id: Optional[str] = None
+    instructions: Optional[str] = None
+
+    @property
+    def target_id(self) -> str:
+        return self.ship_id or self.actor_id
+
+    @property
+    def is_corp_ship(self) -> bool:
+        return bool(self.ship_id)
+
+    @property
+    def actor_character_id(self) -> Optional[str]:
+        return self.actor_id if self.ship_id else None
+
+    @property
+    def agent_name(self) -> str:
+        return f"npc_{self.target_id}"
+
+
+@dataclass(frozen=True)
+class FleetShipResult:
+    target_id: str
+    status: str
+    detail: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "completed"
+
+
+def load_fleet(path: Path) -> List[FleetShip]:
+    """Read a fleet file: a JSON array, or one JSON object per line.
+
+    Each entry needs ``actor_id`` and ``task``; ``ship_id`` and
+    ``instructions`` are optional and mean the same as the single-ship CLI
+    flags. Raises ``ValueError`` on malformed entries or a ship listed twice.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        entries = json.loads(stripped)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    ships: List[FleetShip] = []
+    seen: set[str] = set()
+    for index, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"fleet entry {index}: expected an object")
+        actor_id = str(entry.get("actor_id") or "").strip()
+        task = str(entry.get("task") or "").strip()
+        ship_id = str(entry.get("ship_id") or "").strip() or None
+        if not actor_id or not task:
+            raise ValueError(f"fleet entry {index}: actor_id and task are required")
+        if ship_id == actor_id:
+            raise ValueError(f"fleet entry {index}: ship_id must differ from actor_id")
+        ship = FleetShip(
+            actor_id=actor_id,
+            task=task,
+            ship_id=ship_id,
+            instructions=entry.get("instructions") or None,
+        )
+        if ship.target_id in seen:
+            raise ValueError(f"fleet entry {index}: {ship.target_id} is listed twice")
+        seen.add(ship.target_id)
+        ships.append(ship)
+    if not ships:
+        raise ValueError("fleet file has no entries")
+    return ships
+
+
+class FleetBroker(GameBrokerMixin, BaseWorker):
+    """Parent of every ship's TaskAgent; brokers their game RPCs.
+
+    Uses the same :class:`GameBrokerMixin` handlers as the Orchestrator;
+    identity for each request comes from the ship the sending agent was
+    started for, never from the message.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        game_client: Any,
+        llm_factory: Optional[Callable[[], Any]] = None,
+        agent_factory: Optional[Callable[[FleetShip], BaseWorker]] = None,
+    ):
+        super().__init__(name=name)
+        self._game_client = game_client
+        self._llm_factory = llm_factory
+        self._agent_factory = agent_factory or self._build_agent
+        self._ships: Dict[str, FleetShip] = {}
+        self._payloads: Dict[str, dict] = {}
+        self._outcomes: Dict[str, asyncio.Future] = {}
+        self._activated = asyncio.Event()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def on_activated(self, args: dict | None) -> None:
+        await super().on_activated(args)
+        for event_name in NPC_FORWARDED_EVENTS:
+            self._game_client.add_event_handler(event_name, self._forward_event)
+        self._activated.set()
+
+    async def wait_activated(self) -> None:
+        await self._activated.wait()
+
+    async def _forward_event(self, event: Dict[str, Any]) -> None:
+        await self.send_bus_message(BusGameEventMessage(source=self.name, event=event))
+
+    def _build_agent(self, ship: FleetShip) -> BaseWorker:
+        return NPCTaskAgent(
+            ship.agent_name,
+            character_id=ship.target_id,
+            is_corp_ship=ship.is_corp_ship,
+            llm_override=self._llm_factory() if self._llm_factory else None,
+        )
+
+    def _update_polling_scope(self) -> None:
+        ships = list(self._ships.values())
+        self._game_client.set_event_polling_scope(
+            character_ids=sorted(s.target_id for s in ships if not s.is_corp_ship),
+            ship_ids=sorted(s.target_id for s in ships if s.is_corp_ship),
+        )
+
+    # ── Ships ─────────────────────────────────────────────────────────
+
+    async def run_ship(self, ship: FleetShip) -> FleetShipResult:
+        """Join ``ship``, run its task on a fresh TaskAgent and wait for the outcome."""
+        name = ship.agent_name
+        payload: dict = {"task_description": ship.task}
+        if ship.instructions:
+            payload["context"] = ship.instructions
+        if ship.is_corp_ship:
+            payload["task_metadata"] = {
+                "actor_character_id": ship.actor_id,
+                "ship_id": ship.ship_id,
+            }
+
+        self._ships[name] = ship
+        self._outcomes[name] = asyncio.get_running_loop().create_future()
+        try:
+            self._update_polling_scope()
+            await self._game_client.sync_event_polling_scope()
+            try:
+                with per_call_identity(ship.target_id, ship.actor_character_id):
+                    await self._game_client._request("join", {"character_id": ship.target_id})
+            except RPCError as exc:
+                detail = (getattr(exc, "detail", "") or str(exc)).strip()
+                logger.error(f"npc.fleet.join_failed ship={ship.target_id} detail={detail}")
+                return FleetShipResult(ship.target_id, "join_failed", detail)
+            logger.info(f"npc.fleet.joined ship={ship.target_id}")
+
+            self._payloads[name] = payload
+            await self.add_workers(self._agent_factory(ship))
+            status, detail = await self._outcomes[name]
+            return FleetShipResult(ship.target_id, status, detail)
+        finally:
+            self._payloads.pop(name, None)
+            self._outcomes.pop(name, None)
+            self._ships.pop(name, None)
+            await self._end_agent(name)
+            self._update_polling_scope()
+
+    async def _end_agent(self, name: str) -> None:
+        if not any(child.name == name for child in self._children):
+            return
+        try:
+            await self.send_bus_message(
+                BusEndWorkerMessage(source=self.name, target=name, reason="task complete")
+            )
+        except Exception as exc:
+            logger.warning(f"npc.fleet.end_failed agent={name} error={exc}")
+        self._children = [c for c in self._children if c.name != name]
+
+    def _settle(self, name: str, status: str, detail: str = "") -> None:
+        outcome = self._outcomes.get(name)
+        if outcome is not None and not outcome.done():
+            outcome.set_result((status, detail))
+
+    async def on_worker_ready(self, data) -> None:
+        await super().on_worker_ready(data)
+        payload = self._payloads.pop(data.worker_name, None)
+        if payload is None:
+            return
+        try:
+            await self.request_job(data.worker_name, params=JobParams(payload=payload))
+        except Exception as exc:
+            logger.exception(f"npc.fleet.dispatch_failed agent={data.worker_name}")
+            self._settle(data.worker_name, "error", str(exc))
+
+    async def on_worker_failed(self, data) -> None:
+        await super().on_worker_failed(data)
+        logger.error(f"npc.fleet.agent_failed agent={data.worker_name} error={data.error}")
+        self._settle(data.worker_name, "error", str(data.error))
+
+    async def on_job_response(self, message) -> None:
+        await super().on_job_response(message)
+        if message.status == JobStatus.COMPLETED:
+            self._settle(message.source, "completed")
+        else:
+            detail = (message.response or {}).get("message", "")
+            self._settle(message.source, str(message.status), str(detail))
+
+    # ── Broker ────────────────────────────────────────────────────────
+
+    async def on_bus_message(self, message: BusMessage) -> None:
+        await super().on_bus_message(message)
+        if getattr(message, "target", None) and message.target != self.name:
+            return
+        await self.dispatch_broker_message(message)
+
+    def _broker_identity_for_message(
+        self,
+        message: BusMessage,
+        *,
+        task_id: Optional[str] = None,
+    ) -> BrokerIdentity:
+        """Identity of the ship the sending agent was started for."""
+        ship = self._ships.get(getattr(message, "source", "") or "")
+        if ship is None:
+            raise PermissionError(f"unknown fleet agent {message.source!r}")
+        incoming_task_id = task_id if task_id is not None else getattr(message, "task_id", "")
+        return ship.target_id, ship.actor_character_id, incoming_task_id or None
+
+
+async def run_fleet_ships(
+    broker: FleetBroker,
+    ships: Iterable[FleetShip],
+    *,
+    max_concurrent: int,
+    lock_ship: Optional[Callable[[FleetShip], Callable[[], None]]] = None,
+) -> List[FleetShipResult]:
+    """Run every ship on ``broker``, at most ``max_concurrent`` at a time.
+
+    ``lock_ship`` takes the ship's session lock and returns its release
+    function; when it raises, that ship is reported ``locked`` and skipped.
+    Nothing one ship does can fail the others.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def _run(ship: FleetShip) -> FleetShipResult:
+        async with semaphore:
+            try:
+                release = lock_ship(ship) if lock_ship else None
+            except Exception as exc:
+                logger.error(f"npc.fleet.locked ship={ship.target_id} error={exc}")
+                return FleetShipResult(ship.target_id, "locked", str(exc))
+            try:
+                return await broker.run_ship(ship)
+            except Exception as exc:
+                logger.exception(f"npc.fleet.ship_failed ship={ship.target_id}")
+                return FleetShipResult(ship.target_id, "error", str(exc))
+            finally:
+                if release:
+                    release()
+
+    return list(await asyncio.gather(*(_run(ship) for ship in ships)))
+
+
+async def run_fleet(
+    ships: List[FleetShip],
+    *,
+    server: str,
+    max_concurrent: int,
+    lock_ship: Optional[Callable[[FleetShip], Callable[[], None]]] = None,
+) -> List[FleetShipResult]:
+    """Host every ship in ``ships`` on one game client and one worker runner."""
+    from pipecat.workers.runner import WorkerRunner
+
+    from gradientbang.game.client import AsyncGameClient
+    from gradientbang.utils.llm_factory import create_llm_service, get_task_agent_llm_config
+
+    # Resolve provider, model and key once; each running ship gets its own
+    # service instance built from it.
+    llm_config = get_task_agent_llm_config()
+
+    # The client's bound identity only satisfies local signature checks;
+    # every RPC carries its ship's identity via per_call_identity.
+    async with AsyncGameClient(base_url=server, character_id=ships[0].actor_id) as game_client:
+        logger.info(
+            f"npc.fleet.connect server={server} ships={len(ships)} max_concurrent={max_concurrent}"
+        )
+        await game_client.start_event_delivery()
+
+        runner = WorkerRunner(handle_sigint=True)
+        broker = FleetBroker(
+            "npc_fleet",
+            game_client=game_client,
+            llm_factory=lambda: create_llm_service(llm_config),
+        )
+        await runner.add_workers(broker)
+        runner_task = asyncio.create_task(runner.run())
+        activated = asyncio.ensure_future(broker.wait_activated())
+        try:
+            await asyncio.wait({activated, runner_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not activated.done():
+                raise RuntimeError("worker runner stopped before the fleet broker started")
+            results = await run_fleet_ships(
+                broker, ships, max_concurrent=max_concurrent, lock_ship=lock_ship
+            )
+        finally:
+            activated.cancel()
+            await runner.end()
+            with suppress(asyncio.CancelledError):
+                await runner_task
+
+    for result in results:
+        if result.ok:
+            logger.info(f"npc.fleet.result ship={result.target_id} status={result.status}")
+        else:
+            logger.warning(
+                f"npc.fleet.result ship={result.target_id} status={result.status} "
+                f"detail={result.detail}"
+            )
+    return results
@@ -15,6 +15,7 @@ import sys
 from contextlib import suppress
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
 from loguru import logger
 
@@ -27,6 +28,7 @@ logger.configure(handlers=[{"sink": sys.stderr, "level": _log_level}])
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 SESSION_LOCK_DIR = PROJECT_ROOT / "logs" / "ship-sessions"
+DEFAULT_FLEET_MAX_CONCURRENT = 20
 
 
 class SessionLockError(RuntimeError):
@@ -46,7 +48,7 @@ def _acquire_ship_session_lock(
     *,
     actor_id: str,
     server: str,
-) -> callable:
+) -> Callable[[], None]:
     SESSION_LOCK_DIR.mkdir(parents=True, exist_ok=True)
     lock_path = SESSION_LOCK_DIR / f"{ship_id}.lock"
     metadata = {
@@ -142,6 +144,11 @@ def parse_args() -> argparse.Namespace:
 Examples:
   %(prog)s npc-02 "Where am I?"
   %(prog)s corp-member-01 --ship-id ship-123 "Move to sector 5 and scan"
+  %(prog)s --fleet fleet.jsonl --max-concurrent 25
+
+Fleet files hold one JSON object per line (or a JSON array), each with
+actor_id, task and optional ship_id / instructions. All ships share one
+game client, event subscription and worker runner.
 
 Environment Variables:
   SUPABASE_URL               Required. Base URL for Supabase (edge functions + REST).
@@ -152,9 +159,10 @@ Environment Variables:
 
     parser.add_argument(
         "actor_id",
+        nargs="?",
         help="Character issuing the task (use this character directly unless controlling a corporation ship)",
     )
-    parser.add_argument("task", help="Task description to execute")
+    parser.add_argument("task", nargs="?", help="Task description to execute")
 
     parser.add_argument(
         "--server",
@@ -171,9 +179,30 @@ Environment Variables:
         dest="ship_id",
         help="Corporation ship ID (character_id) to control; cannot equal actor_id",
     )
+    parser.add_argument(
+        "--fleet",
+        type=Path,
+        help="Run every ship in this JSON/JSONL file from one process instead of actor_id/task",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        dest="max_concurrent",
+        type=int,
+        default=DEFAULT_FLEET_MAX_CONCURRENT,
+        help=f"Fleet mode: ships running at once (default: {DEFAULT_FLEET_MAX_CONCURRENT})",
+    )
 
     args = parser.parse_args()
 
+    if args.fleet:
+        if args.actor_id or args.task or args.ship_id or args.instructions:
+            parser.error("--fleet takes its ships from the file; drop actor_id/task/--ship-id.")
+        if args.max_concurrent < 1:
+            parser.error("--max-concurrent must be at least 1")
+        return args
+    if not args.actor_id or not args.task:
+        parser.error("actor_id and task are required unless --fleet is given")
+
     if args.ship_id and args.ship_id == args.actor_id:
         parser.error(
             "--ship-id must differ from actor_id. Omit --ship-id to control the actor directly."
@@ -196,57 +225,7 @@ async def run_task(args: argparse.Namespace) -> int:
     from pipecat.workers.base_worker import BaseWorker
     from pipecat.workers.runner import WorkerRunner
 
-    from gradientbang.runtime.subagents.task_agent import TaskAgent
-    from gradientbang.runtime.tool_schema import (
-        CREATE_CORPORATION,
-        JOIN_CORPORATION,
-        LEAVE_CORPORATION,
-        KICK_CORPORATION_MEMBER,
-        REGENERATE_INVITE_CODE,
-        RENAME_SHIP,
-        RENAME_CORPORATION,
-        SEND_MESSAGE,
-    )
-
-    # NPC-specific tools that TaskAgent normally lacks (voice-only in the bot
-    # because they require UI confirmation flows that don't apply to NPCs).
-    _NPC_EXTRA_TOOLS = [
-        CREATE_CORPORATION,
-        JOIN_CORPORATION,
-        LEAVE_CORPORATION,
-        KICK_CORPORATION_MEMBER,
-        REGENERATE_INVITE_CODE,
-        RENAME_SHIP,
-        RENAME_CORPORATION,
-        SEND_MESSAGE,
-    ]
-
-    class NPCTaskAgent(TaskAgent):
-        """TaskAgent with the full tool set for autonomous NPC operation."""
-
-        def build_tools(self) -> list:
-            return super().build_tools() + _NPC_EXTRA_TOOLS
-
-        # Tools where schema param names don't match the RPC method signature.
-        _NPC_SPECIAL_HANDLERS = {
-            "send_message": "_tool_send_message",
-        }
-
-        def _get_tool_handler(self, tool_name):
-            npc_special = self._NPC_SPECIAL_HANDLERS.get(tool_name)
-            if npc_special:
-                return getattr(self, npc_special, None)
-            return super()._get_tool_handler(tool_name)
-
-        async def _tool_send_message(self, args: dict):
-            return await self._game_client.send_message(
-                content=args["content"],
-                msg_type=args.get("msg_type", "broadcast"),
-                to_name=args.get("to_player"),
-                to_ship_id=args.get("to_ship_id"),
-                to_ship_name=args.get("to_ship_name"),
-                character_id=self._character_id,
-            )
+    from gradientbang.npc.agent import NPC_FORWARDED_EVENTS, NPCTaskAgent
 
     success = False
     async with AsyncGameClient(
@@ -281,23 +260,6 @@ async def run_task(args: argparse.Namespace) -> int:
         # Forward game events from the game client to the bus so TaskAgent
         # receives completion events (status.snapshot, movement.complete, etc.).
         from gradientbang.runtime.bus import BusGameEventMessage
-        from gradientbang.runtime.subagents.task_agent import ASYNC_TOOL_COMPLETIONS
-
-        # Every event type TaskAgent may wait on, plus ambient ones it filters for.
-        _NPC_FORWARDED_EVENTS = set(ASYNC_TOOL_COMPLETIONS.values()) | {
-            "error",
-            "chat.message",
-            "task.start",
-            "task.finish",
-            "task.cancel",
-            "combat.round_waiting",
-            "combat.round_resolved",
-            "combat.ended",
-            "combat.action_accepted",
-            "status.update",
-            "quest.progress",
-            "quest.complete",
-        }
 
         # Minimal launcher agent that starts a TaskAgent child and waits for completion.
         task_done = asyncio.Event()
@@ -311,7 +273,7 @@ async def run_task(args: argparse.Namespace) -> int:
             async def on_activated(self, activation_args):
                 await super().on_activated(activation_args)
                 # Wire up game event forwarding to the bus
-                for event_name in _NPC_FORWARDED_EVENTS:
+                for event_name in NPC_FORWARDED_EVENTS:
                     game_client.add_event_handler(event_name, self._forward_event)
 
                 task_agent = NPCTaskAgent(
@@ -376,8 +338,44 @@ async def run_task(args: argparse.Namespace) -> int:
     return 0 if success else 1
 
 
+async def run_fleet_file(args: argparse.Namespace) -> int:
+    if not args.server:
+        logger.error("SUPABASE_URL is required (or pass --server).")
+        return 1
+    from gradientbang.npc.fleet import FleetShip, load_fleet, run_fleet
+
+    try:
+        ships = load_fleet(args.fleet)
+    except (OSError, ValueError) as exc:
+        logger.error("Cannot read fleet file {}: {}", args.fleet, exc)
+        return 1
+
+    def lock_ship(ship: FleetShip) -> Callable[[], None]:
+        return _acquire_ship_session_lock(
+            ship.target_id,
+            actor_id=ship.actor_id,
+            server=args.server,
+        )
+
+    results = await run_fleet(
+        ships,
+        server=args.server,
+        max_concurrent=args.max_concurrent,
+        lock_ship=lock_ship,
+    )
+    completed = sum(1 for result in results if result.ok)
+    logger.info("FLEET_COMPLETE {}/{} ships completed", completed, len(results))
+    return 0 if completed == len(results) else 1
+
+
 def main() -> int:
     args = parse_args()
+    if args.fleet:
+        try:
+            return asyncio.run(run_fleet_file(args))
+        except KeyboardInterrupt:
+            logger.info("INTERRUPTED by user")
+            return 130
     release_lock = None
     try:
         if args.ship_id:
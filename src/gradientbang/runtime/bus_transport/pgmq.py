@@ -8,7 +8,9 @@ the ``public.bus_*`` SECURITY DEFINER wrappers defined in
 the same wrapper surface and see each other's queues via the ``bus_peers``
 registry.
 
-The asyncpg pool is owned by this builder and closed on ``bus.stop()``.
+The asyncpg pool is owned by this builder and closed on ``bus.stop()``,
+unless the caller passes its own (see :func:`create_bus_pool`), in which case
+the pool outlives the bus and can back the next one.
 """
 
 from __future__ import annotations
@@ -54,12 +56,25 @@ class _OwnedPgmqBus(PgmqBus):
             logger.exception("pgmq.pool_close_failed")
 
 
+async def create_bus_pool(database_url: str, *, pool_size: int = 4) -> asyncpg.pool.Pool:
+    """Open an asyncpg pool for PGMQ buses on ``database_url``."""
+    dsn = (database_url or "").strip()
+    if not dsn:
+        raise RuntimeError("create_bus_pool requires database_url")
+    return await asyncpg.create_pool(
+        **parse_database_url(dsn),
+        min_size=1,
+        max_size=pool_size,
+    )
+
+
 async def build_pgmq_bus(
     *,
     database_url: str,
     channel: str,
     pool_size: int = 4,
-) -> _OwnedPgmqBus:
+    pool: asyncpg.pool.Pool | None = None,
+) -> PgmqBus:
     """Build a PGMQ-backed subagent bus on ``channel``.
 
     Args:
@@ -68,6 +83,8 @@ async def build_pgmq_bus(
         channel: Bus channel name. Treated as a capability — anyone holding
             the channel name on the same DB can join.
         pool_size: Max asyncpg pool size. Default 4.
+        pool: Already-open pool to run on (from :func:`create_bus_pool`).
+            The caller keeps ownership; ``bus.stop()`` leaves it open.
 
     Returns:
         An initialized bus ready to pass to ``WorkerRunner(bus=...)``.
@@ -79,20 +96,18 @@ async def build_pgmq_bus(
     if not chan:
         raise RuntimeError("build_pgmq_bus requires channel")
 
-    pool = await asyncpg.create_pool(
-        **parse_database_url(dsn),
-        min_size=1,
-        max_size=pool_size,
-    )
-    backend = IsolatedPgmqBackend(pool=pool)
-    bus = _OwnedPgmqBus(
-        pool=pool,
-        backend=backend,
-        channel=chan,
-        serializer=BusJSONSerializer(),
-    )
+    backend_kwargs = {"channel": chan, "serializer": BusJSONSerializer()}
+    if pool is not None:
+        bus: PgmqBus = PgmqBus(backend=IsolatedPgmqBackend(pool=pool), **backend_kwargs)
+    else:
+        owned_pool = await create_bus_pool(dsn, pool_size=pool_size)
+        bus = _OwnedPgmqBus(
+            pool=owned_pool,
+            backend=IsolatedPgmqBackend(pool=owned_pool),
+            **backend_kwargs,
+        )
     logger.info(f"bus.pgmq_initialized channel_prefix={chan[:11]}")
     return bus
 
 
-__all__ = ["build_pgmq_bus", "parse_database_url"]
+__all__ = ["build_pgmq_bus", "create_bus_pool", "parse_database_url"]
@@ -213,8 +213,13 @@ class ByoaApp:
         """Blocking entry: run one session and return when the agent stops."""
         asyncio.run(self.run_async())
 
-    async def run_async(self) -> None:
-        """Async entry. Use when you need to drive the event loop yourself."""
+    async def run_async(self, *, bus_pool: Any = None) -> None:
+        """Async entry. Use when you need to drive the event loop yourself.
+
+        ``bus_pool`` is an already-open asyncpg pool for the bus DSN (warm
+        ``byoa --serve`` workers keep one across tasks); it is left open when
+        the session ends.
+        """
         ctx = ByoaContext.from_env()
 
         provider = os.getenv("TASK_LLM_PROVIDER", "google").strip().lower()
@@ -247,6 +252,7 @@ class ByoaApp:
         bus = await build_pgmq_bus(
             database_url=ctx.bus_dsn,
             channel=ctx.channel,
+            pool=bus_pool,
         )
 
         agent_name = f"byoa_{ctx.ship_id}"
@@ -416,6 +422,21 @@ def _build_parser() -> argparse.ArgumentParser:
         default=8765,
         help="Wake daemon port (only used with --serve). Default 8765.",
     )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=0,
+        help=(
+            "Warm workers to keep ready (only used with --serve). Wakes are "
+            "handed to an idle worker instead of spawning a process. Default 0 (off)."
+        ),
+    )
+    parser.add_argument(
+        "--worker-max-tasks",
+        type=int,
+        default=20,
+        help="Tasks a warm worker runs before it is replaced. Default 20.",
+    )
     return parser
 
 
@@ -425,7 +446,12 @@ def main() -> None:
         if args.serve:
             from gradientbang.runtime.byoa.serve import run_wake_daemon
 
-            run_wake_daemon(host=args.host, port=args.port)
+            run_wake_daemon(
+                host=args.host,
+                port=args.port,
+                pool_size=args.pool_size,
+                worker_max_tasks=args.worker_max_tasks,
+            )
             return
         from gradientbang.utils.logging_config import configure_logging
 
@@ -5,6 +5,11 @@ validates the wake payload, then starts a fresh BYOA process with the env
 the edge function would have injected into a remote sandbox. The spawned
 child is just ``uv run byoa`` (i.e. :mod:`gradientbang.runtime.byoa.app`).
 
+With ``--pool-size N`` the daemon also keeps N warm workers
+(:mod:`gradientbang.runtime.byoa.worker`) that have already imported the
+harness and connected to the bus; a wake is handed to an idle one and only
+falls back to a cold spawn when every worker is busy.
+
 This daemon only runs when the operator explicitly invokes ``byoa --serve``
 on a workstation; it has no role in production. It loads ``.env.byoa`` and
 falls back to ``.env.bot`` for LLM keys so dev iteration matches the bot's
@@ -66,6 +71,205 @@ def _require(env_key: str) -> str:
     return value
 
 
+# ── Warm worker pool ───────────────────────────────────────────────────────
+
+
+WORKER_COMMAND = [sys.executable, "-m", "gradientbang.runtime.byoa.worker"]
+
+
+class _WarmWorker:
+    def __init__(self, proc: subprocess.Popen[str]) -> None:
+        self.proc = proc
+        self.ready = False
+        self.task_id: Optional[str] = None
+        self.tasks_run = 0
+        self.retiring = False
+
+    @property
+    def idle(self) -> bool:
+        return self.ready and self.task_id is None and not self.retiring
+
+
+class _WarmWorkerPool:
+    """Pre-started ``byoa`` workers that wakes are handed to.
+
+    Each worker runs up to ``max_tasks_per_worker`` tasks, then is retired
+    (stdin closed) and replaced, so leaks in one session cannot build up. A
+    worker that exits on its own is replaced too; if it died before it was
+    ready, after ``respawn_delay_seconds`` so a broken install does not spin.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        max_tasks_per_worker: int,
+        env: dict[str, str],
+        command: Optional[list[str]] = None,
+        respawn_delay_seconds: float = 1.0,
+    ) -> None:
+        self.size = size
+        self.max_tasks_per_worker = max(1, max_tasks_per_worker)
+        self._env = env
+        self._command = command or WORKER_COMMAND
+        self._respawn_delay_seconds = respawn_delay_seconds
+        self._lock = threading.Lock()
+        self._workers: list[_WarmWorker] = []
+        self._stopping = False
+        # Learned from the first wake; later workers connect before "ready".
+        self._bus_dsn: Optional[str] = None
+
+    def start(self) -> None:
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        env = dict(self._env)
+        with self._lock:
+            if self._stopping:
+                return
+            if self._bus_dsn:
+                env["BYOA_BUS_DATABASE_URL"] = self._bus_dsn
+        try:
+            proc = subprocess.Popen(
+                self._command,
+                env=env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+        except OSError:
+            logger.exception("byoa.serve.pool.spawn_failed")
+            return
+        worker = _WarmWorker(proc)
+        with self._lock:
+            self._workers.append(worker)
+        logger.info(f"byoa.serve.pool.worker_started pid={proc.pid}")
+        threading.Thread(
+            target=self._watch,
+            args=(worker,),
+            name=f"byoa-worker-{proc.pid}",
+            daemon=True,
+        ).start()
+
+    def dispatch(self, task_id: str, env: dict[str, str]) -> Optional[int]:
+        """Hand a task to an idle worker; its pid, or None if none is idle."""
+        with self._lock:
+            worker = next((w for w in self._workers if w.idle), None)
+            if worker is None:
+                return None
+            worker.task_id = task_id
+            self._bus_dsn = env.get("BYOA_BUS_DATABASE_URL") or self._bus_dsn
+        try:
+            assert worker.proc.stdin is not None
+            worker.proc.stdin.write(json.dumps({"task_id": task_id, "env": env}) + "\n")
+            worker.proc.stdin.flush()
+        except OSError:
+            # The worker died under us; its watcher replaces it.
+            with self._lock:
+                worker.task_id = None
+                worker.ready = False
+            return None
+        return worker.proc.pid
+
+    def running_pid(self, task_id: str) -> Optional[int]:
+        with self._lock:
+            for worker in self._workers:
+                if worker.task_id == task_id:
+                    return worker.proc.pid
+        return None
+
+    def _watch(self, worker: _WarmWorker) -> None:
+        assert worker.proc.stdout is not None
+        for line in worker.proc.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            event = message.get("event") if isinstance(message, dict) else None
+            if event == "ready":
+                with self._lock:
+                    worker.ready = True
+                logger.info(f"byoa.serve.pool.worker_ready pid={worker.proc.pid}")
+            elif event == "done":
+                with self._lock:
+                    task_id = worker.task_id or ""
+                    worker.task_id = None
+                    worker.tasks_run += 1
+                    retire = (
+                        worker.tasks_run >= self.max_tasks_per_worker and not self._stopping
+                    )
+                    worker.retiring = worker.retiring or retire
+                logger.info(
+                    f"byoa.serve.pool.task_done task={task_id[:8]} pid={worker.proc.pid} "
+                    f"ok={message.get('ok')} tasks_run={worker.tasks_run}"
+                )
+                if retire:
+                    logger.info(f"byoa.serve.pool.worker_recycled pid={worker.proc.pid}")
+                    self._close_stdin(worker)
+                    self._spawn()
+
+        returncode = worker.proc.wait()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            replace = not self._stopping and not worker.retiring
+        if not replace:
+            return
+        logger.warning(
+            f"byoa.serve.pool.worker_exited pid={worker.proc.pid} returncode={returncode} "
+            f"task={(worker.task_id or '(idle)')[:8]}"
+        )
+        if not worker.ready:
+            time.sleep(self._respawn_delay_seconds)
+        self._spawn()
+
+    @staticmethod
+    def _close_stdin(worker: _WarmWorker) -> None:
+        try:
+            if worker.proc.stdin is not None:
+                worker.proc.stdin.close()
+        except OSError:
+            pass
+
+    def health(self) -> dict[str, Any]:
+        with self._lock:
+            idle = sum(1 for w in self._workers if w.idle)
+            workers = [
+                {
+                    "pid": w.proc.pid,
+                    "ready": w.ready,
+                    "task_id": w.task_id,
+                    "tasks_run": w.tasks_run,
+                    "retiring": w.retiring,
+                }
+                for w in self._workers
+            ]
+        return {
+            "size": self.size,
+            "max_tasks_per_worker": self.max_tasks_per_worker,
+            "idle": idle,
+            "workers": workers,
+        }
+
+    def terminate(self, *, timeout_seconds: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout_seconds
+        with self._lock:
+            self._stopping = True
+            workers = list(self._workers)
+        for worker in workers:
+            self._close_stdin(worker)
+            if worker.proc.poll() is None:
+                worker.proc.terminate()
+        for worker in workers:
+            try:
+                worker.proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning(f"byoa.serve.pool.killing pid={worker.proc.pid}")
+                worker.proc.kill()
+
+
 # ── Daemon ────────────────────────────────────────────────────────────────
 
 
@@ -74,7 +278,8 @@ class _WakeDaemon:
 
     The edge function owns the wake contract; this daemon validates the
     shared edge API token and spawns a real ``uv run byoa`` process with
-    the env values the edge function would inject into a remote sandbox.
+    the env values the edge function would inject into a remote sandbox,
+    or hands the task to an idle worker when a warm ``pool`` is configured.
     """
 
     def __init__(
@@ -83,10 +288,12 @@ class _WakeDaemon:
         ship_id: str,
         character_id: str,
         wake_secret: str,
+        pool: Optional[_WarmWorkerPool] = None,
     ) -> None:
         self.ship_id = ship_id
         self.character_id = character_id
         self.wake_secret = wake_secret
+        self._pool = pool
         self._lock = threading.Lock()
         self._processes: dict[str, subprocess.Popen[Any]] = {}
 
@@ -100,11 +307,14 @@ class _WakeDaemon:
                 }
                 for task_id, proc in self._processes.items()
             }
-        return {
+        health: dict[str, Any] = {
             "status": "ok",
             "ship_id": self.ship_id,
             "active": active,
         }
+        if self._pool is not None:
+            health["pool"] = self._pool.health()
+        return health
 
     def handle_wake(
         self,
@@ -138,32 +348,49 @@ class _WakeDaemon:
         if not bus_database_url:
             return 400, {"success": False, "error": "BYOA_BUS_DATABASE_URL_required"}
 
+        task_env = {
+            "BYOA_CHANNEL": channel,
+            "BYOA_SHIP_ID": self.ship_id,
+            "BYOA_CHARACTER_ID": self.character_id,
+            "BYOA_BUS_DATABASE_URL": bus_database_url,
+            "BYOA_TASK_ID": task_id,
+            "BYOA_WAKE_REQUEST_ID": str(payload.get("request_id") or ""),
+        }
+
         with self._lock:
             existing = self._processes.get(task_id)
+            running_pid = self._pool.running_pid(task_id) if self._pool else None
             if existing is not None and existing.poll() is None:
+                running_pid = existing.pid
+            if running_pid is not None:
                 logger.info(
-                    f"byoa.serve.duplicate task={task_id[:8]} pid={existing.pid}"
+                    f"byoa.serve.duplicate task={task_id[:8]} pid={running_pid}"
                 )
                 return 202, {
                     "success": True,
                     "status": "accepted",
                     "duplicate": True,
-                    "pid": existing.pid,
+                    "pid": running_pid,
                 }
             if existing is not None and existing.poll() is not None:
                 self._processes.pop(task_id, None)
 
-            env = os.environ.copy()
-            env.update(
-                {
-                    "BYOA_CHANNEL": channel,
-                    "BYOA_SHIP_ID": self.ship_id,
-                    "BYOA_CHARACTER_ID": self.character_id,
-                    "BYOA_BUS_DATABASE_URL": bus_database_url,
-                    "BYOA_TASK_ID": task_id,
-                    "BYOA_WAKE_REQUEST_ID": str(payload.get("request_id") or ""),
+            warm_pid = self._pool.dispatch(task_id, task_env) if self._pool else None
+            if warm_pid is not None:
+                logger.info(
+                    f"byoa.serve.handed_off task={task_id[:8]} ship={self.ship_id[:8]} "
+                    f"channel_prefix={channel[:11]} pid={warm_pid}"
+                )
+                return 202, {
+                    "success": True,
+                    "status": "accepted",
+                    "duplicate": False,
+                    "pid": warm_pid,
+                    "warm": True,
                 }
-            )
+
+            env = os.environ.copy()
+            env.update(task_env)
             # Spawn the harness directly; equivalent to `uv run byoa` once the
             # console script is installed, but works even when uv isn't on PATH.
             cmd = [sys.executable, "-m", "gradientbang.runtime.byoa.app"]
@@ -179,10 +406,13 @@ class _WakeDaemon:
             "status": "accepted",
             "duplicate": False,
             "pid": proc.pid,
+            "warm": False,
         }
 
     def terminate_children(self, *, timeout_seconds: float = 5.0) -> None:
         deadline = time.monotonic() + timeout_seconds
+        if self._pool is not None:
+            self._pool.terminate(timeout_seconds=timeout_seconds)
         with self._lock:
             processes = list(self._processes.items())
         for task_id, proc in processes:
@@ -261,8 +491,18 @@ def _make_wake_handler(daemon: _WakeDaemon) -> type[BaseHTTPRequestHandler]:
 # ── Entry point ───────────────────────────────────────────────────────────
 
 
-def run_wake_daemon(*, host: str, port: int) -> None:
-    """Serve the local HTTP wake provider until SIGINT/SIGTERM."""
+def run_wake_daemon(
+    *,
+    host: str,
+    port: int,
+    pool_size: int = 0,
+    worker_max_tasks: int = 20,
+) -> None:
+    """Serve the local HTTP wake provider until SIGINT/SIGTERM.
+
+    ``pool_size`` warm workers are kept ready (0 disables the pool); each is
+    replaced after ``worker_max_tasks`` tasks.
+    """
     try:
         _load_env_files()
         from gradientbang.utils.logging_config import configure_logging
@@ -275,10 +515,22 @@ def run_wake_daemon(*, host: str, port: int) -> None:
         print(f"byoa: {exc}", file=sys.stderr)
         sys.exit(1)
 
+    pool: Optional[_WarmWorkerPool] = None
+    if pool_size > 0:
+        worker_env = os.environ.copy()
+        worker_env.update({"BYOA_SHIP_ID": ship_id, "BYOA_CHARACTER_ID": character_id})
+        pool = _WarmWorkerPool(
+            size=pool_size,
+            max_tasks_per_worker=worker_max_tasks,
+            env=worker_env,
+        )
+        pool.start()
+
     daemon = _WakeDaemon(
         ship_id=ship_id,
         character_id=character_id,
         wake_secret=wake_secret,
+        pool=pool,
     )
     server = ThreadingHTTPServer((host, port), _make_wake_handler(daemon))
     bound_host, bound_port = server.server_address[:2]
@@ -292,6 +544,12 @@ def run_wake_daemon(*, host: str, port: int) -> None:
             ("character_id", _short(character_id)),
             ("wake_url", f"http://{bound_host}:{bound_port}/wake"),
             ("health_url", f"http://{bound_host}:{bound_port}/health"),
+            (
+                "warm_pool",
+                f"{pool_size} workers, recycled every {worker_max_tasks} tasks"
+                if pool is not None
+                else "(off)",
+            ),
         ],
     )
 
@@ -0,0 +1,107 @@
+"""Warm BYOA worker for the ``byoa --serve`` pool.
+
+A cold wake spawns a fresh ``byoa`` process and pays interpreter start-up,
+the pipecat / TaskAgent / LLM SDK imports and a new bus connection before the
+agent can say hello. A warm worker does all of that ahead of time, then
+waits on stdin for tasks from the wake daemon and runs them one after the
+other through the bundled :class:`ByoaApp`.
+
+Protocol (one JSON object per line):
+
+* worker → daemon on the original stdout: ``{"event": "ready"}`` once
+  warmed, ``{"event": "done", "task_id": ..., "ok": ...}`` after each task.
+* daemon → worker on stdin: ``{"task_id": ..., "env": {...}}`` with the
+  per-task ``BYOA_*`` env the daemon would give a cold process. EOF asks the
+  worker to exit after closing its bus pools.
+
+Anything else the process prints is sent to stderr so it cannot corrupt the
+protocol stream. The asyncpg pool for each bus DSN is opened once (before
+``ready`` when the daemon already knows the DSN) and reused by every task.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, TextIO
+
+from loguru import logger
+
+
+def _send(control: TextIO, message: dict[str, Any]) -> None:
+    control.write(json.dumps(message) + "\n")
+    control.flush()
+
+
+def _warm_imports() -> None:
+    """Import the modules a session needs so the first task doesn't."""
+    import pipecat.workers.runner  # noqa: F401
+
+    import gradientbang.runtime.bus_transport.pgmq  # noqa: F401
+    import gradientbang.runtime.subagents.task_agent  # noqa: F401
+
+
+async def _serve(control: TextIO) -> None:
+    from gradientbang.runtime.bus_transport.pgmq import create_bus_pool
+    from gradientbang.runtime.byoa.app import ByoaApp, ByoaConfigError
+
+    loop = asyncio.get_running_loop()
+    bus_pools: dict[str, Any] = {}
+
+    async def _bus_pool(dsn: str) -> Any:
+        if dsn not in bus_pools:
+            bus_pools[dsn] = await create_bus_pool(dsn)
+        return bus_pools[dsn]
+
+    initial_dsn = (os.environ.get("BYOA_BUS_DATABASE_URL") or "").strip()
+    if initial_dsn:
+        try:
+            await _bus_pool(initial_dsn)
+        except Exception:
+            logger.exception("byoa.worker.preconnect_failed")
+    _send(control, {"event": "ready", "pid": os.getpid()})
+
+    try:
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            request = json.loads(line)
+            task_id = request.get("task_id")
+            os.environ.update({k: str(v) for k, v in (request.get("env") or {}).items()})
+            ok = True
+            try:
+                dsn = (os.environ.get("BYOA_BUS_DATABASE_URL") or "").strip()
+                pool = await _bus_pool(dsn) if dsn else None
+                await ByoaApp().run_async(bus_pool=pool)
+            except ByoaConfigError as exc:
+                ok = False
+                logger.error(f"byoa.worker.config_error task={task_id!s} error={exc}")
+            except Exception:
+                ok = False
+                logger.exception(f"byoa.worker.task_failed task={task_id!s}")
+            _send(control, {"event": "done", "task_id": task_id, "ok": ok})
+    finally:
+        for pool in bus_pools.values():
+            try:
+                await pool.close()
+            except Exception:
+                logger.exception("byoa.worker.pool_close_failed")
+
+
+def main() -> None:
+    # Keep the protocol stream to ourselves: fd 1 becomes stderr.
+    control = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    from gradientbang.utils.logging_config import configure_logging
+
+    configure_logging()
+    _warm_imports()
+    asyncio.run(_serve(control))
+
+
+if __name__ == "__main__":
+    main()
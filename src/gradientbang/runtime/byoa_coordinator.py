@@ -3,15 +3,21 @@
 BYOA (Bring-Your-Own-Agent) is a cold path: per-corp-ship operator setup,
 not per-conversation. The runtime host delegates BYOA wake, presence, and
 broker authorization here.
+
+Ship ownership (who claimed a corp ship for BYOA) is read from
+``my_corporation`` and kept in a :class:`ByoaOwnerCache`: one read answers
+every ship of the corp, and the corp/ship events that can change the answer
+drop the affected entries before their TTL runs out.
 """
 
 from __future__ import annotations
 
 import asyncio
+import heapq
 import os
 import time
 from dataclasses import dataclass, replace
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from loguru import logger
 from pipecat.bus import BusEndWorkerMessage
@@ -26,6 +32,29 @@ from gradientbang.game.client import AsyncGameClient
 PRESENCE_STALE_SECONDS = 25.0
 PRESENCE_SWEEP_SECONDS = 5.0
 
+OWNER_CACHE_TTL_SECONDS = 300.0
+# Ships my_corporation doesn't list (not ours, or bought since the read).
+OWNER_CACHE_NEGATIVE_TTL_SECONDS = 30.0
+
+# Events that can change one ship's owner; their payload carries ship_id.
+OWNER_SHIP_EVENTS = (
+    "ship.byoa_configured",
+    "ship.purchased",
+    "ship.traded_in",
+    "ship.destroyed",
+    "corporation.ship_purchased",
+    "corporation.ship_sold",
+)
+# Events that can change which ships the corp has at all.
+OWNER_CORP_EVENTS = (
+    "corporation.created",
+    "corporation.disbanded",
+    "corporation.member_joined",
+    "corporation.member_left",
+    "corporation.member_kicked",
+    "corporation.ships_abandoned",
+)
+
 
 @dataclass
 class ByoaPresence:
@@ -36,6 +65,141 @@ class ByoaPresence:
     last_seen_monotonic: float
 
 
+@dataclass
+class _OwnerEntry:
+    owner: Optional[str]
+    in_corp: bool
+    stored_at: float
+
+
+_MISSING = object()
+
+
+class ByoaOwnerCache:
+    """Ship id -> BYOA owner prefix, as last read from ``my_corporation``.
+
+    ``None`` is a real answer (not claimed, or not a corp ship), so lookups
+    return ``(found, owner)``. Entries for ships missing from the corp
+    expire after ``negative_ttl_seconds``, the rest after ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = OWNER_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: float = OWNER_CACHE_NEGATIVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._entries: Dict[str, _OwnerEntry] = {}
+        # Bumped on every invalidation; a read that started before one is
+        # returned to its callers but not stored.
+        self.generation = 0
+        # Owners of entries that expired, to tell whether the refresh changed them.
+        self._expired: Dict[str, Optional[str]] = {}
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._fetches = 0
+        self._invalidations = 0
+        self._stale_refreshes = 0
+        self._hit_age_total = 0.0
+        self._hit_age_max = 0.0
+
+    def get(self, ship_id: str) -> Tuple[bool, Optional[str]]:
+        entry = self._entries.get(ship_id)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            ttl = self.ttl_seconds if entry.in_corp else self.negative_ttl_seconds
+            if age <= ttl:
+                self._hits += 1
+                self._negative_hits += not entry.in_corp
+                self._hit_age_total += age
+                self._hit_age_max = max(self._hit_age_max, age)
+                return True, entry.owner
+            del self._entries[ship_id]
+            self._expired[ship_id] = entry.owner
+        self._misses += 1
+        return False, None
+
+    def store(
+        self,
+        owners: Mapping[str, Optional[str]],
+        *,
+        generation: int,
+        unknown: tuple[str, ...] = (),
+    ) -> None:
+        """Store one ``my_corporation`` read, plus ``unknown`` ships it lacked."""
+        if generation != self.generation:
+            return
+        now = self._clock()
+        for ship_id, owner in owners.items():
+            previous = self._expired.pop(ship_id, _MISSING)
+            if previous is not _MISSING and previous != owner:
+                self._stale_refreshes += 1
+            self._entries[ship_id] = _OwnerEntry(owner=owner, in_corp=True, stored_at=now)
+        for ship_id in unknown:
+            if ship_id not in owners:
+                self._entries[ship_id] = _OwnerEntry(owner=None, in_corp=False, stored_at=now)
+
+    def note_fetch(self) -> None:
+        self._fetches += 1
+
+    def invalidate(self, ship_id: Optional[str] = None) -> None:
+        """Drop ``ship_id`` and every not-in-corp entry, or everything."""
+        self.generation += 1
+        self._invalidations += 1
+        if ship_id is None:
+            self._entries.clear()
+            return
+        self._entries.pop(ship_id, None)
+        for other in [sid for sid, entry in self._entries.items() if not entry.in_corp]:
+            del self._entries[other]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "negative_hits": self._negative_hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            "fetches": self._fetches,
+            "invalidations": self._invalidations,
+            "entries": len(self._entries),
+            "mean_hit_age_seconds": (
+                round(self._hit_age_total / self._hits, 1) if self._hits else None
+            ),
+            "max_hit_age_seconds": round(self._hit_age_max, 1),
+            # Expired entries whose refresh came back with a different owner.
+            "stale_refreshes": self._stale_refreshes,
+        }
+
+
+def _owners_from_corporation(corp_result: Any) -> Optional[Dict[str, Optional[str]]]:
+    """Map each corp ship to its BYOA owner prefix (None when unclaimed)."""
+    corp = corp_result.get("corporation") if isinstance(corp_result, dict) else None
+    if not isinstance(corp, dict):
+        return None
+    ships = corp.get("ships")
+    if not isinstance(ships, list):
+        return None
+    owners: Dict[str, Optional[str]] = {}
+    for ship in ships:
+        if not isinstance(ship, dict) or not isinstance(ship.get("ship_id"), str):
+            continue
+        byoa = ship.get("byoa")
+        # The corp payload exposes a truncated 12-char prefix, not the
+        # full UUID. That's enough as a routing hint for the wake_agent
+        # call (the server re-resolves the owner from the row).
+        owner_prefix = byoa.get("owner_character_id_prefix") if isinstance(byoa, dict) else None
+        owners[ship["ship_id"]] = (
+            owner_prefix if isinstance(owner_prefix, str) and owner_prefix else None
+        )
+    return owners
+
+
 class ByoaCoordinator:
     """Own BYOA wake, presence, broker auth, and registry handling."""
 
@@ -57,9 +221,19 @@ class ByoaCoordinator:
         # Process presence for external BYOA runners. This is UI/task-start
         # liveness only; registry + hello remains authoritative for dispatch.
         self._presence: Dict[str, ByoaPresence] = {}
+        # Expiry deadlines of online presences: (deadline, ship_id,
+        # last_seen_monotonic). Every heartbeat pushes a new entry; entries
+        # superseded by a later heartbeat are skipped when popped.
+        self._presence_deadlines: List[Tuple[float, str, float]] = []
         self._sweep_task: Optional[asyncio.Task] = None
+        self._release_tasks: set[asyncio.Task] = set()
         self._known_ships: set[str] = set()
 
+        self._owner_cache = ByoaOwnerCache()
+        self._owner_read: Optional[asyncio.Future] = None
+        for event_name in OWNER_SHIP_EVENTS + OWNER_CORP_EVENTS:
+            game_client.add_event_handler(event_name, self._on_ownership_event)
+
         # Remote BYOA agents are not children in this process, so the broker
         # keeps its own active-task table for authorization and cleanup.
         # agent_name -> {task_id, character_id, actor_character_id, task_metadata}
@@ -101,10 +275,30 @@ class ByoaCoordinator:
     async def lookup_owner(self, ship_id: str) -> Optional[str]:
         """Return the BYOA owner character_id for ``ship_id``, or None.
 
-        Hits ``my_corporation`` to read the ``byoa`` block surfaced by
-        ``_shared/corporations.ts``. Truthy return means the ship is
-        BYOA-claimed (route via wake_agent); None means in-process spawn.
+        Reads the ``byoa`` block that ``my_corporation`` surfaces from
+        ``_shared/corporations.ts``, through the owner cache. Truthy return
+        means the ship is BYOA-claimed (route via wake_agent); None means
+        in-process spawn.
         """
+        found, owner = self._owner_cache.get(ship_id)
+        if found:
+            return owner
+        generation = self._owner_cache.generation
+        owners = await self._read_corp_owners()
+        if owners is None:
+            return None
+        # Concurrent lookups share one read; each records its own unknown ship.
+        self._owner_cache.store(owners, generation=generation, unknown=(ship_id,))
+        return owners.get(ship_id)
+
+    async def _read_corp_owners(self) -> Optional[Dict[str, Optional[str]]]:
+        """One ``my_corporation`` read shared by every lookup waiting on it."""
+        if self._owner_read is None or self._owner_read.done():
+            self._owner_read = asyncio.ensure_future(self._request_corp_owners())
+        return await asyncio.shield(self._owner_read)
+
+    async def _request_corp_owners(self) -> Optional[Dict[str, Optional[str]]]:
+        self._owner_cache.note_fetch()
         try:
             corp_result = await self._game_client._request(
                 "my_corporation",
@@ -113,26 +307,26 @@ class ByoaCoordinator:
         except Exception as exc:
             logger.warning(f"byoa.lookup_owner failed: {exc}")
             return None
-        corp = corp_result.get("corporation") if isinstance(corp_result, dict) else None
-        if not isinstance(corp, dict):
-            return None
-        ships = corp.get("ships")
-        if not isinstance(ships, list):
-            return None
-        for ship in ships:
-            if not isinstance(ship, dict):
-                continue
-            if ship.get("ship_id") != ship_id:
-                continue
-            byoa = ship.get("byoa")
-            if not isinstance(byoa, dict):
-                return None
-            # The corp payload exposes a truncated 12-char prefix, not the
-            # full UUID. That's enough as a routing hint for the wake_agent
-            # call (the server re-resolves the owner from the row).
-            owner_prefix = byoa.get("owner_character_id_prefix")
-            return owner_prefix if isinstance(owner_prefix, str) and owner_prefix else None
-        return None
+        return _owners_from_corporation(corp_result)
+
+    def invalidate_owner(self, ship_id: Optional[str] = None) -> None:
+        """Forget cached ownership of ``ship_id`` (or of every ship)."""
+        self._owner_cache.invalidate(ship_id)
+        if ship_id is None:
+            self._known_ships.clear()
+        else:
+            self._known_ships.discard(ship_id)
+
+    def owner_cache_stats(self) -> Dict[str, Any]:
+        return self._owner_cache.stats()
+
+    def _on_ownership_event(self, event_message: Dict[str, Any]) -> None:
+        payload = event_message.get("payload", event_message)
+        ship_id = payload.get("ship_id") if isinstance(payload, dict) else None
+        if event_message.get("event_name") in OWNER_SHIP_EVENTS and isinstance(ship_id, str):
+            self.invalidate_owner(ship_id)
+        else:
+            self.invalidate_owner()
 
     @staticmethod
     def wake_failure_message(
@@ -201,12 +395,14 @@ class ByoaCoordinator:
         last_seen_at = message.last_seen_at
         now = time.monotonic()
         previous = self._presence.get(ship_id)
-        self._presence[ship_id] = ByoaPresence(
-            ship_id=ship_id,
-            online=online,
-            status=status,
-            last_seen_at=last_seen_at,
-            last_seen_monotonic=now,
+        self._record_presence(
+            ByoaPresence(
+                ship_id=ship_id,
+                online=online,
+                status=status,
+                last_seen_at=last_seen_at,
+                last_seen_monotonic=now,
+            )
         )
 
         if online:
@@ -218,6 +414,10 @@ class ByoaCoordinator:
             self.invalidate_registry_entry(self.agent_name_for(ship_id))
 
         changed = previous is None or previous.online != online or previous.status != status
+        if previous is not None and previous.online != online:
+            # A runner coming back (or going away) is when an operator
+            # re-links or releases a ship; re-read ownership next time.
+            self._owner_cache.invalidate(ship_id)
         if changed:
             await self._push_presence(
                 ship_id=ship_id,
@@ -256,12 +456,35 @@ class ByoaCoordinator:
                 name="byoa_presence_sweeper",
             )
 
+    def _record_presence(self, presence: ByoaPresence) -> None:
+        self._presence[presence.ship_id] = presence
+        if not presence.online:
+            return
+        heapq.heappush(
+            self._presence_deadlines,
+            (
+                presence.last_seen_monotonic + PRESENCE_STALE_SECONDS,
+                presence.ship_id,
+                presence.last_seen_monotonic,
+            ),
+        )
+        # Heartbeats leave a few superseded entries per ship; rebuild from the
+        # live presences once they clearly outnumber them.
+        if len(self._presence_deadlines) > 4 * len(self._presence) + 64:
+            self._presence_deadlines = [
+                (p.last_seen_monotonic + PRESENCE_STALE_SECONDS, p.ship_id, p.last_seen_monotonic)
+                for p in self._presence.values()
+                if p.online
+            ]
+            heapq.heapify(self._presence_deadlines)
+
     async def _sweep_loop(self) -> None:
         try:
-            while True:
-                await asyncio.sleep(PRESENCE_SWEEP_SECONDS)
-                if not self._presence:
-                    return
+            while self._presence_deadlines:
+                # Sleep until the earliest deadline, batching expiries that
+                # fall within one sweep interval of each other.
+                delay = self._presence_deadlines[0][0] - time.monotonic()
+                await asyncio.sleep(max(PRESENCE_SWEEP_SECONDS, delay))
                 await self._mark_stale_offline()
         except asyncio.CancelledError:
             return
@@ -269,29 +492,65 @@ class ByoaCoordinator:
             if asyncio.current_task() is self._sweep_task:
                 self._sweep_task = None
 
-    async def _mark_stale_offline(self) -> None:
+    async def _mark_stale_offline(self) -> Optional[asyncio.Task]:
+        """Mark presences past their deadline offline; only those are touched.
+
+        Lock releases for the expired ships run as one background batch so a
+        burst of expiries doesn't hold up the sweep. Returns that batch's
+        task, or None when nothing expired.
+        """
         now = time.monotonic()
-        for ship_id, presence in list(self._presence.items()):
-            if presence.online and now - presence.last_seen_monotonic > PRESENCE_STALE_SECONDS:
-                self._presence[ship_id] = replace(
-                    presence,
-                    online=False,
-                    status="offline",
-                )
-                self.invalidate_registry_entry(self.agent_name_for(ship_id))
-                await self._push_presence(
-                    ship_id=ship_id,
-                    online=False,
-                    status="offline",
-                    last_seen_at=presence.last_seen_at,
+        expired: List[ByoaPresence] = []
+        while self._presence_deadlines and self._presence_deadlines[0][0] < now:
+            _, ship_id, last_seen = heapq.heappop(self._presence_deadlines)
+            presence = self._presence.get(ship_id)
+            if presence is None or not presence.online:
+                continue
+            if presence.last_seen_monotonic != last_seen:
+                continue  # a later heartbeat pushed its own deadline
+            self._presence[ship_id] = replace(
+                presence,
+                online=False,
+                status="offline",
+            )
+            self.invalidate_registry_entry(self.agent_name_for(ship_id))
+            self._owner_cache.invalidate(ship_id)
+            expired.append(presence)
+
+        for presence in expired:
+            await self._push_presence(
+                ship_id=presence.ship_id,
+                online=False,
+                status="offline",
+                last_seen_at=presence.last_seen_at,
+            )
+        if not expired:
+            return None
+        # If these BYOAs were running tasks, the bot is the only authority on
+        # their locks. Release them locally and emit task.cancel events so
+        # downstream consumers (event log, UI) see the tasks ended. A zombie
+        # BYOA (if still alive) won't affect this bot's state — any belated
+        # bus messages tagged with a cancelled task_id are filtered out by
+        # TaskAgent.
+        task = asyncio.create_task(
+            self._release_locks_on_offline([p.ship_id for p in expired]),
+            name="byoa_presence_release",
+        )
+        self._release_tasks.add(task)
+        task.add_done_callback(self._release_tasks.discard)
+        return task
+
+    async def _release_locks_on_offline(self, ship_ids: List[str]) -> None:
+        results = await asyncio.gather(
+            *(self._release_lock_on_offline(ship_id) for ship_id in ship_ids),
+            return_exceptions=True,
+        )
+        for ship_id, result in zip(ship_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"byoa.presence_stale release failed for ship={ship_id[:8]}: {result!r}"
                 )
-                # If this BYOA was running a task, the bot is the only
-                # authority on its lock. Release it locally and emit a
-                # task.cancel event so downstream consumers (event log, UI)
-                # see the task ended. The zombie BYOA (if still alive) won't
-                # affect this bot's state — any belated bus messages tagged
-                # with the cancelled task_id are filtered out by TaskAgent.
-                await self._release_lock_on_offline(ship_id)
+        logger.info(f"byoa.presence_stale.batch ships={len(ship_ids)}")
 
     async def _release_lock_on_offline(self, ship_character_id: str) -> None:
         framework_task_id = self._host.release_ship_lock(ship_character_id)
@@ -325,10 +584,13 @@ class ByoaCoordinator:
             )
 
     def close_sweeper(self) -> None:
-        """Cancel the presence sweeper task during runtime shutdown."""
+        """Cancel the presence sweeper and lock releases during runtime shutdown."""
         if self._sweep_task and not self._sweep_task.done():
             self._sweep_task.cancel()
         self._sweep_task = None
+        for task in list(self._release_tasks):
+            task.cancel()
+        self._release_tasks.clear()
 
     # ── Active-agent table + broker auth ──────────────────────────────────
 
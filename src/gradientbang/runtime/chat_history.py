@@ -1,12 +1,147 @@
-"""Fetch and emit chat history for runtime session bootstrap."""
+"""Recent chat history for runtime sessions.
 
+Each character's recent chat is kept in a bounded in-memory ring shared by
+every session for that character in this bot process. A session start runs
+one ``event_query`` for whatever the ring has not seen yet. From then on the
+ring is appended to from live ``chat.message`` events. History requests and
+reconnects are answered from the ring without another query.
+"""
+
+import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+from loguru import logger
 from pipecat.processors.frameworks.rtvi import RTVIProcessor, RTVIServerMessageFrame
 
 from gradientbang.game.client import AsyncGameClient
 
+MAX_HISTORY_HOURS = 72
+RING_CAPACITY = 100
+MAX_TRACKED_CHARACTERS = 256
+
+
+def _message_from_payload(payload: Mapping[str, Any], timestamp: Any = None) -> Dict[str, Any]:
+    return {
+        "id": payload.get("id"),
+        "type": payload.get("type"),
+        "from_name": payload.get("from_name"),
+        "content": payload.get("content"),
+        "to_name": payload.get("to_name"),
+        "timestamp": payload.get("timestamp") or timestamp,
+    }
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class ChatHistoryRing:
+    """The most recent chat messages seen by one character, deduplicated by id."""
+
+    def __init__(self, capacity: int = RING_CAPACITY) -> None:
+        self.capacity = capacity
+        # Oldest first, ordered by (timestamp, id).
+        self._messages: List[Tuple[datetime, str, Dict[str, Any]]] = []
+        self._ids: set[str] = set()
+        # End of the last query; a later sync only asks for what came after.
+        self.synced_through: Optional[datetime] = None
+        self._sync_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def add(self, message: Dict[str, Any]) -> bool:
+        """Insert ``message`` in order; False if it is a duplicate or too old to keep."""
+        message_id = message.get("id")
+        sent_at = _parse_timestamp(message.get("timestamp"))
+        if not isinstance(message_id, str) or sent_at is None or message_id in self._ids:
+            return False
+        key = (sent_at, message_id)
+        if len(self._messages) >= self.capacity and key < self._messages[0][:2]:
+            return False
+        position = len(self._messages)
+        # Messages nearly always arrive newest last; walk back from the end.
+        while position and self._messages[position - 1][:2] > key:
+            position -= 1
+        self._messages.insert(position, (sent_at, message_id, message))
+        self._ids.add(message_id)
+        if len(self._messages) > self.capacity:
+            _, dropped_id, _ = self._messages.pop(0)
+            self._ids.discard(dropped_id)
+        return True
+
+    def recent(self, *, since_hours: int = 24, max_rows: int = 50) -> List[Dict[str, Any]]:
+        """Messages from the last ``since_hours``, newest first, at most ``max_rows``."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+        messages: List[Dict[str, Any]] = []
+        for sent_at, _, message in reversed(self._messages):
+            if sent_at < cutoff or len(messages) >= max_rows:
+                break
+            messages.append(dict(message))
+        return messages
+
+    async def sync(self, game_client: AsyncGameClient, character_id: str) -> None:
+        """Query chat the ring has not seen yet (the last 72h on first use)."""
+        async with self._sync_lock:
+            end_time = datetime.now(timezone.utc)
+            start_time = self.synced_through or end_time - timedelta(hours=MAX_HISTORY_HOURS)
+            result = await game_client.event_query(
+                start=start_time.isoformat(),
+                end=end_time.isoformat(),
+                character_id=character_id,
+                filter_event_type="chat.message",
+                include_broadcasts=True,
+                max_rows=self.capacity,
+                sort_direction="reverse",
+            )
+            added = sum(
+                self.add(_message_from_payload(ev.get("payload", {}), ev.get("timestamp")))
+                for ev in result.get("events", [])
+            )
+            self.synced_through = end_time
+            logger.info(
+                "chat_history.synced character_id={} added={} size={}",
+                character_id,
+                added,
+                len(self),
+            )
+
+
+_rings: "OrderedDict[str, ChatHistoryRing]" = OrderedDict()
+
+
+def chat_history_ring(character_id: str) -> ChatHistoryRing:
+    """The process-wide ring for ``character_id``, kept across reconnects."""
+    ring = _rings.get(character_id)
+    if ring is None:
+        ring = _rings[character_id] = ChatHistoryRing()
+        while len(_rings) > MAX_TRACKED_CHARACTERS:
+            _rings.popitem(last=False)
+    else:
+        _rings.move_to_end(character_id)
+    return ring
+
+
+def track_chat_history(game_client: AsyncGameClient, character_id: str) -> ChatHistoryRing:
+    """Append ``game_client``'s ``chat.message`` events to the character's ring."""
+    ring = chat_history_ring(character_id)
+
+    def _on_chat_message(event_message: Dict[str, Any]) -> None:
+        payload = event_message.get("payload", event_message)
+        if isinstance(payload, dict):
+            ring.add(_message_from_payload(payload))
+
+    game_client.add_event_handler("chat.message", _on_chat_message)
+    return ring
+
 
 async def fetch_chat_history(
     game_client: AsyncGameClient,
@@ -15,7 +150,10 @@ async def fetch_chat_history(
     since_hours: int = 24,
     max_rows: int = 50,
 ) -> List[Dict[str, Any]]:
-    """Fetch recent chat messages and return them as clean message dicts.
+    """Return recent chat messages as clean message dicts, newest first.
+
+    Served from the character's ring; only the first call in this process
+    queries the server.
 
     Args:
         game_client: The game client to query with.
@@ -26,34 +164,13 @@ async def fetch_chat_history(
     Returns:
         List of chat message dicts with id, type, from_name, content, to_name, timestamp.
     """
-    since_hours = min(since_hours, 72)
-    max_rows = min(max_rows, 100)
-
-    end_time = datetime.now(timezone.utc)
-    start_time = end_time - timedelta(hours=since_hours)
-
-    result = await game_client.event_query(
-        start=start_time.isoformat(),
-        end=end_time.isoformat(),
-        character_id=character_id,
-        filter_event_type="chat.message",
-        include_broadcasts=True,
-        max_rows=max_rows,
-        sort_direction="reverse",
-    )
+    since_hours = min(since_hours, MAX_HISTORY_HOURS)
+    max_rows = min(max_rows, RING_CAPACITY)
 
-    raw_events = result.get("events", [])
-    return [
-        {
-            "id": ev.get("payload", {}).get("id"),
-            "type": ev.get("payload", {}).get("type"),
-            "from_name": ev.get("payload", {}).get("from_name"),
-            "content": ev.get("payload", {}).get("content"),
-            "to_name": ev.get("payload", {}).get("to_name"),
-            "timestamp": ev.get("payload", {}).get("timestamp") or ev.get("timestamp"),
-        }
-        for ev in raw_events
-    ]
+    ring = chat_history_ring(character_id)
+    if ring.synced_through is None:
+        await ring.sync(game_client, character_id)
+    return ring.recent(since_hours=since_hours, max_rows=max_rows)
 
 
 async def emit_chat_history(
@@ -19,6 +19,8 @@ from pipecat.utils.time import time_now_iso8601
 
 from gradientbang.game.base_client import RPCError
 from gradientbang.runtime.frames import UserTextInputFrame
+from gradientbang.runtime.session_cache import MAP_REGION
+from gradientbang.runtime.task_history import TaskHistory
 from gradientbang.runtime.voices import get_voices_for_provider
 from gradientbang.utils.tts_factory import get_tts_provider
 
@@ -42,6 +44,7 @@ class ClientMessageHandler:
         transport,
         pipeline_worker,
         llm_context=None,
+        session_cache=None,
     ):
         self._game_client = game_client
         self._character_id = character_id
@@ -49,6 +52,8 @@ class ClientMessageHandler:
         self._transport = transport
         self._pipeline_worker = pipeline_worker
         self._llm_context = llm_context
+        self._session_cache = session_cache
+        self._task_history = TaskHistory(game_client, character_id).attach()
         self._voices = get_voices_for_provider(get_tts_provider())
 
     async def handle(self, message):
@@ -73,6 +78,12 @@ class ClientMessageHandler:
         if callable(track_request_id):
             track_request_id(result.get("request_id"))
 
+    async def _cached(self, namespace, key, fetch):
+        """Read through the session cache when the session has one."""
+        if self._session_cache is None:
+            return await fetch()
+        return await self._session_cache.get_or_fetch(namespace, key, fetch)
+
     # ── Individual handlers ───────────────────────────────────────────
 
     async def _handle_start(self, msg_type, msg_data):
@@ -190,83 +201,14 @@ class ClientMessageHandler:
             max_rows_raw = msg_data.get("max_rows") if isinstance(msg_data, dict) else None
             max_rows = int(max_rows_raw) if max_rows_raw is not None else 50
 
-            end_time = datetime.now(timezone.utc)
-            start_time = end_time - timedelta(days=30)
-            target_character = ship_id or self._character_id
+            cursor = msg_data.get("cursor") if isinstance(msg_data, dict) else None
 
-            start_query = self._game_client.event_query(
-                start=start_time.isoformat(),
-                end=end_time.isoformat(),
-                character_id=target_character,
-                filter_event_type="task.start",
-                max_rows=max_rows + 10,
-                sort_direction="reverse",
+            payload = await self._task_history.page(
+                ship_id or self._character_id, limit=max_rows, cursor=cursor
             )
-            finish_query = self._game_client.event_query(
-                start=start_time.isoformat(),
-                end=end_time.isoformat(),
-                character_id=target_character,
-                filter_event_type="task.finish",
-                max_rows=max_rows + 10,
-                sort_direction="reverse",
-            )
-            start_result, finish_result = await asyncio.gather(start_query, finish_query)
-
-            start_events = start_result.get("events", [])
-            finish_events = finish_result.get("events", [])
-
-            finish_by_task_id: dict = {}
-            for event in finish_events:
-                task_id = event.get("task_id")
-                if task_id:
-                    finish_by_task_id[task_id] = event
-
-            tasks = []
-            for start_event in start_events:
-                task_id = start_event.get("task_id")
-                if not task_id:
-                    continue
-                finish_event = finish_by_task_id.get(task_id)
-                start_payload = start_event.get("payload", {})
-                finish_payload = finish_event.get("payload", {}) if finish_event else {}
-                end_summary = None
-                end_status = None
-                if finish_event:
-                    end_summary = (
-                        finish_payload.get("task_summary")
-                        or finish_payload.get("summary")
-                        or finish_payload.get("result")
-                    )
-                    end_status = finish_payload.get("task_status")
-                tasks.append(
-                    {
-                        "task_id": task_id,
-                        "started": start_event.get("timestamp"),
-                        "ended": finish_event.get("timestamp") if finish_event else None,
-                        "start_instructions": start_payload.get("task_description")
-                        or start_payload.get("instructions")
-                        or "",
-                        "end_summary": end_summary,
-                        "end_status": end_status,
-                        "actor_character_id": start_payload.get("actor_character_id"),
-                        "actor_character_name": start_payload.get("actor_character_name"),
-                        "task_scope": start_payload.get("task_scope"),
-                        "ship_id": start_payload.get("ship_id"),
-                        "ship_name": start_payload.get("ship_name"),
-                        "ship_type": start_payload.get("ship_type"),
-                    }
-                )
-
-            tasks.sort(key=lambda t: t["started"] or "", reverse=True)
-            tasks = tasks[:max_rows]
-
             await self._rtvi.push_frame(
                 RTVIServerMessageFrame(
-                    {
-                        "frame_type": "event",
-                        "event": "task.history",
-                        "payload": {"tasks": tasks, "total_count": len(tasks)},
-                    }
+                    {"frame_type": "event", "event": "task.history", "payload": payload}
                 )
             )
         except Exception as exc:  # noqa: BLE001
@@ -425,14 +367,25 @@ class ClientMessageHandler:
                 max_sectors,
                 fit_sectors,
             )
-            result = await self._game_client.local_map_region(
-                character_id=self._character_id,
-                center_sector=center_sector if fit_sectors is None else None,
-                bounds=bounds,
-                max_hops=max_hops,
-                max_sectors=max_sectors,
-                fit_sectors=fit_sectors,
-                source="get-my-map",
+            map_center = center_sector if fit_sectors is None else None
+            result = await self._cached(
+                MAP_REGION,
+                (
+                    map_center,
+                    bounds,
+                    max_hops,
+                    max_sectors,
+                    tuple(fit_sectors) if fit_sectors is not None else None,
+                ),
+                lambda: self._game_client.local_map_region(
+                    character_id=self._character_id,
+                    center_sector=map_center,
+                    bounds=bounds,
+                    max_hops=max_hops,
+                    max_sectors=max_sectors,
+                    fit_sectors=fit_sectors,
+                    source="get-my-map",
+                ),
             )
             elapsed_ms = (time.monotonic() - started_at) * 1000
             logger.info(
@@ -28,7 +28,7 @@ from loguru import logger
 from pipecat.frames.frames import LLMMessagesAppendFrame, LLMRunFrame
 from pipecat.processors.frameworks.rtvi import RTVIProcessor, RTVIServerMessageFrame
 
-from gradientbang.runtime.chat_history import emit_chat_history, fetch_chat_history
+from gradientbang.runtime.chat_history import emit_chat_history, track_chat_history
 from gradientbang.utils.event_ordering import (
     extract_event_id,
     extract_payload_event_context,
@@ -1174,6 +1174,7 @@ class EventRelay:
         # Subscribe to game events from config registry
         for event_name in EVENT_CONFIGS:
             game_client.on(event_name)(self._enqueue_event)
+        self._chat_history = track_chat_history(game_client, character_id)
 
     @property
     def character_id(self) -> str:
@@ -1289,7 +1290,9 @@ class EventRelay:
 
     async def _send_initial_chat_history(self) -> None:
         try:
-            messages = await fetch_chat_history(self._game_client, self._character_id)
+            # One query per session start, for chat the ring has not seen yet.
+            await self._chat_history.sync(self._game_client, self._character_id)
+            messages = self._chat_history.recent()
             await emit_chat_history(self._rtvi, messages)
             logger.info(f"Sent initial chat history: {len(messages)} messages")
         except Exception:
@@ -0,0 +1,271 @@
+"""Game RPC broker shared by every TaskAgent parent.
+
+TaskAgents, including external BYOA runners, speak typed bus messages
+instead of holding their own AsyncGameClient. Whoever parents them — the
+Orchestrator for a voice session, the NPC fleet runner for many ships —
+brokers those messages onto one game client. Each handler:
+  - asks the host's identity resolver for character_id / actor_character_id
+    / task_id, never trusting identity fields inside ``msg.args``
+  - applies that identity and task_id for the call duration via ContextVars
+    so concurrent brokered RPCs don't trample each other
+  - catches exceptions → error=str(e) in the response. Never re-raises.
+
+Hosts mix in :class:`GameBrokerMixin` and provide ``name``,
+``send_bus_message``, ``_game_client`` and ``_broker_identity_for_message``.
+"""
+
+from __future__ import annotations
+
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+from pipecat.bus import BusMessage
+
+from gradientbang.game.client import per_call_identity, per_call_task_id
+from gradientbang.runtime.bus import (
+    BusCombatStrategyRequest,
+    BusCombatStrategyResponse,
+    BusCorporationQueryRequest,
+    BusCorporationQueryResponse,
+    BusGameToolCallRequest,
+    BusGameToolCallResponse,
+    BusTaskFinishNotification,
+)
+
+# (character_id, actor_character_id, task_id) for one brokered request.
+BrokerIdentity = Tuple[str, Optional[str], Optional[str]]
+
+
+class GameBrokerMixin:
+    """Broker TaskAgent game requests onto the host's game client."""
+
+    def _broker_identity_for_message(
+        self,
+        message: BusMessage,
+        *,
+        task_id: Optional[str] = None,
+    ) -> BrokerIdentity:
+        """Resolve authoritative identity for a brokered request.
+
+        Raise ``PermissionError`` to refuse the sender outright.
+        """
+        raise NotImplementedError
+
+    def _broker_sender_pinned_to_ship(self, source: str) -> bool:
+        """Whether ``source`` may only ask about the ship it acts as.
+
+        Remote BYOA agents are pinned: a combat strategy request naming any
+        other ship is refused.
+        """
+        return False
+
+    async def dispatch_broker_message(self, message: BusMessage) -> bool:
+        """Handle ``message`` if it is a broker request; return whether it was."""
+        if isinstance(message, BusGameToolCallRequest):
+            await self._on_game_tool_call_request(message)
+        elif isinstance(message, BusCombatStrategyRequest):
+            await self._on_combat_strategy_request(message)
+        elif isinstance(message, BusCorporationQueryRequest):
+            await self._on_corporation_query_request(message)
+        elif isinstance(message, BusTaskFinishNotification):
+            await self._on_task_finish_notification(message)
+        else:
+            return False
+        return True
+
+    def _broker_tool_kwargs(
+        self, method: Callable[..., Any], args: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Return user/tool args only, with identity kept out of method kwargs.
+
+        The broker applies authoritative identity through ContextVars at the
+        Supabase transport boundary. Some client methods still require
+        a ``character_id`` argument and validate it against the bound player
+        client before calling ``_request``; pass the bound player id only to
+        satisfy that local signature. ``_inject_character_ids`` overwrites the
+        outbound payload with the broker envelope identity later.
+        """
+        kwargs = {
+            key: value
+            for key, value in dict(args).items()
+            if key not in {"character_id", "actor_character_id"}
+        }
+        try:
+            signature = inspect.signature(method)
+        except (TypeError, ValueError):
+            return kwargs
+
+        character_param = signature.parameters.get("character_id")
+        if (
+            character_param is not None
+            and character_param.default is inspect.Parameter.empty
+            and character_param.kind
+            in (
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                inspect.Parameter.KEYWORD_ONLY,
+            )
+            and "character_id" not in kwargs
+        ):
+            kwargs["character_id"] = self._game_client.character_id
+        return kwargs
+
+    async def _on_game_tool_call_request(self, msg: BusGameToolCallRequest) -> None:
+        """Dispatch a TaskAgent tool call to the bound game client.
+
+        ``character_id`` and ``actor_character_id`` from the resolver
+        are applied through per-call ContextVars at the Supabase transport
+        boundary, not passed through heterogeneous Python method signatures.
+        The broker is the trust boundary between TaskAgent / BYOA senders
+        and the edge functions, so identity keys in ``msg.args`` are
+        stripped before dispatch and cannot hijack the envelope identity.
+
+        ``task_id`` propagates via a ContextVar (``per_call_task_id``) for
+        the duration of the call rather than by mutating the shared
+        client's ``current_task_id`` field; that mutation would race when
+        two concurrent brokered RPCs are in flight on the same client.
+        """
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+        method = getattr(self._game_client, msg.tool_name, None)
+        try:
+            character_id, actor_character_id, task_id = self._broker_identity_for_message(
+                msg,
+                task_id=msg.task_id or None,
+            )
+            if method is None or not callable(method):
+                error = f"unknown tool: {msg.tool_name!r}"
+            else:
+                kwargs = self._broker_tool_kwargs(method, msg.args)
+                with (
+                    per_call_identity(
+                        character_id or None,
+                        actor_character_id or None,
+                    ),
+                    per_call_task_id(task_id or None),
+                ):
+                    raw = await method(**kwargs)
+                result = raw if isinstance(raw, dict) else {"result": raw}
+        except Exception as exc:
+            logger.warning(f"broker game_tool_call({msg.tool_name}) failed: {exc}")
+            error = str(exc)
+
+        await self.send_bus_message(
+            BusGameToolCallResponse(
+                source=self.name,
+                target=msg.source,
+                correlation_id=msg.correlation_id,
+                result=result,
+                error=error,
+            )
+        )
+
+    async def _on_combat_strategy_request(self, msg: BusCombatStrategyRequest) -> None:
+        strategy: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+        try:
+            character_id, actor_character_id, _task_id = self._broker_identity_for_message(
+                msg,
+                task_id=msg.task_id or None,
+            )
+            if (
+                self._broker_sender_pinned_to_ship(msg.source)
+                and msg.ship_id
+                and msg.ship_id != character_id
+            ):
+                raise PermissionError("unauthorized_byoa_ship")
+            method = self._game_client.combat_get_strategy
+            kwargs = self._broker_tool_kwargs(
+                method, {"ship_id": msg.ship_id} if msg.ship_id else {}
+            )
+            with per_call_identity(character_id or None, actor_character_id or None):
+                raw = await method(**kwargs)
+            strategy = raw if isinstance(raw, dict) else {"strategy": raw}
+        except Exception as exc:
+            logger.warning(f"broker combat_strategy failed: {exc}")
+            error = str(exc)
+
+        await self.send_bus_message(
+            BusCombatStrategyResponse(
+                source=self.name,
+                target=msg.source,
+                correlation_id=msg.correlation_id,
+                strategy=strategy,
+                error=error,
+            )
+        )
+
+    async def _on_corporation_query_request(self, msg: BusCorporationQueryRequest) -> None:
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+        try:
+            character_id, actor_character_id, _task_id = self._broker_identity_for_message(
+                msg,
+                task_id=msg.task_id or None,
+            )
+            with per_call_identity(character_id or None, actor_character_id or None):
+                if msg.query_type == "list":
+                    raw = await self._game_client._request("corporation.list", {})
+                elif msg.query_type == "info":
+                    if not msg.corp_id:
+                        raise ValueError("corp_id required for query_type='info'")
+                    raw = await self._game_client._request(
+                        "corporation.info",
+                        {"character_id": character_id, "corp_id": msg.corp_id},
+                    )
+                elif msg.query_type == "my":
+                    raw = await self._game_client._request(
+                        "my_corporation",
+                        {"character_id": character_id},
+                    )
+                else:
+                    raise ValueError(f"unknown query_type: {msg.query_type!r}")
+            result = raw if isinstance(raw, dict) else {"result": raw}
+        except Exception as exc:
+            logger.warning(f"broker corp_query({msg.query_type}) failed: {exc}")
+            error = str(exc)
+
+        await self.send_bus_message(
+            BusCorporationQueryResponse(
+                source=self.name,
+                target=msg.source,
+                correlation_id=msg.correlation_id,
+                result=result,
+                error=error,
+            )
+        )
+
+    async def _on_task_finish_notification(self, msg: BusTaskFinishNotification) -> None:
+        """Fire-and-forget — call task_lifecycle(finish) and log on failure.
+
+        Server-side this triggers the pair-matched ship-lock release.
+        No response message; the TaskAgent already finishes its own
+        bookkeeping before sending this.
+
+        actor_character_id is forwarded explicitly. For a corp ship the
+        server's owner-only check is keyed on this field, and defaulting it
+        to character_id (the pseudo-character) would 403 the finish and
+        leave the lock until stale recovery.
+        """
+        task_metadata: Dict[str, Any] = {}
+        try:
+            character_id, actor_character_id, _task_id = self._broker_identity_for_message(
+                msg,
+                task_id=msg.task_id,
+            )
+            if actor_character_id:
+                task_metadata["actor_character_id"] = actor_character_id
+            if msg.ship_id:
+                task_metadata["ship_id"] = msg.ship_id
+            with per_call_identity(character_id or None, actor_character_id or None):
+                await self._game_client.task_lifecycle(
+                    character_id=character_id,
+                    task_id=msg.task_id,
+                    event_type="finish",
+                    task_status=msg.status,
+                    task_summary=msg.summary,
+                    task_metadata=task_metadata or None,
+                )
+        except Exception as exc:
+            # Task is already done from the agent's POV; log and move on.
+            logger.warning(f"broker task_finish failed for {msg.task_id[:8]}: {exc}")
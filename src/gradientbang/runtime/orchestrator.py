@@ -59,27 +59,22 @@ from gradientbang.config import (
 )
 from gradientbang.game.auth import Auth
 from gradientbang.game.base_client import RPCError
-from gradientbang.game.client import AsyncGameClient, per_call_identity, per_call_task_id
+from gradientbang.game.client import AsyncGameClient
 from gradientbang.runtime.bus import (
     BusAgentHelloRequest,
     BusAgentHelloResponse,
     BusByoaPresenceMessage,
-    BusCombatStrategyRequest,
-    BusCombatStrategyResponse,
     BusCombatWakeMessage,
-    BusCorporationQueryRequest,
-    BusCorporationQueryResponse,
     BusGameEventMessage,
-    BusGameToolCallRequest,
-    BusGameToolCallResponse,
     BusSteerTaskMessage,
-    BusTaskFinishNotification,
     PendingRequests,
 )
 from gradientbang.runtime.byoa_coordinator import ByoaCoordinator
 from gradientbang.runtime.client_message_handlers import ClientMessageHandler
 from gradientbang.runtime.event_relay import EventRelay
 from gradientbang.runtime.frames import TaskActivityFrame
+from gradientbang.runtime.game_broker import GameBrokerMixin
+from gradientbang.runtime.session_cache import PORTS_LIST, SessionCache
 from gradientbang.runtime.session_init import gather_initial_state
 from gradientbang.runtime.subagent_narrator import SpeechStateSnapshot, SubagentNarrator
 from gradientbang.runtime.subagents.task_agent import TaskAgent
@@ -160,7 +155,7 @@ def require_voice_worker(func):
     return sync_wrapper
 
 
-class Orchestrator:
+class Orchestrator(GameBrokerMixin):
     # ── Runtime Setup ────────────────────────────────────────────────
 
     def __init__(
@@ -181,6 +176,7 @@ class Orchestrator:
         self.voice_worker: PipelineWorker | None = None
         self.game_client: AsyncGameClient | None = None
         self.event_relay: EventRelay | None = None
+        self.session_cache: SessionCache | None = None
         self.context: LLMContext | None = None
         self.voice_llm: Any | None = None
         self.voice_runtime: VoiceRuntime | None = None
@@ -242,6 +238,9 @@ class Orchestrator:
             functions_url=local_api_url,
             access_token=auth.access_token,
         )
+        # One cache for the UI agent, voice tools and client messages, kept
+        # current by the same client's events.
+        orch.session_cache = SessionCache.from_settings().attach(orch.game_client)
         # EventRelay only registers handlers on game_client at construction;
         # no IO. The orchestrator satisfies TaskStateProvider directly.
         orch.event_relay = EventRelay(
@@ -300,6 +299,7 @@ class Orchestrator:
             transport=transport,
             pipeline_worker=voice_worker,
             llm_context=context,
+            session_cache=self.session_cache,
         )
 
     async def create_bus(self) -> AgentBus:
@@ -1735,7 +1735,15 @@ class Orchestrator:
             if args.get(key) is not None:
                 kwargs[key] = args[key]
 
-        result = await self._game_client.list_known_ports(character_id=self._character_id, **kwargs)
+        result = None
+        if self.session_cache is not None:
+            cached = self.session_cache.get(PORTS_LIST, self.session_cache.ports_list_key(kwargs))
+            if cached is not None:
+                result = cached.get("payload", cached)
+        if result is None:
+            result = await self._game_client.list_known_ports(
+                character_id=self._character_id, **kwargs
+            )
         summary = list_known_ports_summary(result)
         self._begin_assistant_response_cycle()
         await params.result_callback({"summary": summary})
@@ -2479,15 +2487,10 @@ class Orchestrator:
 
     # ── BYOA broker ────────────────────────────────────────────────────
     #
-    # TaskAgents, including external BYOA runners, speak typed bus messages
-    # instead of holding their own AsyncGameClient. This broker is the only
-    # edge-function ingress for the whole agent ecosystem. Each handler:
-    #   - derives character_id / actor_character_id from local broker state
-    #     for remote BYOA messages, falling back to local TaskAgent metadata
-    #     or message fields for in-process callers
-    #   - tags task_id for the call duration via a ContextVar so concurrent
-    #     brokered RPCs don't trample each other's event correlation
-    #   - catches exceptions → error=str(e) in the response. Never re-raises.
+    # The handlers live in GameBrokerMixin; this broker is the only
+    # edge-function ingress for the session's agents. Identity comes from
+    # local broker state for remote BYOA messages, falling back to local
+    # TaskAgent metadata or message fields for in-process callers.
     #
     def _broker_identity_for_message(
         self,
@@ -2530,6 +2533,9 @@ class Orchestrator:
             str(incoming_task_id) if incoming_task_id else None,
         )
 
+    def _broker_sender_pinned_to_ship(self, source: str) -> bool:
+        return self._byoa.is_agent_name(source)
+
     async def on_bus_message(self, message: BusMessage) -> None:
         """Dispatch typed messages; delegate everything else upstream."""
         # Targeted messages for other agents are ignored upstream; mirror
@@ -2537,15 +2543,9 @@ class Orchestrator:
         if getattr(message, "target", None) and message.target != self.name:
             return
 
-        if isinstance(message, BusGameToolCallRequest):
-            await self._on_game_tool_call_request(message)
-        elif isinstance(message, BusCombatStrategyRequest):
-            await self._on_combat_strategy_request(message)
-        elif isinstance(message, BusCorporationQueryRequest):
-            await self._on_corporation_query_request(message)
-        elif isinstance(message, BusTaskFinishNotification):
-            await self._on_task_finish_notification(message)
-        elif isinstance(message, BusByoaPresenceMessage):
+        if await self.dispatch_broker_message(message):
+            return
+        if isinstance(message, BusByoaPresenceMessage):
             await self._byoa.on_presence(message)
         elif isinstance(message, BusAgentHelloResponse):
             self._resolve_hello_response(message)
@@ -2584,194 +2584,6 @@ class Orchestrator:
                 message.error or "agent reported not ready",
             )
 
-    def _broker_tool_kwargs(
-        self, method: Callable[..., Any], args: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Return user/tool args only, with identity kept out of method kwargs.
-
-        The broker applies authoritative identity through ContextVars at the
-        Supabase transport boundary. Some client methods still require
-        a ``character_id`` argument and validate it against the bound player
-        client before calling ``_request``; pass the bound player id only to
-        satisfy that local signature. ``_inject_character_ids`` overwrites the
-        outbound payload with the broker envelope identity later.
-        """
-        kwargs = {
-            key: value
-            for key, value in dict(args).items()
-            if key not in {"character_id", "actor_character_id"}
-        }
-        try:
-            signature = inspect.signature(method)
-        except (TypeError, ValueError):
-            return kwargs
-
-        character_param = signature.parameters.get("character_id")
-        if (
-            character_param is not None
-            and character_param.default is inspect.Parameter.empty
-            and character_param.kind
-            in (
-                inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                inspect.Parameter.KEYWORD_ONLY,
-            )
-            and "character_id" not in kwargs
-        ):
-            kwargs["character_id"] = self._character_id
-        return kwargs
-
-    async def _on_game_tool_call_request(self, msg: BusGameToolCallRequest) -> None:
-        """Dispatch a TaskAgent tool call to the player-bound game client.
-
-        ``character_id`` and ``actor_character_id`` from the envelope
-        are applied through per-call ContextVars at the Supabase transport
-        boundary, not passed through heterogeneous Python method signatures.
-        The broker is the trust boundary between TaskAgent / future BYOA
-        senders and the edge functions, so identity keys in ``msg.args`` are
-        stripped before dispatch and cannot hijack the envelope identity.
-
-        ``task_id`` propagates via a ContextVar (``per_call_task_id``) for
-        the duration of the call rather than by mutating the shared
-        client's ``current_task_id`` field; that mutation would race when
-        two concurrent brokered RPCs are in flight on the same client.
-        """
-        result: Optional[Dict[str, Any]] = None
-        error: Optional[str] = None
-        method = getattr(self._game_client, msg.tool_name, None)
-        try:
-            character_id, actor_character_id, task_id = self._broker_identity_for_message(
-                msg,
-                task_id=msg.task_id or None,
-            )
-            if method is None or not callable(method):
-                error = f"unknown tool: {msg.tool_name!r}"
-            else:
-                kwargs = self._broker_tool_kwargs(method, msg.args)
-                with (
-                    per_call_identity(
-                        character_id or None,
-                        actor_character_id or None,
-                    ),
-                    per_call_task_id(task_id or None),
-                ):
-                    raw = await method(**kwargs)
-                result = raw if isinstance(raw, dict) else {"result": raw}
-        except Exception as exc:
-            logger.warning(f"broker game_tool_call({msg.tool_name}) failed: {exc}")
-            error = str(exc)
-
-        await self.send_bus_message(
-            BusGameToolCallResponse(
-                source=self.name,
-                target=msg.source,
-                correlation_id=msg.correlation_id,
-                result=result,
-                error=error,
-            )
-        )
-
-    async def _on_combat_strategy_request(self, msg: BusCombatStrategyRequest) -> None:
-        strategy: Optional[Dict[str, Any]] = None
-        error: Optional[str] = None
-        try:
-            character_id, _actor_character_id, _task_id = self._broker_identity_for_message(
-                msg,
-                task_id=msg.task_id or None,
-            )
-            if self._byoa.is_agent_name(msg.source) and msg.ship_id and msg.ship_id != character_id:
-                raise PermissionError("unauthorized_byoa_ship")
-            kwargs: Dict[str, Any] = {"character_id": character_id}
-            if msg.ship_id:
-                kwargs["ship_id"] = msg.ship_id
-            raw = await self._game_client.combat_get_strategy(**kwargs)
-            strategy = raw if isinstance(raw, dict) else {"strategy": raw}
-        except Exception as exc:
-            logger.warning(f"broker combat_strategy failed: {exc}")
-            error = str(exc)
-
-        await self.send_bus_message(
-            BusCombatStrategyResponse(
-                source=self.name,
-                target=msg.source,
-                correlation_id=msg.correlation_id,
-                strategy=strategy,
-                error=error,
-            )
-        )
-
-    async def _on_corporation_query_request(self, msg: BusCorporationQueryRequest) -> None:
-        result: Optional[Dict[str, Any]] = None
-        error: Optional[str] = None
-        try:
-            character_id, _actor_character_id, _task_id = self._broker_identity_for_message(
-                msg,
-                task_id=msg.task_id or None,
-            )
-            if msg.query_type == "list":
-                raw = await self._game_client._request("corporation.list", {})
-            elif msg.query_type == "info":
-                if not msg.corp_id:
-                    raise ValueError("corp_id required for query_type='info'")
-                raw = await self._game_client._request(
-                    "corporation.info",
-                    {"character_id": character_id, "corp_id": msg.corp_id},
-                )
-            elif msg.query_type == "my":
-                raw = await self._game_client._request(
-                    "my_corporation",
-                    {"character_id": character_id},
-                )
-            else:
-                raise ValueError(f"unknown query_type: {msg.query_type!r}")
-            result = raw if isinstance(raw, dict) else {"result": raw}
-        except Exception as exc:
-            logger.warning(f"broker corp_query({msg.query_type}) failed: {exc}")
-            error = str(exc)
-
-        await self.send_bus_message(
-            BusCorporationQueryResponse(
-                source=self.name,
-                target=msg.source,
-                correlation_id=msg.correlation_id,
-                result=result,
-                error=error,
-            )
-        )
-
-    async def _on_task_finish_notification(self, msg: BusTaskFinishNotification) -> None:
-        """Fire-and-forget — call task_lifecycle(finish) and log on failure.
-
-        Server-side this triggers the pair-matched ship-lock release.
-        No response message; the bundled TaskAgent already finishes its
-        own bookkeeping before sending this.
-
-        actor_character_id is forwarded explicitly. For a BYOA
-        corp ship the server's owner-only check is keyed on this field,
-        and defaulting it to character_id (the pseudo-character) would
-        403 the finish and leave the lock until stale recovery.
-        """
-        task_metadata: Dict[str, Any] = {}
-        try:
-            character_id, actor_character_id, _task_id = self._broker_identity_for_message(
-                msg,
-                task_id=msg.task_id,
-            )
-            if actor_character_id:
-                task_metadata["actor_character_id"] = actor_character_id
-            if msg.ship_id:
-                task_metadata["ship_id"] = msg.ship_id
-            await self._game_client.task_lifecycle(
-                character_id=character_id,
-                task_id=msg.task_id,
-                event_type="finish",
-                task_status=msg.status,
-                task_summary=msg.summary,
-                task_metadata=task_metadata or None,
-            )
-        except Exception as exc:
-            # Task is already done from the agent's POV; log and move on.
-            logger.warning(f"broker task_finish failed for {msg.task_id[:8]}: {exc}")
-
     # ── Task output handling ───────────────────────────────────────────
 
     async def _task_output_handler(
@@ -3639,6 +3451,9 @@ class Orchestrator:
 
     async def close(self) -> None:
         """Tear down session-owned resources."""
+        if self.session_cache is not None:
+            logger.info("session_cache.stats {}", self.session_cache.stats())
+        logger.info("byoa.owner_cache.stats {}", self._byoa.owner_cache_stats())
         if self.event_relay is not None:
             try:
                 await self.event_relay.close()
@@ -0,0 +1,283 @@
+"""Session-scoped cache shared by the UI agent, voice tools and client messages.
+
+One :class:`SessionCache` per voice session holds the answers several
+consumers used to fetch independently: ``ports.list``, ``course.plot`` and
+``ships.list`` events and ``local_map_region`` results. Entries are
+namespaced, each namespace has its own TTL, and the game events that change
+the underlying data drop them explicitly:
+
+- ``trade.executed`` changes port stock and the ship's cargo and credits.
+- ``port.update`` changes ports.
+- Ship purchases, sales, trade-ins, renames and destruction change ships.
+- ``movement.complete`` changes the origin of port searches, the visited
+  map and where the ship is.
+
+Course plots only depend on the universe's warps, so they expire by age.
+
+Only replies addressed to the session's own character (the event context's
+``character_id``) are stored; a corporation ship's task asking for ports or
+a course gets replies addressed to the ship, and those are left alone. :meth:`SessionCache.stats`
+reports hits, misses and invalidations per namespace for tuning the TTLs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional
+
+from gradientbang.config import settings
+from gradientbang.utils.event_ordering import extract_event_context
+
+PORTS_LIST = "ports.list"
+COURSE_PLOT = "course.plot"
+SHIPS_LIST = "ships.list"
+MAP_REGION = "map.region"
+
+DEFAULT_MAX_ENTRIES = 64
+# list_known_ports defaults (deployment/supabase/functions/list_known_ports).
+PORTS_LIST_DEFAULT_MAX_HOPS = 5
+PORTS_LIST_MAX_HOPS_LIMIT = 100
+
+_STORED_EVENTS = (PORTS_LIST, COURSE_PLOT, SHIPS_LIST)
+_SHIP_EVENTS = (
+    "ship.purchased",
+    "ship.traded_in",
+    "ship.renamed",
+    "ship.destroyed",
+    "corporation.ship_purchased",
+    "corporation.ship_sold",
+    "corporation.ships_abandoned",
+)
+INVALIDATIONS: Dict[str, tuple[str, ...]] = {
+    "trade.executed": (PORTS_LIST, SHIPS_LIST),
+    "port.update": (PORTS_LIST,),
+    "movement.complete": (PORTS_LIST, SHIPS_LIST, MAP_REGION),
+    "map.update": (MAP_REGION,),
+    **{event_name: (SHIPS_LIST,) for event_name in _SHIP_EVENTS},
+}
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: Any
+    stored_at: float
+
+
+class SessionCache:
+    """Namespaced TTL cache for one session, invalidated by game events."""
+
+    def __init__(
+        self,
+        *,
+        ttls: Mapping[str, float],
+        character_id: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttls = dict(ttls)
+        self.character_id = character_id
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[str, OrderedDict[Hashable, CacheEntry]] = {}
+        # Bumped on every invalidation so a fetch that raced one is not stored.
+        self._generations: Counter[str] = Counter()
+        self._inflight: Dict[tuple[str, Hashable], asyncio.Future] = {}
+        self._game_client: Any = None
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.invalidations: Counter[str] = Counter()
+
+    @classmethod
+    def from_settings(cls, *, character_id: Optional[str] = None) -> "SessionCache":
+        return cls(
+            ttls={
+                PORTS_LIST: settings.UI_AGENT_PORTS_LIST_STALE_SECS,
+                SHIPS_LIST: settings.UI_AGENT_SHIPS_CACHE_TTL_SECS,
+                COURSE_PLOT: settings.SESSION_CACHE_COURSE_PLOT_TTL_SECS,
+                MAP_REGION: settings.SESSION_CACHE_MAP_TTL_SECS,
+            },
+            character_id=character_id,
+        )
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def ttl(self, namespace: str) -> float:
+        return max(0.0, float(self.ttls.get(namespace, 0.0)))
+
+    def get_entry(
+        self,
+        namespace: str,
+        key: Hashable = None,
+        *,
+        allow_stale: bool = False,
+    ) -> Optional[CacheEntry]:
+        """Return the entry for ``key``; expired entries only with ``allow_stale``.
+
+        Stale reads are for callers that report an entry's age themselves and
+        are not counted in the stats.
+        """
+        entry = self._entries.get(namespace, {}).get(key)
+        if allow_stale:
+            return entry
+        if entry is None or self._clock() - entry.stored_at > self.ttl(namespace):
+            self.misses[namespace] += 1
+            return None
+        self.hits[namespace] += 1
+        return entry
+
+    def get(self, namespace: str, key: Hashable = None) -> Any:
+        entry = self.get_entry(namespace, key)
+        return None if entry is None else entry.value
+
+    def put(self, namespace: str, key: Hashable, value: Any) -> None:
+        entries = self._entries.setdefault(namespace, OrderedDict())
+        entries[key] = CacheEntry(value, self._clock())
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop one namespace, or everything when ``namespace`` is None."""
+        if namespace is None:
+            namespaces = set(self._entries) | {name for name, _ in self._inflight}
+        else:
+            namespaces = {namespace}
+        for name in namespaces:
+            self._generations[name] += 1
+            if self._entries.pop(name, None):
+                self.invalidations[name] += 1
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached value or fetch it, sharing one fetch between callers.
+
+        The fetch runs as its own task, so cancelling the caller that started
+        it does not cancel it for the others. A result whose namespace was
+        invalidated while it was being fetched is returned to its callers but
+        not stored.
+        """
+        entry = self.get_entry(namespace, key)
+        if entry is not None:
+            return entry.value
+        task = self._inflight.get((namespace, key))
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_and_store(namespace, key, fetch, self._generations[namespace])
+            )
+            # Callers re-raise a failure; don't log "exception never retrieved"
+            # when every caller has gone away.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[(namespace, key)] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self,
+        namespace: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        generation: int,
+    ) -> Any:
+        try:
+            value = await fetch()
+        finally:
+            self._inflight.pop((namespace, key), None)
+        if generation == self._generations[namespace]:
+            self.put(namespace, key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "invalidations": dict(self.invalidations),
+            "entries": {name: len(entries) for name, entries in self._entries.items() if entries},
+        }
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def ports_list_key(self, filters: Mapping[str, Any]) -> tuple:
+        """Key a ports.list query the way the server resolves its arguments.
+
+        Event payloads carry the resolved ``from_sector`` and ``max_hops``, so
+        request arguments that leave them out are filled in the same way.
+        """
+        mega = filters.get("mega")
+        from_sector = filters.get("from_sector")
+        if from_sector is None and self._game_client is not None:
+            from_sector = getattr(self._game_client, "_current_sector", None)
+        max_hops = filters.get("max_hops")
+        if max_hops is None:
+            max_hops = PORTS_LIST_MAX_HOPS_LIMIT if mega is True else PORTS_LIST_DEFAULT_MAX_HOPS
+        port_type = filters.get("port_type")
+        return (
+            mega,
+            port_type.upper() if isinstance(port_type, str) else port_type,
+            filters.get("commodity"),
+            filters.get("trade_type"),
+            from_sector,
+            max_hops,
+        )
+
+    # ------------------------------------------------------------------
+    # Event stream
+    # ------------------------------------------------------------------
+
+    def attach(self, game_client: Any) -> "SessionCache":
+        """Store and invalidate from ``game_client``'s events."""
+        self._game_client = game_client
+        if self.character_id is None:
+            self.character_id = getattr(game_client, "character_id", None)
+        for event_name in _STORED_EVENTS:
+            game_client.add_event_handler(event_name, self._on_answer_event)
+        for event_name in INVALIDATIONS:
+            game_client.add_event_handler(event_name, self._on_invalidating_event)
+        return self
+
+    def _on_answer_event(self, event_message: Dict[str, Any]) -> None:
+        event_name = event_message.get("event_name")
+        payload = event_message.get("payload", event_message)
+        if not isinstance(payload, dict) or not self._is_own(event_message):
+            return
+        if event_name == PORTS_LIST:
+            self.put(PORTS_LIST, self.ports_list_key(payload), event_message)
+        elif event_name == COURSE_PLOT:
+            from_sector = payload.get("from_sector")
+            to_sector = payload.get("to_sector")
+            if isinstance(from_sector, int) and isinstance(to_sector, int):
+                self.put(COURSE_PLOT, (from_sector, to_sector), event_message)
+        elif event_name == SHIPS_LIST and isinstance(payload.get("ships"), list):
+            self.put(SHIPS_LIST, None, event_message)
+
+    def _on_invalidating_event(self, event_message: Dict[str, Any]) -> None:
+        event_name = event_message.get("event_name")
+        for namespace in INVALIDATIONS.get(event_name, ()):
+            self.invalidate(namespace)
+
+    def _is_own(self, event_message: Mapping[str, Any]) -> bool:
+        # ports.list and course.plot carry no player block; the event context
+        # names the character the reply was addressed to.
+        ctx = extract_event_context(event_message)
+        addressee = ctx.get("character_id") if ctx is not None else None
+        return not (self.character_id and addressee and addressee != self.character_id)
+
+
+__all__ = [
+    "COURSE_PLOT",
+    "INVALIDATIONS",
+    "MAP_REGION",
+    "PORTS_LIST",
+    "SHIPS_LIST",
+    "CacheEntry",
+    "SessionCache",
+]
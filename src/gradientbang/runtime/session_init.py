@@ -1,9 +1,11 @@
 """Session bootstrap.
 
 Owns the bot's startup data-gathering flow: the explicit RPCs that build
-the voice runtime's initial LLM context. Runs as a strict sequence after the
-client connects, before the first inference. Failures bubble up — the
-bot bails rather than half-joining.
+the voice runtime's initial LLM context. Runs after the client connects,
+before the first inference: ``join`` first, then the independent ships,
+quest and mega-port lookups concurrently. A failed ``join`` bubbles up — the
+bot bails rather than half-joining. The later lookups are best-effort: one
+that fails or times out is logged and left out of the context.
 
 Contract with the rest of the bot:
 - ``gather_initial_state`` returns an :class:`InitialState` with everything
@@ -16,15 +18,20 @@ Contract with the rest of the bot:
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Mapping, Optional
+from typing import Any, Awaitable, Dict, List, Mapping, Optional
 
 from loguru import logger
 
 from gradientbang.game.client import AsyncGameClient
 from gradientbang.utils.prompt_loader import load_prompt
 
+# Upper bound on each post-join bootstrap RPC; they run concurrently, so this
+# also bounds how long they add to time-to-first-word.
+BOOTSTRAP_RPC_TIMEOUT = 10.0
+
 
 @dataclass
 class InitialState:
@@ -94,19 +101,34 @@ def _build_onboarding_xml(
     return f'<event name="onboarding">\n{content}</event>'
 
 
+async def _optional_rpc(name: str, call: Awaitable[Any], timeout: float) -> Any:
+    """Await a best-effort bootstrap RPC; ``None`` if it fails or times out."""
+    try:
+        return await asyncio.wait_for(call, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"session_init: {name} timed out after {timeout:g}s; continuing without it")
+    except Exception as exc:
+        logger.warning(f"session_init: {name} failed; continuing without it: {exc}")
+    return None
+
+
 async def gather_initial_state(
     *,
     game_client: AsyncGameClient,
     character_id: str,
     character_display_name: str,
     new_player_onboarding_enabled: bool = True,
+    rpc_timeout: float = BOOTSTRAP_RPC_TIMEOUT,
 ) -> InitialState:
     """Fetch initial state via blocking RPCs and assemble user messages
     for the LLM context.
 
     Each RPC returns its result inline (the matching events still emit
     for any other subscribers — UI, BYOAs — via the event channel).
-    Failures raise; the caller is expected to bail the session.
+    A ``join`` failure raises; the caller is expected to bail the session.
+    The lookups after it run concurrently, each bounded by ``rpc_timeout``;
+    any that fail are omitted, and a missing mega-port list means the
+    player is not treated as new.
     """
     session_started_at = datetime.now(timezone.utc).isoformat()
 
@@ -127,10 +149,22 @@ async def gather_initial_state(
     display_name = _extract_display_name(status_payload, character_display_name)
     universe_size, fedspace_sector_count = _extract_universe_info(status_payload)
 
-    ships_result = await game_client.list_user_ships(character_id=character_id)
-    quest_result = await game_client.quest_status(character_id=character_id)
-    ports_result = await game_client.list_known_ports(
-        character_id=character_id, mega=True, max_hops=100
+    ships_result, quest_result, ports_result = await asyncio.gather(
+        _optional_rpc(
+            "list_user_ships",
+            game_client.list_user_ships(character_id=character_id),
+            rpc_timeout,
+        ),
+        _optional_rpc(
+            "quest_status",
+            game_client.quest_status(character_id=character_id),
+            rpc_timeout,
+        ),
+        _optional_rpc(
+            "list_known_ports",
+            game_client.list_known_ports(character_id=character_id, mega=True, max_hops=100),
+            rpc_timeout,
+        ),
     )
 
     is_new_player = _is_new_player(ports_result)
@@ -148,6 +182,8 @@ async def gather_initial_state(
         ("map.local", map_local_payload),
         ("quest.status", quest_result),
     ):
+        if payload is None:
+            continue
         summary = game_client._get_summary(event_name, payload)
         if summary:
             initial_messages.append(
@@ -43,6 +43,13 @@ from pipecat.services.llm_service import FunctionCallParams
 
 from gradientbang.config import settings
 from gradientbang.runtime.inference_gate import PreLLMInferenceGate
+from gradientbang.runtime.session_cache import (
+    COURSE_PLOT,
+    PORTS_LIST,
+    SHIPS_LIST,
+    CacheEntry,
+    SessionCache,
+)
 from gradientbang.runtime.tool_schema import CORPORATION_INFO, MY_STATUS
 from gradientbang.utils.llm_factory import create_llm_service, get_ui_agent_llm_config
 from gradientbang.utils.prompt_loader import build_ui_agent_prompt
@@ -171,7 +178,6 @@ UI_AGENT_TOOLS = ToolsSchema(
 
 _CONTEXT_SUMMARY_RE = re.compile(r"<context_summary>(.*?)</context_summary>", re.DOTALL)
 
-DEFAULT_COURSE_PLOT_CACHE_TTL_SECS = 300
 DEFAULT_PORTS_LIST_MAX_HOPS = 100
 
 
@@ -193,23 +199,26 @@ class PendingIntent:
 class UIAgentContext(FrameProcessor):
     """Catches LLMContextFrame from main pipeline, builds fresh context, pushes to LLM."""
 
-    def __init__(self, config, rtvi, game_client) -> None:
+    def __init__(
+        self,
+        config,
+        rtvi,
+        game_client,
+        session_cache: SessionCache | None = None,
+    ) -> None:
         super().__init__()
         self._config = config
         self._rtvi = rtvi
         self._game_client = game_client
+        # Ports, ships and course plots are shared with the voice tools; a
+        # standalone agent keeps its own cache fed by the same events.
+        self._session_cache = session_cache or SessionCache.from_settings().attach(game_client)
         self._context_summary: str = ""
-        self._cached_ships: list[dict] = []
-        self._cached_ships_at: float | None = None
-        self._cached_ships_source_ts: str | None = None
-        self._cached_ships_source_epoch: float | None = None
-        self._cached_ships_event_message: dict | None = None
         self._last_run_message_count = 0
         self._pending_rerun = False
         self._inference_lock = asyncio.Lock()
         self._inference_inflight = False
         self._context: Optional[Any] = None  # main pipeline LLMContext reference
-        self._ships_cache_ttl_secs = self._read_ships_cache_ttl()
 
         # control_ui dedup state
         self._last_show_panel: str | None = None
@@ -237,15 +246,9 @@ class UIAgentContext(FrameProcessor):
         self._ports_list_timeout_secs = settings.UI_AGENT_PORTS_LIST_TIMEOUT_SECS
         self._ships_list_timeout_secs = settings.UI_AGENT_SHIPS_LIST_TIMEOUT_SECS
         self._course_plot_timeout_secs = settings.UI_AGENT_COURSE_PLOT_TIMEOUT_SECS
-        self._ports_list_stale_secs = settings.UI_AGENT_PORTS_LIST_STALE_SECS
         self._intent_request_delay_secs = settings.UI_AGENT_INTENT_REQUEST_DELAY_SECS
         self._pending_intents: dict[str, PendingIntent] = {}
         self._pending_intent_id = 0
-        self._ports_list_cache: dict[tuple, dict] = {}
-        self._ports_list_cache_seen_at: dict[tuple, float] = {}
-        self._course_plot_cache: dict[tuple[int, int], dict] = {}
-        self._course_plot_cache_seen_at: dict[tuple[int, int], float] = {}
-        self._course_plot_cache_ttl_secs = DEFAULT_COURSE_PLOT_CACHE_TTL_SECS
         self._missing_user_warning_at: float | None = None
         self._pending_intent_inference_requested = False
 
@@ -277,31 +280,8 @@ class UIAgentContext(FrameProcessor):
 
     # ── Ships cache ───────────────────────────────────────────────────
 
-    @staticmethod
-    def _read_ships_cache_ttl() -> int:
-        return max(0, int(settings.UI_AGENT_SHIPS_CACHE_TTL_SECS))
-
     async def _on_ships_list(self, event_message: dict) -> None:
-        payload = event_message.get("payload", event_message)
-        if not isinstance(payload, dict):
-            return
-        ships = payload.get("ships")
-        if isinstance(ships, list):
-            self._cached_ships = ships
-            self._cached_ships_at = time.time()
-            self._cached_ships_source_ts = None
-            self._cached_ships_source_epoch = None
-            self._cached_ships_event_message = event_message
-
-            source = payload.get("source")
-            if isinstance(source, dict):
-                timestamp = source.get("timestamp")
-                if isinstance(timestamp, str) and timestamp.strip():
-                    parsed_epoch = self._parse_timestamp(timestamp)
-                    if parsed_epoch is not None:
-                        self._cached_ships_source_ts = timestamp
-                        self._cached_ships_source_epoch = parsed_epoch
-
+        # The session cache stores the list; only pending intents are handled here.
         await self._handle_ships_list_intent(event_message)
 
     @staticmethod
@@ -312,18 +292,33 @@ class UIAgentContext(FrameProcessor):
         except Exception:
             return None
 
-    def _ships_cache_age(self) -> float | None:
-        if self._cached_ships_at is None:
+    @staticmethod
+    def _ships_source_timestamp(entry: CacheEntry) -> str | None:
+        payload = entry.value.get("payload", entry.value)
+        source = payload.get("source") if isinstance(payload, dict) else None
+        if isinstance(source, dict):
+            timestamp = source.get("timestamp")
+            if isinstance(timestamp, str) and timestamp.strip():
+                return timestamp
+        return None
+
+    def _ships_cache_age(self, entry: CacheEntry | None) -> float | None:
+        if entry is None:
             return None
-        now = time.time()
-        reference = self._cached_ships_source_epoch or self._cached_ships_at
-        return max(0.0, now - reference)
+        timestamp = self._ships_source_timestamp(entry)
+        source_epoch = self._parse_timestamp(timestamp) if timestamp else None
+        reference = source_epoch or entry.stored_at
+        return max(0.0, time.time() - reference)
 
-    def _ships_cache_is_fresh(self) -> bool:
-        age = self._ships_cache_age()
+    def _ships_cache_is_fresh(self, entry: CacheEntry | None) -> bool:
+        age = self._ships_cache_age(entry)
         if age is None:
             return False
-        return age <= self._ships_cache_ttl_secs
+        return age <= self._session_cache.ttl(SHIPS_LIST)
+
+    def _get_fresh_ships_event(self) -> dict | None:
+        entry = self._session_cache.get_entry(SHIPS_LIST)
+        return entry.value if self._ships_cache_is_fresh(entry) else None
 
     # ── Frame processing ──────────────────────────────────────────────
 
@@ -652,83 +647,24 @@ class UIAgentContext(FrameProcessor):
                 return False
         return True
 
-    @staticmethod
-    def _ports_list_signature(filters: dict) -> tuple:
-        return (
-            filters.get("mega"),
-            filters.get("port_type"),
-            filters.get("commodity"),
-            filters.get("trade_type"),
-            filters.get("from_sector"),
-            filters.get("max_hops"),
-        )
-
-    def _cache_ports_list_event(self, event_message: dict) -> None:
-        payload = event_message.get("payload", event_message)
-        if not isinstance(payload, dict):
-            return
-        self._prune_ports_list_cache()
-        signature = self._ports_list_signature(payload)
-        self._ports_list_cache[signature] = event_message
-        self._ports_list_cache_seen_at[signature] = time.time()
-
-    def _prune_ports_list_cache(self, now: float | None = None) -> None:
-        if self._ports_list_stale_secs <= 0:
-            self._ports_list_cache.clear()
-            self._ports_list_cache_seen_at.clear()
-            return
-        now = time.time() if now is None else now
-        cutoff = now - self._ports_list_stale_secs
-        for signature, seen_at in list(self._ports_list_cache_seen_at.items()):
-            if seen_at < cutoff:
-                self._ports_list_cache_seen_at.pop(signature, None)
-                self._ports_list_cache.pop(signature, None)
-
     def _get_cached_ports_list_event(self, filters: dict) -> dict | None:
-        self._prune_ports_list_cache()
-        signature = self._ports_list_signature(filters)
-        seen_at = self._ports_list_cache_seen_at.get(signature)
-        if seen_at is None:
-            return None
-        age = max(0.0, time.time() - seen_at)
-        if age > self._ports_list_stale_secs:
-            return None
-        return self._ports_list_cache.get(signature)
-
-    def _prune_course_plot_cache(self, now: float | None = None) -> None:
-        if self._course_plot_cache_ttl_secs <= 0:
-            self._course_plot_cache.clear()
-            self._course_plot_cache_seen_at.clear()
-            return
-        now = time.time() if now is None else now
-        cutoff = now - self._course_plot_cache_ttl_secs
-        for signature, seen_at in list(self._course_plot_cache_seen_at.items()):
-            if seen_at < cutoff:
-                self._course_plot_cache_seen_at.pop(signature, None)
-                self._course_plot_cache.pop(signature, None)
-
-    def _cache_course_plot_event(self, event_message: dict) -> None:
-        payload = event_message.get("payload", event_message)
-        if not isinstance(payload, dict):
-            return
-        from_sector = payload.get("from_sector")
-        to_sector = payload.get("to_sector")
-        if not isinstance(from_sector, int) or not isinstance(to_sector, int):
-            return
-        signature = (from_sector, to_sector)
-        self._prune_course_plot_cache()
-        self._course_plot_cache[signature] = event_message
-        self._course_plot_cache_seen_at[signature] = time.time()
+        # Key by the arguments _delayed_ports_list_request would send.
+        request_filters = {
+            **filters,
+            "max_hops": filters.get("max_hops") or DEFAULT_PORTS_LIST_MAX_HOPS,
+        }
+        return self._session_cache.get(
+            PORTS_LIST, self._session_cache.ports_list_key(request_filters)
+        )
 
     def _get_cached_course_plot_event(
         self,
         from_sector: int | None,
         to_sector: int | None,
     ) -> dict | None:
-        self._prune_course_plot_cache()
         if not (isinstance(from_sector, int) and isinstance(to_sector, int)):
             return None
-        return self._course_plot_cache.get((from_sector, to_sector))
+        return self._session_cache.get(COURSE_PLOT, (from_sector, to_sector))
 
     async def _delayed_ports_list_request(self, intent_id: int, filters: dict) -> None:
         try:
@@ -767,7 +703,7 @@ class UIAgentContext(FrameProcessor):
             intent = self._pending_intents.get("ships.list")
             if not intent or intent.id != intent_id:
                 return
-            if self._ships_cache_is_fresh():
+            if self._get_fresh_ships_event() is not None:
                 return
             await self._game_client.list_user_ships(
                 character_id=self._game_client.character_id,
@@ -791,8 +727,6 @@ class UIAgentContext(FrameProcessor):
         if not isinstance(payload, dict):
             return
 
-        self._cache_ports_list_event(event_message)
-
         intent = self._pending_intents.get("ports.list")
         if not intent:
             return
@@ -849,7 +783,6 @@ class UIAgentContext(FrameProcessor):
         payload = event_message.get("payload", event_message)
         if not isinstance(payload, dict):
             return
-        self._cache_course_plot_event(event_message)
 
         intent = self._pending_intents.get("course.plot")
         if not intent:
@@ -1163,8 +1096,9 @@ class UIAgentContext(FrameProcessor):
     _SHIPS_SUMMARY_KEYS = ("ship_name", "sector", "owner_type")
 
     def _format_ships_block(self) -> str:
-        if not self._ships_cache_is_fresh():
-            age = self._ships_cache_age()
+        entry = self._session_cache.get_entry(SHIPS_LIST, allow_stale=True)
+        if not self._ships_cache_is_fresh(entry):
+            age = self._ships_cache_age(entry)
             age_str = f"{age:.1f}s" if age is not None else "unknown"
             return (
                 "Recent ships list: (stale or unavailable)\n"
@@ -1172,15 +1106,16 @@ class UIAgentContext(FrameProcessor):
             )
 
         metadata = []
-        if self._cached_ships_source_ts:
-            metadata.append(f"source timestamp: {self._cached_ships_source_ts}")
-        age = self._ships_cache_age()
+        source_ts = self._ships_source_timestamp(entry)
+        if source_ts and self._parse_timestamp(source_ts) is not None:
+            metadata.append(f"source timestamp: {source_ts}")
+        age = self._ships_cache_age(entry)
         if age is not None:
             metadata.append(f"age: {age:.1f}s")
         meta_line = f"({', '.join(metadata)})" if metadata else ""
         summary = [
             {k: ship[k] for k in self._SHIPS_SUMMARY_KEYS if k in ship}
-            for ship in self._cached_ships
+            for ship in entry.value.get("payload", entry.value).get("ships", [])
         ]
         try:
             ships_json = json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
@@ -1315,14 +1250,8 @@ class UIAgentContext(FrameProcessor):
                     replace_existing=replace_existing,
                     request_factory=_ships_request_factory,
                 )
-                if self._ships_cache_is_fresh():
-                    cached_event = self._cached_ships_event_message
-                    if cached_event is None:
-                        payload = {"ships": list(self._cached_ships)}
-                        expected_player_id = getattr(self._game_client, "character_id", None)
-                        if expected_player_id:
-                            payload["player"] = {"id": expected_player_id}
-                        cached_event = {"event_name": "ships.list", "payload": payload}
+                cached_event = self._get_fresh_ships_event()
+                if cached_event is not None:
                     await self._handle_ships_list_intent(cached_event)
 
             else:
@@ -1882,9 +1811,17 @@ class UIAgent:
         self._branch: list[FrameProcessor] = [context, llm, collector]
 
     @classmethod
-    def create(cls, *, rtvi: Any, game_client: Any) -> "UIAgent":
+    def create(
+        cls,
+        *,
+        rtvi: Any,
+        game_client: Any,
+        session_cache: SessionCache | None = None,
+    ) -> "UIAgent":
         config = get_ui_agent_llm_config()
-        context = UIAgentContext(config=config, rtvi=rtvi, game_client=game_client)
+        context = UIAgentContext(
+            config=config, rtvi=rtvi, game_client=game_client, session_cache=session_cache
+        )
         llm = create_llm_service(config)
         collector = UIAgentResponseCollector(context=context)
         agent = cls(context=context, llm=llm, collector=collector)
@@ -0,0 +1,267 @@
+"""Per-session task history for the task panel.
+
+The panel used to run two 30-day ``event_query`` scans (task starts and task
+finishes) on every open. :class:`TaskHistory` scans once per character (the
+player, or a ship the player asks about), keeps the result as an index of
+tasks, and keeps the index current from the ``task.start`` / ``task.finish``
+events the session already receives. Panel requests are pages of that index.
+
+Pages use keyset cursors (the start time and id of the last task shown), so
+tasks that start while the client is paging do not shift or repeat rows.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+HISTORY_DAYS = 30
+DEFAULT_MAX_TASKS = 500
+QUERY_PAGE_ROWS = 100
+
+_SortKey = Tuple[float, str]
+
+
+def _epoch(timestamp: Any) -> float:
+    if not isinstance(timestamp, str) or not timestamp:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def encode_cursor(key: _SortKey) -> str:
+    return f"{key[0]:.6f}|{key[1]}"
+
+
+def decode_cursor(cursor: str) -> _SortKey:
+    started, _, task_id = cursor.partition("|")
+    try:
+        return float(started), task_id
+    except ValueError:
+        raise ValueError(f"Invalid task history cursor: {cursor!r}") from None
+
+
+def _task_row(
+    task_id: str,
+    start: Tuple[Optional[str], Mapping[str, Any]],
+    finish: Optional[Tuple[Optional[str], Mapping[str, Any]]],
+) -> Dict[str, Any]:
+    """The task panel's row for one task, from its start and finish events."""
+    started, start_payload = start
+    ended, finish_payload = finish if finish else (None, {})
+    end_summary = None
+    end_status = None
+    if finish:
+        end_summary = (
+            finish_payload.get("task_summary")
+            or finish_payload.get("summary")
+            or finish_payload.get("result")
+        )
+        end_status = finish_payload.get("task_status")
+    return {
+        "task_id": task_id,
+        "started": started,
+        "ended": ended,
+        "start_instructions": start_payload.get("task_description")
+        or start_payload.get("instructions")
+        or "",
+        "end_summary": end_summary,
+        "end_status": end_status,
+        "actor_character_id": start_payload.get("actor_character_id"),
+        "actor_character_name": start_payload.get("actor_character_name"),
+        "task_scope": start_payload.get("task_scope"),
+        "ship_id": start_payload.get("ship_id"),
+        "ship_name": start_payload.get("ship_name"),
+        "ship_type": start_payload.get("ship_type"),
+    }
+
+
+class TaskHistoryIndex:
+    """Known tasks of one character, newest first, bounded to ``max_tasks``."""
+
+    def __init__(self, *, max_tasks: int = DEFAULT_MAX_TASKS) -> None:
+        self.max_tasks = max_tasks
+        self.seeded = False
+        self._starts: Dict[str, Tuple[Optional[str], Mapping[str, Any]]] = {}
+        self._finishes: Dict[str, Tuple[Optional[str], Mapping[str, Any]]] = {}
+        # Ascending by (start time, task id); pages read it from the end.
+        self._order: List[_SortKey] = []
+        self._seed_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add_start(self, task_id: str, timestamp: Optional[str], payload: Mapping[str, Any]) -> None:
+        if task_id in self._starts:
+            return
+        key = (_epoch(timestamp), task_id)
+        if len(self._order) >= self.max_tasks and key < self._order[0]:
+            return
+        self._starts[task_id] = (timestamp, payload)
+        insort(self._order, key)
+        while len(self._order) > self.max_tasks:
+            _, oldest = self._order.pop(0)
+            self._starts.pop(oldest, None)
+            self._finishes.pop(oldest, None)
+
+    def add_finish(
+        self, task_id: str, timestamp: Optional[str], payload: Mapping[str, Any]
+    ) -> None:
+        self._finishes[task_id] = (timestamp, payload)
+        # Finishes whose start is older than the index are not kept for long.
+        if len(self._finishes) > 2 * self.max_tasks:
+            for orphan in [t for t in self._finishes if t not in self._starts]:
+                del self._finishes[orphan]
+
+    def page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return up to ``limit`` tasks older than ``cursor`` and the next cursor."""
+        end = len(self._order)
+        if cursor:
+            end = bisect_left(self._order, decode_cursor(cursor))
+        start = max(0, end - max(0, limit))
+        keys = self._order[start:end][::-1]
+        tasks = [
+            _task_row(task_id, self._starts[task_id], self._finishes.get(task_id))
+            for _, task_id in keys
+        ]
+        next_cursor = encode_cursor(keys[-1]) if keys and start > 0 else None
+        return tasks, next_cursor
+
+
+class TaskHistory:
+    """Task history indexes for one session, kept current by task events."""
+
+    def __init__(
+        self,
+        game_client: Any,
+        character_id: str,
+        *,
+        max_tasks: int = DEFAULT_MAX_TASKS,
+        history_days: int = HISTORY_DAYS,
+    ) -> None:
+        self._game_client = game_client
+        self._character_id = character_id
+        self.max_tasks = max_tasks
+        self.history_days = history_days
+        self._indexes: Dict[str, TaskHistoryIndex] = {}
+
+    def attach(self) -> "TaskHistory":
+        self._game_client.add_event_handler("task.start", self._on_task_event)
+        self._game_client.add_event_handler("task.finish", self._on_task_event)
+        return self
+
+    async def page(
+        self,
+        target_character: Optional[str] = None,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """A ``task.history`` payload: one page of tasks, newest first."""
+        index = await self._seeded_index(target_character or self._character_id)
+        tasks, next_cursor = index.page(limit, cursor)
+        return {
+            "tasks": tasks,
+            "total_count": len(tasks),
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+        }
+
+    async def _seeded_index(self, target_character: str) -> TaskHistoryIndex:
+        # Created before seeding so events that arrive meanwhile are kept.
+        index = self._indexes.get(target_character)
+        if index is None:
+            index = self._indexes[target_character] = TaskHistoryIndex(max_tasks=self.max_tasks)
+        if index.seeded:
+            return index
+        async with index._seed_lock:
+            if not index.seeded:
+                await self._seed(index, target_character)
+                index.seeded = True
+        return index
+
+    async def _seed(self, index: TaskHistoryIndex, target_character: str) -> None:
+        end_time = datetime.now(timezone.utc)
+        start_time = end_time - timedelta(days=self.history_days)
+        starts, finishes = await asyncio.gather(
+            self._scan(target_character, "task.start", start_time, end_time),
+            self._scan(target_character, "task.finish", start_time, end_time),
+        )
+        for event in finishes:
+            task_id = event.get("task_id") or event.get("payload", {}).get("task_id")
+            if task_id:
+                index.add_finish(task_id, event.get("timestamp"), event.get("payload", {}))
+        for event in starts:
+            task_id = event.get("task_id") or event.get("payload", {}).get("task_id")
+            if task_id:
+                index.add_start(task_id, event.get("timestamp"), event.get("payload", {}))
+        logger.info(
+            "task_history.seeded character_id={} tasks={} start_rows={} finish_rows={}",
+            target_character,
+            len(index),
+            len(starts),
+            len(finishes),
+        )
+
+    async def _scan(
+        self,
+        target_character: str,
+        event_type: str,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> List[Dict[str, Any]]:
+        """Page through one event type, newest first, up to ``max_tasks`` rows."""
+        events: List[Dict[str, Any]] = []
+        cursor = None
+        while len(events) < self.max_tasks:
+            result = await self._game_client.event_query(
+                start=start_time.isoformat(),
+                end=end_time.isoformat(),
+                character_id=target_character,
+                filter_event_type=event_type,
+                max_rows=min(QUERY_PAGE_ROWS, self.max_tasks - len(events)),
+                sort_direction="reverse",
+                cursor=cursor,
+            )
+            events.extend(result.get("events", []))
+            cursor = result.get("next_cursor")
+            if not result.get("has_more") or cursor is None:
+                break
+        return events
+
+    def _on_task_event(self, event_message: Dict[str, Any]) -> None:
+        payload = event_message.get("payload", event_message)
+        if not isinstance(payload, dict):
+            return
+        task_id = payload.get("task_id")
+        if not isinstance(task_id, str) or not task_id:
+            return
+        source = payload.get("source")
+        timestamp = source.get("timestamp") if isinstance(source, dict) else None
+        if not isinstance(timestamp, str):
+            timestamp = datetime.now(timezone.utc).isoformat()
+        # Every task event reaches the player; ship indexes keep their ship's.
+        for target_character, index in self._indexes.items():
+            if (
+                target_character != self._character_id
+                and payload.get("ship_id") != target_character
+            ):
+                continue
+            if event_message.get("event_name") == "task.finish":
+                index.add_finish(task_id, timestamp, payload)
+            else:
+                index.add_start(task_id, timestamp, payload)
+
+
+__all__ = ["TaskHistory", "TaskHistoryIndex", "decode_cursor", "encode_cursor"]
@@ -6,8 +6,11 @@ Loads quest definitions into Supabase tables:
 - quest_step_definitions
 - quest_event_subscriptions
 
-Each JSON file represents one quest. The loader upserts by quest code,
-so it is safe to re-run after editing quest data.
+Each JSON file represents one quest. The loader reads the existing rows for
+the quests it is about to load, computes a diff, and applies only the changes
+with bulk upserts/deletes -- one request per table per batch of quests rather
+than one per step. Steps are keyed by (quest_id, step_index) so existing step
+UUIDs, and therefore player progress, survive a reload.
 
 Usage:
     # Load quest JSON files from GRADIENTBANG_QUEST_DATA_DIR (default: data/quests)
@@ -16,18 +19,230 @@ Usage:
     # Force reload (delete all quest definitions and re-insert)
     uv run -m gradientbang.scripts.load_quests_to_supabase --force
 
-    # Offline validation
+    # Diff report without writing (offline validation when no credentials are set)
     uv run -m gradientbang.scripts.load_quests_to_supabase --dry-run
+
+    # Many quest files: 50 quests per batch, 4 batches in flight
+    uv run -m gradientbang.scripts.load_quests_to_supabase --batch-size 50 --jobs 4
 """
 
 import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
 
 from supabase import Client, create_client
 
+QUEST_COLUMNS = (
+    "code",
+    "name",
+    "description",
+    "assign_on_creation",
+    "is_repeatable",
+    "enabled",
+    "meta",
+)
+STEP_COLUMNS = (
+    "step_index",
+    "name",
+    "description",
+    "eval_type",
+    "event_types",
+    "target_value",
+    "payload_filter",
+    "aggregate_field",
+    "unique_field",
+    "enabled",
+    "meta",
+    "reward_credits",
+)
+DEFAULT_BATCH_SIZE = 100
+# Upper bound on ids per ``in.(...)`` filter so request URLs stay well clear of
+# PostgREST/proxy URL length limits.
+FILTER_CHUNK_SIZE = 200
+PAGE_SIZE = 1000  # Rows per page when fetching (PostgREST max_rows default is 1000)
+
+
+def quest_row(quest: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the quest_definitions row for a quest JSON document."""
+    return {
+        "code": quest["code"],
+        "name": quest["name"],
+        "description": quest.get("description"),
+        "assign_on_creation": quest.get("assign_on_creation", False),
+        "is_repeatable": quest.get("is_repeatable", False),
+        "enabled": quest.get("enabled", True),
+        "meta": quest.get("meta", {}),
+    }
+
+
+def step_row(step: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the quest_step_definitions row for a step (without quest_id)."""
+    return {
+        "step_index": step["step_index"],
+        "name": step["name"],
+        "description": step.get("description"),
+        "eval_type": step["eval_type"],
+        "event_types": step["event_types"],
+        "target_value": step["target_value"],
+        "payload_filter": step.get("payload_filter", {}),
+        "aggregate_field": step.get("aggregate_field"),
+        "unique_field": step.get("unique_field"),
+        "enabled": step.get("enabled", True),
+        "meta": step.get("meta", {}),
+        "reward_credits": step.get("reward_credits"),
+    }
+
+
+def _row_differs(desired: Dict[str, Any], existing: Dict[str, Any], columns: Sequence[str]) -> bool:
+    return any(desired.get(column) != existing.get(column) for column in columns)
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+@dataclass
+class ExistingStep:
+    id: str
+    row: Dict[str, Any]
+    subscriptions: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class ExistingQuest:
+    id: str
+    row: Dict[str, Any]
+    steps: Dict[int, ExistingStep] = field(default_factory=dict)
+
+
+@dataclass
+class StepChange:
+    """A step whose definition row and/or event subscriptions must be written."""
+
+    quest_code: str
+    row: Dict[str, Any]
+    step_id: str | None
+    write_row: bool
+    refresh_subscriptions: bool
+    clear_subscriptions: bool
+
+    @property
+    def step_index(self) -> int:
+        return self.row["step_index"]
+
+
+@dataclass
+class QuestDiff:
+    """Changes needed to bring a batch of quests in line with their JSON."""
+
+    new_quests: List[str] = field(default_factory=list)
+    changed_quests: List[str] = field(default_factory=list)
+    unchanged_quests: List[str] = field(default_factory=list)
+    quest_rows: List[Dict[str, Any]] = field(default_factory=list)
+    step_changes: List[StepChange] = field(default_factory=list)
+    step_deletes: List[Tuple[str, int, str]] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.quest_rows or self.step_changes or self.step_deletes)
+
+    def merge(self, other: "QuestDiff") -> None:
+        self.new_quests.extend(other.new_quests)
+        self.changed_quests.extend(other.changed_quests)
+        self.unchanged_quests.extend(other.unchanged_quests)
+        self.quest_rows.extend(other.quest_rows)
+        self.step_changes.extend(other.step_changes)
+        self.step_deletes.extend(other.step_deletes)
+
+    def report_lines(self) -> List[str]:
+        """Human-readable per-quest summary of the diff."""
+        by_code: Dict[str, Dict[str, List[int]]] = {}
+        for change in self.step_changes:
+            entry = by_code.setdefault(change.quest_code, {"steps": [], "subs": []})
+            if change.write_row:
+                entry["steps"].append(change.step_index)
+            elif change.refresh_subscriptions:
+                entry["subs"].append(change.step_index)
+        deleted: Dict[str, List[int]] = {}
+        for code, step_index, _step_id in self.step_deletes:
+            deleted.setdefault(code, []).append(step_index)
+
+        lines = []
+        for code in self.new_quests:
+            steps = by_code.get(code, {}).get("steps", [])
+            lines.append(f"  + {code}: new quest ({len(steps)} steps)")
+        for code in self.changed_quests:
+            parts = []
+            if any(row["code"] == code for row in self.quest_rows):
+                parts.append("definition")
+            entry = by_code.get(code, {})
+            if entry.get("steps"):
+                parts.append(f"steps {sorted(entry['steps'])}")
+            if entry.get("subs"):
+                parts.append(f"subscriptions for steps {sorted(entry['subs'])}")
+            if code in deleted:
+                parts.append(f"removed steps {sorted(deleted[code])}")
+            lines.append(f"  ~ {code}: " + ", ".join(parts))
+        for code in self.unchanged_quests:
+            lines.append(f"  = {code}: unchanged")
+        return lines
+
+
+def diff_quests(quests: Iterable[Dict[str, Any]], existing: Dict[str, ExistingQuest]) -> QuestDiff:
+    """Compare validated quest JSON against the rows currently in the database."""
+    diff = QuestDiff()
+    for quest in quests:
+        code = quest["code"]
+        current = existing.get(code)
+        desired = quest_row(quest)
+        quest_changed = current is None or _row_differs(desired, current.row, QUEST_COLUMNS)
+        if quest_changed:
+            diff.quest_rows.append(desired)
+
+        touched = quest_changed
+        desired_indexes = set()
+        for step in quest["steps"]:
+            row = step_row(step)
+            desired_indexes.add(row["step_index"])
+            current_step = current.steps.get(row["step_index"]) if current else None
+            wanted = set(row["event_types"])
+            if current_step is None:
+                change = StepChange(code, row, None, True, True, False)
+            else:
+                write_row = _row_differs(row, current_step.row, STEP_COLUMNS)
+                stale = current_step.subscriptions != wanted
+                if not (write_row or stale):
+                    continue
+                change = StepChange(
+                    code,
+                    row,
+                    current_step.id,
+                    write_row,
+                    stale,
+                    stale and bool(current_step.subscriptions),
+                )
+            diff.step_changes.append(change)
+            touched = True
+
+        if current is not None:
+            for step_index, current_step in sorted(current.steps.items()):
+                if step_index not in desired_indexes:
+                    diff.step_deletes.append((code, step_index, current_step.id))
+                    touched = True
+
+        if current is None:
+            diff.new_quests.append(code)
+        elif touched:
+            diff.changed_quests.append(code)
+        else:
+            diff.unchanged_quests.append(code)
+    return diff
+
 
 class QuestLoader:
     """Loads quest data from JSON files into Supabase."""
@@ -37,18 +252,32 @@ class QuestLoader:
         supabase_url: str | None,
         supabase_key: str | None,
         dry_run: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        jobs: int = 1,
     ):
         if not dry_run and (not supabase_url or not supabase_key):
             raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
 
+        # A dry run still reads existing rows when credentials are available so
+        # it can report a real diff; without them it diffs against an empty DB.
         self.supabase: Client | None = (
-            None if dry_run else create_client(supabase_url or "", supabase_key or "")
+            create_client(supabase_url, supabase_key) if supabase_url and supabase_key else None
         )
         self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.jobs = jobs
+        self.existing_cleared = False
         self.stats = {
             "quests_loaded": 0,
+            "quests_unchanged": 0,
             "steps_loaded": 0,
+            "steps_deleted": 0,
             "subscriptions_loaded": 0,
+            "requests": 0,
         }
 
     def _db(self) -> Client:
@@ -100,90 +329,160 @@ class QuestLoader:
                         f"{filepath.name}: step {idx} 'reward_credits' must be a positive integer"
                     )
 
-    def load_quest(self, quest: Dict[str, Any]) -> None:
-        """Load a single quest into Supabase (upsert by code).
+    def fetch_existing(self, codes: Sequence[str]) -> Tuple[Dict[str, ExistingQuest], int]:
+        """Read current rows for ``codes``: paged selects per table per id chunk.
 
-        Steps are upserted by (quest_id, step_index) so existing UUIDs are
-        preserved and player progress is not destroyed.
+        Returns the snapshot keyed by quest code and the number of requests made.
         """
-        code = quest["code"]
-
-        # 1. Upsert quest definition
-        quest_row = {
-            "code": code,
-            "name": quest["name"],
-            "description": quest.get("description"),
-            "assign_on_creation": quest.get("assign_on_creation", False),
-            "is_repeatable": quest.get("is_repeatable", False),
-            "enabled": quest.get("enabled", True),
-            "meta": quest.get("meta", {}),
-        }
+        if self.existing_cleared or self.supabase is None or not codes:
+            return {}, 0
+
+        requests = 0
+        existing: Dict[str, ExistingQuest] = {}
+        for chunk in _chunks(list(codes), FILTER_CHUNK_SIZE):
+            rows, pages = self._fetch_in("quest_definitions", "*", "code", chunk, ("code",))
+            requests += pages
+            for row in rows:
+                existing[row["code"]] = ExistingQuest(id=row["id"], row=row)
+
+        by_id = {quest.id: quest for quest in existing.values()}
+        steps_by_id: Dict[str, ExistingStep] = {}
+        for chunk in _chunks(list(by_id), FILTER_CHUNK_SIZE):
+            rows, pages = self._fetch_in("quest_step_definitions", "*", "quest_id", chunk, ("id",))
+            requests += pages
+            for row in rows:
+                step = ExistingStep(id=row["id"], row=row)
+                by_id[row["quest_id"]].steps[row["step_index"]] = step
+                steps_by_id[step.id] = step
+
+        for chunk in _chunks(list(steps_by_id), FILTER_CHUNK_SIZE):
+            rows, pages = self._fetch_in(
+                "quest_event_subscriptions",
+                "event_type,step_id",
+                "step_id",
+                chunk,
+                ("event_type", "step_id"),
+            )
+            requests += pages
+            for row in rows:
+                steps_by_id[row["step_id"]].subscriptions.add(row["event_type"])
 
-        if self.dry_run:
-            print(f"  [DRY RUN] Would upsert quest '{code}' with {len(quest['steps'])} steps")
-            self.stats["quests_loaded"] += 1
-            self.stats["steps_loaded"] += len(quest["steps"])
-            for step in quest["steps"]:
-                self.stats["subscriptions_loaded"] += len(step["event_types"])
-            return
+        return existing, requests
 
+    def _fetch_in(
+        self,
+        table: str,
+        columns: str,
+        column: str,
+        values: Sequence[Any],
+        order: Sequence[str],
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Fetch every row whose ``column`` is in ``values``, paging past max_rows.
+
+        ``order`` must be unique per row so pages neither overlap nor skip rows.
+        Returns the rows and the number of requests made.
+        """
         db = self._db()
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        requests = 0
+        while True:
+            query = db.table(table).select(columns).in_(column, list(values))
+            for key in order:
+                query = query.order(key)
+            resp = query.range(offset, offset + PAGE_SIZE - 1).execute()
+            requests += 1
+            page = resp.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows, requests
+            offset += PAGE_SIZE
+
+    def apply_diff(self, diff: QuestDiff, existing: Dict[str, ExistingQuest]) -> int:
+        """Write ``diff`` with one bulk request per table and operation.
+
+        Order matters for the foreign keys: quests first (new quests need their
+        generated ids), removed steps before upserts, subscriptions last.
+        Returns the number of requests made.
+        """
+        if diff.is_empty:
+            return 0
 
-        # Upsert quest definition, get back the id
-        result = db.table("quest_definitions").upsert(quest_row, on_conflict="code").execute()
-        quest_id = result.data[0]["id"]
+        db = self._db()
+        requests = 0
+        quest_ids = {code: quest.id for code, quest in existing.items()}
 
-        # 2. Upsert steps by (quest_id, step_index) to preserve existing UUIDs
-        new_step_indexes: List[int] = []
-        for step in quest["steps"]:
-            step_row = {
-                "quest_id": quest_id,
-                "step_index": step["step_index"],
-                "name": step["name"],
-                "description": step.get("description"),
-                "eval_type": step["eval_type"],
-                "event_types": step["event_types"],
-                "target_value": step["target_value"],
-                "payload_filter": step.get("payload_filter", {}),
-                "aggregate_field": step.get("aggregate_field"),
-                "unique_field": step.get("unique_field"),
-                "enabled": step.get("enabled", True),
-                "meta": step.get("meta", {}),
-                "reward_credits": step.get("reward_credits"),
-            }
-
-            step_result = (
+        if diff.quest_rows:
+            result = (
+                db.table("quest_definitions").upsert(diff.quest_rows, on_conflict="code").execute()
+            )
+            requests += 1
+            quest_ids.update({row["code"]: row["id"] for row in result.data})
+
+        if diff.step_deletes:
+            # Cascades to subscriptions and to player progress on the removed
+            # steps, which is the intended behaviour for a shortened quest.
+            db.table("quest_step_definitions").delete().in_(
+                "id", [step_id for _code, _index, step_id in diff.step_deletes]
+            ).execute()
+            requests += 1
+
+        step_ids: Dict[Tuple[str, int], str] = {
+            (change.quest_code, change.step_index): change.step_id
+            for change in diff.step_changes
+            if change.step_id is not None
+        }
+        step_rows = [
+            {"quest_id": quest_ids[change.quest_code], **change.row}
+            for change in diff.step_changes
+            if change.write_row
+        ]
+        if step_rows:
+            result = (
                 db.table("quest_step_definitions")
-                .upsert(step_row, on_conflict="quest_id,step_index")
+                .upsert(step_rows, on_conflict="quest_id,step_index")
                 .execute()
             )
-            step_id = step_result.data[0]["id"]
-            new_step_indexes.append(step["step_index"])
-            self.stats["steps_loaded"] += 1
-
-            # Remove old subscriptions for this step, then insert current ones
-            db.table("quest_event_subscriptions").delete().eq("step_id", step_id).execute()
-            for event_type in step["event_types"]:
-                db.table("quest_event_subscriptions").insert(
-                    {"event_type": event_type, "step_id": step_id},
-                ).execute()
-                self.stats["subscriptions_loaded"] += 1
-
-        # 3. Remove steps that are no longer in the JSON (e.g. quest was shortened).
-        #    This will CASCADE delete their subscriptions and any player progress
-        #    on those removed steps, which is the correct behavior.
-        existing_steps = (
-            db.table("quest_step_definitions")
-            .select("id,step_index")
-            .eq("quest_id", quest_id)
-            .execute()
-        )
-        for row in existing_steps.data:
-            if row["step_index"] not in new_step_indexes:
-                db.table("quest_step_definitions").delete().eq("id", row["id"]).execute()
-
-        self.stats["quests_loaded"] += 1
-        print(f"  Loaded quest '{code}' ({len(quest['steps'])} steps)")
+            requests += 1
+            code_by_id = {quest_id: code for code, quest_id in quest_ids.items()}
+            for row in result.data:
+                step_ids[(code_by_id[row["quest_id"]], row["step_index"])] = row["id"]
+
+        stale = [
+            change.step_id
+            for change in diff.step_changes
+            if change.clear_subscriptions and change.step_id is not None
+        ]
+        if stale:
+            db.table("quest_event_subscriptions").delete().in_("step_id", stale).execute()
+            requests += 1
+
+        subscriptions = [
+            {"event_type": event_type, "step_id": step_ids[(change.quest_code, change.step_index)]}
+            for change in diff.step_changes
+            if change.refresh_subscriptions
+            for event_type in dict.fromkeys(change.row["event_types"])
+        ]
+        if subscriptions:
+            db.table("quest_event_subscriptions").insert(subscriptions).execute()
+            requests += 1
+
+        return requests
+
+    def load_batch(self, quests: Sequence[Dict[str, Any]]) -> Tuple[QuestDiff, int]:
+        """Diff and (unless dry-run) apply one batch of quests."""
+        existing, requests = self.fetch_existing([quest["code"] for quest in quests])
+        diff = diff_quests(quests, existing)
+        if not self.dry_run:
+            requests += self.apply_diff(diff, existing)
+        return diff, requests
+
+    def load_quest(self, quest: Dict[str, Any]) -> QuestDiff:
+        """Load a single quest (a batch of one)."""
+        diff, requests = self.load_batch([quest])
+        self.stats["requests"] += requests
+        self.record_stats(diff)
+        return diff
 
     def check_existing_quests(self) -> int:
         """Check how many quest definitions exist."""
@@ -195,13 +494,15 @@ class QuestLoader:
         print("\n  Deleting existing quest data...")
         if self.dry_run:
             print("  [DRY RUN] Would delete all quest definitions")
+            self.existing_cleared = True
             return
 
         self._db().table("quest_definitions").delete().neq("code", "").execute()
+        self.existing_cleared = True
         print("  Deleted all quest definitions")
 
-    def load(self, data_path: Path) -> None:
-        """Main load process."""
+    def load(self, data_path: Path) -> QuestDiff:
+        """Main load process. Returns the combined diff that was applied."""
         # Find all JSON files
         if data_path.is_file() and data_path.suffix == ".json":
             json_files = [data_path]
@@ -217,26 +518,61 @@ class QuestLoader:
 
         # Load and validate all files first
         quests: List[Dict[str, Any]] = []
+        seen_codes: Dict[str, Path] = {}
         for filepath in json_files:
             quest = self.load_json(filepath)
             self.validate_quest(quest, filepath)
+            if quest["code"] in seen_codes:
+                raise ValueError(
+                    f"{filepath.name}: duplicate quest code '{quest['code']}' "
+                    f"(also in {seen_codes[quest['code']].name})"
+                )
+            seen_codes[quest["code"]] = filepath
             quests.append(quest)
 
         print(f"  Validated {len(quests)} quest(s)")
 
-        # Load each quest
-        print()
-        for quest in quests:
-            self.load_quest(quest)
+        # Batches touch disjoint quest codes, so they can be applied concurrently.
+        batches = list(_chunks(quests, self.batch_size))
+        if self.jobs > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(pool.map(self.load_batch, batches))
+        else:
+            results = [self.load_batch(batch) for batch in batches]
+
+        diff = QuestDiff()
+        for batch_diff, requests in results:
+            diff.merge(batch_diff)
+            self.stats["requests"] += requests
+        self.record_stats(diff)
+
+        print("\n  Diff" + (" [DRY RUN, nothing written]" if self.dry_run else "") + ":")
+        for line in diff.report_lines():
+            print(line)
 
         # Print summary
         print("\n" + "=" * 60)
-        print("Quest load complete!")
+        print("Quest dry run complete!" if self.dry_run else "Quest load complete!")
         print("=" * 60)
         print(f"Quests loaded:         {self.stats['quests_loaded']}")
+        print(f"Quests unchanged:      {self.stats['quests_unchanged']}")
         print(f"Steps loaded:          {self.stats['steps_loaded']}")
+        print(f"Steps deleted:         {self.stats['steps_deleted']}")
         print(f"Subscriptions loaded:  {self.stats['subscriptions_loaded']}")
+        print(f"Requests:              {self.stats['requests']}")
         print("=" * 60)
+        return diff
+
+    def record_stats(self, diff: QuestDiff) -> None:
+        self.stats["quests_loaded"] += len(diff.new_quests) + len(diff.changed_quests)
+        self.stats["quests_unchanged"] += len(diff.unchanged_quests)
+        self.stats["steps_loaded"] += sum(1 for change in diff.step_changes if change.write_row)
+        self.stats["steps_deleted"] += len(diff.step_deletes)
+        self.stats["subscriptions_loaded"] += sum(
+            len(set(change.row["event_types"]))
+            for change in diff.step_changes
+            if change.refresh_subscriptions
+        )
 
 
 def main():
@@ -256,7 +592,19 @@ def main():
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Validate files without loading to database",
+        help="Validate files and print the diff without writing (reads existing rows if credentials are set)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Quests diffed and written per batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of batches to apply concurrently (default: 1)",
     )
     parser.add_argument(
         "--env",
@@ -297,10 +645,18 @@ def main():
     print(f"Supabase URL:   {supabase_url or '(not required for dry run)'}")
     print(f"Dry run:        {args.dry_run}")
     print(f"Force reload:   {args.force}")
+    print(f"Batch size:     {args.batch_size}")
+    print(f"Jobs:           {args.jobs}")
     print("=" * 60)
 
     try:
-        loader = QuestLoader(supabase_url, supabase_key, dry_run=args.dry_run)
+        loader = QuestLoader(
+            supabase_url,
+            supabase_key,
+            dry_run=args.dry_run,
+            batch_size=args.batch_size,
+            jobs=args.jobs,
+        )
 
         # Check for existing data
         if not args.dry_run:
@@ -311,8 +667,8 @@ def main():
                 print("  Use --force to delete all quest data and reload from scratch.")
                 print()
 
-            if args.force:
-                loader.truncate_quests()
+        if args.force:
+            loader.truncate_quests()
 
         loader.load(data_path)
 
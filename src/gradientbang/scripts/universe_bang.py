@@ -13,13 +13,12 @@ backbone, light one-way warp variation, and a connected Federation Space core.
 
 import argparse
 import heapq
-import json
 import math
 import random
 import sys
 from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import networkx as nx
 import numpy as np
@@ -27,6 +26,13 @@ from loguru import logger
 from scipy.spatial import Delaunay
 
 from gradientbang.config import settings
+from gradientbang.scripts.universe_format import (
+    UNIVERSE_JSON_NAME,
+    UNIVERSE_NPZ_NAME,
+    UniverseArrays,
+    write_universe_json,
+    write_universe_npz,
+)
 from gradientbang.scripts.universe_test import (
     format_validation_report,
     validate_universe_data,
@@ -742,6 +748,49 @@ def tune_complementary_pairs(
                 port_class_by_sector[s] = desired
 
 
+def iter_sector_payloads(
+    sector_count: int,
+    sector_positions: PositionMap,
+    sector_regions: Dict[int, int],
+    warps: WarpMap,
+    port_class_by_sector: PortClassMap,
+    mega_port_set: Set[int],
+) -> Iterator[Dict[str, Any]]:
+    """Yield `universe.json` sector payloads one at a time."""
+    for s in range(sector_count):
+        if s not in sector_positions:
+            continue
+
+        warp_list = []
+        for t in sorted(warps.get(s, set())):
+            warp_list.append(
+                {
+                    "to": t,
+                    "two_way": s in warps.get(t, set()),
+                }
+            )
+
+        port = None
+        if s in port_class_by_sector:
+            port = build_port_object(
+                port_class_by_sector[s],
+                is_mega=(s in mega_port_set),
+            )
+
+        yield {
+            "id": s,
+            "position": {
+                "x": int(sector_positions[s][0]),
+                "y": int(sector_positions[s][1]),
+            },
+            "region": sector_regions[s],
+            "warps": warp_list,
+            "port": port,
+            "planets": [],
+            "scene_config": generate_scene_variant(s),
+        }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a spatially-aware universe with regional structure"
@@ -759,6 +808,12 @@ def main():
         default=Path(settings.GRADIENTBANG_WORLD_DATA_DIR),
         help="Directory to write universe.json (default: GRADIENTBANG_WORLD_DATA_DIR)",
     )
+    parser.add_argument(
+        "--format",
+        choices=("json", "npz", "both"),
+        default="json",
+        help="Output format: universe.json, columnar universe.npz, or both (default: json)",
+    )
 
     args = parser.parse_args()
 
@@ -781,9 +836,10 @@ def main():
         sys.exit(1)
 
     output_dir = args.output_dir
-    universe_path = output_dir / "universe.json"
+    json_path = output_dir / UNIVERSE_JSON_NAME
+    npz_path = output_dir / UNIVERSE_NPZ_NAME
 
-    if universe_path.exists():
+    if json_path.exists() or npz_path.exists():
         if not args.force:
             logger.info("Universe data already exists at {}.", output_dir)
             logger.info("Use --force to regenerate and overwrite existing data")
@@ -885,46 +941,15 @@ def main():
         "commodities": COM_LONG,
     }
 
-    sectors_payload = []
-    for s in range(args.sector_count):
-        if s not in sector_positions:
-            continue
-
-        warp_list = []
-        for t in sorted(warps.get(s, set())):
-            warp_list.append(
-                {
-                    "to": t,
-                    "two_way": s in warps.get(t, set()),
-                }
-            )
-
-        port = None
-        if s in port_class_by_sector:
-            port = build_port_object(
-                port_class_by_sector[s],
-                is_mega=(s in mega_port_set),
-            )
-
-        sectors_payload.append(
-            {
-                "id": s,
-                "position": {
-                    "x": int(sector_positions[s][0]),
-                    "y": int(sector_positions[s][1]),
-                },
-                "region": sector_regions[s],
-                "warps": warp_list,
-                "port": port,
-                "planets": [],
-                "scene_config": generate_scene_variant(s),
-            }
-        )
-
-    universe = {
-        "meta": universe_meta,
-        "sectors": sectors_payload,
-    }
+    sector_payloads = iter_sector_payloads(
+        args.sector_count,
+        sector_positions,
+        sector_regions,
+        warps,
+        port_class_by_sector,
+        mega_port_set,
+    )
+    universe = UniverseArrays.from_sectors(universe_meta, sector_payloads)
 
     validation_report = validate_universe_data(universe)
     validation_summary = format_validation_report(validation_report)
@@ -937,14 +962,26 @@ def main():
         logger.info("Validation: {}", line)
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    universe_path.write_text(json.dumps(universe, indent=2) + "\n")
+    written = []
+    if args.format in ("json", "both"):
+        write_universe_json(json_path, universe.meta, universe.iter_sectors())
+        written.append(json_path)
+    if args.format in ("npz", "both"):
+        write_universe_npz(npz_path, universe)
+        written.append(npz_path)
+    for stale_path in (json_path, npz_path):
+        # Never leave a previous generation next to the new one; readers
+        # prefer universe.npz when both exist.
+        if stale_path not in written and stale_path.exists():
+            stale_path.unlink()
+            logger.info("Removed stale {}.", stale_path)
 
     logger.info(
         "Generation complete: ports={} fedspace_center={} mega_ports={} output={}",
         len(port_class_by_sector),
         center_sector,
         mega_port_sectors,
-        universe_path,
+        ", ".join(str(path) for path in written),
     )
 
 
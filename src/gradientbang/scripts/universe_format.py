@@ -0,0 +1,385 @@
+"""Read and write generated universes in JSON or a columnar NumPy format.
+
+`universe.json` stays the interchange format consumed by the Supabase loader
+and anything outside this repo. For large universes the same data can also be
+stored as `universe.npz`: flat arrays for sector positions and regions, a CSR
+warp table (`warp_offsets` / `warp_targets` / `warp_two_way`) and a port table.
+The archive is written uncompressed so `open_universe` can memory-map every
+member instead of parsing hundreds of MB of JSON.
+
+Scene configs are not stored in the columnar format: they are a deterministic
+function of the sector id (see `universe_scene_gen`). Sectors whose scene
+config or planets differ from the generated defaults are kept in a small
+sparse JSON side table so round trips stay lossless.
+"""
+
+import json
+import struct
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from gradientbang.scripts.universe_scene_gen import generate_scene_variant
+
+UNIVERSE_JSON_NAME = "universe.json"
+UNIVERSE_NPZ_NAME = "universe.npz"
+UNIVERSE_FORMAT_VERSION = 1
+
+PORT_COMMODITIES = ("QF", "RO", "NS")  # Column order of the port stock tables.
+DEFAULT_COMMODITY_NAMES = {
+    "QF": "quantum_foam",
+    "RO": "retro_organics",
+    "NS": "neuro_symbolics",
+}
+PORT_STOCK_COLUMNS = ("stock", "stock_max", "demand", "demand_max")
+
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+@dataclass(frozen=True)
+class UniverseArrays:
+    """Columnar view of a generated universe.
+
+    Arrays are indexed by sector row (file order), not by sector id. Warps for
+    row `i` live in `warp_targets[warp_offsets[i]:warp_offsets[i + 1]]` and
+    hold destination sector ids. Port rows are independent of sector rows and
+    keyed by `port_sector_ids`.
+    """
+
+    meta: Dict[str, Any]
+    sector_ids: np.ndarray
+    position_x: np.ndarray
+    position_y: np.ndarray
+    region: np.ndarray
+    warp_offsets: np.ndarray
+    warp_targets: np.ndarray
+    warp_two_way: np.ndarray
+    port_sector_ids: np.ndarray
+    port_class: np.ndarray
+    port_code: np.ndarray
+    port_stock: np.ndarray
+    port_stock_max: np.ndarray
+    port_demand: np.ndarray
+    port_demand_max: np.ndarray
+    port_is_mega: np.ndarray
+    extras: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def sector_count(self) -> int:
+        return int(self.sector_ids.shape[0])
+
+    @property
+    def warp_count(self) -> int:
+        return int(self.warp_targets.shape[0])
+
+    @property
+    def port_count(self) -> int:
+        return int(self.port_sector_ids.shape[0])
+
+    def warps_for_row(self, row: int) -> slice:
+        return slice(int(self.warp_offsets[row]), int(self.warp_offsets[row + 1]))
+
+    def port_rows_by_sector(self) -> Dict[int, int]:
+        return {int(sector_id): row for row, sector_id in enumerate(self.port_sector_ids.tolist())}
+
+    def port_payload(self, row: int) -> Dict[str, Any]:
+        """Rebuild the `port` object of `universe.json` for one port row."""
+        code = _decode_code(self.port_code[row])
+        names = self.meta.get("commodities") or DEFAULT_COMMODITY_NAMES
+        buys = [names[com] for idx, com in enumerate(PORT_COMMODITIES) if code[idx] != "S"]
+        sells = [names[com] for idx, com in enumerate(PORT_COMMODITIES) if code[idx] == "S"]
+        port: Dict[str, Any] = {
+            "class": int(self.port_class[row]),
+            "code": code,
+            "buys": buys,
+            "sells": sells,
+        }
+        for column, table in zip(
+            PORT_STOCK_COLUMNS,
+            (self.port_stock, self.port_stock_max, self.port_demand, self.port_demand_max),
+        ):
+            values = table[row].tolist()
+            port[column] = dict(zip(PORT_COMMODITIES, values))
+        if bool(self.port_is_mega[row]):
+            port["is_mega"] = True
+        return port
+
+    def iter_sectors(self, *, details: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield sectors in the `universe.json` shape, one at a time.
+
+        With `details=False` only `id` and `warps` are produced, which is all
+        graph checks need and skips port and scene-config reconstruction.
+        """
+        sector_ids = self.sector_ids.tolist()
+        offsets = self.warp_offsets.tolist()
+        port_rows = self.port_rows_by_sector() if details else {}
+        for row, sector_id in enumerate(sector_ids):
+            start, end = offsets[row], offsets[row + 1]
+            warps = [
+                {"to": to, "two_way": two_way}
+                for to, two_way in zip(
+                    self.warp_targets[start:end].tolist(),
+                    self.warp_two_way[start:end].tolist(),
+                )
+            ]
+            if not details:
+                yield {"id": sector_id, "warps": warps}
+                continue
+
+            extras = self.extras.get(sector_id, {})
+            port_row = port_rows.get(sector_id)
+            yield {
+                "id": sector_id,
+                "position": {
+                    "x": self.position_x[row].item(),
+                    "y": self.position_y[row].item(),
+                },
+                "region": int(self.region[row]),
+                "warps": warps,
+                "port": self.port_payload(port_row) if port_row is not None else None,
+                "planets": extras.get("planets", []),
+                "scene_config": extras.get("scene_config") or generate_scene_variant(sector_id),
+            }
+
+    def to_universe(self) -> Dict[str, Any]:
+        """Materialise the full `universe.json` dict (small universes only)."""
+        return {"meta": self.meta, "sectors": list(self.iter_sectors())}
+
+    @classmethod
+    def from_universe(cls, universe: Dict[str, Any]) -> "UniverseArrays":
+        if "meta" not in universe or "sectors" not in universe:
+            raise ValueError("universe JSON missing required keys: meta, sectors")
+        return cls.from_sectors(universe["meta"], universe["sectors"])
+
+    @classmethod
+    def from_sectors(
+        cls,
+        meta: Dict[str, Any],
+        sectors: Iterable[Dict[str, Any]],
+    ) -> "UniverseArrays":
+        """Build columnar arrays from sector payloads without keeping them."""
+        sector_ids: List[int] = []
+        xs: List[Union[int, float]] = []
+        ys: List[Union[int, float]] = []
+        regions: List[int] = []
+        offsets: List[int] = [0]
+        targets: List[int] = []
+        two_way: List[bool] = []
+        port_ids: List[int] = []
+        port_class: List[int] = []
+        port_code: List[str] = []
+        port_columns: Dict[str, List[List[int]]] = {name: [] for name in PORT_STOCK_COLUMNS}
+        port_mega: List[bool] = []
+        extras: Dict[int, Dict[str, Any]] = {}
+
+        for sector in sectors:
+            sector_id = int(sector["id"])
+            position = sector.get("position") or {}
+            sector_ids.append(sector_id)
+            xs.append(position.get("x", 0))
+            ys.append(position.get("y", 0))
+            regions.append(int(sector.get("region", 0)))
+            for warp in sector.get("warps", []):
+                targets.append(int(warp["to"]))
+                two_way.append(bool(warp.get("two_way")))
+            offsets.append(len(targets))
+
+            port = sector.get("port")
+            if port:
+                port_ids.append(sector_id)
+                port_class.append(int(port["class"]))
+                port_code.append(port["code"])
+                for name in PORT_STOCK_COLUMNS:
+                    values = port.get(name) or {}
+                    port_columns[name].append([int(values.get(com, 0)) for com in PORT_COMMODITIES])
+                port_mega.append(bool(port.get("is_mega")))
+
+            sector_extras: Dict[str, Any] = {}
+            planets = sector.get("planets") or []
+            if planets:
+                sector_extras["planets"] = planets
+            scene_config = sector.get("scene_config")
+            if scene_config is not None and scene_config != generate_scene_variant(sector_id):
+                sector_extras["scene_config"] = scene_config
+            if sector_extras:
+                extras[sector_id] = sector_extras
+
+        def stock_table(name: str) -> np.ndarray:
+            return np.asarray(port_columns[name], dtype=np.int64).reshape(-1, len(PORT_COMMODITIES))
+
+        return cls(
+            meta=meta,
+            sector_ids=np.asarray(sector_ids, dtype=np.int64),
+            position_x=_position_array(xs),
+            position_y=_position_array(ys),
+            region=np.asarray(regions, dtype=np.int32),
+            warp_offsets=np.asarray(offsets, dtype=np.int64),
+            warp_targets=np.asarray(targets, dtype=np.int64),
+            warp_two_way=np.asarray(two_way, dtype=np.bool_),
+            port_sector_ids=np.asarray(port_ids, dtype=np.int64),
+            port_class=np.asarray(port_class, dtype=np.int16),
+            port_code=np.asarray([code.encode("ascii") for code in port_code], dtype="S3"),
+            port_stock=stock_table("stock"),
+            port_stock_max=stock_table("stock_max"),
+            port_demand=stock_table("demand"),
+            port_demand_max=stock_table("demand_max"),
+            port_is_mega=np.asarray(port_mega, dtype=np.bool_),
+            extras=extras,
+        )
+
+
+def resolve_universe_path(data_path: Path) -> Path:
+    """Resolve a universe file, preferring `universe.npz` inside a directory."""
+    if not data_path.is_dir():
+        return data_path
+    npz_path = data_path / UNIVERSE_NPZ_NAME
+    if npz_path.exists():
+        return npz_path
+    return data_path / UNIVERSE_JSON_NAME
+
+
+def open_universe(path: Path, *, mmap: bool = True) -> UniverseArrays:
+    """Open a universe from `universe.npz`, `universe.json` or their directory."""
+    path = resolve_universe_path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Missing universe file: {path}")
+    if path.suffix == ".npz":
+        return read_universe_npz(path, mmap=mmap)
+    return UniverseArrays.from_universe(json.loads(path.read_text(encoding="utf-8")))
+
+
+def write_universe_json(
+    path: Path,
+    meta: Dict[str, Any],
+    sectors: Iterable[Dict[str, Any]],
+) -> None:
+    """Stream `universe.json` one sector at a time.
+
+    The output is byte-identical to `json.dumps(universe, indent=2) + "\\n"`.
+    """
+    with path.open("w", encoding="utf-8") as fh:
+        _write_universe_json(fh, meta, sectors)
+
+
+def _write_universe_json(
+    fh: IO[str],
+    meta: Dict[str, Any],
+    sectors: Iterable[Dict[str, Any]],
+) -> None:
+    fh.write('{\n  "meta": ')
+    fh.write(_indent_json(meta, "  "))
+    fh.write(',\n  "sectors": [')
+    first = True
+    for sector in sectors:
+        fh.write("\n    " if first else ",\n    ")
+        fh.write(_indent_json(sector, "    "))
+        first = False
+    fh.write("]\n}\n" if first else "\n  ]\n}\n")
+
+
+def write_universe_npz(path: Path, universe: UniverseArrays) -> None:
+    """Write the columnar format as an uncompressed (memory-mappable) `.npz`."""
+    header = {
+        "format_version": UNIVERSE_FORMAT_VERSION,
+        "meta": universe.meta,
+        "extras": {str(sector_id): value for sector_id, value in universe.extras.items()},
+    }
+    np.savez(
+        path,
+        header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+        sector_ids=universe.sector_ids,
+        position_x=universe.position_x,
+        position_y=universe.position_y,
+        region=universe.region,
+        warp_offsets=universe.warp_offsets,
+        warp_targets=universe.warp_targets,
+        warp_two_way=universe.warp_two_way,
+        port_sector_ids=universe.port_sector_ids,
+        port_class=universe.port_class,
+        port_code=universe.port_code,
+        port_stock=universe.port_stock,
+        port_stock_max=universe.port_stock_max,
+        port_demand=universe.port_demand,
+        port_demand_max=universe.port_demand_max,
+        port_is_mega=universe.port_is_mega,
+    )
+
+
+def read_universe_npz(path: Path, *, mmap: bool = True) -> UniverseArrays:
+    arrays = _load_npz_members(path, mmap=mmap)
+    header = json.loads(bytes(arrays.pop("header")).decode("utf-8"))
+    version = header.get("format_version")
+    if version != UNIVERSE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported universe.npz format version: {version}")
+    extras = {int(sector_id): value for sector_id, value in header.get("extras", {}).items()}
+    return UniverseArrays(meta=header["meta"], extras=extras, **arrays)
+
+
+def _load_npz_members(path: Path, *, mmap: bool) -> Dict[str, np.ndarray]:
+    """Load `.npz` members, memory-mapping the ones stored without compression."""
+    with zipfile.ZipFile(path) as archive:
+        infos = [info for info in archive.infolist() if info.filename.endswith(".npy")]
+
+    arrays: Dict[str, np.ndarray] = {}
+    compressed: List[str] = []
+    with path.open("rb") as fh:
+        for info in infos:
+            name = info.filename[: -len(".npy")]
+            if not mmap or info.compress_type != zipfile.ZIP_STORED:
+                compressed.append(name)
+                continue
+            mapped = _mmap_stored_member(path, fh, info)
+            if mapped is None:
+                compressed.append(name)
+            else:
+                arrays[name] = mapped
+
+    if compressed:
+        with np.load(path, allow_pickle=False) as archive:
+            for name in compressed:
+                arrays[name] = archive[name]
+    return arrays
+
+
+def _mmap_stored_member(path: Path, fh: IO[bytes], info: zipfile.ZipInfo) -> Optional[np.ndarray]:
+    fh.seek(info.header_offset)
+    local_header = fh.read(_ZIP_LOCAL_HEADER_SIZE)
+    name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+    fh.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_len + extra_len)
+
+    version = np.lib.format.read_magic(fh)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+    else:
+        return None
+    if dtype.hasobject:
+        return None
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=fh.tell(),
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def _position_array(values: List[Union[int, float]]) -> np.ndarray:
+    if all(isinstance(value, int) for value in values):
+        return np.asarray(values, dtype=np.int64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def _decode_code(value: Any) -> str:
+    return value.decode("ascii") if isinstance(value, bytes) else str(value)
+
+
+def _indent_json(value: Any, prefix: str) -> str:
+    return json.dumps(value, indent=2).replace("\n", "\n" + prefix)
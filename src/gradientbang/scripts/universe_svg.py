@@ -1,18 +1,80 @@
 #!/usr/bin/env -S uv run python
-"""Generate an SVG map of the universe from generated universe JSON."""
+"""Generate an SVG map of the universe from generated universe JSON or NPZ.
+
+Two output modes:
+
+* a single SVG (``--output``), streamed to disk element by element;
+* a zoom-level tile pyramid (``--tiles DIR``) of SVG or PNG tiles laid out as
+  ``DIR/{z}/{x}/{y}.{svg,png}`` plus ``DIR/index.json``. Each tile only
+  contains the sectors and warps that intersect it, and detail (edges, arrow
+  heads, ports, labels) is dropped at zoom levels where it would be too small
+  to see.
+
+Two-way warps are drawn once with an arrow head at each end rather than as
+two overlapping one-way lines.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
 import math
+from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Sequence, TextIO, Tuple
 
-from gradientbang.config import settings
+import numpy as np
 
-def _load_json(path: Path) -> Dict:
-    return json.loads(path.read_text())
+from gradientbang.config import settings
+from gradientbang.scripts.universe_format import UniverseArrays, open_universe
+
+TILE_INDEX_NAME = "index.json"
+TILE_FORMATS = ("svg", "png")
+
+# Level-of-detail thresholds, in on-screen hex radius pixels.
+LOD_PORTS_MIN_RADIUS = 1.5
+LOD_EDGES_MIN_RADIUS = 2.0
+LOD_ARROWS_MIN_RADIUS = 5.0
+LOD_LABELS_MIN_RADIUS = 10.0
+# Auto max zoom stops once a hex is this large on screen.
+AUTO_MAX_ZOOM_RADIUS = 24.0
+
+COLORS = {
+    "bg": "#07090c",
+    "edge": "#1c2a33",
+    "sector-fill": "#0c1217",
+    "sector-stroke": "#1f2a33",
+    "fedspace-fill": "#0c2433",
+    "fedspace-stroke": "#5aa2d8",
+    "port": "#66f3a3",
+    "port-stroke": "#1e5a3c",
+    "mega": "#ffd37b",
+    "mega-stroke": "#b8861f",
+    "label": "#a7b4bf",
+    "label-halo": "#05070a",
+    "text": "#cbd5e1",
+}
+EDGE_OPACITY = 0.25
+
+SVG_STYLE = (
+    "<style>"
+    ":root {" + "".join(f"--{name}:{value};" for name, value in COLORS.items()) + "}"
+    ".bg{fill:var(--bg);}"
+    ".edge{stroke:var(--edge);stroke-opacity:.25;stroke-width:0.5;stroke-linecap:round;}"
+    ".sector{fill:var(--sector-fill);stroke:var(--sector-stroke);stroke-width:0.6;"
+    "vector-effect:non-scaling-stroke;}"
+    ".fedspace{fill:var(--fedspace-fill);stroke:var(--fedspace-stroke);stroke-width:0.8;"
+    "vector-effect:non-scaling-stroke;}"
+    ".port{fill:var(--port);stroke:var(--port-stroke);stroke-width:0.9;}"
+    ".mega{fill:var(--mega);stroke:var(--mega-stroke);stroke-width:1.2;}"
+    ".label{fill:var(--label);font-size:9px;letter-spacing:0.2px;"
+    "font-family:Rajdhani,Space Grotesk,Segoe UI,ui-sans-serif,system-ui;"
+    "paint-order:stroke;stroke:var(--label-halo);stroke-width:2;"
+    "stroke-linejoin:round;opacity:.8;}"
+    ".legend{fill:var(--text);font-family:Rajdhani,Space Grotesk,Segoe UI,ui-sans-serif,system-ui;}"
+    "</style>"
+)
 
 
 def _hex_path_unit() -> str:
@@ -41,20 +103,6 @@ def _compute_scale(
     return min_x, max_x, min_y, max_y, scale
 
 
-def _project(
-    x: float,
-    y: float,
-    min_x: float,
-    max_y: float,
-    scale: float,
-    margin: float,
-) -> Tuple[float, float]:
-    px = margin + (x - min_x) * scale
-    # Flip y for conventional top-down orientation
-    py = margin + (max_y - y) * scale
-    return px, py
-
-
 def _median(values: List[float]) -> float:
     if not values:
         return 1.0
@@ -65,255 +113,580 @@ def _median(values: List[float]) -> float:
     return values[mid]
 
 
-def _safe_int(value: object) -> Optional[int]:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Generate an SVG map from generated universe.json."
-    )
-    parser.add_argument(
-        "--data-dir",
-        type=Path,
-        default=Path(settings.GRADIENTBANG_WORLD_DATA_DIR),
-        help="Path to universe.json or directory containing it",
-    )
-    parser.add_argument(
-        "--output",
-        type=Path,
-        default=Path("artifacts/universe-map.svg"),
-        help="Output SVG path (default: artifacts/universe-map.svg)",
-    )
-    parser.add_argument("--width", type=int, default=3200)
-    parser.add_argument("--height", type=int, default=2400)
-    parser.add_argument("--margin", type=int, default=80)
-    parser.add_argument("--no-edges", action="store_true")
-    parser.add_argument("--legend", action="store_true")
-    parser.add_argument(
-        "--labels",
-        action="store_true",
-        help="Include sector number labels (default: off)",
-    )
-    args = parser.parse_args()
-
-    data_path = args.data_dir
-    universe_path = data_path / "universe.json" if data_path.is_dir() else data_path
-    universe = _load_json(universe_path)
+@dataclass(frozen=True)
+class MapLayout:
+    """Projected sector positions and deduplicated warp edges on the base canvas."""
+
+    width: int
+    height: int
+    hex_radius: float
+    sector_ids: np.ndarray
+    px: np.ndarray
+    py: np.ndarray
+    fedspace: np.ndarray
+    port: np.ndarray
+    mega: np.ndarray
+    edge_src: np.ndarray
+    edge_dst: np.ndarray
+    edge_both: np.ndarray
+
+    @property
+    def sector_count(self) -> int:
+        return int(self.sector_ids.shape[0])
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.edge_src.shape[0])
+
+
+@dataclass(frozen=True)
+class LevelOfDetail:
+    edges: bool
+    arrows: bool
+    ports: bool
+    labels: bool
+
+    @classmethod
+    def full(cls, *, edges: bool = True, labels: bool = False) -> "LevelOfDetail":
+        return cls(edges=edges, arrows=edges, ports=True, labels=labels)
+
+    @classmethod
+    def for_radius(cls, hex_radius: float, *, edges: bool, labels: bool) -> "LevelOfDetail":
+        return cls(
+            edges=edges and hex_radius >= LOD_EDGES_MIN_RADIUS,
+            arrows=edges and hex_radius >= LOD_ARROWS_MIN_RADIUS,
+            ports=hex_radius >= LOD_PORTS_MIN_RADIUS,
+            labels=labels and hex_radius >= LOD_LABELS_MIN_RADIUS,
+        )
 
-    sectors = universe.get("sectors", [])
-    positions: Dict[int, Tuple[float, float]] = {}
-    for sector in sectors:
-        sector_id = _safe_int(sector.get("id"))
-        pos = sector.get("position") or {}
-        if sector_id is None:
-            continue
-        positions[sector_id] = (float(pos.get("x", 0)), float(pos.get("y", 0)))
 
-    if not positions:
+@dataclass(frozen=True)
+class Viewport:
+    """Region of the base canvas mapped onto an output surface at ``scale``."""
+
+    x0: float
+    y0: float
+    width: int
+    height: int
+    scale: float
+
+    def project(self, px: np.ndarray, py: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return (px - self.x0) * self.scale, (py - self.y0) * self.scale
+
+
+def dedup_edges(
+    universe: UniverseArrays,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return warp edges as (src_row, dst_row, both_directions) arrays.
+
+    Warps to sectors without a position are dropped. A warp pair that exists
+    in both directions with both sides flagged ``two_way`` is kept once (from
+    the lower row) with ``both_directions`` set; everything else is kept as a
+    directed edge.
+    """
+    n = universe.sector_count
+    offsets = np.asarray(universe.warp_offsets, dtype=np.int64)
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    targets = np.asarray(universe.warp_targets, dtype=np.int64)
+    two_way = np.asarray(universe.warp_two_way, dtype=bool)
+
+    ids = np.asarray(universe.sector_ids, dtype=np.int64)
+    order = np.argsort(ids, kind="stable")
+    pos = np.clip(np.searchsorted(ids, targets, sorter=order), 0, max(n - 1, 0))
+    known = (ids[order[pos]] == targets) if n else np.zeros(0, dtype=bool)
+    src, dst, two_way = src[known], order[pos][known], two_way[known]
+
+    keys = src * n + dst
+    key_order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[key_order]
+    reverse = dst * n + src
+    slot = np.clip(np.searchsorted(sorted_keys, reverse), 0, max(len(keys) - 1, 0))
+    has_reverse = (sorted_keys[slot] == reverse) if len(keys) else np.zeros(0, dtype=bool)
+    reverse_two_way = np.zeros_like(two_way)
+    reverse_two_way[has_reverse] = two_way[key_order[slot[has_reverse]]]
+
+    mutual = two_way & has_reverse & reverse_two_way & (src != dst)
+    keep = ~mutual | (src < dst)
+    return src[keep], dst[keep], mutual[keep]
+
+
+def build_layout(universe: UniverseArrays, width: int, height: int, margin: int) -> MapLayout:
+    """Project sectors onto a ``width`` x ``height`` canvas."""
+    if universe.sector_count == 0:
         raise SystemExit("No sector positions found in universe.json")
 
-    pos_values = list(positions.values())
-    min_x, max_x, min_y, max_y, scale = _compute_scale(
-        pos_values, args.width, args.height, args.margin
+    xs = np.asarray(universe.position_x, dtype=float)
+    ys = np.asarray(universe.position_y, dtype=float)
+    min_x, _max_x, _min_y, max_y, scale = _compute_scale(
+        [(float(xs.min()), float(ys.min())), (float(xs.max()), float(ys.max()))],
+        width,
+        height,
+        margin,
+    )
+    px = margin + (xs - min_x) * scale
+    # Flip y for conventional top-down orientation
+    py = margin + (max_y - ys) * scale
+
+    meta = universe.meta
+    sector_ids = np.asarray(universe.sector_ids, dtype=np.int64)
+    port_ids = np.asarray(universe.port_sector_ids, dtype=np.int64)
+    mega_ids = set(meta.get("mega_port_sectors") or [])
+    mega_ids.update(port_ids[np.asarray(universe.port_is_mega, dtype=bool)].tolist())
+    is_port = np.isin(sector_ids, port_ids)
+
+    edge_src, edge_dst, edge_both = dedup_edges(universe)
+    return MapLayout(
+        width=width,
+        height=height,
+        # Use a fixed hex radius in grid units to avoid overlaps.
+        hex_radius=scale * 0.45,
+        sector_ids=sector_ids,
+        px=px,
+        py=py,
+        fedspace=np.isin(sector_ids, list(meta.get("fedspace_sectors") or [])),
+        port=is_port,
+        mega=is_port & np.isin(sector_ids, list(mega_ids)),
+        edge_src=edge_src,
+        edge_dst=edge_dst,
+        edge_both=edge_both,
     )
 
-    adjacency_edges: List[Tuple[int, int]] = []
-    for sector in sectors:
-        source_id = _safe_int(sector.get("id"))
-        if source_id is None or source_id not in positions:
-            continue
-        sx, sy = positions[source_id]
-        for warp in sector.get("warps", []):
-            dest_id = _safe_int(warp.get("to"))
-            if dest_id is None or dest_id not in positions:
-                continue
-            adjacency_edges.append((source_id, dest_id))
 
-    # Use a fixed hex radius in grid units to avoid overlaps.
-    hex_radius = scale * 0.45
+def _edge_segments(
+    layout: MapLayout, viewport: Viewport, edges: np.ndarray
+) -> Iterable[Tuple[float, float, float, float, bool]]:
+    """Yield shrunk edge segments (x1, y1, x2, y2, both) in viewport coordinates."""
+    sx, sy = viewport.project(layout.px[layout.edge_src[edges]], layout.py[layout.edge_src[edges]])
+    tx, ty = viewport.project(layout.px[layout.edge_dst[edges]], layout.py[layout.edge_dst[edges]])
+    shrink = layout.hex_radius * viewport.scale * 0.85
+    for x1, y1, x2, y2, both in zip(
+        sx.tolist(), sy.tolist(), tx.tolist(), ty.tolist(), layout.edge_both[edges].tolist()
+    ):
+        dx = x2 - x1
+        dy = y2 - y1
+        length = math.hypot(dx, dy)
+        if length < 1e-6:
+            continue
+        ux, uy = dx / length, dy / length
+        yield x1 + ux * shrink, y1 + uy * shrink, x2 - ux * shrink, y2 - uy * shrink, both
+
+
+def write_svg(
+    out: TextIO,
+    layout: MapLayout,
+    viewport: Viewport,
+    lod: LevelOfDetail,
+    *,
+    sectors: np.ndarray | None = None,
+    edges: np.ndarray | None = None,
+    legend_margin: float | None = None,
+) -> None:
+    """Stream an SVG of ``sectors``/``edges`` (default: all) within ``viewport``.
+
+    ``legend_margin`` draws the legend box inset by that many pixels.
+    """
+    sectors = np.arange(layout.sector_count) if sectors is None else sectors
+    edges = np.arange(layout.edge_count) if edges is None else edges
+    hex_radius = layout.hex_radius * viewport.scale
     port_radius = hex_radius * 0.33
     mega_radius = hex_radius * 0.55
+    width, height = viewport.width, viewport.height
 
-    meta = universe.get("meta", {})
-    fedspace = set(
-        meta.get("fedspace_sectors") or []
-    )
-    mega_ports = set(
-        meta.get("mega_port_sectors") or []
-    )
-
-    ports: Dict[int, Dict] = {}
-    for sector in sectors:
-        sector_id = _safe_int(sector.get("id"))
-        if sector_id is None:
-            continue
-        port_data = sector.get("port")
-        if port_data:
-            ports[sector_id] = port_data
-            if port_data.get("is_mega"):
-                mega_ports.add(sector_id)
-
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-
-    hex_path = _hex_path_unit()
-
-    svg_lines: List[str] = []
-    svg_lines.append(
+    out.write(
         f'<svg xmlns="http://www.w3.org/2000/svg" '
-        f'width="{args.width}" height="{args.height}" '
-        f'viewBox="0 0 {args.width} {args.height}" '
-        f'role="img" aria-label="Universe map">'
+        f'width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" '
+        f'role="img" aria-label="Universe map">\n'
     )
-    svg_lines.append("<defs>")
-    svg_lines.append(
+    out.write("<defs>\n")
+    out.write(
         '<marker id="arrow" markerWidth="4" markerHeight="4" refX="3" refY="2" '
-        'orient="auto" markerUnits="strokeWidth">'
+        'orient="auto-start-reverse" markerUnits="strokeWidth">'
         '<path d="M0,0 L4,2 L0,4 Z" fill="var(--edge)" />'
-        "</marker>"
+        "</marker>\n"
     )
-    svg_lines.append(f'<path id="hex" d="{hex_path}" />')
-    svg_lines.append("</defs>")
-
-    svg_lines.append(
-        "<style>"
-        ":root {"
-        "--bg:#07090c;"
-        "--edge:#1c2a33;"
-        "--sector-fill:#0c1217;"
-        "--sector-stroke:#1f2a33;"
-        "--fedspace-fill:#0c2433;"
-        "--fedspace-stroke:#5aa2d8;"
-        "--port:#66f3a3;"
-        "--port-stroke:#1e5a3c;"
-        "--mega:#ffd37b;"
-        "--mega-stroke:#b8861f;"
-        "--label:#a7b4bf;"
-        "--label-halo:#05070a;"
-        "--text:#cbd5e1;"
-        "}"
-        ".bg{fill:var(--bg);}"
-        ".edge{stroke:var(--edge);stroke-opacity:.25;stroke-width:0.5;stroke-linecap:round;}"
-        ".sector{fill:var(--sector-fill);stroke:var(--sector-stroke);stroke-width:0.6;"
-        "vector-effect:non-scaling-stroke;}"
-        ".fedspace{fill:var(--fedspace-fill);stroke:var(--fedspace-stroke);stroke-width:0.8;"
-        "vector-effect:non-scaling-stroke;}"
-        ".port{fill:var(--port);stroke:var(--port-stroke);stroke-width:0.9;}"
-        ".mega{fill:var(--mega);stroke:var(--mega-stroke);stroke-width:1.2;}"
-        ".label{fill:var(--label);font-size:9px;letter-spacing:0.2px;"
-        "font-family:Rajdhani,Space Grotesk,Segoe UI,ui-sans-serif,system-ui;"
-        "paint-order:stroke;stroke:var(--label-halo);stroke-width:2;"
-        "stroke-linejoin:round;opacity:.8;}"
-        ".legend{fill:var(--text);font-family:Rajdhani,Space Grotesk,Segoe UI,ui-sans-serif,system-ui;}"
-        "</style>"
-    )
-
-    svg_lines.append(f'<rect class="bg" x="0" y="0" width="{args.width}" height="{args.height}" />')
+    out.write(f'<path id="hex" d="{_hex_path_unit()}" />\n')
+    out.write("</defs>\n")
+    out.write(SVG_STYLE + "\n")
+    out.write(f'<rect class="bg" x="0" y="0" width="{width}" height="{height}" />\n')
 
     # Edges
-    if not args.no_edges:
-        svg_lines.append('<g class="edges">')
-        for source_id, dest_id in adjacency_edges:
-            sx, sy = positions[source_id]
-            tx, ty = positions[dest_id]
-            psx, psy = _project(sx, sy, min_x, max_y, scale, args.margin)
-            ptx, pty = _project(tx, ty, min_x, max_y, scale, args.margin)
-            dx = ptx - psx
-            dy = pty - psy
-            length = math.hypot(dx, dy)
-            if length < 1e-6:
-                continue
-            shrink = hex_radius * 0.85
-            ux, uy = dx / length, dy / length
-            start_x = psx + ux * shrink
-            start_y = psy + uy * shrink
-            end_x = ptx - ux * shrink
-            end_y = pty - uy * shrink
-            svg_lines.append(
-                f'<line class="edge" x1="{start_x:.2f}" y1="{start_y:.2f}" '
-                f'x2="{end_x:.2f}" y2="{end_y:.2f}" marker-end="url(#arrow)" />'
+    if lod.edges:
+        out.write('<g class="edges">\n')
+        for x1, y1, x2, y2, both in _edge_segments(layout, viewport, edges):
+            markers = ""
+            if lod.arrows:
+                markers = ' marker-end="url(#arrow)"'
+                if both:
+                    markers = ' marker-start="url(#arrow)"' + markers
+            out.write(
+                f'<line class="edge" x1="{x1:.2f}" y1="{y1:.2f}" '
+                f'x2="{x2:.2f}" y2="{y2:.2f}"{markers} />\n'
             )
-        svg_lines.append("</g>")
+        out.write("</g>\n")
+
+    px, py = viewport.project(layout.px[sectors], layout.py[sectors])
+    rows = list(zip(sectors.tolist(), px.tolist(), py.tolist()))
 
     # Sectors
-    svg_lines.append('<g class="sectors">')
-    for sector_id, (x, y) in positions.items():
-        px, py = _project(x, y, min_x, max_y, scale, args.margin)
-        cls = "fedspace" if sector_id in fedspace else "sector"
-        svg_lines.append(
-            f'<use href="#hex" class="{cls}" transform="translate({px:.2f},{py:.2f}) scale({hex_radius:.2f})" />'
+    out.write('<g class="sectors">\n')
+    for row, x, y in rows:
+        cls = "fedspace" if layout.fedspace[row] else "sector"
+        out.write(
+            f'<use href="#hex" class="{cls}" '
+            f'transform="translate({x:.2f},{y:.2f}) scale({hex_radius:.2f})" />\n'
         )
-    svg_lines.append("</g>")
+    out.write("</g>\n")
 
     # Ports & mega-ports
-    svg_lines.append('<g class="ports">')
-    for sector_id, (x, y) in positions.items():
-        if sector_id not in ports:
-            continue
-        px, py = _project(x, y, min_x, max_y, scale, args.margin)
-        if sector_id in mega_ports:
-            svg_lines.append(
-                f'<circle class="mega" cx="{px:.2f}" cy="{py:.2f}" r="{mega_radius:.2f}" />'
-            )
-        svg_lines.append(
-            f'<circle class="port" cx="{px:.2f}" cy="{py:.2f}" r="{port_radius:.2f}" />'
-        )
-    svg_lines.append("</g>")
-
-    if args.labels:
+    if lod.ports:
+        out.write('<g class="ports">\n')
+        for row, x, y in rows:
+            if not layout.port[row]:
+                continue
+            if layout.mega[row]:
+                out.write(
+                    f'<circle class="mega" cx="{x:.2f}" cy="{y:.2f}" r="{mega_radius:.2f}" />\n'
+                )
+            out.write(f'<circle class="port" cx="{x:.2f}" cy="{y:.2f}" r="{port_radius:.2f}" />\n')
+        out.write("</g>\n")
+
+    if lod.labels:
         # Sector labels
         label_dx = hex_radius * 0.6
         label_dy = -hex_radius * 0.35
-        svg_lines.append('<g class="labels">')
-        for sector_id, (x, y) in positions.items():
-            px, py = _project(x, y, min_x, max_y, scale, args.margin)
-            lx = px + label_dx
-            ly = py + label_dy
-            svg_lines.append(
-                f'<text class="label" x="{lx:.2f}" y="{ly:.2f}">{sector_id}</text>'
+        out.write('<g class="labels">\n')
+        for row, x, y in rows:
+            out.write(
+                f'<text class="label" x="{x + label_dx:.2f}" y="{y + label_dy:.2f}">'
+                f"{layout.sector_ids[row]}</text>\n"
             )
-        svg_lines.append("</g>")
-
-    if args.legend:
-        legend_x = args.margin
-        legend_y = args.margin * 0.6
-        svg_lines.append('<g class="legend">')
-        svg_lines.append(
-            f'<rect x="{legend_x - 10}" y="{legend_y - 22}" width="240" height="88" '
-            'fill="rgba(11,15,22,0.75)" stroke="var(--sector-stroke)" />'
-        )
-        svg_lines.append(
-            f'<use href="#hex" class="sector" transform="translate({legend_x:.2f},{legend_y:.2f}) scale({hex_radius:.2f})" />'
-        )
-        svg_lines.append(
-            f'<text x="{legend_x + 18}" y="{legend_y + 4}" class="legend">Standard sector</text>'
-        )
-        svg_lines.append(
-            f'<use href="#hex" class="fedspace" transform="translate({legend_x:.2f},{legend_y + 26:.2f}) scale({hex_radius:.2f})" />'
-        )
-        svg_lines.append(
-            f'<text x="{legend_x + 18}" y="{legend_y + 30}" class="legend">Federation Space</text>'
-        )
-        svg_lines.append(
-            f'<circle class="port" cx="{legend_x:.2f}" cy="{legend_y + 52:.2f}" r="{port_radius:.2f}" />'
-        )
-        svg_lines.append(
-            f'<text x="{legend_x + 18}" y="{legend_y + 56}" class="legend">Port</text>'
+        out.write("</g>\n")
+
+    if legend_margin is not None:
+        _write_legend(out, hex_radius, port_radius, mega_radius, legend_margin)
+
+    out.write("</svg>\n")
+
+
+def _write_legend(
+    out: TextIO, hex_radius: float, port_radius: float, mega_radius: float, margin: float
+) -> None:
+    legend_x = margin
+    legend_y = margin * 0.6
+    out.write('<g class="legend">\n')
+    out.write(
+        f'<rect x="{legend_x - 10}" y="{legend_y - 22}" width="240" height="88" '
+        'fill="rgba(11,15,22,0.75)" stroke="var(--sector-stroke)" />\n'
+    )
+    out.write(
+        f'<use href="#hex" class="sector" '
+        f'transform="translate({legend_x:.2f},{legend_y:.2f}) scale({hex_radius:.2f})" />\n'
+    )
+    out.write(
+        f'<text x="{legend_x + 18}" y="{legend_y + 4}" class="legend">Standard sector</text>\n'
+    )
+    out.write(
+        f'<use href="#hex" class="fedspace" '
+        f'transform="translate({legend_x:.2f},{legend_y + 26:.2f}) scale({hex_radius:.2f})" />\n'
+    )
+    out.write(
+        f'<text x="{legend_x + 18}" y="{legend_y + 30}" class="legend">Federation Space</text>\n'
+    )
+    out.write(
+        f'<circle class="port" cx="{legend_x:.2f}" cy="{legend_y + 52:.2f}" '
+        f'r="{port_radius:.2f}" />\n'
+    )
+    out.write(f'<text x="{legend_x + 18}" y="{legend_y + 56}" class="legend">Port</text>\n')
+    out.write(
+        f'<circle class="mega" cx="{legend_x:.2f}" cy="{legend_y + 74:.2f}" '
+        f'r="{mega_radius:.2f}" />\n'
+    )
+    out.write(f'<text x="{legend_x + 18}" y="{legend_y + 78}" class="legend">Mega-port</text>\n')
+    out.write("</g>\n")
+
+
+def _rgb(color: str) -> Tuple[int, int, int]:
+    return tuple(int(color[i : i + 2], 16) for i in (1, 3, 5))  # type: ignore[return-value]
+
+
+def _blend(color: str, background: str, alpha: float) -> Tuple[int, int, int]:
+    fg, bg = _rgb(color), _rgb(background)
+    return tuple(round(b + (f - b) * alpha) for f, b in zip(fg, bg))  # type: ignore[return-value]
+
+
+def write_png(
+    path: Path,
+    layout: MapLayout,
+    viewport: Viewport,
+    lod: LevelOfDetail,
+    *,
+    sectors: np.ndarray,
+    edges: np.ndarray,
+) -> None:
+    """Rasterise a tile directly with Pillow (no SVG renderer dependency)."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("RGB", (viewport.width, viewport.height), _rgb(COLORS["bg"]))
+    draw = ImageDraw.Draw(image)
+    hex_radius = layout.hex_radius * viewport.scale
+    edge_color = _blend(COLORS["edge"], COLORS["bg"], EDGE_OPACITY)
+
+    if lod.edges:
+        head = max(2.0, hex_radius * 0.15)
+        for x1, y1, x2, y2, both in _edge_segments(layout, viewport, edges):
+            draw.line([(x1, y1), (x2, y2)], fill=edge_color, width=1)
+            if not lod.arrows:
+                continue
+            ends = [(x1, y1, x2, y2)] + ([(x2, y2, x1, y1)] if both else [])
+            for ax, ay, bx, by in ends:
+                length = math.hypot(bx - ax, by - ay)
+                ux, uy = (bx - ax) / length, (by - ay) / length
+                draw.polygon(
+                    [
+                        (bx, by),
+                        (bx - ux * head - uy * head / 2, by - uy * head + ux * head / 2),
+                        (bx - ux * head + uy * head / 2, by - uy * head - ux * head / 2),
+                    ],
+                    fill=edge_color,
+                )
+
+    px, py = viewport.project(layout.px[sectors], layout.py[sectors])
+    rows = list(zip(sectors.tolist(), px.tolist(), py.tolist()))
+    unit_hex = [(math.cos(math.radians(60 * i)), math.sin(math.radians(60 * i))) for i in range(6)]
+    for row, x, y in rows:
+        kind = "fedspace" if layout.fedspace[row] else "sector"
+        draw.polygon(
+            [(x + ux * hex_radius, y + uy * hex_radius) for ux, uy in unit_hex],
+            fill=_rgb(COLORS[f"{kind}-fill"]),
+            outline=_rgb(COLORS[f"{kind}-stroke"]),
         )
-        svg_lines.append(
-            f'<circle class="mega" cx="{legend_x:.2f}" cy="{legend_y + 74:.2f}" r="{mega_radius:.2f}" />'
+
+    if lod.ports:
+        for row, x, y in rows:
+            if not layout.port[row]:
+                continue
+            if layout.mega[row]:
+                r = hex_radius * 0.55
+                draw.ellipse(
+                    (x - r, y - r, x + r, y + r),
+                    fill=_rgb(COLORS["mega"]),
+                    outline=_rgb(COLORS["mega-stroke"]),
+                )
+            r = hex_radius * 0.33
+            draw.ellipse(
+                (x - r, y - r, x + r, y + r),
+                fill=_rgb(COLORS["port"]),
+                outline=_rgb(COLORS["port-stroke"]),
+            )
+
+    if lod.labels:
+        font = ImageFont.load_default()
+        for row, x, y in rows:
+            draw.text(
+                (x + hex_radius * 0.6, y - hex_radius * 0.35),
+                str(layout.sector_ids[row]),
+                fill=_rgb(COLORS["label"]),
+                font=font,
+                anchor="ls",
+            )
+
+    image.save(path, format="PNG")
+
+
+def auto_max_zoom(layout: MapLayout, tile_size: int) -> int:
+    """Smallest zoom at which a hex reaches ``AUTO_MAX_ZOOM_RADIUS`` pixels."""
+    base_radius = layout.hex_radius * tile_size / max(layout.width, layout.height)
+    if base_radius <= 0:
+        return 0
+    return max(0, math.ceil(math.log2(AUTO_MAX_ZOOM_RADIUS / base_radius)))
+
+
+def _tile_ranges(
+    lo: np.ndarray, hi: np.ndarray, tile_extent: float, count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    first = np.clip(np.floor(lo / tile_extent), 0, count - 1).astype(np.int64)
+    last = np.clip(np.floor(hi / tile_extent), 0, count - 1).astype(np.int64)
+    return first, last
+
+
+def _bucket(
+    x_range: Tuple[np.ndarray, np.ndarray], y_range: Tuple[np.ndarray, np.ndarray]
+) -> Dict[Tuple[int, int], List[int]]:
+    """Assign each item to every tile its bounding box overlaps."""
+    buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    x0, x1 = x_range
+    y0, y1 = y_range
+    single = (x0 == x1) & (y0 == y1)
+    for item, tx, ty in zip(
+        np.flatnonzero(single).tolist(), x0[single].tolist(), y0[single].tolist()
+    ):
+        buckets[(tx, ty)].append(item)
+    for item in np.flatnonzero(~single).tolist():
+        for tx in range(int(x0[item]), int(x1[item]) + 1):
+            for ty in range(int(y0[item]), int(y1[item]) + 1):
+                buckets[(tx, ty)].append(item)
+    return buckets
+
+
+def write_tile_pyramid(
+    layout: MapLayout,
+    out_dir: Path,
+    *,
+    tile_size: int = 256,
+    max_zoom: int | None = None,
+    tile_format: str = "svg",
+    edges: bool = True,
+    labels: bool = False,
+) -> Dict[str, object]:
+    """Write ``out_dir/{z}/{x}/{y}.{fmt}`` tiles and ``out_dir/index.json``.
+
+    Zoom 0 fits the whole canvas in one tile; each level doubles the scale.
+    Tiles with nothing in them are not written and are absent from the index.
+    Returns the index payload.
+    """
+    if tile_format not in TILE_FORMATS:
+        raise ValueError(f"tile_format must be one of {TILE_FORMATS}")
+    if max_zoom is None:
+        max_zoom = auto_max_zoom(layout, tile_size)
+
+    pad = layout.hex_radius
+    levels = []
+    for zoom in range(max_zoom + 1):
+        scale = tile_size / max(layout.width, layout.height) * (2**zoom)
+        cols = max(1, math.ceil(layout.width * scale / tile_size))
+        rows = max(1, math.ceil(layout.height * scale / tile_size))
+        extent = tile_size / scale
+        lod = LevelOfDetail.for_radius(layout.hex_radius * scale, edges=edges, labels=labels)
+
+        sector_tiles = _bucket(
+            _tile_ranges(layout.px - pad, layout.px + pad, extent, cols),
+            _tile_ranges(layout.py - pad, layout.py + pad, extent, rows),
         )
-        svg_lines.append(
-            f'<text x="{legend_x + 18}" y="{legend_y + 78}" class="legend">Mega-port</text>'
+        edge_tiles: Dict[Tuple[int, int], List[int]] = {}
+        if lod.edges and layout.edge_count:
+            sx, tx = layout.px[layout.edge_src], layout.px[layout.edge_dst]
+            sy, ty = layout.py[layout.edge_src], layout.py[layout.edge_dst]
+            edge_tiles = _bucket(
+                _tile_ranges(np.minimum(sx, tx), np.maximum(sx, tx), extent, cols),
+                _tile_ranges(np.minimum(sy, ty), np.maximum(sy, ty), extent, rows),
+            )
+
+        written = []
+        for tx, ty in sorted(set(sector_tiles) | set(edge_tiles)):
+            viewport = Viewport(tx * extent, ty * extent, tile_size, tile_size, scale)
+            tile_sectors = np.asarray(sector_tiles.get((tx, ty), []), dtype=np.int64)
+            tile_edges = np.asarray(edge_tiles.get((tx, ty), []), dtype=np.int64)
+            path = out_dir / str(zoom) / str(tx) / f"{ty}.{tile_format}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if tile_format == "svg":
+                with path.open("w", encoding="utf-8") as handle:
+                    write_svg(handle, layout, viewport, lod, sectors=tile_sectors, edges=tile_edges)
+            else:
+                write_png(path, layout, viewport, lod, sectors=tile_sectors, edges=tile_edges)
+            written.append([tx, ty])
+
+        levels.append(
+            {
+                "zoom": zoom,
+                "scale": scale,
+                "cols": cols,
+                "rows": rows,
+                "hex_radius": layout.hex_radius * scale,
+                "detail": {
+                    "edges": lod.edges,
+                    "arrows": lod.arrows,
+                    "ports": lod.ports,
+                    "labels": lod.labels,
+                },
+                "tiles": written,
+            }
         )
-        svg_lines.append("</g>")
 
-    svg_lines.append("</svg>")
+    index: Dict[str, object] = {
+        "format": tile_format,
+        "tile_size": tile_size,
+        "min_zoom": 0,
+        "max_zoom": max_zoom,
+        "url_template": f"{{z}}/{{x}}/{{y}}.{tile_format}",
+        "canvas": {"width": layout.width, "height": layout.height},
+        "sector_count": layout.sector_count,
+        "edge_count": layout.edge_count,
+        "levels": levels,
+    }
+    (out_dir / TILE_INDEX_NAME).write_text(json.dumps(index, indent=2) + "\n")
+    return index
 
-    args.output.write_text("\n".join(svg_lines) + "\n")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate an SVG map (or map tile pyramid) from generated universe.json."
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(settings.GRADIENTBANG_WORLD_DATA_DIR),
+        help="Path to universe.json, universe.npz, or a directory containing one",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("artifacts/universe-map.svg"),
+        help="Output SVG path (default: artifacts/universe-map.svg)",
+    )
+    parser.add_argument("--width", type=int, default=3200)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--margin", type=int, default=80)
+    parser.add_argument("--no-edges", action="store_true")
+    parser.add_argument("--legend", action="store_true")
+    parser.add_argument(
+        "--labels",
+        action="store_true",
+        help="Include sector number labels (default: off)",
+    )
+    parser.add_argument(
+        "--tiles",
+        type=Path,
+        default=None,
+        help="Write a zoom-level tile pyramid to this directory instead of one SVG",
+    )
+    parser.add_argument("--tile-format", choices=TILE_FORMATS, default="svg")
+    parser.add_argument("--tile-size", type=int, default=256)
+    parser.add_argument(
+        "--max-zoom",
+        type=int,
+        default=None,
+        help="Deepest zoom level (default: until hexes are ~24px across)",
+    )
+    args = parser.parse_args()
+
+    universe = open_universe(args.data_dir)
+    layout = build_layout(universe, args.width, args.height, args.margin)
+
+    if args.tiles is not None:
+        index = write_tile_pyramid(
+            layout,
+            args.tiles,
+            tile_size=args.tile_size,
+            max_zoom=args.max_zoom,
+            tile_format=args.tile_format,
+            edges=not args.no_edges,
+            labels=args.labels,
+        )
+        tile_count = sum(len(level["tiles"]) for level in index["levels"])  # type: ignore[union-attr]
+        print(f"Wrote {tile_count} tiles (zoom 0-{index['max_zoom']}) to {args.tiles}")
+        return 0
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    viewport = Viewport(0.0, 0.0, args.width, args.height, 1.0)
+    with args.output.open("w", encoding="utf-8") as handle:
+        write_svg(
+            handle,
+            layout,
+            viewport,
+            LevelOfDetail.full(edges=not args.no_edges, labels=args.labels),
+            legend_margin=args.margin if args.legend else None,
+        )
     print(f"Wrote {args.output}")
     return 0
 
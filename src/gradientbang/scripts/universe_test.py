@@ -2,18 +2,20 @@
 """Validate generated universe JSON connectivity and warp metadata."""
 
 import argparse
-import json
 import sys
-from collections import deque
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order, connected_components
 
 from gradientbang.config import settings
+from gradientbang.scripts.universe_format import UniverseArrays, open_universe
 
-DEFAULT_UNIVERSE_PATH = Path(settings.GRADIENTBANG_WORLD_DATA_DIR) / "universe.json"
+DEFAULT_UNIVERSE_PATH = Path(settings.GRADIENTBANG_WORLD_DATA_DIR)
 TwoWayIssue = Tuple[
     str,
     Tuple[int, int],
@@ -57,20 +59,76 @@ class UniverseValidationReport:
         return self.two_way_warps / total if total else 0.0
 
 
-def load_universe_data(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(f"Missing universe JSON: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+def load_universe_data(path: Path) -> UniverseArrays:
+    return open_universe(path)
 
 
-def build_graph(universe_data: Dict[str, Any]) -> nx.DiGraph:
-    graph = nx.DiGraph()
-    for sector in _sectors(universe_data):
-        graph.add_node(sector["id"])
-    for sector in _sectors(universe_data):
-        for warp in sector.get("warps", []):
-            graph.add_edge(sector["id"], warp["to"])
-    return graph
+class WarpGraph:
+    """Directed warp graph stored as a CSR adjacency matrix.
+
+    Graph rows are sector rows in file order, followed by any warp targets
+    that have no sector of their own. `node_ids` maps rows back to sector ids.
+    Component labellings are computed once and shared by every check.
+    """
+
+    def __init__(self, node_ids: np.ndarray, adjacency: csr_matrix):
+        self.node_ids = node_ids
+        self.adjacency = adjacency
+
+    @property
+    def number_of_nodes(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    @property
+    def number_of_edges(self) -> int:
+        return int(self.adjacency.nnz)
+
+    @cached_property
+    def edge_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        coo = self.adjacency.tocoo()
+        return coo.row, coo.col
+
+    @cached_property
+    def strong_components(self) -> Tuple[int, np.ndarray]:
+        return connected_components(self.adjacency, directed=True, connection="strong")
+
+    @cached_property
+    def weak_components(self) -> Tuple[int, np.ndarray]:
+        return connected_components(self.adjacency, directed=True, connection="weak")
+
+    def row_of(self, sector_id: int) -> Optional[int]:
+        order = self._id_order
+        pos = int(np.searchsorted(self.node_ids, sector_id, sorter=order))
+        if pos < len(order) and self.node_ids[order[pos]] == sector_id:
+            return int(order[pos])
+        return None
+
+    @cached_property
+    def _id_order(self) -> np.ndarray:
+        return np.argsort(self.node_ids, kind="stable")
+
+
+def build_graph(universe: UniverseArrays) -> WarpGraph:
+    sector_ids = np.asarray(universe.sector_ids, dtype=np.int64)
+    targets = np.asarray(universe.warp_targets, dtype=np.int64)
+
+    # Warps may point at ids with no sector entry; they still count as nodes.
+    known = np.isin(targets, sector_ids)
+    extra_ids, first_seen = np.unique(targets[~known], return_index=True)
+    node_ids = np.concatenate([sector_ids, extra_ids[np.argsort(first_seen)]])
+
+    order = np.argsort(node_ids, kind="stable")
+    dst = order[np.searchsorted(node_ids, targets, sorter=order)]
+    src = np.repeat(np.arange(len(sector_ids)), np.diff(universe.warp_offsets))
+
+    n = len(node_ids)
+    adjacency = csr_matrix(
+        (np.ones(len(dst), dtype=np.int8), (src, dst)),
+        shape=(n, n),
+    )
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1
+    return WarpGraph(node_ids, adjacency)
 
 
 def validate_universe_file(path: Path) -> UniverseValidationReport:
@@ -78,35 +136,35 @@ def validate_universe_file(path: Path) -> UniverseValidationReport:
 
 
 def validate_universe_data(
-    universe_data: Dict[str, Any],
+    universe_data: Union[Dict[str, Any], UniverseArrays],
 ) -> UniverseValidationReport:
-    sectors = _sectors(universe_data)
-    if not sectors:
+    universe = _as_arrays(universe_data)
+    if universe.sector_count == 0:
         raise ValueError("universe JSON contains no sectors")
 
-    graph = build_graph(universe_data)
-    start_sector = _start_sector(universe_data)
-    two_way_warps, one_way_warps = _warp_counts(universe_data)
-    scc_sizes = sorted(
-        (len(component) for component in nx.strongly_connected_components(graph)),
-        reverse=True,
-    )
+    graph = build_graph(universe)
+    start_sector = _start_sector(universe.meta)
+    two_way_warps = int(np.count_nonzero(universe.warp_two_way))
+    one_way_warps = universe.warp_count - two_way_warps
+    _, scc_labels = graph.strong_components
+    scc_sizes = sorted(np.bincount(scc_labels).tolist(), reverse=True)
+    average_degree = graph.number_of_edges / graph.number_of_nodes
 
     return UniverseValidationReport(
-        sector_count=graph.number_of_nodes(),
-        warp_count=graph.number_of_edges(),
+        sector_count=graph.number_of_nodes,
+        warp_count=graph.number_of_edges,
         start_sector=start_sector,
-        average_out_degree=_average_degree(graph, incoming=False),
-        average_in_degree=_average_degree(graph, incoming=True),
+        average_out_degree=average_degree,
+        average_in_degree=average_degree,
         two_way_warps=two_way_warps,
         one_way_warps=one_way_warps,
-        strongly_connected=nx.is_strongly_connected(graph),
+        strongly_connected=check_strong_connectivity(graph),
         scc_sizes=scc_sizes,
-        dead_ends=find_dead_ends(universe_data),
+        dead_ends=find_dead_ends(universe),
         unreachable_from_start=find_unreachable_from_start(graph, start_sector),
         trap_clusters=find_trap_clusters(graph),
         isolated_clusters=find_isolated_clusters(graph),
-        two_way_inconsistencies=find_two_way_inconsistencies(universe_data),
+        two_way_inconsistencies=find_two_way_inconsistencies(universe),
     )
 
 
@@ -167,85 +225,98 @@ def format_validation_report(
     return "\n".join(lines)
 
 
-def find_two_way_inconsistencies(
-    universe_data: Dict[str, Any],
-) -> List[TwoWayIssue]:
-    edges = _map_edges(universe_data)
-    problems = []
-    checked_pairs = set()
-    for (u, v), _info_uv in edges.items():
-        pair = (min(u, v), max(u, v))
-        if pair in checked_pairs:
-            continue
-        checked_pairs.add(pair)
-
-        uv = (u, v)
-        vu = (v, u)
-        has_uv = uv in edges
-        has_vu = vu in edges
-        flag_uv = edges[uv].get("two_way") if has_uv else None
-        flag_vu = edges[vu].get("two_way") if has_vu else None
-
-        if has_uv and has_vu and not (flag_uv and flag_vu):
-            problems.append(("mutual_edges_not_flagged_two_way", uv, vu, flag_uv, flag_vu))
-        elif has_uv and not has_vu and flag_uv:
-            problems.append(("one_way_flagged_two_way", uv, None, flag_uv, None))
-        elif has_vu and not has_uv and flag_vu:
-            problems.append(("one_way_flagged_two_way", vu, None, flag_vu, None))
+def find_two_way_inconsistencies(universe: UniverseArrays) -> List[TwoWayIssue]:
+    targets = np.asarray(universe.warp_targets, dtype=np.int64)
+    if len(targets) == 0:
+        return []
+    sources = np.repeat(np.asarray(universe.sector_ids, dtype=np.int64), np.diff(universe.warp_offsets))
+
+    # Encode each (u, v) as one scalar over dense id ranks so pairs and their
+    # reverses can be matched with a single sorted lookup.
+    ids, ranks = np.unique(np.concatenate([sources, targets]), return_inverse=True)
+    span = len(ids)
+    keys = ranks[: len(sources)] * span + ranks[len(sources) :]
+
+    # Deduplicate the way a dict keyed on (u, v) would: the first occurrence
+    # fixes the position, the last occurrence wins the flag.
+    unique_keys, first_idx = np.unique(keys, return_index=True)
+    _, last_from_end = np.unique(keys[::-1], return_index=True)
+    flags = np.asarray(universe.warp_two_way, dtype=bool)[len(keys) - 1 - last_from_end]
+
+    reverse_keys = (unique_keys % span) * span + unique_keys // span
+    reverse_idx = np.minimum(np.searchsorted(unique_keys, reverse_keys), len(unique_keys) - 1)
+    has_reverse = unique_keys[reverse_idx] == reverse_keys
+    reverse_flags = np.where(has_reverse, flags[reverse_idx], False)
+
+    # Report each mutual pair once, at whichever direction appeared first.
+    mutual_issue = (
+        has_reverse & (first_idx <= first_idx[reverse_idx]) & ~(flags & reverse_flags)
+    )
+    one_way_issue = ~has_reverse & flags
+    issue_idx = np.flatnonzero(mutual_issue | one_way_issue)
+    issue_idx = issue_idx[np.argsort(first_idx[issue_idx], kind="stable")]
+
+    problems: List[TwoWayIssue] = []
+    for idx in issue_idx.tolist():
+        u = int(ids[unique_keys[idx] // span])
+        v = int(ids[unique_keys[idx] % span])
+        if has_reverse[idx]:
+            problems.append(
+                (
+                    "mutual_edges_not_flagged_two_way",
+                    (u, v),
+                    (v, u),
+                    bool(flags[idx]),
+                    bool(reverse_flags[idx]),
+                )
+            )
+        else:
+            problems.append(("one_way_flagged_two_way", (u, v), None, True, None))
     return problems
 
 
-def find_dead_ends(universe_data: Dict[str, Any]) -> List[int]:
-    return [sector["id"] for sector in _sectors(universe_data) if not sector.get("warps")]
+def find_dead_ends(universe: UniverseArrays) -> List[int]:
+    out_degree = np.diff(universe.warp_offsets)
+    return np.asarray(universe.sector_ids)[out_degree == 0].tolist()
 
 
 def find_unreachable_from_start(
-    graph: nx.DiGraph,
+    graph: WarpGraph,
     start_sector: int = 0,
 ) -> List[int]:
-    if start_sector not in graph:
-        return sorted(graph.nodes())
-
-    reachable = set()
-    queue = deque([start_sector])
-    while queue:
-        current = queue.popleft()
-        if current in reachable:
-            continue
-        reachable.add(current)
-        for neighbor in graph.successors(current):
-            if neighbor not in reachable:
-                queue.append(neighbor)
-    return sorted(set(graph.nodes()) - reachable)
-
-
-def find_trap_clusters(graph: nx.DiGraph) -> List[List[int]]:
-    sccs = list(nx.strongly_connected_components(graph))
-    condensation = nx.condensation(graph, sccs)
-    traps = []
-    for scc_idx, scc_nodes in enumerate(sccs):
-        if condensation.in_degree(scc_idx) > 0 and condensation.out_degree(scc_idx) == 0:
-            traps.append(sorted(scc_nodes))
-    return traps
-
-
-def find_isolated_clusters(graph: nx.DiGraph) -> List[List[int]]:
-    if nx.is_strongly_connected(graph):
+    start_row = graph.row_of(start_sector)
+    if start_row is None:
+        return sorted(graph.node_ids.tolist())
+
+    reachable = np.zeros(graph.number_of_nodes, dtype=bool)
+    reachable[breadth_first_order(graph.adjacency, start_row, return_predecessors=False)] = True
+    return sorted(graph.node_ids[~reachable].tolist())
+
+
+def find_trap_clusters(graph: WarpGraph) -> List[List[int]]:
+    count, labels = graph.strong_components
+    src, dst = graph.edge_rows
+    src_labels, dst_labels = labels[src], labels[dst]
+    crossing = src_labels != dst_labels
+    out_degree = np.bincount(src_labels[crossing], minlength=count)
+    in_degree = np.bincount(dst_labels[crossing], minlength=count)
+    traps = (in_degree > 0) & (out_degree == 0)
+    return [cluster for label, cluster in _clusters(graph, labels, count) if traps[label]]
+
+
+def find_isolated_clusters(graph: WarpGraph) -> List[List[int]]:
+    if check_strong_connectivity(graph):
         return []
 
-    isolated = []
-    for component in nx.weakly_connected_components(graph):
-        external_edges = 0
-        for node in component:
-            external_edges += sum(1 for pred in graph.predecessors(node) if pred not in component)
-            external_edges += sum(1 for succ in graph.successors(node) if succ not in component)
-        if external_edges == 0:
-            isolated.append(sorted(component))
-    return isolated
+    # A weakly connected component has no edges to the rest of the graph by
+    # construction, so every component is reported once the graph is split.
+    count, labels = graph.weak_components
+    return [cluster for _label, cluster in _clusters(graph, labels, count)]
 
 
-def check_strong_connectivity(graph: nx.DiGraph) -> bool:
-    return nx.is_strongly_connected(graph)
+def check_strong_connectivity(graph: WarpGraph) -> bool:
+    count, _labels = graph.strong_components
+    return count == 1
 
 
 def analyze_universe(filepath: Path) -> bool:
@@ -254,24 +325,29 @@ def analyze_universe(filepath: Path) -> bool:
     return report.passed
 
 
-def _sectors(universe_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _as_arrays(universe_data: Union[Dict[str, Any], UniverseArrays]) -> UniverseArrays:
+    if isinstance(universe_data, UniverseArrays):
+        return universe_data
     sectors = universe_data.get("sectors")
     if not isinstance(sectors, list):
         raise ValueError("universe JSON missing required list: sectors")
-    return sectors
+    return UniverseArrays.from_sectors(universe_data.get("meta", {}), sectors)
 
 
-def _map_edges(universe_data: Dict[str, Any]) -> Dict[Tuple[int, int], Dict[str, Any]]:
-    edges = {}
-    for sector in _sectors(universe_data):
-        source = sector["id"]
-        for warp in sector.get("warps", []):
-            edges[(source, warp["to"])] = warp
-    return edges
+def _clusters(
+    graph: WarpGraph,
+    labels: np.ndarray,
+    count: int,
+) -> List[Tuple[int, List[int]]]:
+    """Group nodes by component label, ordered by each component's first row."""
+    order = np.argsort(labels, kind="stable")
+    bounds = np.cumsum(np.bincount(labels, minlength=count))[:-1]
+    groups = np.split(order, bounds)
+    groups.sort(key=lambda rows: rows[0])
+    return [(int(labels[rows[0]]), sorted(graph.node_ids[rows].tolist())) for rows in groups]
 
 
-def _start_sector(universe_data: Dict[str, Any]) -> int:
-    meta = universe_data.get("meta", {})
+def _start_sector(meta: Dict[str, Any]) -> int:
     mega_ports = meta.get("mega_port_sectors")
     if not mega_ports and meta.get("mega_port_sector") is not None:
         mega_ports = [meta["mega_port_sector"]]
@@ -282,25 +358,6 @@ def _start_sector(universe_data: Dict[str, Any]) -> int:
     return 0
 
 
-def _warp_counts(universe_data: Dict[str, Any]) -> Tuple[int, int]:
-    two_way = 0
-    one_way = 0
-    for sector in _sectors(universe_data):
-        for warp in sector.get("warps", []):
-            if warp.get("two_way"):
-                two_way += 1
-            else:
-                one_way += 1
-    return two_way, one_way
-
-
-def _average_degree(graph: nx.DiGraph, *, incoming: bool) -> float:
-    if graph.number_of_nodes() == 0:
-        return 0.0
-    degrees = graph.in_degree() if incoming else graph.out_degree()
-    return sum(degree for _node, degree in degrees) / graph.number_of_nodes()
-
-
 def _sample(value: Any, limit: int) -> str:
     if isinstance(value, list):
         suffix = "" if len(value) <= limit else f" ... (+{len(value) - limit} more)"
@@ -315,7 +372,10 @@ def main() -> int:
         type=Path,
         nargs="?",
         default=DEFAULT_UNIVERSE_PATH,
-        help="Path to universe.json (default: GRADIENTBANG_WORLD_DATA_DIR/universe.json)",
+        help=(
+            "Path to universe.json, universe.npz, or a directory containing one "
+            "(default: GRADIENTBANG_WORLD_DATA_DIR)"
+        ),
     )
     args = parser.parse_args()
 
@@ -0,0 +1,211 @@
+"""Direct-Postgres universe loader (binary COPY) against a real database.
+
+Opt-in via ``pytest.mark.integration``; skipped unless ``POSTGRES_URL`` is set
+(the integration harness in ``scripts/run-integration-tests.sh`` exports it
+for the local Supabase container). Everything runs inside a throwaway schema
+selected through ``search_path`` so the shared test database is never touched.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+
+import psycopg
+import pytest
+from psycopg.conninfo import make_conninfo
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from gradientbang.scripts.load_universe_to_supabase import PostgresUniverseLoader  # noqa: E402
+
+pytestmark = pytest.mark.integration
+
+SCHEMA_DDL = """
+CREATE TABLE universe_config (
+  id INTEGER PRIMARY KEY DEFAULT 1,
+  sector_count INTEGER NOT NULL,
+  generation_seed BIGINT,
+  generation_params JSONB,
+  meta JSONB,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  CHECK (id = 1)
+);
+CREATE TABLE universe_structure (
+  sector_id INTEGER PRIMARY KEY,
+  position_x DOUBLE PRECISION NOT NULL,
+  position_y DOUBLE PRECISION NOT NULL,
+  region TEXT,
+  warps JSONB NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE TABLE ports (
+  port_id BIGSERIAL PRIMARY KEY,
+  sector_id INTEGER NOT NULL UNIQUE REFERENCES universe_structure(sector_id),
+  port_code CHAR(3) NOT NULL,
+  port_class INTEGER NOT NULL,
+  max_qf INTEGER NOT NULL,
+  max_ro INTEGER NOT NULL,
+  max_ns INTEGER NOT NULL,
+  stock_qf INTEGER NOT NULL,
+  stock_ro INTEGER NOT NULL,
+  stock_ns INTEGER NOT NULL,
+  last_updated TIMESTAMPTZ DEFAULT NOW(),
+  version INTEGER DEFAULT 1
+);
+CREATE TABLE sector_contents (
+  sector_id INTEGER PRIMARY KEY REFERENCES universe_structure(sector_id),
+  port_id BIGINT REFERENCES ports(port_id),
+  combat JSONB,
+  salvage JSONB DEFAULT '[]',
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE TABLE ship_instances (ship_id UUID);
+CREATE TABLE characters (character_id UUID);
+CREATE TABLE corporations (corp_id UUID);
+CREATE TABLE garrisons (sector_id INTEGER);
+CREATE TABLE events (id BIGINT);
+CREATE TABLE port_transactions (id BIGINT);
+"""
+
+
+def _postgres_dsn() -> str | None:
+    return os.environ.get("POSTGRES_URL")
+
+
+@pytest.fixture
+def schema_dsn():
+    dsn = _postgres_dsn()
+    if not dsn:
+        pytest.skip(
+            "Universe COPY loader test requires POSTGRES_URL "
+            "(set by scripts/run-integration-tests.sh)"
+        )
+
+    schema = f"gb_universe_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+        conn.execute(f"SET search_path TO {schema}")
+        conn.execute(SCHEMA_DDL)
+    try:
+        yield make_conninfo(dsn, options=f"-c search_path={schema}")
+    finally:
+        with psycopg.connect(dsn, autocommit=True) as conn:
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+def _port(code: str) -> dict:
+    names = {"QF": "quantum_foam", "RO": "retro_organics", "NS": "neuro_symbolics"}
+    return {
+        "class": 1,
+        "code": code,
+        "buys": [names[c] for c, ch in zip(names, code) if ch == "B"],
+        "sells": [names[c] for c, ch in zip(names, code) if ch == "S"],
+        "stock": {c: (700 if ch == "S" else 0) for c, ch in zip(names, code)},
+        "stock_max": {c: (700 if ch == "S" else 0) for c, ch in zip(names, code)},
+        "demand": {c: (900 if ch == "B" else 0) for c, ch in zip(names, code)},
+        "demand_max": {c: (900 if ch == "B" else 0) for c, ch in zip(names, code)},
+    }
+
+
+def _write_universe(tmp_path, sector_count: int = 60, seed: int = 1):
+    sectors = []
+    for s in range(sector_count):
+        prev_s, next_s = (s - 1) % sector_count, (s + 1) % sector_count
+        sectors.append(
+            {
+                "id": s,
+                "position": {"x": s, "y": s % 5},
+                "region": 1 if s < 10 else 0,
+                "warps": [
+                    {"to": t, "two_way": True} for t in sorted({prev_s, next_s})
+                ],
+                "port": _port("BBS") if s % 3 == 0 else None,
+                "planets": [],
+            }
+        )
+    universe = {
+        "meta": {
+            "sector_count": sector_count,
+            "seed": seed,
+            "regions": [{"id": 0, "name": "Neutral"}, {"id": 1, "name": "Federation Space"}],
+            "mega_port_sectors": [0],
+        },
+        "sectors": sectors,
+    }
+    path = tmp_path / "universe.json"
+    path.write_text(json.dumps(universe))
+    return path
+
+
+def _counts(dsn: str) -> dict:
+    with psycopg.connect(dsn) as conn:
+        return {
+            table: conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ("universe_config", "universe_structure", "ports", "sector_contents")
+        }
+
+
+def test_copy_loader_loads_and_links_tables(schema_dsn, tmp_path):
+    path = _write_universe(tmp_path)
+    loader = PostgresUniverseLoader(schema_dsn)
+
+    assert loader.check_existing_universe() is False
+    loader.load(path)
+
+    assert _counts(schema_dsn) == {
+        "universe_config": 1,
+        "universe_structure": 60,
+        "ports": 20,
+        "sector_contents": 60,
+    }
+    with psycopg.connect(schema_dsn) as conn:
+        warps, region = conn.execute(
+            "SELECT warps, region FROM universe_structure WHERE sector_id = 0"
+        ).fetchone()
+        assert warps == [{"to": 1, "two_way": True}, {"to": 59, "two_way": True}]
+        assert region == "Federation Space"
+        linked = conn.execute(
+            "SELECT count(*) FROM sector_contents sc JOIN ports p USING (port_id)"
+            " WHERE p.sector_id = sc.sector_id"
+        ).fetchone()[0]
+        assert linked == 20
+        stock_ns, max_qf = conn.execute(
+            "SELECT stock_ns, max_qf FROM ports WHERE sector_id = 3"
+        ).fetchone()
+        assert (stock_ns, max_qf) == (700, 900)
+    assert PostgresUniverseLoader(schema_dsn).check_existing_universe() is True
+
+
+def test_force_reload_replaces_universe_in_one_transaction(schema_dsn, tmp_path):
+    PostgresUniverseLoader(schema_dsn).load(_write_universe(tmp_path, sector_count=60))
+
+    reloaded = tmp_path / "reload"
+    reloaded.mkdir()
+    loader = PostgresUniverseLoader(schema_dsn)
+    loader.truncate_universe()
+    loader.load(_write_universe(reloaded, sector_count=30, seed=2))
+
+    assert _counts(schema_dsn)["universe_structure"] == 30
+    with psycopg.connect(schema_dsn) as conn:
+        assert conn.execute("SELECT generation_seed FROM universe_config").fetchone()[0] == 2
+
+
+def test_failed_reload_keeps_previous_universe(schema_dsn, tmp_path, monkeypatch):
+    PostgresUniverseLoader(schema_dsn).load(_write_universe(tmp_path, sector_count=60))
+
+    reloaded = tmp_path / "reload"
+    reloaded.mkdir()
+    loader = PostgresUniverseLoader(schema_dsn)
+    loader.truncate_universe()
+
+    def fail_verification(_universe):
+        raise ValueError("integrity check failed")
+
+    monkeypatch.setattr(loader, "verify_integrity", fail_verification)
+    with pytest.raises(ValueError, match="integrity check failed"):
+        loader.load(_write_universe(reloaded, sector_count=30, seed=2))
+
+    assert _counts(schema_dsn)["universe_structure"] == 60
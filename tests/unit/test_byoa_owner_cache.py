@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, MagicMock
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.runtime.bus import BusByoaPresenceMessage
+from gradientbang.runtime.byoa import ByoaAgentConfig
+from gradientbang.runtime.byoa_coordinator import ByoaCoordinator, ByoaOwnerCache
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+CLAIMED = "22222222-2222-2222-2222-222222222222"
+UNCLAIMED = "33333333-3333-3333-3333-333333333333"
+STRANGER = "44444444-4444-4444-4444-444444444444"
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    """Answers ``my_corporation`` from a mutable ship list."""
+
+    def __init__(self) -> None:
+        super().__init__("http://test.local", character_id=PLAYER_ID)
+        self.ships: List[Dict[str, Any]] = [
+            {"ship_id": CLAIMED, "byoa": {"owner_character_id_prefix": "abc123def456"}},
+            {"ship_id": UNCLAIMED, "byoa": None},
+        ]
+        self.corp_reads = 0
+        self.release: asyncio.Event | None = None
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        assert endpoint == "my_corporation"
+        self.corp_reads += 1
+        if self.release is not None:
+            await self.release.wait()
+        return {"corporation": {"ships": [dict(ship) for ship in self.ships]}}
+
+
+def _coordinator(client: FakeGameClient) -> ByoaCoordinator:
+    return ByoaCoordinator(
+        host=MagicMock(),
+        game_client=client,
+        rtvi=MagicMock(push_frame=AsyncMock()),
+        character_id=PLAYER_ID,
+        config=ByoaAgentConfig(),
+    )
+
+
+async def test_one_corporation_read_answers_every_ship_until_an_event_changes_it():
+    client = FakeGameClient()
+    coordinator = _coordinator(client)
+
+    assert await coordinator.lookup_owner(CLAIMED) == "abc123def456"
+    assert await coordinator.lookup_owner(UNCLAIMED) is None
+    assert await coordinator.lookup_owner(CLAIMED) == "abc123def456"
+    assert client.corp_reads == 1
+
+    client.ships[1]["byoa"] = {"owner_character_id_prefix": "fedcba654321"}
+    await client._process_event(
+        "ship.byoa_configured", {"ship_id": UNCLAIMED, "action": "set"}
+    )
+
+    assert await coordinator.lookup_owner(UNCLAIMED) == "fedcba654321"
+    assert await coordinator.lookup_owner(CLAIMED) == "abc123def456"
+    assert client.corp_reads == 2
+
+    await client._process_event("corporation.member_left", {"corp_id": "corp-1"})
+    await coordinator.lookup_owner(CLAIMED)
+    assert client.corp_reads == 3
+    stats = coordinator.owner_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["fetches"]) == (3, 3, 3)
+
+
+async def test_unknown_ships_are_cached_briefly_and_dropped_on_purchase():
+    client = FakeGameClient()
+    coordinator = _coordinator(client)
+
+    assert await coordinator.lookup_owner(STRANGER) is None
+    assert await coordinator.lookup_owner(STRANGER) is None
+    assert client.corp_reads == 1
+    assert coordinator.owner_cache_stats()["negative_hits"] == 1
+
+    # A purchase of another ship still drops not-in-corp entries.
+    client.ships.append({"ship_id": STRANGER, "byoa": None})
+    await client._process_event(
+        "corporation.ship_purchased", {"ship_id": "55555555-5555-5555-5555-555555555555"}
+    )
+    assert await coordinator.lookup_owner(STRANGER) is None
+    assert await coordinator.lookup_owner(CLAIMED) == "abc123def456"
+    assert client.corp_reads == 2
+
+
+async def test_concurrent_lookups_share_one_read_that_an_invalidation_discards():
+    client = FakeGameClient()
+    client.release = asyncio.Event()
+    coordinator = _coordinator(client)
+
+    lookups = [
+        asyncio.create_task(coordinator.lookup_owner(ship)) for ship in (CLAIMED, UNCLAIMED)
+    ]
+    await asyncio.sleep(0)
+    await client._process_event("corporation.ship_sold", {"ship_id": CLAIMED})
+    client.release.set()
+
+    assert await asyncio.gather(*lookups) == ["abc123def456", None]
+    assert client.corp_reads == 1
+    # The read raced an invalidation, so it was not kept.
+    await coordinator.lookup_owner(UNCLAIMED)
+    assert client.corp_reads == 2
+
+
+async def test_presence_flip_rereads_ownership():
+    client = FakeGameClient()
+    coordinator = _coordinator(client)
+
+    def presence(online: bool) -> BusByoaPresenceMessage:
+        return BusByoaPresenceMessage(
+            source=coordinator.agent_name_for(CLAIMED),
+            ship_id=CLAIMED,
+            online=online,
+            last_seen_at=None,
+        )
+
+    await coordinator.on_presence(presence(True))
+    await coordinator.on_presence(presence(True))
+    assert client.corp_reads == 1
+    await coordinator.on_presence(presence(False))
+    await coordinator.lookup_owner(CLAIMED)
+    assert client.corp_reads == 2
+    coordinator.close_sweeper()
+
+
+def test_expired_entries_are_refreshed_and_counted_when_they_changed():
+    now = [0.0]
+    cache = ByoaOwnerCache(ttl_seconds=60, negative_ttl_seconds=10, clock=lambda: now[0])
+    cache.store({CLAIMED: "abc123def456"}, generation=cache.generation, unknown=(STRANGER,))
+
+    now[0] = 30.0
+    assert cache.get(CLAIMED) == (True, "abc123def456")
+    assert cache.get(STRANGER) == (False, None)
+    now[0] = 90.0
+    assert cache.get(CLAIMED) == (False, None)
+    cache.store({CLAIMED: None}, generation=cache.generation)
+
+    stats = cache.stats()
+    assert stats["stale_refreshes"] == 1
+    assert stats["max_hit_age_seconds"] == 30.0
+    assert stats["hit_rate"] == 0.333
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+from gradientbang.runtime.byoa import ByoaAgentConfig
+from gradientbang.runtime.byoa_coordinator import (
+    PRESENCE_STALE_SECONDS,
+    ByoaCoordinator,
+    ByoaPresence,
+)
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def _coordinator(locks: dict[str, str]) -> ByoaCoordinator:
+    host = MagicMock()
+    host.name = "voice"
+    host.release_ship_lock = MagicMock(side_effect=lambda ship_id: locks.pop(ship_id, None))
+    host.send_bus_message = AsyncMock()
+    host.get_worker_registry = MagicMock(return_value=None)
+    game_client = MagicMock()
+    game_client.task_cancel = AsyncMock(return_value={"success": True})
+    return ByoaCoordinator(
+        host=host,
+        game_client=game_client,
+        rtvi=MagicMock(push_frame=AsyncMock()),
+        character_id=PLAYER_ID,
+        config=ByoaAgentConfig(),
+    )
+
+
+def _heartbeat(coordinator: ByoaCoordinator, ship_id: str, seconds_ago: float) -> None:
+    coordinator._record_presence(
+        ByoaPresence(
+            ship_id=ship_id,
+            online=True,
+            status="online",
+            last_seen_at=None,
+            last_seen_monotonic=time.monotonic() - seconds_ago,
+        )
+    )
+
+
+async def test_sweep_only_expires_presences_past_their_deadline():
+    locks = {"ship-0003": "task-3", "ship-renewed": "task-r"}
+    coordinator = _coordinator(locks)
+    for n in range(1000):
+        # Every 100th ship went quiet; the rest heartbeat recently.
+        quiet = n % 100 == 3
+        _heartbeat(coordinator, f"ship-{n:04d}", PRESENCE_STALE_SECONDS + 5.0 if quiet else 1.0)
+    # An old heartbeat superseded by a fresh one must not expire the ship.
+    _heartbeat(coordinator, "ship-renewed", PRESENCE_STALE_SECONDS + 5.0)
+    _heartbeat(coordinator, "ship-renewed", 1.0)
+
+    release = await coordinator._mark_stale_offline()
+    await release
+
+    offline = sorted(s for s, p in coordinator._presence.items() if not p.online)
+    assert offline == [f"ship-{n:04d}" for n in range(3, 1000, 100)]
+    assert coordinator._rtvi.push_frame.await_count == 10
+    # Only the expired ships were asked about locks; the one holding a lock released it.
+    assert coordinator._host.release_ship_lock.call_count == 10
+    coordinator._game_client.task_cancel.assert_awaited_once_with(
+        task_id="task-3", character_id=PLAYER_ID
+    )
+    assert locks == {"ship-renewed": "task-r"}
+    # Expired and superseded deadlines are gone; one live deadline per online ship remains.
+    assert len(coordinator._presence_deadlines) == 991
+    assert await coordinator._mark_stale_offline() is None
+
+
+async def test_sweep_releases_locks_in_one_batch_that_survives_a_failure():
+    locks = {"ship-a": "task-a", "ship-b": "task-b"}
+    coordinator = _coordinator(locks)
+    coordinator._game_client.task_cancel = AsyncMock(side_effect=[RuntimeError("boom"), {}])
+    _heartbeat(coordinator, "ship-a", PRESENCE_STALE_SECONDS + 1.0)
+    _heartbeat(coordinator, "ship-b", PRESENCE_STALE_SECONDS + 2.0)
+
+    release = await coordinator._mark_stale_offline()
+    assert release in coordinator._release_tasks
+    await release
+
+    assert locks == {}
+    assert coordinator._host.send_bus_message.await_count == 2
+    assert not coordinator._release_tasks
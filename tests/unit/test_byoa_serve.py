@@ -0,0 +1,121 @@
+"""Tests for the ``byoa --serve`` warm worker pool."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from gradientbang.runtime.byoa.serve import _WakeDaemon, _WarmWorkerPool
+
+SHIP_ID = "22222222-2222-2222-2222-222222222222"
+CHARACTER_ID = "11111111-1111-1111-1111-111111111111"
+
+# Speaks the worker protocol; a task whose channel is "crash" kills it.
+FAKE_WORKER = """
+import json, os, sys
+print(json.dumps({"event": "ready"}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["env"]["BYOA_CHANNEL"] == "crash":
+        os._exit(3)
+    print(json.dumps({"event": "done", "task_id": request["task_id"], "ok": True}), flush=True)
+"""
+
+
+def _wait_for(predicate, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.02)
+    raise AssertionError("condition not met in time")
+
+
+def _wake(daemon: _WakeDaemon, task_id: str, channel: str = "byoa_chan_1"):
+    return daemon.handle_wake(
+        authorization="Bearer secret",
+        payload={
+            "ship_id": SHIP_ID,
+            "task_id": task_id,
+            "env": {
+                "BYOA_CHANNEL": channel,
+                "BYOA_SHIP_ID": SHIP_ID,
+                "BYOA_BUS_DATABASE_URL": "postgresql://bus@localhost/db",
+            },
+        },
+    )
+
+
+def _idle_pids(pool: _WarmWorkerPool) -> list[int]:
+    return [
+        w["pid"]
+        for w in pool.health()["workers"]
+        if w["ready"] and not w["task_id"] and not w["retiring"]
+    ]
+
+
+@pytest.fixture
+def pool():
+    pool = _WarmWorkerPool(
+        size=1,
+        max_tasks_per_worker=2,
+        env=dict(os.environ),
+        command=[sys.executable, "-c", FAKE_WORKER],
+        respawn_delay_seconds=0.0,
+    )
+    pool.start()
+    yield pool
+    pool.terminate(timeout_seconds=2.0)
+
+
+@pytest.mark.unit
+class TestWarmWorkerPool:
+    def test_wakes_reuse_a_warm_worker_until_it_is_recycled(self, pool):
+        daemon = _WakeDaemon(
+            ship_id=SHIP_ID, character_id=CHARACTER_ID, wake_secret="secret", pool=pool
+        )
+        (first_pid,) = _wait_for(lambda: _idle_pids(pool))
+
+        status, body = _wake(daemon, "task-1")
+        assert (status, body["warm"], body["pid"]) == (202, True, first_pid)
+        _wait_for(lambda: _idle_pids(pool) == [first_pid])
+
+        status, body = _wake(daemon, "task-2")
+        assert body["pid"] == first_pid
+        # Second task hits max_tasks_per_worker: a fresh worker takes over.
+        (second_pid,) = _wait_for(lambda: _idle_pids(pool))
+        assert second_pid != first_pid
+        assert _wake(daemon, "task-3")[1]["pid"] == second_pid
+
+    def test_crashed_worker_is_replaced_and_busy_pool_falls_back(self, pool, monkeypatch):
+        spawned = []
+
+        class FakePopen:
+            pid = 4242
+
+            def __init__(self, cmd, env):
+                spawned.append(env["BYOA_TASK_ID"])
+
+            def poll(self):
+                return None
+
+        daemon = _WakeDaemon(
+            ship_id=SHIP_ID, character_id=CHARACTER_ID, wake_secret="secret", pool=pool
+        )
+        (first_pid,) = _wait_for(lambda: _idle_pids(pool))
+
+        assert _wake(daemon, "task-crash", channel="crash")[1]["warm"] is True
+        (replacement_pid,) = _wait_for(lambda: _idle_pids(pool))
+        assert replacement_pid != first_pid
+
+        # With the only worker busy, the next wake is a cold spawn.
+        with pool._lock:
+            pool._workers[0].task_id = "task-busy"
+        monkeypatch.setattr("gradientbang.runtime.byoa.serve.subprocess.Popen", FakePopen)
+        status, body = _wake(daemon, "task-cold")
+        assert (status, body["warm"], body["pid"]) == (202, False, 4242)
+        assert spawned == ["task-cold"]
+        # Duplicate wakes for a task running on a warm worker are acknowledged.
+        assert _wake(daemon, "task-busy")[1]["duplicate"] is True
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.runtime import chat_history
+from gradientbang.runtime.chat_history import (
+    ChatHistoryRing,
+    chat_history_ring,
+    fetch_chat_history,
+    track_chat_history,
+)
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def _message(n: int, minutes_ago: float) -> Dict[str, Any]:
+    sent_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return {
+        "id": f"msg-{n}",
+        "type": "broadcast",
+        "from_name": "Ana",
+        "content": f"hello {n}",
+        "to_name": None,
+        "timestamp": sent_at.isoformat(),
+    }
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    """Answers chat ``event.query`` calls from stored messages, newest first."""
+
+    def __init__(self, stored: List[Dict[str, Any]]) -> None:
+        super().__init__("http://test.local", character_id=PLAYER_ID)
+        self.stored = stored
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append((endpoint, dict(payload)))
+        start = datetime.fromisoformat(payload["start"])
+        rows = [
+            {"timestamp": message["timestamp"], "payload": message}
+            for message in sorted(self.stored, key=lambda m: m["timestamp"], reverse=True)
+            if datetime.fromisoformat(message["timestamp"]) >= start
+        ]
+        return {"request_id": "req", "events": rows[: payload["max_rows"]], "success": True}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rings(monkeypatch):
+    monkeypatch.setattr(chat_history, "_rings", type(chat_history._rings)())
+
+
+async def test_history_is_seeded_once_and_follows_live_messages():
+    client = FakeGameClient([_message(1, 30), _message(2, 20)])
+    ring = track_chat_history(client, PLAYER_ID)
+
+    first = await fetch_chat_history(client, PLAYER_ID)
+    assert [m["id"] for m in first] == ["msg-2", "msg-1"]
+
+    await client._process_event("chat.message", _message(3, 0))
+    # The same message replayed (e.g. by a catch-up query) is not duplicated.
+    await client._process_event("chat.message", _message(3, 0))
+    second = await fetch_chat_history(client, PLAYER_ID, max_rows=2)
+
+    assert len(client.requests) == 1
+    assert [m["id"] for m in second] == ["msg-3", "msg-2"]
+    assert len(ring) == 3
+
+
+async def test_reconnect_reuses_the_ring_and_only_queries_the_gap():
+    first_session = FakeGameClient([_message(1, 30)])
+    ring = track_chat_history(first_session, PLAYER_ID)
+    await ring.sync(first_session, PLAYER_ID)
+    synced_through = ring.synced_through
+
+    # A message sent after the first session synced, while disconnected.
+    second_session = FakeGameClient([_message(1, 30), _message(2, -1)])
+    assert track_chat_history(second_session, PLAYER_ID) is ring
+    await ring.sync(second_session, PLAYER_ID)
+
+    ((_, payload),) = second_session.requests
+    assert payload["start"] == synced_through.isoformat()
+    # Late arrivals are placed by timestamp, not arrival order.
+    ring.add(_message(0, 40))
+    messages = await fetch_chat_history(second_session, PLAYER_ID)
+    assert [m["id"] for m in messages] == ["msg-2", "msg-1", "msg-0"]
+    assert len(second_session.requests) == 1
+
+
+def test_ring_keeps_the_newest_messages_within_the_window():
+    ring = ChatHistoryRing(capacity=3)
+    for n in range(5):
+        ring.add(_message(n, 10 - n))
+    assert ring.add(_message(9, 60)) is False
+
+    assert [m["id"] for m in ring.recent()] == ["msg-4", "msg-3", "msg-2"]
+    ring.add(_message(5, 60 * 30))
+    assert [m["id"] for m in ring.recent(since_hours=24)] == ["msg-4", "msg-3", "msg-2"]
+    assert chat_history_ring(PLAYER_ID) is chat_history_ring(PLAYER_ID)
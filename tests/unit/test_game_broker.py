@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.runtime.bus import (
+    BusCombatStrategyRequest,
+    BusCombatStrategyResponse,
+    BusGameToolCallRequest,
+    BusGameToolCallResponse,
+)
+from gradientbang.runtime.game_broker import GameBrokerMixin
+
+PLAYER = "11111111-1111-1111-1111-111111111111"
+CORP_SHIP = "33333333-3333-3333-3333-333333333333"
+OTHER_SHIP = "44444444-4444-4444-4444-444444444444"
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    def __init__(self) -> None:
+        super().__init__("http://test.local", character_id=PLAYER)
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        from gradientbang.game.client import _per_call_actor_character_id, _per_call_character_id
+
+        identity = (_per_call_character_id.get(), _per_call_actor_character_id.get())
+        self.requests.append((endpoint, {**payload, "identity": identity}))
+        return {"success": True}
+
+
+class Host(GameBrokerMixin):
+    """Resolves every sender to the corp ship; ``byoa-*`` senders are pinned."""
+
+    name = "host"
+
+    def __init__(self) -> None:
+        self._game_client = FakeGameClient()
+        self.sent: List[Any] = []
+
+    async def send_bus_message(self, message) -> None:
+        self.sent.append(message)
+
+    def _broker_identity_for_message(self, message, *, task_id: Optional[str] = None):
+        return CORP_SHIP, PLAYER, task_id
+
+    def _broker_sender_pinned_to_ship(self, source: str) -> bool:
+        return source.startswith("byoa-")
+
+
+async def test_tool_call_uses_resolved_identity_not_args():
+    host = Host()
+    handled = await host.dispatch_broker_message(
+        BusGameToolCallRequest(
+            source="task-1",
+            target="host",
+            correlation_id="c1",
+            tool_name="move",
+            args={"to_sector": 7, "character_id": OTHER_SHIP, "actor_character_id": OTHER_SHIP},
+            character_id=OTHER_SHIP,
+            task_id="t1",
+        )
+    )
+
+    assert handled
+    [response] = host.sent
+    assert isinstance(response, BusGameToolCallResponse) and response.error is None
+    [(endpoint, payload)] = host._game_client.requests
+    assert endpoint == "move"
+    assert payload["identity"] == (CORP_SHIP, PLAYER)
+    # Only the bound id reaches move()'s local check.
+    assert payload["character_id"] == PLAYER
+
+
+async def test_pinned_sender_cannot_ask_about_another_ship():
+    host = Host()
+    for source in ("byoa-agent", "task-1"):
+        await host.dispatch_broker_message(
+            BusCombatStrategyRequest(
+                source=source,
+                target="host",
+                correlation_id=source,
+                character_id=CORP_SHIP,
+                ship_id=OTHER_SHIP,
+                task_id="t1",
+            )
+        )
+
+    pinned, local = host.sent
+    assert isinstance(pinned, BusCombatStrategyResponse)
+    assert pinned.error == "unauthorized_byoa_ship" and pinned.strategy is None
+    assert local.error is None
+    [(endpoint, payload)] = host._game_client.requests
+    assert endpoint == "combat.get_strategy"
+    assert payload["identity"] == (CORP_SHIP, PLAYER) and payload["ship_id"] == OTHER_SHIP
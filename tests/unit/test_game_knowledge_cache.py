@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.game.client import AsyncGameClient, per_call_identity
+from gradientbang.game.knowledge_cache import KnowledgeCache
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+CORP_SHIP_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def _port_entry(sector_id: int, code: str, price: int) -> Dict[str, Any]:
+    return {
+        "sector": {
+            "id": sector_id,
+            "position": [sector_id, 0],
+            "port": {"code": code, "mega": False, "prices": {"quantum_foam": price}},
+        },
+        "hops_from_start": 1,
+        "last_visited": "2026-10-01T00:00:00Z",
+    }
+
+
+PORTS_RESPONSE = {
+    "from_sector": 10,
+    "ports": [_port_entry(11, "BBS", 30), _port_entry(12, "SSB", 40)],
+    "total_ports_found": 2,
+    "searched_sectors": 5,
+}
+
+MAP_RESPONSE = {
+    "center_sector": 10,
+    "sectors": [
+        {"id": 10, "visited": True, "hops_from_center": 0, "lanes": [{"to": 11}]},
+        {
+            "id": 11,
+            "visited": True,
+            "hops_from_center": 1,
+            "port": {"code": "BBS", "mega": False},
+            "lanes": [{"to": 10}, {"to": 12}],
+        },
+        {"id": 12, "visited": False, "hops_from_center": 2, "lanes": []},
+    ],
+}
+
+PATH_EVENT = {
+    "path": [10, 11, 12],
+    "distance": 2,
+    "sectors": [
+        {"sector_id": 10, "on_path": True, "visited": True, "adjacent_sectors": [11]},
+        {"sector_id": 11, "on_path": True, "visited": True, "adjacent_sectors": [10, 12]},
+        {"sector_id": 12, "on_path": True, "visited": False, "adjacent_sectors": []},
+    ],
+    "total_sectors": 3,
+    "known_sectors": 2,
+    "unknown_sectors": 1,
+}
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    def __init__(self) -> None:
+        super().__init__("http://test.local", character_id=PLAYER_ID)
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append((endpoint, dict(payload)))
+        body = {"list_known_ports": PORTS_RESPONSE, "local_map_region": MAP_RESPONSE}
+        request_id = payload.get("request_id", f"req-{len(self.requests)}")
+        return {"request_id": request_id, **body.get(endpoint, {}), "success": True}
+
+
+@pytest.fixture
+def client() -> FakeGameClient:
+    game_client = FakeGameClient()
+    game_client.enable_knowledge_cache()
+    game_client._set_current_sector(10)
+    return game_client
+
+
+async def _next_event(client: BaseAsyncGameClient, event_name: str) -> Dict[str, Any]:
+    return await asyncio.wait_for(client.get_event_queue(event_name).get(), timeout=1.0)
+
+
+async def test_repeated_port_query_is_answered_from_cache_and_replayed(client):
+    client.current_task_id = "task-1"
+    first = await client.list_known_ports(PLAYER_ID, max_hops=5)
+    second = await client.list_known_ports(PLAYER_ID, max_hops=5)
+
+    assert [endpoint for endpoint, _ in client.requests] == ["list_known_ports"]
+    assert second["ports"] == first["ports"]
+    assert second["success"] is True
+    assert second["request_id"] != first["request_id"]
+
+    event = await _next_event(client, "ports.list")
+    assert event["request_id"] == second["request_id"]
+    assert event["payload"]["ports"] == first["ports"]
+    assert event["payload"]["__event_context"]["recipient_ids"] == [PLAYER_ID]
+    assert event["payload"]["__task_id"] == "task-1"
+    assert "summary" in event
+
+    # Different arguments are a separate answer.
+    await client.list_known_ports(PLAYER_ID, max_hops=6)
+    assert len(client.requests) == 2
+    stats = client.knowledge_cache.stats()
+    assert stats["hits"] == {"ports.list": 1}
+    assert stats["misses"] == {"ports.list": 2}
+
+
+async def test_port_update_patches_cached_answers(client):
+    await client.list_known_ports(PLAYER_ID)
+    await client._process_event(
+        "port.update",
+        {"sector": {"id": 12, "port": {"code": "SSB", "prices": {"quantum_foam": 55}}}},
+    )
+
+    cached = await client.list_known_ports(PLAYER_ID)
+
+    assert len(client.requests) == 1
+    prices = {entry["sector"]["id"]: entry["sector"]["port"]["prices"] for entry in cached["ports"]}
+    assert prices == {11: {"quantum_foam": 30}, 12: {"quantum_foam": 55}}
+    assert cached["ports"][1]["sector"]["port"]["mega"] is False
+
+
+async def test_port_update_refreshes_or_drops_cached_map_regions(client):
+    await client.local_map_region(PLAYER_ID, center_sector=10)
+    await client._process_event(
+        "port.update",
+        {"sector": {"id": 11, "port": {"code": "SBS", "prices": {"quantum_foam": 12}}}},
+    )
+
+    cached = await client.local_map_region(PLAYER_ID, center_sector=10)
+
+    assert len(client.requests) == 1
+    ports = {sector["id"]: sector.get("port") for sector in cached["sectors"]}
+    assert ports == {10: None, 11: {"code": "SBS", "mega": False}, 12: None}
+
+    # The map showed no port at sector 12, so it cannot be patched in place.
+    await client._process_event(
+        "port.update", {"sector": {"id": 12, "port": {"code": "BSS", "mega": False}}}
+    )
+    await client.local_map_region(PLAYER_ID, center_sector=10)
+    assert len(client.requests) == 2
+
+
+async def test_newly_visited_sector_invalidates_everything(client):
+    await client.list_known_ports(PLAYER_ID, from_sector=10)
+    await client.local_map_region(PLAYER_ID, center_sector=10)
+    await client._process_event(
+        "movement.complete",
+        {"player": {"id": PLAYER_ID}, "sector": {"id": 11, "adjacent_sectors": {"10": {}}}},
+    )
+    # Sector 11 was already visited, so nothing changed.
+    await client.list_known_ports(PLAYER_ID, from_sector=10)
+    assert len(client.requests) == 2
+
+    await client._process_event(
+        "movement.complete",
+        {"player": {"id": PLAYER_ID}, "sector": {"id": 12, "adjacent_sectors": {"11": {}}}},
+    )
+    await client.list_known_ports(PLAYER_ID, from_sector=10)
+    await client.local_map_region(PLAYER_ID, center_sector=10)
+
+    assert [endpoint for endpoint, _ in client.requests] == [
+        "list_known_ports",
+        "local_map_region",
+        "list_known_ports",
+        "local_map_region",
+    ]
+    assert client.knowledge_cache.sectors[12].visited is True
+    assert client.knowledge_cache.sectors[12].adjacent == (11,)
+
+
+async def test_sector_content_events_drop_only_answers_showing_that_sector(client):
+    await client.list_known_ports(PLAYER_ID)
+    await client.local_map_region(PLAYER_ID)
+    await client._process_event(
+        "garrison.deployed", {"sector": {"id": 11}, "garrison": {"fighters": 10}}
+    )
+
+    await client.list_known_ports(PLAYER_ID)
+    await client.local_map_region(PLAYER_ID)
+
+    assert [endpoint for endpoint, _ in client.requests] == [
+        "list_known_ports",
+        "local_map_region",
+        "local_map_region",
+    ]
+
+
+async def test_path_region_answer_is_captured_from_its_event(client):
+    ack = await client.path_with_region(12, PLAYER_ID)
+    sent = client.requests[0][1]
+    assert ack["request_id"] == sent["request_id"]
+    await client._process_event("path.region", dict(PATH_EVENT), request_id=sent["request_id"])
+    await _next_event(client, "path.region")
+
+    replay_ack = await client.path_with_region(12, PLAYER_ID)
+    event = await _next_event(client, "path.region")
+
+    assert len(client.requests) == 1
+    assert set(replay_ack) == {"request_id", "success"}
+    assert event["request_id"] == replay_ack["request_id"]
+    assert event["payload"]["path"] == [10, 11, 12]
+    assert client.knowledge_cache.sectors[11].adjacent == (10, 12)
+
+
+async def test_unknown_origin_is_never_cached():
+    game_client = FakeGameClient()
+    game_client.enable_knowledge_cache()
+
+    await game_client.list_known_ports(PLAYER_ID)
+    await game_client.list_known_ports(PLAYER_ID)
+
+    assert len(game_client.requests) == 2
+
+
+def test_entries_expire_after_ttl():
+    now = [0.0]
+    cache = KnowledgeCache(ttl=5.0, clock=lambda: now[0])
+    cache.put("ports.list", ("key",), {"request_id": "r", "ports": [], "success": True})
+
+    now[0] = 4.0
+    assert cache.get("ports.list", ("key",)) == {"ports": []}
+    now[0] = 9.5
+    assert cache.get("ports.list", ("key",)) is None
+    assert cache.stats()["hits"] == {"ports.list": 1}
+    assert cache.stats()["misses"] == {"ports.list": 1}
+
+
+async def test_brokered_calls_for_other_characters_bypass_the_cache(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "http://test-supabase.local")
+    game_client = AsyncGameClient(
+        base_url="http://test-supabase.local",
+        character_id=PLAYER_ID,
+        enable_event_polling=False,
+    )
+    game_client.enable_knowledge_cache()
+    game_client._set_current_sector(10)
+    calls: List[Dict[str, Any]] = []
+
+    async def fake_request(endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(game_client._inject_character_ids(payload))
+        return {"request_id": f"req-{len(calls)}", **PORTS_RESPONSE, "success": True}
+
+    monkeypatch.setattr(game_client, "_request", fake_request)
+
+    await game_client.list_known_ports(PLAYER_ID)
+    with per_call_identity(CORP_SHIP_ID, PLAYER_ID):
+        await game_client.list_known_ports(PLAYER_ID)
+    await game_client.list_known_ports(PLAYER_ID)
+
+    assert [call["character_id"] for call in calls] == [PLAYER_ID, CORP_SHIP_ID]
+    await game_client.close()
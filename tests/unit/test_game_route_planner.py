@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pytest
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.game.knowledge_cache import KnowledgeCache
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def grid_universe(width: int, height: int, seed: int) -> Dict[int, List[int]]:
+    """A spatial universe like the generator's: warps join nearby sectors on a grid.
+
+    Warps are listed in (shuffled) universe order; some lanes are one-way.
+    """
+    rng = random.Random(seed)
+    warps: Dict[int, List[int]] = {s: [] for s in range(width * height)}
+    for y in range(height):
+        for x in range(width):
+            here = y * width + x
+            for dx, dy in ((1, 0), (0, 1), (1, 1)):
+                if x + dx >= width or y + dy >= height or rng.random() < 0.25:
+                    continue
+                there = (y + dy) * width + x + dx
+                roll = rng.random()  # < 0.8: two-way, otherwise one-way either direction
+                if roll < 0.9:
+                    warps[here].append(there)
+                if roll < 0.8 or roll >= 0.9:
+                    warps[there].append(here)
+    for lanes in warps.values():
+        rng.shuffle(lanes)
+    return warps
+
+
+def server_shortest_path(warps: Dict[int, List[int]], start: int, goal: int) -> Optional[List[int]]:
+    """Port of findShortestPath in deployment/supabase/functions/_shared/map.ts."""
+    if start == goal:
+        return [start]
+    parents: Dict[int, Optional[int]] = {start: None}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for current in frontier:
+            for neighbor in warps.get(current, []):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = current
+                if neighbor == goal:
+                    path = [neighbor]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                next_frontier.append(neighbor)
+        frontier = next_frontier
+    return None
+
+
+def map_local(warps: Dict[int, List[int]], visited: Iterable[int]) -> Dict[str, Any]:
+    """A map.local payload: visited sectors with their lanes, plus fog-of-war neighbours."""
+    visited = set(visited)
+    sectors: Dict[int, Dict[str, Any]] = {}
+    for sector_id in sorted(visited):
+        sectors[sector_id] = {
+            "id": sector_id,
+            "visited": True,
+            "lanes": [{"to": to, "two_way": sector_id in warps[to]} for to in warps[sector_id]],
+        }
+        for neighbor in warps[sector_id]:
+            if neighbor in visited:
+                continue
+            # Unvisited sectors carry lanes derived back to whoever saw them.
+            fog = sectors.setdefault(neighbor, {"id": neighbor, "visited": False, "lanes": []})
+            fog["lanes"].append({"to": sector_id, "two_way": False})
+    return {"center_sector": min(visited), "sectors": list(sectors.values())}
+
+
+def explored(warps: Dict[int, List[int]], start: int, count: int) -> List[int]:
+    """The ``count`` sectors nearest ``start``: a pilot's explored neighbourhood."""
+    order = [start]
+    seen = {start}
+    for sector_id in order:
+        for neighbor in warps[sector_id]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                order.append(neighbor)
+    return sorted(order[:count])
+
+
+def test_local_routes_match_the_server_or_defer_to_it():
+    warps = grid_universe(50, 40, seed=7)
+    visited = explored(warps, start=1025, count=800)
+    cache = KnowledgeCache()
+    cache.learn("map.local", map_local(warps, visited))
+    rng = random.Random(11)
+
+    answered: List[Tuple[int, int]] = []
+    for _ in range(400):
+        start, goal = rng.choice(visited), rng.choice(visited)
+        route = cache.routes.route(start, goal)
+        if route is None:
+            continue
+        assert list(route.path) == server_shortest_path(warps, start, goal)
+        assert route.distance == len(route.path) - 1
+        answered.append((start, goal))
+
+    stats = cache.routes.stats()
+    assert len(answered) == stats["answered"] > 50
+    assert stats["fallbacks"] > 0
+    # Unvisited destinations are rejected by the server, so they are never planned.
+    known = set(visited)
+    unvisited = next(s for s in warps if s not in known)
+    assert cache.routes.route(visited[0], unvisited) is None
+
+
+def test_shortcut_through_an_unknown_sector_defers_to_the_server():
+    # 1 -> 2 -> 3 -> 4 is known; the unvisited sector 9 links 1 and 4 directly.
+    warps = {1: [2, 9], 2: [1, 3], 3: [2, 4], 4: [3], 9: [4]}
+    cache = KnowledgeCache()
+    cache.learn("map.local", map_local(warps, [1, 2, 3, 4]))
+
+    assert cache.routes.route(1, 2).path == (1, 2)
+    assert cache.routes.route(1, 4) is None
+    assert server_shortest_path(warps, 1, 4) == [1, 9, 4]
+    # Once 9 is visited its warps are known and the route is exact again.
+    cache.learn("movement.complete", {"sector": {"id": 9, "adjacent_sectors": {"4": {}}}})
+    assert cache.routes.route(1, 4).path == (1, 9, 4)
+    assert cache.routes.route(3, 1).path == (3, 2, 1)
+
+
+def test_queries_over_5k_known_sectors_match_the_server():
+    warps = grid_universe(100, 50, seed=21)
+    cache = KnowledgeCache()
+    cache.learn("map.local", map_local(warps, warps))
+    rng = random.Random(5)
+    origins = [y * 100 + x for x, y in ((20, 10), (70, 12), (35, 40), (80, 38))]
+
+    for origin in origins:
+        # A nearby destination, then far ones from the same (now warm) origin.
+        for goal in [origin + 6] + [rng.randrange(5000) for _ in range(25)]:
+            route = cache.routes.route(origin, goal)
+            assert route is not None
+            assert list(route.path) == server_shortest_path(warps, origin, goal)
+
+
+@pytest.mark.stress
+def test_queries_over_5k_known_sectors_are_sub_millisecond():
+    warps = grid_universe(100, 50, seed=21)
+    payload = map_local(warps, warps)
+    rng = random.Random(5)
+    origins = [y * 100 + x for x, y in ((20, 10), (70, 12), (35, 40), (80, 38))]
+    goals = [rng.randrange(5000) for _ in range(500)]
+
+    def timed_ms(cache: KnowledgeCache, pairs: List[Tuple[int, int]]) -> float:
+        started = time.perf_counter()
+        for start, goal in pairs:
+            assert cache.routes.route(start, goal) is not None
+        return (time.perf_counter() - started) * 1000 / len(pairs)
+
+    nearby = KnowledgeCache()
+    nearby.learn("map.local", payload)
+    # A new origin (after every move) with a destination a few sectors away.
+    nearby_ms = timed_ms(nearby, [(origin, origin + 6) for origin in origins])
+
+    cache = KnowledgeCache()
+    cache.learn("map.local", payload)
+    timed_ms(cache, [(origin, goals[0]) for origin in origins])
+    warm_ms = timed_ms(cache, [(origin, goal) for origin in origins for goal in goals])
+
+    assert nearby_ms < 1.0, f"new origin, nearby destination took {nearby_ms:.3f}ms"
+    assert warm_ms < 1.0, f"repeat origin took {warm_ms:.4f}ms"
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    def __init__(self) -> None:
+        super().__init__("http://test.local", character_id=PLAYER_ID)
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append((endpoint, dict(payload)))
+        return {"request_id": f"req-{len(self.requests)}", "success": True}
+
+
+async def test_plot_course_is_answered_locally_when_known():
+    warps = {1: [2, 9], 2: [1, 3], 3: [2, 4], 4: [3], 9: [4]}
+    client = FakeGameClient()
+    client.enable_knowledge_cache()
+    await client._process_event(
+        "map.local",
+        {"player": {"id": PLAYER_ID}, **map_local(warps, [1, 2, 3, 4]), "center_sector": 3},
+    )
+    client.current_task_id = "task-7"
+
+    result = await client.plot_course(1)
+    event = await asyncio.wait_for(client.get_event_queue("course.plot").get(), timeout=1.0)
+
+    assert client.requests == []
+    assert result["path"] == [3, 2, 1] and result["distance"] == 2
+    assert event["request_id"] == result["request_id"]
+    assert event["payload"]["source"]["request_id"] == result["request_id"]
+    assert event["payload"]["path"] == [3, 2, 1]
+    assert event["payload"]["__task_id"] == "task-7"
+    assert "summary" in event
+
+    await client.plot_course(4, from_sector=1)
+    assert [endpoint for endpoint, _ in client.requests] == ["plot_course"]
+    assert client.knowledge_cache.stats()["routes"]["fallbacks"] == 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import timedelta
+
+from gradientbang.newspaper.scripts.digest import (
+    EVENT_QUERY,
+    build_digest,
+    build_digest_streaming,
+    dedupe_events,
+    digest_to_dict,
+)
+from gradientbang.newspaper.scripts.digest_bench import (
+    legacy_dedupe,
+    measure,
+    synthetic_event_rows,
+)
+
+
+def test_synthetic_rows_look_like_event_query_output():
+    rows = list(synthetic_event_rows(5000, seed=3))
+
+    assert len(rows) == 5000
+    assert rows == list(synthetic_event_rows(5000, seed=3))
+    assert rows != list(synthetic_event_rows(5000, seed=4))
+    select_list = EVENT_QUERY.split("SELECT", 1)[1].split("FROM events", 1)[0]
+    columns = re.findall(r"(\w+),?\n", select_list)
+    assert all(list(row) == columns for row in rows)
+    assert [(row["timestamp"], row["id"]) for row in rows] == sorted(
+        (row["timestamp"], row["id"]) for row in rows
+    )
+    # Payloads are decoded per delivery, like rows from the database.
+    assert rows[0]["payload"] is not rows[1]["payload"]
+
+    event_types = Counter(row["event_type"] for row in rows)
+    for event_type in ("trade.executed", "movement.complete", "chat.message",
+                       "combat.round_resolved", "combat.ended", "status.snapshot"):  # fmt: skip
+        assert event_types[event_type], event_type
+    fanned_out = Counter(
+        row["request_id"] for row in rows if row["recipient_reason"] == "sector_snapshot"
+    )
+    assert fanned_out and max(fanned_out.values()) > 1
+
+
+def test_synthetic_fan_out_deduplicates_identically_in_both_digest_paths():
+    rows = list(synthetic_event_rows(20_000, seed=5))
+    window = {
+        "start": rows[0]["timestamp"],
+        "end": rows[-1]["timestamp"] + timedelta(seconds=1),
+        "leaderboard_ranks": {},
+    }
+
+    batch = build_digest(rows, **window)
+    streamed = build_digest_streaming(iter(rows), dedup_window=timedelta(0), **window)
+
+    assert batch.global_stats.deduped_events < batch.global_stats.raw_event_rows
+    assert batch.global_stats.messages_direct and batch.global_stats.combat_ids_ended
+    for digest in (batch, streamed):
+        digest.generated_at = window["start"]
+    assert digest_to_dict(streamed) == digest_to_dict(batch)
+
+
+def test_measure_reports_throughput_and_peak_rss():
+    result = measure("build_digest", 2000, seed=0, players=50, fanout=2.0)
+
+    assert result.rows == 2000
+    assert result.seconds > 0 and result.rows_per_sec > 0
+    assert result.peak_rss_mb >= result.input_rss_mb > 0
+
+
+def test_legacy_dedupe_stage_is_a_baseline_for_dedupe_events():
+    rows = list(synthetic_event_rows(3000, seed=2))
+
+    assert [event.id for event in legacy_dedupe(rows)] == [
+        event.id for event in dedupe_events(rows)
+    ]
+    assert measure("legacy_dedupe", 500, seed=0, players=50, fanout=2.0).rows_per_sec > 0
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import json
+import random
+import sys
+import time
+
+import pytest
 
 from gradientbang.newspaper.scripts.front_page_regions import (
+    DARK_COMPOSITE_BACKGROUND,
+    LIGHT_COMPOSITE_BACKGROUND,
+    CompositeTarget,
+    RateLimitGate,
     build_region_prompt,
     build_units,
     choose_generation_size,
+    composite_pages,
     default_references,
+    generate_regions,
+    is_rate_limit_output,
+    is_transient_output,
     parse_front_page_markdown,
     plan_regions,
     read_layout,
@@ -294,3 +307,208 @@ def test_plan_regions_writes_prompt_and_uses_selected_region(tmp_path):
     assert planned[0].prompt.exists()
     assert hashes["story_01"]
     assert "--dry-run" in planned[0].command
+
+
+# Stands in for image_gen.py: logs start/end times, fails story_02 with a
+# rate limit on its first attempt and story_03 with a permanent error.
+STUB_GENERATOR = """
+import pathlib, sys, time
+
+args = sys.argv[1:]
+out = pathlib.Path(args[args.index("--out") + 1])
+log = out.parent / "calls.log"
+attempts = out.with_suffix(".attempts")
+attempt = int(attempts.read_text()) + 1 if attempts.exists() else 1
+attempts.write_text(str(attempt))
+with log.open("a") as fh:
+    fh.write(f"start {out.stem} {time.monotonic()}\\n")
+time.sleep(0.2)
+with log.open("a") as fh:
+    fh.write(f"end {out.stem} {time.monotonic()}\\n")
+if out.stem == "story_02" and attempt == 1:
+    sys.exit("openai.RateLimitError: Error code: 429 - retry-after: 0.3")
+if out.stem == "story_03":
+    sys.exit("openai.BadRequestError: Error code: 400 - moderation_blocked")
+out.write_bytes(b"png")
+"""
+
+
+def plan_with_stub(tmp_path, *, regions, cache_dir=None):
+    front_page_md = tmp_path / "front-page.md"
+    layout_path = tmp_path / "layout.json"
+    write_front_page(front_page_md)
+    write_layout(layout_path)
+    stub = tmp_path / "stub_image_gen.py"
+    stub.write_text(STUB_GENERATOR)
+    planned, _ = plan_regions(
+        front_page=parse_front_page_markdown(front_page_md),
+        layout=read_layout(layout_path),
+        front_page_md=front_page_md,
+        out_dir=tmp_path / "out",
+        composite_size=(2336, 3504),
+        global_references=[],
+        model="gpt-image-2",
+        quality="high",
+        selected_regions=regions,
+        force=False,
+        dry_run=False,
+        generator_command=[sys.executable, str(stub)],
+        cache_dir=cache_dir,
+    )
+    (tmp_path / "out" / "regions").mkdir(parents=True, exist_ok=True)
+    return planned
+
+
+def max_overlap(log_path):
+    events = []
+    for line in log_path.read_text().splitlines():
+        kind, _, stamp = line.split()
+        events.append((float(stamp), 1 if kind == "start" else -1))
+    running = peak = 0
+    for _, delta in sorted(events, key=lambda event: (event[0], event[1])):
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def test_generate_regions_runs_concurrently_and_isolates_failures(tmp_path):
+    planned = plan_with_stub(
+        tmp_path, regions={"story_01", "story_02", "story_03", "story_04", "story_05"}
+    )
+    outputs = {item.unit.id: item.output for item in planned}
+    # A finished region from an earlier run is resumed, not regenerated.
+    outputs["story_05"].write_bytes(b"earlier")
+
+    results = generate_regions(
+        planned, composite_only=False, concurrency=3, max_attempts=3, backoff_seconds=0.05
+    )
+
+    by_id = {result.unit_id: result for result in results}
+    assert by_id["story_01"].status == "generated"
+    assert by_id["story_02"].status == "generated" and by_id["story_02"].attempts == 2
+    assert by_id["story_03"].status == "failed" and by_id["story_03"].attempts == 1
+    assert "moderation_blocked" in by_id["story_03"].error
+    assert by_id["story_04"].status == "generated"
+    assert by_id["story_05"].status == "skipped"
+    assert outputs["story_05"].read_bytes() == b"earlier"
+    assert not outputs["story_03"].exists()
+
+    log = outputs["story_01"].parent / "calls.log"
+    assert 1 < max_overlap(log) <= 3
+    assert "story_05" not in log.read_text()
+
+
+def test_cached_regions_always_reach_the_generator(tmp_path):
+    planned = plan_with_stub(tmp_path, regions={"story_01"}, cache_dir=tmp_path / "cache")
+    planned[0].output.write_bytes(b"stale")
+
+    results = generate_regions(planned, composite_only=False, concurrency=1)
+
+    # The cache, not the file's existence, decides whether a region is current.
+    assert results[0].status == "generated"
+    command = list(planned[0].command)
+    assert command[command.index("--cache-dir") + 1] == str(tmp_path / "cache")
+    assert "--force" in command
+
+
+@pytest.mark.parametrize(
+    "output, transient",
+    [
+        ("openai.InternalServerError: Error code: 502 - Bad Gateway", True),
+        ("HTTP/1.1 503 Service Unavailable", True),
+        ("httpx.HTTPStatusError: status 503", True),
+        ('{"error": {"code": 503, "message": "overloaded"}}', True),
+        ("502 Bad Gateway", True),
+        ("Request timed out.", True),
+        ("story_503.png: invalid size 1502x503", False),
+        ("Wrote region sector-502 in 503ms", False),
+        ("Error code: 400 - invalid prompt", False),
+    ],
+)
+def test_transient_output_matches_gateway_statuses_not_bare_digits(output, transient):
+    assert is_transient_output(output) is transient
+
+
+@pytest.mark.parametrize(
+    "output, rate_limited",
+    [
+        ("openai.RateLimitError: Error code: 429 - retry-after: 0.3", True),
+        ("HTTP/1.1 429 Too Many Requests", True),
+        ("httpx.HTTPStatusError: status code 429", True),
+        ("Region sector-429 written to story_429.png", False),
+        ("Composited 429 regions in 3.2s", False),
+    ],
+)
+def test_rate_limit_output_matches_http_429_not_bare_digits(output, rate_limited):
+    assert is_rate_limit_output(output) is rate_limited
+
+
+def test_rate_limit_gate_holds_every_worker():
+    gate = RateLimitGate()
+    gate.back_off(0.2)
+    gate.back_off(0.05)  # A shorter back-off never shortens the pause.
+
+    started = time.monotonic()
+    gate.wait()
+
+    assert time.monotonic() - started >= 0.19
+    started = time.monotonic()
+    gate.wait()
+    assert time.monotonic() - started < 0.05
+
+
+def serial_composite(image_module, planned, composite_size, light_mode):
+    background = LIGHT_COMPOSITE_BACKGROUND if light_mode else DARK_COMPOSITE_BACKGROUND
+    canvas = image_module.new("RGB", composite_size, background)
+    for item in planned:
+        x0, y0, x1, y1 = item.target_bbox
+        region = image_module.open(item.output).convert("RGB")
+        fitted = region.resize((x1 - x0, y1 - y0), resample=image_module.Resampling.LANCZOS)
+        canvas.paste(fitted, (x0, y0))
+    return canvas
+
+
+def test_light_and_dark_pages_composite_in_one_pass_pixel_identically(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    front_page_md = tmp_path / "front-page.md"
+    layout_path = tmp_path / "layout.json"
+    write_front_page(front_page_md)
+    write_layout(layout_path)
+    composite_size = (584, 876)
+    rng = random.Random(7)
+
+    targets = []
+    for light_mode in (True, False):
+        planned, _ = plan_regions(
+            front_page=parse_front_page_markdown(front_page_md),
+            layout=read_layout(layout_path),
+            front_page_md=front_page_md,
+            out_dir=tmp_path / ("light" if light_mode else "dark"),
+            composite_size=composite_size,
+            global_references=[],
+            model="gpt-image-2",
+            quality="high",
+            selected_regions=None,
+            force=False,
+            dry_run=True,
+            light_mode=light_mode,
+        )
+        for item in planned:
+            # Generated regions come back larger than their slot and not always as RGB.
+            size = (rng.randint(200, 420), rng.randint(120, 300))
+            mode = rng.choice(["RGB", "RGBA", "L", "P"])
+            noise = image_module.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+            noise.convert(mode).save(item.output)
+        targets.append(
+            CompositeTarget(planned, tmp_path / f"page-{light_mode}.png", composite_size, light_mode)
+        )
+
+    composite_pages(targets, workers=3)
+
+    for target in targets:
+        expected = serial_composite(
+            image_module, target.planned, composite_size, target.light_mode
+        )
+        with image_module.open(target.composite_path) as actual:
+            assert actual.mode == "RGB"
+            assert actual.tobytes() == expected.tobytes()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import base64
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from gradientbang.newspaper.scripts import image_gen
+from gradientbang.newspaper.scripts.image_cache import (
+    ImageCache,
+    cache_key,
+    describe_request,
+)
+
+
+class FakeImages:
+    def __init__(self):
+        self.calls = []
+
+    def _result(self, prompt, n):
+        data = [
+            SimpleNamespace(b64_json=base64.b64encode(f"{prompt}#{i}".encode()).decode())
+            for i in range(n)
+        ]
+        return SimpleNamespace(data=data)
+
+    def edit(self, **request):
+        self.calls.append(request["prompt"])
+        return self._result(request["prompt"], request.get("n", 1))
+
+
+class FakeAsyncImages(FakeImages):
+    async def generate(self, **request):
+        self.calls.append(request["prompt"])
+        return self._result(request["prompt"], request.get("n", 1))
+
+
+def run_image_gen(monkeypatch, argv, client):
+    monkeypatch.setattr(sys, "argv", ["image_gen.py", *argv])
+    monkeypatch.setattr(image_gen, "_ensure_api_key", lambda dry_run: None)
+    monkeypatch.setattr(image_gen, "_create_client", lambda: client)
+    monkeypatch.setattr(image_gen, "_create_async_client", lambda: client)
+    return image_gen.main()
+
+
+def test_cache_key_covers_prompt_references_and_options(tmp_path):
+    reference = tmp_path / "ref.png"
+    reference.write_bytes(b"reference-v1")
+    request = {"model": "gpt-image-2", "prompt": "A ship", "size": "1024x1536", "quality": "high"}
+
+    def key(**changes):
+        return cache_key(
+            describe_request(
+                endpoint="/v1/images/edits", request={**request, **changes}, references=[reference]
+            )
+        )
+
+    base = key()
+    assert key() == base
+    assert key(background=None) == base
+    assert key(prompt="A station") != base
+    assert key(size="1536x1024") != base
+    assert key(quality="medium") != base
+    assert key(model="gpt-image-1.5") != base
+    reference.write_bytes(b"reference-v2")
+    assert key() != base
+
+
+def test_cache_round_trips_and_first_writer_wins(tmp_path):
+    cache = ImageCache(tmp_path / "cache")
+    description = describe_request(endpoint="/v1/images/generations", request={"prompt": "x"})
+    key = cache_key(description)
+
+    assert cache.get(key) is None
+    cache.put(key, [b"one", b"two"], description=description, output_format="png")
+    cache.put(key, [b"other"], description=description, output_format="png")
+
+    assert cache.get(key) == [b"one", b"two"]
+    entry = json.loads((cache.entry_dir(key) / "entry.json").read_text())
+    assert entry["key"] == key and entry["images"] == ["image_1.png", "image_2.png"]
+    assert [path.name for path in cache.entry_dir(key).parent.iterdir()] == [key]
+
+
+def test_edit_reuses_cached_image_until_an_input_changes(tmp_path, monkeypatch):
+    prompt = tmp_path / "prompt.txt"
+    reference = tmp_path / "ref.png"
+    out = tmp_path / "out" / "story_01.png"
+    cache_dir = tmp_path / "cache"
+    prompt.write_text("Headline one", encoding="utf-8")
+    reference.write_bytes(b"reference")
+    client = SimpleNamespace(images=FakeImages())
+    argv = [
+        "edit",
+        "--prompt-file", str(prompt),
+        "--image", str(reference),
+        "--size", "1024x1536",
+        "--quality", "high",
+        "--out", str(out),
+        "--no-augment",
+        "--cache-dir", str(cache_dir),
+    ]  # fmt: skip
+
+    run_image_gen(monkeypatch, argv, client)
+    first = out.read_bytes()
+    # Unchanged request: served from the cache, and the identical output is left alone.
+    run_image_gen(monkeypatch, argv, client)
+    out.unlink()
+    run_image_gen(monkeypatch, argv, client)
+    assert client.images.calls == ["Headline one"]
+    assert out.read_bytes() == first
+
+    prompt.write_text("Headline two", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        run_image_gen(monkeypatch, argv, client)  # A changed image still needs --force...
+    run_image_gen(monkeypatch, [*argv, "--force"], client)
+    # ...but the image generated by the refused run was kept, so it isn't paid for twice.
+    assert client.images.calls == ["Headline one", "Headline two"]
+    assert out.read_bytes() == b"Headline two#0"
+
+
+def test_batch_jobs_only_call_the_api_for_changed_prompts(tmp_path, monkeypatch):
+    jobs = tmp_path / "jobs.jsonl"
+    out_dir = tmp_path / "out"
+    client = SimpleNamespace(images=FakeAsyncImages())
+    argv = [
+        "generate-batch",
+        "--input", str(jobs),
+        "--out-dir", str(out_dir),
+        "--no-augment",
+        "--cache-dir", str(tmp_path / "cache"),
+        "--force",
+    ]  # fmt: skip
+
+    jobs.write_text(
+        '{"prompt": "Pirate fleet", "out": "a.png"}\n{"prompt": "Trade boom", "out": "b.png"}\n'
+    )
+    run_image_gen(monkeypatch, argv, client)
+    run_image_gen(monkeypatch, argv, client)
+    assert sorted(client.images.calls) == ["Pirate fleet", "Trade boom"]
+
+    jobs.write_text(
+        '{"prompt": "Pirate fleet", "out": "a.png"}\n{"prompt": "Trade bust", "out": "b.png"}\n'
+    )
+    run_image_gen(monkeypatch, argv, client)
+    assert sorted(client.images.calls) == ["Pirate fleet", "Trade boom", "Trade bust"]
+    assert (out_dir / "b.png").read_bytes() == b"Trade bust#0"
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from pipecat.pipeline.job_context import JobStatus
+from pipecat.workers.base_worker import BaseWorker
+from pipecat.workers.runner import WorkerRunner
+
+from gradientbang.game.base_client import BaseAsyncGameClient, RPCError
+from gradientbang.npc.fleet import FleetBroker, FleetShip, load_fleet, run_fleet_ships
+from gradientbang.runtime.bus import BusGameToolCallRequest, BusGameToolCallResponse
+
+FIRST_ACTOR = "11111111-1111-1111-1111-111111111111"
+CORP_ACTOR = "22222222-2222-2222-2222-222222222222"
+CORP_SHIP = "33333333-3333-3333-3333-333333333333"
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    """Records each request with the identity the broker bound for it."""
+
+    def __init__(self) -> None:
+        super().__init__("http://test.local", character_id=FIRST_ACTOR)
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        self.scopes: List[Tuple[List[str], List[str]]] = []
+        self.refuse_join: set[str] = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def set_event_polling_scope(self, *, character_ids=None, corp_id=None, ship_ids=None):
+        self.scopes.append((list(character_ids or []), list(ship_ids or [])))
+
+    async def sync_event_polling_scope(self) -> None:
+        return None
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        from gradientbang.game.client import _per_call_actor_character_id, _per_call_character_id
+
+        identity = (_per_call_character_id.get(), _per_call_actor_character_id.get())
+        self.requests.append((endpoint, {**payload, "identity": identity}))
+        if endpoint == "join" and identity[0] in self.refuse_join:
+            raise RPCError("join", 403, "not authorized")
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        return {"success": True}
+
+
+class FakeShipAgent(BaseWorker):
+    """Moves once through the broker, then completes (or fails when told to)."""
+
+    def __init__(self, name: str):
+        super().__init__(name=name)
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def on_job_request(self, message) -> None:
+        await super().on_job_request(message)
+        task = message.payload["task_description"]
+        correlation_id = uuid.uuid4().hex
+        pending = self._pending[correlation_id] = asyncio.get_running_loop().create_future()
+        await self.send_bus_message(
+            BusGameToolCallRequest(
+                source=self.name,
+                target=message.source,
+                correlation_id=correlation_id,
+                tool_name="move",
+                # A spoofed identity in args must not reach the payload.
+                args={"to_sector": 7, "character_id": FIRST_ACTOR},
+                character_id=FIRST_ACTOR,
+                task_id=message.job_id,
+            )
+        )
+        response = await pending
+        status = JobStatus.FAILED if task == "fail" else JobStatus.COMPLETED
+        await self.send_job_response(
+            message.job_id, response={"message": response.error or "ok"}, status=status
+        )
+
+    async def on_bus_message(self, message) -> None:
+        await super().on_bus_message(message)
+        if isinstance(message, BusGameToolCallResponse) and message.target == self.name:
+            future = self._pending.pop(message.correlation_id, None)
+            if future is not None and not future.done():
+                future.set_result(message)
+
+
+def _ship(actor_id: str, task: str = "patrol", ship_id: Optional[str] = None) -> FleetShip:
+    return FleetShip(actor_id=actor_id, task=task, ship_id=ship_id)
+
+
+async def _run(client, ships, *, max_concurrent, lock_ship=None):
+    runner = WorkerRunner(handle_sigint=False)
+    broker = FleetBroker(
+        "npc_fleet", game_client=client, agent_factory=lambda s: FakeShipAgent(s.agent_name)
+    )
+    await runner.add_workers(broker)
+    runner_task = asyncio.create_task(runner.run())
+    try:
+        await asyncio.wait_for(broker.wait_activated(), timeout=5)
+        results = await asyncio.wait_for(
+            run_fleet_ships(broker, ships, max_concurrent=max_concurrent, lock_ship=lock_ship),
+            timeout=10,
+        )
+    finally:
+        await runner.end()
+        with suppress(asyncio.CancelledError):
+            await runner_task
+    return broker, results
+
+
+async def test_ships_share_one_client_with_per_ship_identity():
+    ships = [_ship(f"actor-{n}") for n in range(5)] + [_ship(CORP_ACTOR, ship_id=CORP_SHIP)]
+    client = FakeGameClient()
+    _, results = await _run(client, ships, max_concurrent=2)
+
+    assert [r.status for r in results] == ["completed"] * 6
+    moves = [payload for endpoint, payload in client.requests if endpoint == "move"]
+    assert sorted(p["identity"] for p in moves) == sorted(
+        [(f"actor-{n}", None) for n in range(5)] + [(CORP_SHIP, CORP_ACTOR)]
+    )
+    # The bound id only satisfies move()'s local check; identity comes from the envelope.
+    assert all(p["character_id"] == FIRST_ACTOR for p in moves)
+    assert client.peak_in_flight <= 2
+    # The subscription follows the running ships and is empty once they are done.
+    assert max(len(characters) + len(corp_ships) for characters, corp_ships in client.scopes) == 2
+    assert any(CORP_SHIP in corp_ships for _, corp_ships in client.scopes)
+    assert client.scopes[-1] == ([], [])
+
+
+async def test_one_ships_failure_does_not_stop_the_others():
+    released = []
+
+    def lock_ship(ship):
+        if ship.target_id == "actor-locked":
+            raise RuntimeError("ship actor-locked already has an active TaskAgent session")
+        return lambda: released.append(ship.target_id)
+
+    ships = [
+        _ship("actor-ok"),
+        _ship("actor-locked"),
+        _ship("actor-refused"),
+        _ship("actor-fails", task="fail"),
+    ]
+    client = FakeGameClient()
+    client.refuse_join.add("actor-refused")
+    broker, results = await _run(client, ships, max_concurrent=4, lock_ship=lock_ship)
+
+    assert {r.target_id: r.status for r in results} == {
+        "actor-ok": "completed",
+        "actor-locked": "locked",
+        "actor-refused": "join_failed",
+        "actor-fails": "failed",
+    }
+    assert sorted(released) == ["actor-fails", "actor-ok", "actor-refused"]
+    assert not broker.children
+
+
+def test_load_fleet_reads_jsonl_and_rejects_duplicates(tmp_path):
+    path = tmp_path / "fleet.jsonl"
+    path.write_text(
+        "\n".join(
+            json.dumps(entry)
+            for entry in [
+                {"actor_id": "npc-01", "task": "Explore"},
+                {"actor_id": CORP_ACTOR, "ship_id": CORP_SHIP, "task": "Trade"},
+            ]
+        )
+    )
+    ships = load_fleet(path)
+    assert [(s.target_id, s.actor_character_id) for s in ships] == [
+        ("npc-01", None),
+        (CORP_SHIP, CORP_ACTOR),
+    ]
+
+    duplicate = [{"actor_id": "npc-01", "task": "a"}, {"actor_id": "npc-01", "task": "b"}]
+    path.write_text(json.dumps(duplicate))
+    with pytest.raises(ValueError, match="listed twice"):
+        load_fleet(path)
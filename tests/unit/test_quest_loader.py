@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from gradientbang.scripts import load_quests_to_supabase as quest_module
+from gradientbang.scripts.load_quests_to_supabase import QuestLoader
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.filters: list = []
+        self.order_by: list = []
+        self.bounds = None
+
+    def select(self, _columns="*", count=None):
+        self.op = "select"
+        return self
+
+    def upsert(self, rows, on_conflict):
+        self.op, self.payload, self.conflict = "upsert", rows, on_conflict.split(",")
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = "insert", rows
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row[column] in set(values))
+        return self
+
+    def neq(self, column, value):
+        self.filters.append(lambda row: row[column] != value)
+        return self
+
+    def order(self, column):
+        self.order_by.append(column)
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        return self.db.run(self)
+
+
+class FakeSupabase:
+    """Just enough of the PostgREST table API, with ON DELETE CASCADE.
+
+    Like PostgREST, a select returns at most ``max_rows`` rows whatever the
+    requested range.
+    """
+
+    def __init__(self, max_rows=None):
+        self.max_rows = max_rows
+        self.tables = {
+            "quest_definitions": [],
+            "quest_step_definitions": [],
+            "quest_event_subscriptions": [],
+        }
+        self.requests: list[tuple[str, str]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def run(self, query: FakeQuery):
+        with self._lock:
+            self.requests.append((query.table, query.op))
+            rows = self.tables[query.table]
+            matches = [row for row in rows if all(f(row) for f in query.filters)]
+            if query.op == "select":
+                count = len(matches)
+                if query.order_by:
+                    matches.sort(key=lambda row: [row[column] for column in query.order_by])
+                if query.bounds is not None:
+                    matches = matches[query.bounds[0] : query.bounds[1] + 1]
+                if self.max_rows is not None:
+                    matches = matches[: self.max_rows]
+                return SimpleNamespace(data=copy.deepcopy(matches), count=count)
+            if query.op == "delete":
+                for row in matches:
+                    self._delete(query.table, row)
+                return SimpleNamespace(data=matches)
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            written = []
+            for new in payload:
+                existing = None
+                if query.op == "upsert":
+                    existing = next(
+                        (r for r in rows if all(r[c] == new[c] for c in query.conflict)), None
+                    )
+                elif any(r == new for r in rows):
+                    raise AssertionError(f"duplicate key in {query.table}: {new}")
+                if existing is None:
+                    existing = (
+                        {"id": f"id-{next(self._ids)}"}
+                        if query.table != "quest_event_subscriptions"
+                        else {}
+                    )
+                    rows.append(existing)
+                existing.update(copy.deepcopy(new))
+                written.append(copy.deepcopy(existing))
+            return SimpleNamespace(data=written)
+
+    def _delete(self, table, row):
+        self.tables[table].remove(row)
+        children = {
+            "quest_definitions": ("quest_step_definitions", "quest_id"),
+            "quest_step_definitions": ("quest_event_subscriptions", "step_id"),
+        }
+        if table in children:
+            child, column = children[table]
+            for child_row in [r for r in self.tables[child] if r[column] == row["id"]]:
+                self._delete(child, child_row)
+
+    def writes(self):
+        return [request for request in self.requests if request[1] != "select"]
+
+    def snapshot(self):
+        codes = {row["id"]: row["code"] for row in self.tables["quest_definitions"]}
+        steps = {
+            row["id"]: (codes[row["quest_id"]], row["step_index"])
+            for row in self.tables["quest_step_definitions"]
+        }
+        return {
+            "quests": sorted(
+                (row["code"], row["name"]) for row in self.tables["quest_definitions"]
+            ),
+            "steps": sorted(
+                (codes[row["quest_id"]], row["step_index"], row["name"], row["target_value"])
+                for row in self.tables["quest_step_definitions"]
+            ),
+            "subscriptions": sorted(
+                (*steps[row["step_id"]], row["event_type"])
+                for row in self.tables["quest_event_subscriptions"]
+            ),
+        }
+
+
+def step(index: int, *event_types: str, **overrides) -> dict:
+    payload = {
+        "step_index": index,
+        "name": f"Step {index}",
+        "eval_type": "count",
+        "event_types": list(event_types) or ["trade.executed"],
+        "target_value": 1,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def quest(code: str, steps: list[dict], **overrides) -> dict:
+    payload = {"code": code, "name": code.title(), "steps": steps}
+    payload.update(overrides)
+    return payload
+
+
+def write_quests(directory, quests: list[dict]):
+    directory.mkdir(exist_ok=True)
+    for existing in directory.glob("*.json"):
+        existing.unlink()
+    for item in quests:
+        (directory / f"{item['code']}.json").write_text(json.dumps(item))
+    return directory
+
+
+def tutorial_step_ids(db: FakeSupabase) -> dict[int, str]:
+    (quest_id,) = [r["id"] for r in db.tables["quest_definitions"] if r["code"] == "tutorial"]
+    return {
+        row["step_index"]: row["id"]
+        for row in db.tables["quest_step_definitions"]
+        if row["quest_id"] == quest_id
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase()
+    monkeypatch.setattr(quest_module, "create_client", lambda _url, _key: db)
+    return db
+
+
+def loader(**kwargs) -> QuestLoader:
+    return QuestLoader("http://supabase.test", "service-key", **kwargs)
+
+
+def test_initial_load_uses_one_write_per_table(fake_db, tmp_path):
+    quests = [
+        quest("tutorial", [step(1, "move", "warp"), step(2, "trade.executed")]),
+        quest("explorer", [step(1, "sector.visited"), step(2), step(3)]),
+    ]
+
+    diff = loader().load(write_quests(tmp_path / "quests", quests))
+
+    assert sorted(diff.new_quests) == ["explorer", "tutorial"]
+    assert fake_db.writes() == [
+        ("quest_definitions", "upsert"),
+        ("quest_step_definitions", "upsert"),
+        ("quest_event_subscriptions", "insert"),
+    ]
+    assert len(fake_db.tables["quest_step_definitions"]) == 5
+    assert len(fake_db.tables["quest_event_subscriptions"]) == 6
+
+
+def test_unchanged_reload_only_reads(fake_db, tmp_path):
+    path = write_quests(tmp_path / "quests", [quest("tutorial", [step(1, "move"), step(2)])])
+    loader().load(path)
+    fake_db.requests.clear()
+
+    reload = loader()
+    diff = reload.load(path)
+
+    assert diff.is_empty
+    assert diff.unchanged_quests == ["tutorial"]
+    assert fake_db.writes() == []
+    assert reload.stats["requests"] == 3  # one select per table
+
+
+def test_edit_preserves_step_ids_and_applies_minimal_changes(fake_db, tmp_path):
+    path = tmp_path / "quests"
+    loader().load(
+        write_quests(
+            path,
+            [
+                quest("tutorial", [step(1, "move"), step(2, "trade.executed"), step(3)]),
+                quest("steady", [step(1)]),
+            ],
+        )
+    )
+    step_ids_before = tutorial_step_ids(fake_db)
+    fake_db.requests.clear()
+
+    diff = loader().load(
+        write_quests(
+            path,
+            [
+                quest(
+                    "tutorial",
+                    [step(1, "move", "warp"), step(2, "trade.executed", target_value=5)],
+                ),
+                quest("steady", [step(1)]),
+            ],
+        )
+    )
+
+    assert diff.changed_quests == ["tutorial"]
+    assert diff.unchanged_quests == ["steady"]
+    assert diff.quest_rows == []
+    assert [(c.step_index, c.write_row, c.refresh_subscriptions) for c in diff.step_changes] == [
+        (1, True, True),  # event_types is also a step column
+        (2, True, False),
+    ]
+    assert [(code, index) for code, index, _id in diff.step_deletes] == [("tutorial", 3)]
+    assert fake_db.writes() == [
+        ("quest_step_definitions", "delete"),
+        ("quest_step_definitions", "upsert"),
+        ("quest_event_subscriptions", "delete"),
+        ("quest_event_subscriptions", "insert"),
+    ]
+    step_ids_after = tutorial_step_ids(fake_db)
+    assert step_ids_after == {index: step_ids_before[index] for index in (1, 2)}
+    assert fake_db.snapshot()["subscriptions"] == [
+        ("steady", 1, "trade.executed"),
+        ("tutorial", 1, "move"),
+        ("tutorial", 1, "warp"),
+        ("tutorial", 2, "trade.executed"),
+    ]
+
+
+def test_reload_pages_reads_past_max_rows(monkeypatch, tmp_path):
+    db = FakeSupabase(max_rows=4)
+    monkeypatch.setattr(quest_module, "create_client", lambda _url, _key: db)
+    monkeypatch.setattr(quest_module, "PAGE_SIZE", 4)
+    steps = [step(i, f"event.{i}", "trade.executed") for i in range(1, 8)]
+    path = write_quests(tmp_path / "quests", [quest("tutorial", steps)])
+    loader().load(path)
+    db.requests.clear()
+
+    reload = loader()
+    diff = reload.load(path)
+
+    assert diff.is_empty
+    assert db.writes() == []
+    # 1 quest row, 7 steps over 2 pages, 14 subscriptions over 4 pages.
+    assert reload.stats["requests"] == 7
+
+
+def test_dry_run_reports_diff_without_writing(fake_db, tmp_path, capsys):
+    path = tmp_path / "quests"
+    loader().load(write_quests(path, [quest("tutorial", [step(1), step(2)])]))
+    fake_db.requests.clear()
+
+    diff = loader(dry_run=True).load(
+        write_quests(
+            path, [quest("tutorial", [step(1)], name="Renamed"), quest("fresh", [step(1)])]
+        )
+    )
+
+    assert fake_db.writes() == []
+    assert diff.new_quests == ["fresh"]
+    assert diff.changed_quests == ["tutorial"]
+    output = capsys.readouterr().out
+    assert "+ fresh: new quest (1 steps)" in output
+    assert "~ tutorial: definition, removed steps [2]" in output
+
+
+def test_offline_dry_run_diffs_against_empty_database(tmp_path):
+    path = write_quests(tmp_path / "quests", [quest("tutorial", [step(1)])])
+
+    diff = QuestLoader(None, None, dry_run=True).load(path)
+
+    assert diff.new_quests == ["tutorial"]
+
+
+def test_parallel_batches_match_sequential_load(monkeypatch, tmp_path):
+    quests = [
+        quest(f"quest-{n:02d}", [step(i, f"event.{n}.{i}") for i in range(1, n % 4 + 2)])
+        for n in range(12)
+    ]
+    path = write_quests(tmp_path / "quests", quests)
+
+    sequential, parallel = FakeSupabase(), FakeSupabase()
+    monkeypatch.setattr(quest_module, "create_client", lambda _url, _key: sequential)
+    loader().load(path)
+    monkeypatch.setattr(quest_module, "create_client", lambda _url, _key: parallel)
+    parallel_loader = loader(batch_size=3, jobs=4)
+    parallel_loader.load(path)
+
+    assert parallel.snapshot() == sequential.snapshot()
+    assert parallel_loader.stats["quests_loaded"] == 12
+
+
+def test_duplicate_quest_codes_are_rejected(tmp_path):
+    path = tmp_path / "quests"
+    path.mkdir()
+    (path / "a.json").write_text(json.dumps(quest("same", [step(1)])))
+    (path / "b.json").write_text(json.dumps(quest("same", [step(1)])))
+
+    with pytest.raises(ValueError, match="duplicate quest code 'same'"):
+        QuestLoader(None, None, dry_run=True).load(path)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+from unittest.mock import MagicMock
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.runtime.session_cache import (
+    COURSE_PLOT,
+    MAP_REGION,
+    PORTS_LIST,
+    SHIPS_LIST,
+    SessionCache,
+)
+from gradientbang.runtime.subagents.ui_agent import UIAgentContext
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+CORP_SHIP_ID = "22222222-2222-2222-2222-222222222222"
+TTLS = {PORTS_LIST: 60, SHIPS_LIST: 60, COURSE_PLOT: 300, MAP_REGION: 30}
+
+
+def addressed_to(character_id: str) -> Dict[str, Any]:
+    return {"__event_context": {"scope": "direct", "character_id": character_id}}
+
+
+# Like the server's reply: no player block, addressed through the event context.
+PORTS_PAYLOAD = {
+    **addressed_to(PLAYER_ID),
+    "from_sector": 10,
+    "ports": [{"sector": {"id": 11, "port": {"code": "BBS"}}, "hops_from_start": 1}],
+    "total_ports_found": 1,
+    "searched_sectors": 4,
+    "max_hops": 5,
+    "port_type": None,
+    "commodity": None,
+    "trade_type": None,
+    "mega": None,
+}
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    def __init__(self) -> None:
+        super().__init__("http://test.local", character_id=PLAYER_ID)
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append((endpoint, dict(payload)))
+        return {"request_id": f"req-{len(self.requests)}", "success": True}
+
+
+def _cache(now: List[float]) -> SessionCache:
+    return SessionCache(ttls=TTLS, clock=lambda: now[0])
+
+
+def test_entries_expire_per_namespace_and_count_stats():
+    now = [0.0]
+    cache = _cache(now)
+    cache.put(MAP_REGION, (10,), {"sectors": []})
+    cache.put(COURSE_PLOT, (1, 2), {"path": [1, 2]})
+
+    now[0] = 45.0
+    assert cache.get(MAP_REGION, (10,)) is None
+    assert cache.get(COURSE_PLOT, (1, 2)) == {"path": [1, 2]}
+    assert cache.get_entry(MAP_REGION, (10,), allow_stale=True).stored_at == 0.0
+
+    cache.invalidate(COURSE_PLOT)
+    assert cache.get(COURSE_PLOT, (1, 2)) is None
+    assert cache.stats() == {
+        "hits": {COURSE_PLOT: 1},
+        "misses": {MAP_REGION: 1, COURSE_PLOT: 1},
+        "invalidations": {COURSE_PLOT: 1},
+        "entries": {MAP_REGION: 1},
+    }
+
+
+async def test_game_events_store_answers_and_invalidate_them():
+    client = FakeGameClient()
+    client._set_current_sector(10)
+    cache = SessionCache(ttls=TTLS).attach(client)
+
+    await client._process_event("ports.list", dict(PORTS_PAYLOAD))
+    await client._process_event(
+        "course.plot",
+        {**addressed_to(PLAYER_ID), "from_sector": 10, "to_sector": 12, "path": [10, 11, 12]},
+    )
+    await client._process_event("ships.list", {"player": {"id": PLAYER_ID}, "ships": []})
+    # Replies addressed to a corporation ship's task are not this session's.
+    await client._process_event(
+        "ports.list", {**PORTS_PAYLOAD, **addressed_to(CORP_SHIP_ID), "max_hops": 9}
+    )
+    await client._process_event(
+        "course.plot",
+        {**addressed_to(CORP_SHIP_ID), "from_sector": 10, "to_sector": 13, "path": [10, 13]},
+    )
+
+    # A voice tool call without from_sector/max_hops resolves like the server.
+    cached = cache.get(PORTS_LIST, cache.ports_list_key({}))
+    assert cached["payload"]["ports"] == PORTS_PAYLOAD["ports"]
+    assert cache.get(PORTS_LIST, cache.ports_list_key({"max_hops": 9})) is None
+
+    await client._process_event("trade.executed", {"player": {"id": PLAYER_ID}})
+
+    assert cache.get(PORTS_LIST, cache.ports_list_key({})) is None
+    assert cache.get(SHIPS_LIST) is None
+    assert cache.get(COURSE_PLOT, (10, 12))["payload"]["path"] == [10, 11, 12]
+    assert cache.get(COURSE_PLOT, (10, 13)) is None
+    assert cache.stats()["invalidations"] == {PORTS_LIST: 1, SHIPS_LIST: 1}
+
+
+async def test_concurrent_reads_share_one_fetch_and_skip_storing_after_invalidation():
+    cache = SessionCache(ttls=TTLS)
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch() -> List[str]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["hello"]
+
+    readers = [asyncio.create_task(cache.get_or_fetch(MAP_REGION, "me", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    cache.invalidate(MAP_REGION)
+    release.set()
+
+    assert await asyncio.gather(*readers) == [["hello"]] * 3
+    assert calls == 1
+    # The answer raced an invalidation, so the next read fetches again.
+    await cache.get_or_fetch(MAP_REGION, "me", fetch)
+    assert calls == 2
+    assert await cache.get_or_fetch(MAP_REGION, "me", fetch) == ["hello"]
+    assert calls == 2
+
+
+async def test_cancelling_the_first_reader_does_not_cancel_the_shared_fetch():
+    cache = SessionCache(ttls=TTLS)
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch() -> List[str]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["hello"]
+
+    owner, *waiters = [
+        asyncio.create_task(cache.get_or_fetch(MAP_REGION, "me", fetch)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    owner.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [["hello"]] * 2
+    assert owner.cancelled()
+    assert calls == 1
+    assert cache.get(MAP_REGION, "me") == ["hello"]
+
+
+async def test_ui_agent_and_voice_tools_share_ports_and_ships():
+    client = FakeGameClient()
+    client._set_current_sector(10)
+    cache = SessionCache(ttls=TTLS).attach(client)
+    ui = UIAgentContext(config=None, rtvi=MagicMock(), game_client=client, session_cache=cache)
+
+    # The voice tool's ports.list event answers the UI agent's intent lookup.
+    await client._process_event("ports.list", {**PORTS_PAYLOAD, "max_hops": 100})
+    cached = ui._get_cached_ports_list_event({"from_sector": 10})
+    assert cached["payload"]["ports"] == PORTS_PAYLOAD["ports"]
+
+    await client._process_event(
+        "ships.list", {"player": {"id": PLAYER_ID}, "ships": [{"ship_name": "Kestrel"}]}
+    )
+    assert ui._get_fresh_ships_event() is not None
+    assert '"ship_name":"Kestrel"' in ui._format_ships_block()
+
+    await client._process_event("ship.destroyed", {"ship": {"ship_id": CORP_SHIP_ID}})
+    assert ui._get_fresh_ships_event() is None
+    assert "stale or unavailable" in ui._format_ships_block()
@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 import pytest
 
 from gradientbang.runtime.session_init import gather_initial_state
@@ -37,6 +40,41 @@ class _FakeGameClient:
         return f"{event_name} summary"
 
 
+class _SlowGameClient(_FakeGameClient):
+    """Adds per-RPC latency, and optionally a failure, to the fake client."""
+
+    def __init__(self, *, delays: dict[str, float], fail: str | None = None) -> None:
+        super().__init__(ports=[])
+        self.delays = delays
+        self.fail = fail
+        self.log: list[tuple[str, str]] = []
+
+    async def _respond(self, name: str) -> None:
+        self.log.append(("start", name))
+        await asyncio.sleep(self.delays.get(name, 0.0))
+        self.log.append(("end", name))
+        if name == self.fail:
+            raise RuntimeError(f"{name} unavailable")
+
+    async def join(self, character_id: str) -> dict:
+        await self._respond("join")
+        return await super().join(character_id)
+
+    async def list_user_ships(self, *, character_id: str) -> dict:
+        await self._respond("list_user_ships")
+        return await super().list_user_ships(character_id=character_id)
+
+    async def quest_status(self, *, character_id: str) -> dict:
+        await self._respond("quest_status")
+        return await super().quest_status(character_id=character_id)
+
+    async def list_known_ports(self, *, character_id: str, mega: bool, max_hops: int) -> dict:
+        await self._respond("list_known_ports")
+        return await super().list_known_ports(
+            character_id=character_id, mega=mega, max_hops=max_hops
+        )
+
+
 async def _initial_messages(
     *,
     ports: list[dict] | None,
@@ -88,3 +126,55 @@ async def test_new_player_onboarding_handles_missing_route() -> None:
 
     assert '<event name="onboarding">' in final_message
     assert "Route to nearest mega-port: unavailable" in final_message
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_lookups_after_join_run_concurrently() -> None:
+    delays = {"join": 0.05, "list_user_ships": 0.1, "quest_status": 0.2, "list_known_ports": 0.3}
+
+    client = _SlowGameClient(delays=delays)
+    state = await gather_initial_state(
+        game_client=client,
+        character_id="character-id",
+        character_display_name="Fallback Name",
+    )
+
+    lookups = {"list_user_ships", "quest_status", "list_known_ports"}
+    starts = [client.log.index(("start", name)) for name in lookups]
+    ends = [client.log.index(("end", name)) for name in lookups]
+    # Every lookup waits for join, and all three are in flight at once.
+    assert min(starts) > client.log.index(("end", "join"))
+    assert max(starts) < min(ends)
+    assert state.ships_payload == {"ships": [{"ship_id": "ship-1"}]}
+    assert state.is_new_player
+
+
+@pytest.mark.asyncio
+async def test_failed_or_slow_lookup_is_skipped_and_onboarding_still_runs() -> None:
+    client = _SlowGameClient(delays={"list_user_ships": 5.0}, fail="quest_status")
+
+    started = time.perf_counter()
+    state = await gather_initial_state(
+        game_client=client,
+        character_id="character-id",
+        character_display_name="Fallback Name",
+        rpc_timeout=0.1,
+    )
+
+    assert time.perf_counter() - started < 1.0
+    assert state.ships_payload == {} and state.quest_payload == {}
+    contents = [message["content"] for message in state.initial_messages]
+    assert not any('name="ships.list"' in content for content in contents)
+    assert not any('name="quest.status"' in content for content in contents)
+    assert any('name="status.snapshot"' in content for content in contents)
+    assert '<event name="onboarding">' in contents[-1]
+
+
+@pytest.mark.asyncio
+async def test_join_failure_still_aborts_bootstrap() -> None:
+    with pytest.raises(RuntimeError, match="join unavailable"):
+        await gather_initial_state(
+            game_client=_SlowGameClient(delays={}, fail="join"),
+            character_id="character-id",
+            character_display_name="Fallback Name",
+        )
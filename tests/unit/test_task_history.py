@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from unittest.mock import AsyncMock, MagicMock
+
+from gradientbang.game.base_client import BaseAsyncGameClient
+from gradientbang.runtime.client_message_handlers import ClientMessageHandler
+from gradientbang.runtime.task_history import TaskHistory, TaskHistoryIndex
+
+PLAYER_ID = "11111111-1111-1111-1111-111111111111"
+SHIP_ID = "22222222-2222-2222-2222-222222222222"
+BASE_TIME = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(minutes: int) -> str:
+    return (BASE_TIME + timedelta(minutes=minutes)).isoformat()
+
+
+def _task_events(count: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Stored task.start/task.finish rows, newest first; every other task finished."""
+    starts, finishes = [], []
+    for n in reversed(range(count)):
+        task_id = f"task-{n:04d}"
+        payload = {"task_id": task_id, "task_description": f"job {n}"}
+        if n % 3 == 0:
+            payload["ship_id"] = SHIP_ID
+        starts.append({"task_id": task_id, "timestamp": _timestamp(2 * n), "payload": payload})
+        if n % 2 == 0:
+            finishes.append(
+                {
+                    "task_id": task_id,
+                    "timestamp": _timestamp(2 * n + 1),
+                    "payload": {"task_id": task_id, "task_status": "completed"},
+                }
+            )
+    return {"task.start": starts, "task.finish": finishes}
+
+
+class FakeGameClient(BaseAsyncGameClient):
+    """Serves ``event.query`` pages of 100 rows from stored events."""
+
+    def __init__(self, stored: Dict[str, List[Dict[str, Any]]]) -> None:
+        super().__init__("http://test.local", character_id=PLAYER_ID)
+        self.stored = stored
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append((endpoint, dict(payload)))
+        rows = self.stored[payload["filter_event_type"]]
+        offset = payload.get("cursor") or 0
+        page = rows[offset : offset + min(payload["max_rows"], 100)]
+        has_more = offset + len(page) < len(rows)
+        return {
+            "request_id": f"req-{len(self.requests)}",
+            "events": page,
+            "has_more": has_more,
+            "next_cursor": offset + len(page) if has_more else None,
+            "success": True,
+        }
+
+
+def _handler(client: BaseAsyncGameClient) -> Tuple[ClientMessageHandler, MagicMock]:
+    rtvi = MagicMock()
+    rtvi.push_frame = AsyncMock()
+    handler = ClientMessageHandler(
+        game_client=client,
+        character_id=PLAYER_ID,
+        rtvi=rtvi,
+        transport=MagicMock(),
+        pipeline_worker=MagicMock(),
+    )
+    return handler, rtvi
+
+
+async def test_panel_opens_scan_once_and_follow_live_task_events():
+    client = FakeGameClient(_task_events(250))
+    handler, rtvi = _handler(client)
+
+    await handler._handle_get_task_history("get-task-history", {"max_rows": 20})
+    # Both scans page through all 30 days once: 3 pages of starts, 2 of finishes.
+    assert len(client.requests) == 5
+    first = rtvi.push_frame.await_args_list[-1].args[0].data["payload"]
+    assert [task["task_id"] for task in first["tasks"][:2]] == ["task-0249", "task-0248"]
+    assert first["tasks"][1]["end_status"] == "completed"
+    assert first["tasks"][0]["ended"] is None
+    assert first["has_more"] is True
+
+    await client._process_event(
+        "task.start",
+        {
+            "task_id": "task-live",
+            "source": {"timestamp": _timestamp(1000)},
+            "task_description": "x",
+        },
+    )
+    await client._process_event(
+        "task.finish",
+        {"task_id": "task-0249", "source": {"timestamp": _timestamp(999)}, "task_status": "failed"},
+    )
+    await handler._handle_get_task_history("get-task-history", {"max_rows": 20})
+
+    assert len(client.requests) == 5
+    latest = rtvi.push_frame.await_args_list[-1].args[0].data["payload"]
+    assert latest["tasks"][0]["task_id"] == "task-live"
+    assert latest["tasks"][1]["end_status"] == "failed"
+
+
+async def test_cursor_pages_do_not_shift_when_tasks_start_while_paging():
+    client = FakeGameClient(_task_events(120))
+    history = TaskHistory(client, PLAYER_ID).attach()
+
+    seen: List[str] = []
+    page = await history.page(limit=50)
+    seen += [task["task_id"] for task in page["tasks"]]
+    await client._process_event(
+        "task.start", {"task_id": "task-new", "source": {"timestamp": _timestamp(5000)}}
+    )
+    while page["next_cursor"]:
+        page = await history.page(limit=50, cursor=page["next_cursor"])
+        seen += [task["task_id"] for task in page["tasks"]]
+
+    assert seen == [f"task-{n:04d}" for n in reversed(range(120))]
+    assert page["has_more"] is False
+    assert (await history.page(limit=1))["tasks"][0]["task_id"] == "task-new"
+
+
+async def test_ship_history_is_seeded_for_that_ship_and_keeps_its_tasks():
+    client = FakeGameClient(_task_events(10))
+    history = TaskHistory(client, PLAYER_ID).attach()
+
+    await history.page(SHIP_ID, limit=5)
+    assert {payload["character_id"] for _, payload in client.requests} == {SHIP_ID}
+
+    await client._process_event(
+        "task.start", {"task_id": "mine", "source": {"timestamp": _timestamp(90)}}
+    )
+    await client._process_event(
+        "task.start",
+        {"task_id": "ship-task", "ship_id": SHIP_ID, "source": {"timestamp": _timestamp(91)}},
+    )
+    page = await history.page(SHIP_ID, limit=1)
+    assert page["tasks"][0]["task_id"] == "ship-task"
+
+
+def test_index_keeps_only_the_newest_tasks():
+    index = TaskHistoryIndex(max_tasks=3)
+    for n in range(5):
+        index.add_start(f"t{n}", _timestamp(n), {})
+    index.add_start("ancient", _timestamp(-10), {})
+
+    tasks, next_cursor = index.page(10)
+    assert [task["task_id"] for task in tasks] == ["t4", "t3", "t2"]
+    assert next_cursor is None
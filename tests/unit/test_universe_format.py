@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gradientbang.scripts.universe_format import (  # noqa: E402
+    UniverseArrays,
+    open_universe,
+    resolve_universe_path,
+    write_universe_json,
+    write_universe_npz,
+)
+from gradientbang.scripts.universe_scene_gen import generate_scene_variant  # noqa: E402
+
+
+def port(code: str, *, is_mega: bool = False) -> dict:
+    names = {"QF": "quantum_foam", "RO": "retro_organics", "NS": "neuro_symbolics"}
+    payload = {
+        "class": 7 if code == "SSS" else 1,
+        "code": code,
+        "buys": [names[com] for com, ch in zip(names, code) if ch == "B"],
+        "sells": [names[com] for com, ch in zip(names, code) if ch == "S"],
+        "stock": {com: (500 if ch == "S" else 0) for com, ch in zip(names, code)},
+        "stock_max": {com: (500 if ch == "S" else 0) for com, ch in zip(names, code)},
+        "demand": {com: (800 if ch == "B" else 0) for com, ch in zip(names, code)},
+        "demand_max": {com: (800 if ch == "B" else 0) for com, ch in zip(names, code)},
+    }
+    if is_mega:
+        payload["is_mega"] = True
+    return payload
+
+
+def sector(sector_id: int, warps: list[tuple[int, bool]], **overrides) -> dict:
+    payload = {
+        "id": sector_id,
+        "position": {"x": sector_id * 2, "y": sector_id % 3},
+        "region": 1 if sector_id < 2 else 0,
+        "warps": [{"to": to, "two_way": two_way} for to, two_way in warps],
+        "port": None,
+        "planets": [],
+        "scene_config": generate_scene_variant(sector_id),
+    }
+    payload.update(overrides)
+    return payload
+
+
+def universe() -> dict:
+    return {
+        "meta": {
+            "sector_count": 4,
+            "seed": 7,
+            "regions": [{"id": 0, "name": "Neutral"}, {"id": 1, "name": "Federation Space"}],
+            "mega_port_sectors": [1],
+        },
+        "sectors": [
+            sector(0, [(1, True)]),
+            sector(1, [(0, True), (2, True)], port=port("SSS", is_mega=True)),
+            sector(2, [(1, True), (3, False)], port=port("BBS")),
+            sector(
+                3,
+                [(2, False)],
+                planets=[{"name": "Vega"}],
+                scene_config={"starSize": 1.0},
+            ),
+        ],
+    }
+
+
+def test_streaming_json_writer_matches_json_dumps(tmp_path):
+    data = universe()
+    path = tmp_path / "universe.json"
+
+    write_universe_json(path, data["meta"], iter(data["sectors"]))
+
+    assert path.read_text() == json.dumps(data, indent=2) + "\n"
+
+
+def test_streaming_json_writer_handles_empty_sector_list(tmp_path):
+    path = tmp_path / "universe.json"
+
+    write_universe_json(path, {"sector_count": 0}, [])
+
+    assert path.read_text() == json.dumps({"meta": {"sector_count": 0}, "sectors": []}, indent=2) + "\n"
+
+
+def test_columnar_arrays_build_csr_warps_and_port_table():
+    arrays = UniverseArrays.from_universe(universe())
+
+    assert arrays.sector_ids.tolist() == [0, 1, 2, 3]
+    assert arrays.warp_offsets.tolist() == [0, 1, 3, 5, 6]
+    assert arrays.warp_targets[arrays.warps_for_row(2)].tolist() == [1, 3]
+    assert arrays.warp_two_way.tolist() == [True, True, True, True, False, False]
+    assert arrays.port_sector_ids.tolist() == [1, 2]
+    assert arrays.port_is_mega.tolist() == [True, False]
+    # Only non-default per-sector payloads are kept in the sparse side table.
+    assert set(arrays.extras) == {3}
+
+
+def test_npz_round_trip_is_lossless_and_memory_mapped(tmp_path):
+    data = universe()
+    path = tmp_path / "universe.npz"
+
+    write_universe_npz(path, UniverseArrays.from_universe(data))
+    loaded = open_universe(path)
+
+    assert isinstance(loaded.warp_targets, np.memmap)
+    assert loaded.to_universe() == data
+
+
+def test_npz_reader_without_mmap_loads_plain_arrays(tmp_path):
+    data = universe()
+    path = tmp_path / "universe.npz"
+    write_universe_npz(path, UniverseArrays.from_universe(data))
+
+    loaded = open_universe(path, mmap=False)
+
+    assert not isinstance(loaded.warp_targets, np.memmap)
+    assert loaded.to_universe() == data
+
+
+def test_directory_resolution_prefers_npz(tmp_path):
+    data = universe()
+    write_universe_json(tmp_path / "universe.json", data["meta"], data["sectors"])
+    assert resolve_universe_path(tmp_path) == tmp_path / "universe.json"
+
+    write_universe_npz(tmp_path / "universe.npz", UniverseArrays.from_universe(data))
+    assert resolve_universe_path(tmp_path) == tmp_path / "universe.npz"
+    assert open_universe(tmp_path).to_universe() == data
+
+
+def test_open_universe_reports_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        open_universe(tmp_path)
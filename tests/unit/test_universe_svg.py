@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import io
+import json
+import re
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from gradientbang.scripts.universe_format import UniverseArrays  # noqa: E402
+from gradientbang.scripts.universe_svg import (  # noqa: E402
+    LevelOfDetail,
+    Viewport,
+    build_layout,
+    dedup_edges,
+    write_svg,
+    write_tile_pyramid,
+)
+
+LABEL_RE = re.compile(r'<text class="label"[^>]*>(\d+)</text>')
+
+
+def sector(sector_id: int, warps: list[tuple[int, bool]], *, port: bool = False) -> dict:
+    return {
+        "id": sector_id,
+        "position": {"x": sector_id % 10, "y": sector_id // 10},
+        "region": 0,
+        "warps": [{"to": to, "two_way": two_way} for to, two_way in warps],
+        "port": (
+            {
+                "class": 1,
+                "code": "BBS",
+                "buys": ["quantum_foam", "retro_organics"],
+                "sells": ["neuro_symbolics"],
+                "stock": {"QF": 0, "RO": 0, "NS": 100},
+                "stock_max": {"QF": 0, "RO": 0, "NS": 100},
+                "demand": {"QF": 100, "RO": 100, "NS": 0},
+                "demand_max": {"QF": 100, "RO": 100, "NS": 0},
+            }
+            if port
+            else None
+        ),
+        "planets": [],
+    }
+
+
+def arrays(sectors: list[dict]) -> UniverseArrays:
+    return UniverseArrays.from_universe(
+        {"meta": {"sector_count": len(sectors), "fedspace_sectors": [0]}, "sectors": sectors}
+    )
+
+
+def edge_set(universe: UniverseArrays) -> set[tuple[int, int, bool]]:
+    src, dst, both = dedup_edges(universe)
+    ids = universe.sector_ids
+    return {(int(ids[s]), int(ids[d]), bool(b)) for s, d, b in zip(src, dst, both)}
+
+
+def test_two_way_pairs_are_kept_once():
+    universe = arrays(
+        [
+            sector(0, [(1, True), (2, False)]),
+            sector(1, [(0, True), (3, True)]),
+            sector(2, [(0, False)]),
+            # 3 -> 1 exists but is flagged one-way, so both directions stay.
+            sector(3, [(1, False), (42, True)]),
+        ]
+    )
+
+    assert edge_set(universe) == {
+        (0, 1, True),
+        (0, 2, False),
+        (2, 0, False),
+        (1, 3, False),
+        (3, 1, False),
+    }
+
+
+def test_full_svg_draws_each_two_way_warp_once_with_two_arrows():
+    universe = arrays([sector(0, [(1, True)]), sector(1, [(0, True), (2, False)]), sector(2, [])])
+    layout = build_layout(universe, 400, 300, 20)
+    out = io.StringIO()
+
+    write_svg(out, layout, Viewport(0, 0, 400, 300, 1.0), LevelOfDetail.full())
+
+    lines = [line for line in out.getvalue().splitlines() if line.startswith("<line")]
+    assert len(lines) == 2
+    assert sum('marker-start="url(#arrow)"' in line for line in lines) == 1
+    assert all('marker-end="url(#arrow)"' in line for line in lines)
+    assert 'class="fedspace"' in out.getvalue()
+
+
+def test_tile_pyramid_covers_every_sector_and_writes_index(tmp_path):
+    sectors = [
+        sector(s, [((s + 1) % 40, True), ((s - 1) % 40, True)], port=s % 7 == 0) for s in range(40)
+    ]
+    layout = build_layout(arrays(sectors), 800, 600, 40)
+
+    index = write_tile_pyramid(layout, tmp_path, tile_size=128, max_zoom=3, labels=True)
+
+    assert json.loads((tmp_path / "index.json").read_text()) == index
+    levels = index["levels"]
+    assert [level["zoom"] for level in levels] == [0, 1, 2, 3]
+    assert levels[0]["tiles"] == [[0, 0]]
+    assert (levels[3]["cols"], levels[3]["rows"]) == (8, 6)
+    # Detail only switches on as hexes grow.
+    assert not levels[0]["detail"]["labels"]
+    assert levels[3]["detail"] == {"edges": True, "arrows": True, "ports": True, "labels": True}
+
+    labelled = set()
+    for x, y in levels[3]["tiles"]:
+        content = (tmp_path / "3" / str(x) / f"{y}.svg").read_text()
+        assert content.startswith("<svg") and content.endswith("</svg>\n")
+        labelled.update(int(label) for label in LABEL_RE.findall(content))
+    assert labelled == set(range(40))
+
+
+def test_png_tiles_are_rendered_with_pillow(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    sectors = [sector(s, [((s + 1) % 12, True), ((s - 1) % 12, True)]) for s in range(12)]
+    layout = build_layout(arrays(sectors), 400, 300, 20)
+
+    index = write_tile_pyramid(layout, tmp_path, tile_size=64, max_zoom=1, tile_format="png")
+
+    assert index["url_template"] == "{z}/{x}/{y}.png"
+    for level in index["levels"]:
+        for x, y in level["tiles"]:
+            with image_module.open(tmp_path / str(level["zoom"]) / str(x) / f"{y}.png") as tile:
+                assert tile.size == (64, 64)
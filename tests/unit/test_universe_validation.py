@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+
+import pytest
+
+pytest.importorskip("scipy")
+nx = pytest.importorskip("networkx")
+
+from gradientbang.scripts.universe_format import UniverseArrays  # noqa: E402
+from gradientbang.scripts.universe_test import (  # noqa: E402
+    UniverseValidationReport,
+    validate_universe_data,
+)
+
+
+def networkx_report(universe: dict) -> UniverseValidationReport:
+    """Reference implementation: the previous networkx-based validator."""
+    sectors = universe["sectors"]
+    graph = nx.DiGraph()
+    for sector in sectors:
+        graph.add_node(sector["id"])
+    for sector in sectors:
+        for warp in sector.get("warps", []):
+            graph.add_edge(sector["id"], warp["to"])
+
+    meta = universe.get("meta", {})
+    start = (meta.get("mega_port_sectors") or [0])[0]
+
+    if start in graph:
+        reachable = set()
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current in reachable:
+                continue
+            reachable.add(current)
+            queue.extend(n for n in graph.successors(current) if n not in reachable)
+        unreachable = sorted(set(graph.nodes()) - reachable)
+    else:
+        unreachable = sorted(graph.nodes())
+
+    sccs = list(nx.strongly_connected_components(graph))
+    condensation = nx.condensation(graph, sccs)
+    traps = [
+        sorted(nodes)
+        for idx, nodes in enumerate(sccs)
+        if condensation.in_degree(idx) > 0 and condensation.out_degree(idx) == 0
+    ]
+
+    isolated = []
+    if not nx.is_strongly_connected(graph):
+        for component in nx.weakly_connected_components(graph):
+            external = sum(
+                1 for node in component for pred in graph.predecessors(node) if pred not in component
+            ) + sum(
+                1 for node in component for succ in graph.successors(node) if succ not in component
+            )
+            if external == 0:
+                isolated.append(sorted(component))
+
+    edges = {}
+    for sector in sectors:
+        for warp in sector.get("warps", []):
+            edges[(sector["id"], warp["to"])] = warp
+    problems = []
+    checked = set()
+    for u, v in edges:
+        pair = (min(u, v), max(u, v))
+        if pair in checked:
+            continue
+        checked.add(pair)
+        has_uv, has_vu = (u, v) in edges, (v, u) in edges
+        flag_uv = edges[(u, v)].get("two_way") if has_uv else None
+        flag_vu = edges[(v, u)].get("two_way") if has_vu else None
+        if has_uv and has_vu and not (flag_uv and flag_vu):
+            problems.append(("mutual_edges_not_flagged_two_way", (u, v), (v, u), flag_uv, flag_vu))
+        elif has_uv and not has_vu and flag_uv:
+            problems.append(("one_way_flagged_two_way", (u, v), None, flag_uv, None))
+        elif has_vu and not has_uv and flag_vu:
+            problems.append(("one_way_flagged_two_way", (v, u), None, flag_vu, None))
+
+    two_way = sum(1 for s in sectors for w in s.get("warps", []) if w.get("two_way"))
+    total = sum(len(s.get("warps", [])) for s in sectors)
+    nodes = graph.number_of_nodes()
+    return UniverseValidationReport(
+        sector_count=nodes,
+        warp_count=graph.number_of_edges(),
+        start_sector=start,
+        average_out_degree=sum(d for _n, d in graph.out_degree()) / nodes,
+        average_in_degree=sum(d for _n, d in graph.in_degree()) / nodes,
+        two_way_warps=two_way,
+        one_way_warps=total - two_way,
+        strongly_connected=nx.is_strongly_connected(graph),
+        scc_sizes=sorted((len(c) for c in sccs), reverse=True),
+        dead_ends=[s["id"] for s in sectors if not s.get("warps")],
+        unreachable_from_start=unreachable,
+        trap_clusters=traps,
+        isolated_clusters=isolated,
+        two_way_inconsistencies=problems,
+    )
+
+
+def normalized(report: UniverseValidationReport) -> UniverseValidationReport:
+    # Component enumeration order differs between implementations.
+    return UniverseValidationReport(
+        **{
+            **report.__dict__,
+            "trap_clusters": sorted(report.trap_clusters),
+            "isolated_clusters": sorted(report.isolated_clusters),
+        }
+    )
+
+
+def sector(sector_id: int, warps: list[tuple[int, bool]]) -> dict:
+    return {
+        "id": sector_id,
+        "position": {"x": sector_id, "y": 0},
+        "region": 0,
+        "warps": [{"to": to, "two_way": two_way} for to, two_way in warps],
+        "port": None,
+        "planets": [],
+    }
+
+
+def random_universe(sector_count: int, seed: int, *, healthy: bool) -> dict:
+    rng = random.Random(seed)
+    warps: dict[int, set[int]] = {s: set() for s in range(sector_count)}
+    if healthy:
+        for s in range(sector_count):
+            t = (s + 1) % sector_count
+            warps[s].add(t)
+            warps[t].add(s)
+    for _ in range(sector_count):
+        a, b = rng.randrange(sector_count), rng.randrange(sector_count)
+        if a == b:
+            continue
+        warps[a].add(b)
+        if rng.random() < 0.6:
+            warps[b].add(a)
+    sectors = []
+    for s in range(sector_count):
+        targets = sorted(warps[s])
+        # Sprinkle flag inconsistencies into unhealthy universes.
+        sectors.append(
+            sector(
+                s,
+                [
+                    (t, (s in warps[t]) != (not healthy and rng.random() < 0.02))
+                    for t in targets
+                ],
+            )
+        )
+    return {"meta": {"sector_count": sector_count, "mega_port_sectors": [0]}, "sectors": sectors}
+
+
+def test_hand_built_universe_reports_every_failure_class():
+    universe = {
+        "meta": {"sector_count": 7, "mega_port_sectors": [0]},
+        "sectors": [
+            sector(0, [(1, True)]),
+            sector(1, [(0, True), (2, False)]),
+            sector(2, [(3, True)]),
+            sector(3, [(2, False)]),
+            sector(4, []),
+            sector(5, [(6, True)]),
+            sector(6, [(5, True), (9, False)]),
+        ],
+    }
+
+    report = validate_universe_data(universe)
+
+    assert normalized(report) == normalized(networkx_report(universe))
+    assert report.sector_count == 8  # Sector 9 only exists as a warp target.
+    assert report.dead_ends == [4]
+    assert report.unreachable_from_start == [4, 5, 6, 9]
+    assert sorted(report.trap_clusters) == [[2, 3], [9]]
+    assert report.two_way_inconsistencies == [
+        ("mutual_edges_not_flagged_two_way", (2, 3), (3, 2), True, False)
+    ]
+    assert not report.passed
+
+
+def test_columnar_input_matches_dict_input():
+    universe = random_universe(300, seed=3, healthy=False)
+
+    assert validate_universe_data(UniverseArrays.from_universe(universe)) == validate_universe_data(
+        universe
+    )
+
+
+@pytest.mark.parametrize("healthy", [True, False])
+def test_array_validator_matches_networkx(healthy):
+    universe = random_universe(2000, seed=11, healthy=healthy)
+
+    report = validate_universe_data(universe)
+
+    assert normalized(report) == normalized(networkx_report(universe))
+    assert report.passed is healthy
+
+
+def test_columnar_validator_matches_networkx_on_a_large_universe():
+    universe = random_universe(20000, seed=5, healthy=False)
+
+    report = validate_universe_data(UniverseArrays.from_universe(universe))
+
+    assert normalized(report) == normalized(networkx_report(universe))
+
+
+@pytest.mark.stress
+def test_columnar_validator_is_faster_than_networkx():
+    universe = random_universe(20000, seed=5, healthy=False)
+    arrays = UniverseArrays.from_universe(universe)
+
+    started = time.perf_counter()
+    validate_universe_data(arrays)
+    array_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    networkx_report(universe)
+    networkx_ms = (time.perf_counter() - started) * 1000
+
+    assert array_ms < networkx_ms, f"csgraph took {array_ms:.1f}ms, networkx {networkx_ms:.1f}ms"
@@ -7,7 +7,7 @@ and emit a ``task.cancel`` event so downstream consumers see the task ended.
 
 Covers ``ByoaCoordinator._release_lock_on_offline`` (the single-ship cleanup helper)
 and ``ByoaCoordinator._mark_stale_offline`` (the sweep loop's check, which
-calls into the helper).
+hands expired ships to the helper as one background batch).
 """
 
 from __future__ import annotations
@@ -52,12 +52,14 @@ def _set_presence(
     online: bool,
     seconds_ago: float,
 ) -> None:
-    agent._byoa._presence[ship_id] = ByoaPresence(
-        ship_id=ship_id,
-        online=online,
-        status="online" if online else "offline",
-        last_seen_at=None,
-        last_seen_monotonic=time.monotonic() - seconds_ago,
+    agent._byoa._record_presence(
+        ByoaPresence(
+            ship_id=ship_id,
+            online=online,
+            status="online" if online else "offline",
+            last_seen_at=None,
+            last_seen_monotonic=time.monotonic() - seconds_ago,
+        )
     )
 
 
@@ -122,7 +124,8 @@ class TestMarkStaleByoaPresenceOffline:
             seconds_ago=PRESENCE_STALE_SECONDS + 5.0,
         )
 
-        await agent._byoa._mark_stale_offline()
+        release = await agent._byoa._mark_stale_offline()
+        await release
 
         assert agent._byoa._presence[ship_id].online is False
         assert ship_id not in agent._locked_ships
@@ -135,7 +138,7 @@ class TestMarkStaleByoaPresenceOffline:
         agent._locked_ships[ship_id] = "task-hhh"
         _set_presence(agent, ship_id, online=True, seconds_ago=1.0)
 
-        await agent._byoa._mark_stale_offline()
+        assert await agent._byoa._mark_stale_offline() is None
 
         assert agent._byoa._presence[ship_id].online is True
         assert agent._locked_ships[ship_id] == "task-hhh"